@@ -930,7 +930,7 @@ class OrderSamples:
         #in the reference contract...
         order.referenceContractId = referenceConId
         #being traded at...
-        order.referenceExchange = referenceExchange
+        order.referenceExchangeId = referenceExchange
         #starting reference price is...
         order.stockRefPrice = stockReferencePrice
         #Keep order active as long as reference contract trades between...
@@ -70,7 +70,10 @@ def printWhenExecuting(fn):
     return fn2
 
 def printinstance(inst:Object):
-    attrs = vars(inst)
+    if hasattr(inst, "__dict__"):
+        attrs = vars(inst)
+    else:
+        attrs = {name: getattr(inst, name) for name in inst.__slots__}
     print(', '.join("%s: %s" % item for item in attrs.items()))
 
 class Activity(Object):
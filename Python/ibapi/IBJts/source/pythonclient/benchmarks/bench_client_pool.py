@@ -0,0 +1,133 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Historical backfill through ClientPools of growing size, against a local
+stand-in server that answers reqHistoricalData() with generated bars. Like
+TWS it serves the requests of a connection one after the other, taking
+--service seconds for each, so one connection caps the request rate.
+
+    python benchmarks/bench_client_pool.py --requests 400 --bars 390 --service 0.005 --sizes 1,2,4,8
+"""
+
+import argparse
+import concurrent.futures
+import socket
+import threading
+import time
+
+from ibapi import comm
+from ibapi.client_pool import ClientPool
+from ibapi.contract import Contract
+from ibapi.message import IN, OUT
+from ibapi.server_versions import MAX_CLIENT_VER
+
+
+def recv_msgs(sock, buf):
+    while True:
+        msgs = buf.read_msgs()
+        if msgs:
+            return msgs
+        data = sock.recv(65536)
+        if not data:
+            return []
+        buf.write(data)
+
+
+def bars_msg(reqId, nBars):
+    flds = [comm.make_field(IN.HISTORICAL_DATA), comm.make_field(reqId),
+            comm.make_field("20191001 09:30:00"), comm.make_field("20191002 16:00:00"),
+            comm.make_field(nBars)]
+    for i in range(nBars):
+        price = 100. + (i % 50) * 0.01
+        flds += [comm.make_field("20191002 %02d:%02d:00" % (9 + i // 60, i % 60)),
+                 comm.make_field(price), comm.make_field(price + 0.05),
+                 comm.make_field(price - 0.05), comm.make_field(price + 0.01),
+                 comm.make_field(1000 + i), comm.make_field(price), comm.make_field(10)]
+    return comm.make_msg("".join(flds))
+
+
+clientId2nReqs = {}
+
+
+def serve(sock, nBars, service):
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.recv(4)    # API\0
+    buf = comm.MsgBuffer()
+    recv_msgs(sock, buf)
+    sock.sendall(comm.make_msg(comm.make_field(MAX_CLIENT_VER)
+                               + comm.make_field("20191002 12:00:00 EST")))
+    while True:
+        msgs = recv_msgs(sock, buf)
+        if not msgs:
+            break
+        for text in msgs:
+            fields = comm.read_fields(text)
+            if int(fields[0]) == OUT.START_API:
+                clientId = int(fields[2])
+                clientId2nReqs[clientId] = 0
+            elif int(fields[0]) == OUT.REQ_HISTORICAL_DATA:
+                clientId2nReqs[clientId] += 1
+                time.sleep(service)
+                sock.sendall(bars_msg(int(fields[1]), nBars))
+    sock.close()
+
+
+def start_server(nBars, service):
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+
+    def accept():
+        while True:
+            try:
+                (sock, _) = server.accept()
+            except OSError:
+                return
+            threading.Thread(target=serve, args=(sock, nBars, service),
+                             daemon=True).start()
+
+    threading.Thread(target=accept, daemon=True).start()
+    return server
+
+
+def backfill(port, size, nRequests):
+    pool = ClientPool(size)
+    pool.connect("127.0.0.1", port, 100)
+    contract = Contract()
+    contract.symbol = "SPY"
+    t0 = time.perf_counter()
+    futs = [pool.reqHistoricalDataFuture(contract, "", "1 D", "1 min",
+                                         "TRADES", 1, 1, timeout=60)
+            for _ in range(nRequests)]
+    concurrent.futures.wait(futs)
+    dt = time.perf_counter() - t0
+    nBars = sum(len(fut.result()) for fut in futs)
+    perClient = [clientId2nReqs.pop(client.clientId) for client in pool.clients]
+    pool.disconnect()
+    return dt, nBars, perClient
+
+
+def main():
+    parser = argparse.ArgumentParser("ClientPool backfill")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--bars", type=int, default=390)
+    parser.add_argument("--service", type=float, default=0.005,
+                        help="server seconds per request and connection")
+    parser.add_argument("--sizes", default="1,2,4,8")
+    args = parser.parse_args()
+
+    server = start_server(args.bars, args.service)
+    port = server.getsockname()[1]
+    for size in (int(s) for s in args.sizes.split(",")):
+        (dt, nBars, perClient) = backfill(port, size, args.requests)
+        print("%2d connections: %6.2fs  %7.1f req/s  %9.0f bars/s  requests per connection %s" % (
+            size, dt, args.requests / dt, nBars / dt, perClient))
+    server.close()
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,138 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+The entry path of an option strategy (as in Tradifact_00_05.py): for each
+option contract a reqContractDetails(), a reqMktData() and 4 placeOrder()
+(entry, stop, target and time exit), with the encoded contract cache and
+without it (contractCache.maxSize = 0). Gives the time of each request
+and of the whole path per contract, and for each msg the bytes still built
+field by field when the contract fields come from the cache.
+
+    python benchmarks/bench_contract_cache.py --contracts 200
+"""
+
+import argparse
+import timeit
+
+from ibapi import encoder, log_mode
+from ibapi.client import EClient
+from ibapi.contract import Contract
+from ibapi.order import Order
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+class NullConnection:
+    def isConnected(self):
+        return True
+
+    def sendMsg(self, msg):
+        self.msg = msg
+        return len(msg)
+
+
+def option_contracts(nContracts):
+    contracts = []
+    for i in range(nContracts):
+        contract = Contract()
+        contract.conId = 400000000 + i
+        contract.symbol = "SPY"
+        contract.secType = "OPT"
+        contract.lastTradeDateOrContractMonth = "20191018"
+        contract.strike = 280.0 + i % 40
+        contract.right = "CP"[i % 2]
+        contract.multiplier = "100"
+        contract.exchange = "SMART"
+        contract.currency = "USD"
+        contract.localSymbol = "SPY   191018%s%08d" % (contract.right, contract.strike * 1000)
+        contract.tradingClass = "SPY"
+        contracts.append(contract)
+    return contracts
+
+
+def bracket_orders():
+    orders = []
+    for (orderType, price) in (("LMT", 2.5), ("STP", 1.8), ("LMT", 3.4), ("MKT", 0)):
+        order = Order()
+        order.action = "BUY" if not orders else "SELL"
+        order.totalQuantity = 10
+        order.orderType = orderType
+        if orderType == "LMT":
+            order.lmtPrice = price
+        elif orderType == "STP":
+            order.auxPrice = price
+        order.tif = "DAY"
+        order.account = "DU123456"
+        order.transmit = len(orders) == 3
+        orders.append(order)
+    return orders
+
+
+def main():
+    parser = argparse.ArgumentParser("encoded contract cache benchmark")
+    parser.add_argument("--contracts", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="timings, best kept")
+    args = parser.parse_args()
+
+    log_mode.setLogMode(log_mode.PRODUCTION)
+    client = EClient(EWrapper())
+    client.conn = NullConnection()
+    client.serverVersion_ = MAX_CLIENT_VER
+    client.connState = EClient.CONNECTED
+
+    contracts = option_contracts(args.contracts)
+    orders = bracket_orders()
+    contract = contracts[0]
+
+    def entry_path():
+        for contract in contracts:
+            client.reqContractDetails(1, contract)
+            client.reqMktData(2, contract, "", False, False, [])
+            for (orderId, order) in enumerate(orders, 1001):
+                client.placeOrder(orderId, contract, order)
+
+    requests = (
+        ("reqContractDetails", lambda: client.reqContractDetails(1, contract)),
+        ("reqMktData", lambda: client.reqMktData(2, contract, "", False, False, [])),
+        ("placeOrder", lambda: client.placeOrder(1001, contract, orders[0])))
+
+    cache = encoder.contractCache
+    maxSize = cache.maxSize
+    times = {}
+    def timed(key, fn, number):
+        t = timeit.timeit(fn, number=number) / number
+        times[key] = min(times.get(key, t), t)
+
+    # off and on in turn, the best of each kept
+    for _ in range(args.repeat):
+        for size in (0, maxSize):
+            cache.maxSize = size
+            cache.invalidate()
+            timed(("entry path", size), entry_path, 1)
+            for (name, fn) in requests:
+                timed((name, size), fn, 2000)
+    cache.maxSize = maxSize
+
+    # the contract fields spliced from the cache are not built again
+    encoders = encoder.forServerVersion(MAX_CLIENT_VER)
+    print("%-20s %10s %10s %8s %10s" % ("request", "off us", "on us", "wire B",
+                                        "built B"))
+    for (name, fn) in requests:
+        fn()
+        msg = client.conn.msg
+        blocks = getattr(encoders, name).__globals__["contractBlocks"]
+        (values, types, text) = blocks[contract.conId]
+        print("%-20s %10.2f %10.2f %8d %10d" % (name, times[(name, 0)] * 1e6,
+              times[(name, maxSize)] * 1e6, len(msg), len(msg) - len(text.encode())))
+    print("%-20s %10.2f %10.2f   (per contract: 1 reqContractDetails, 1 reqMktData,"
+          " %d placeOrder)" % ("entry path", times[("entry path", 0)] / len(contracts) * 1e6,
+          times[("entry path", maxSize)] / len(contracts) * 1e6, len(orders)))
+
+
+if "__main__" == __name__:
+    main()
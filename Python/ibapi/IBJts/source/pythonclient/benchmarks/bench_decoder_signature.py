@@ -0,0 +1,68 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Per msg type comparison of Decoder.interpretWithSignature() against the
+decoders generated by Decoder.compileDecoders(), for all the msgs that are
+mapped directly to an EWrapper method (TICK_SIZE, ERR_MSG, ACCT_VALUE, ...).
+
+    python benchmarks/bench_decoder_signature.py --number 100000
+"""
+
+import argparse
+import inspect
+import timeit
+
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+# EWrapper w/ all the callbacks doing nothing, so that only decoding is timed
+NoopWrapper = type("NoopWrapper", (EWrapper, ), {name: lambda self, *args: None
+    for (name, _) in inspect.getmembers(EWrapper, inspect.isfunction)
+    if name != "__init__"})
+
+MsgId2Name = {msgId: name for (name, msgId) in vars(IN).items()
+              if not name.startswith("_")}
+
+
+def sample_fields(msgId, wrapperParams):
+    fields = [str(msgId).encode(), b"1"]
+    for (pname, param) in wrapperParams.items():
+        if pname != "self":
+            if param.annotation is int:
+                fields.append(b"1001")
+            elif param.annotation is float:
+                fields.append(b"289.91")
+            else:
+                fields.append(b"NetLiquidation")
+    return tuple(fields)
+
+
+def main():
+    parser = argparse.ArgumentParser("signature decoders benchmark")
+    parser.add_argument("--number", type=int, default=100000,
+                        help="msgs decoded per msg type and decoder")
+    args = parser.parse_args()
+
+    decoder = Decoder(NoopWrapper(), MAX_CLIENT_VER)
+
+    print("%-28s %12s %12s %8s" % ("msg", "signature/s", "compiled/s", "speedup"))
+    for (msgId, decodeFn) in sorted(decoder.msgId2decodeFn.items()):
+        handleInfo = decoder.msgId2handleInfo[msgId]
+        fields = sample_fields(msgId, handleInfo.wrapperParams)
+
+        tSig = timeit.timeit(lambda: decoder.interpretWithSignature(fields, handleInfo),
+                             number=args.number)
+        tFast = timeit.timeit(lambda: decoder.interpret(fields), number=args.number)
+        print("%-28s %12.0f %12.0f %7.1fx" % (MsgId2Name[msgId],
+            args.number / tSig, args.number / tFast, tSig / tFast))
+
+
+if "__main__" == __name__:
+    main()
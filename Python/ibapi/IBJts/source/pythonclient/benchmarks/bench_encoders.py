@@ -0,0 +1,146 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Orders encoded per second by the precompiled placeOrder encoder, alone and
+through EClient.placeOrder() in production log mode (the not connected
+check, the error handling and sendMsg() to a connection that drops the
+bytes), for a few kinds of orders. Also gives the time to compile the
+encoders of a server version, paid once per process.
+
+    python benchmarks/bench_encoders.py --serverVersion 151 --number 20000
+"""
+
+import argparse
+import time
+import timeit
+
+from ibapi import encoder, log_mode
+from ibapi.client import EClient
+from ibapi.contract import ComboLeg, Contract
+from ibapi.order import Order, OrderComboLeg
+from ibapi.order_condition import OrderCondition, Create
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.tag_value import TagValue
+from ibapi.wrapper import EWrapper
+
+
+class NullConnection:
+    def isConnected(self):
+        return True
+
+    def sendMsg(self, msg):
+        return len(msg)
+
+
+def stock():
+    contract = Contract()
+    contract.symbol = "AAPL"
+    contract.secType = "STK"
+    contract.exchange = "SMART"
+    contract.primaryExchange = "ISLAND"
+    contract.currency = "USD"
+    return contract
+
+
+def combo():
+    contract = Contract()
+    contract.symbol = "MCD"
+    contract.secType = "BAG"
+    contract.exchange = "SMART"
+    contract.currency = "USD"
+    contract.comboLegs = []
+    for (conId, action) in ((43645865, "BUY"), (9408, "SELL")):
+        leg = ComboLeg()
+        leg.conId = conId
+        leg.ratio = 1
+        leg.action = action
+        leg.exchange = "SMART"
+        contract.comboLegs.append(leg)
+    return contract
+
+
+def limit_order():
+    order = Order()
+    order.action = "BUY"
+    order.totalQuantity = 100
+    order.orderType = "LMT"
+    order.lmtPrice = 289.91
+    order.tif = "DAY"
+    order.account = "DU123456"
+    return order
+
+
+def orders():
+    """ (name, contract, order) """
+    lmt = limit_order()
+
+    adaptive = limit_order()
+    adaptive.algoStrategy = "Adaptive"
+    adaptive.algoParams = [TagValue("adaptivePriority", "Normal")]
+
+    comboLegs = limit_order()
+    comboLegs.orderComboLegs = []
+    for price in (10.5, 11.0):
+        leg = OrderComboLeg()
+        leg.price = price
+        comboLegs.orderComboLegs.append(leg)
+    comboLegs.smartComboRoutingParams = [TagValue("NonGuaranteed", "1")]
+
+    conditions = limit_order()
+    priceCondition = Create(OrderCondition.Price)
+    priceCondition.conId = 265598
+    priceCondition.exchange = "SMART"
+    priceCondition.isMore = True
+    priceCondition.triggerMethod = 0
+    priceCondition.price = 300
+    timeCondition = Create(OrderCondition.Time)
+    timeCondition.isMore = True
+    timeCondition.time = "20191018 16:00:00"
+    timeCondition.isConjunctionConnection = True
+    conditions.conditions = [priceCondition, timeCondition]
+
+    return (("LMT", stock(), lmt),
+            ("Adaptive algo", stock(), adaptive),
+            ("combo with leg prices", combo(), comboLegs),
+            ("conditions", stock(), conditions))
+
+
+def main():
+    parser = argparse.ArgumentParser("placeOrder encoding benchmark")
+    parser.add_argument("--serverVersion", type=int, default=MAX_CLIENT_VER)
+    parser.add_argument("--number", type=int, default=20000,
+                        help="orders encoded per timing")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="timings per order, best kept")
+    args = parser.parse_args()
+
+    log_mode.setLogMode(log_mode.PRODUCTION)
+
+    start = time.perf_counter()
+    encoder.Encoders(args.serverVersion)
+    print("compile the encoders of server version %d: %.1f ms" % (
+          args.serverVersion, (time.perf_counter() - start) * 1e3))
+
+    encoders = encoder.forServerVersion(args.serverVersion)
+    client = EClient(EWrapper())
+    client.conn = NullConnection()
+    client.serverVersion_ = args.serverVersion
+    client.connState = EClient.CONNECTED
+
+    print("%-24s %6s %14s %14s" % ("order", "bytes", "encoder/s", "placeOrder/s"))
+    for (name, contract, order) in orders():
+        nBytes = len(encoders.placeOrder(1001, contract, order))
+        rates = []
+        for fn in (lambda: encoders.placeOrder(1001, contract, order),
+                   lambda: client.placeOrder(1001, contract, order)):
+            best = min(timeit.repeat(fn, number=args.number, repeat=args.repeat))
+            rates.append(args.number / best)
+        print("%-24s %6d %14.0f %14.0f" % (name, nBytes, rates[0], rates[1]))
+
+
+if "__main__" == __name__:
+    main()
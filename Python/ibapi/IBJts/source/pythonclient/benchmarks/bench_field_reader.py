@@ -0,0 +1,137 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Field extraction for tick and bar msgs with utils.decode() against
+utils.FieldReader, followed by the msgs/s of Decoder.interpret() (which now
+uses the FieldReader) for the same msgs.
+
+    python benchmarks/bench_field_reader.py --number 100000
+"""
+
+import argparse
+import timeit
+
+from ibapi import comm
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.utils import decode, FieldReader
+from ibapi.wrapper import EWrapper
+
+
+class NoopWrapper(EWrapper):
+    def tickPrice(self, reqId, tickType, price, attrib):
+        pass
+
+    def tickSize(self, reqId, tickType, size):
+        pass
+
+    def historicalData(self, reqId, bar):
+        pass
+
+    def historicalDataEnd(self, reqId, start, end):
+        pass
+
+
+def tick_fields():
+    return comm.read_fields(str.encode(comm.make_field(IN.TICK_PRICE)
+        + "".join(comm.make_field(v) for v in (6, 1001, 1, 289.91, 300, 0))))
+
+
+def bars_fields(nBars):
+    bar = "".join(comm.make_field(v) for v in ("20190902  09:30:00", 289.12,
+        290.5, 288.75, 289.9, 1234567, 289.4, 4321))
+    return comm.read_fields(str.encode(comm.make_field(IN.HISTORICAL_DATA)
+        + comm.make_field(1) + comm.make_field("20190902  09:30:00")
+        + comm.make_field("20190903  09:30:00") + comm.make_field(nBars)
+        + bar * nBars))
+
+
+def tick_decode(fields):
+    fields = iter(fields)
+    next(fields)
+    decode(int, fields)
+    decode(int, fields)
+    decode(int, fields)
+    decode(float, fields)
+    decode(int, fields)
+    decode(int, fields)
+
+
+def tick_field_reader(fields):
+    fields = FieldReader(fields)
+    fields.skip()
+    fields.int()
+    fields.int()
+    fields.int()
+    fields.float()
+    fields.int()
+    fields.int()
+
+
+def bars_decode(fields):
+    fields = iter(fields)
+    next(fields)
+    decode(int, fields)
+    decode(str, fields)
+    decode(str, fields)
+    for _ in range(decode(int, fields)):
+        decode(str, fields)
+        decode(float, fields)
+        decode(float, fields)
+        decode(float, fields)
+        decode(float, fields)
+        decode(int, fields)
+        decode(float, fields)
+        decode(int, fields)
+
+
+def bars_field_reader(fields):
+    fields = FieldReader(fields)
+    fields.skip()
+    fields.int()
+    fields.str()
+    fields.str()
+    for _ in range(fields.int()):
+        fields.str()
+        fields.float()
+        fields.float()
+        fields.float()
+        fields.float()
+        fields.int()
+        fields.float()
+        fields.int()
+
+
+def main():
+    parser = argparse.ArgumentParser("utils.decode vs FieldReader benchmark")
+    parser.add_argument("--number", type=int, default=100000,
+                        help="tick msgs, and bars, decoded per run")
+    args = parser.parse_args()
+
+    tick = tick_fields()
+    nBars = 1000
+    bars = bars_fields(nBars)
+    cases = (("tick msgs", tick, tick_decode, tick_field_reader, 1, args.number),
+             ("bars", bars, bars_decode, bars_field_reader, nBars, args.number // nBars))
+    for (name, fields, fnDecode, fnReader, nPerMsg, number) in cases:
+        tDecode = timeit.timeit(lambda: fnDecode(fields), number=number)
+        tReader = timeit.timeit(lambda: fnReader(fields), number=number)
+        n = number * nPerMsg
+        print("%-10s decode %10.0f/s  FieldReader %10.0f/s  %5.1fx" % (name,
+            n / tDecode, n / tReader, tDecode / tReader))
+
+    decoder = Decoder(NoopWrapper(), MAX_CLIENT_VER)
+    t = timeit.timeit(lambda: decoder.interpret(tick), number=args.number)
+    print("interpret TICK_PRICE      %10.0f msgs/s" % (args.number / t))
+    number = args.number // nBars
+    t = timeit.timeit(lambda: decoder.interpret(bars), number=number)
+    print("interpret HISTORICAL_DATA %10.0f bars/s" % (number * nBars / t))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,89 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Time and memory needed to decode and keep a historical data answer: one
+historicalData() call and BarData per bar, collected in a list as most apps
+do, against the single historicalDataColumns() call with NumPy arrays.
+The memory is the peak traced by tracemalloc while decoding plus what is
+still held once done; the msg itself is not counted.
+
+    python benchmarks/bench_hist_columns.py --bars 100000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from ibapi import comm
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+class KeepingWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.data = None
+
+    def historicalData(self, reqId, bar):
+        if self.data is None:
+            self.data = []
+        self.data.append(bar)
+
+    def historicalDataColumns(self, reqId, *columns):
+        self.data = columns
+
+    def historicalDataEnd(self, reqId, start, end):
+        pass
+
+
+def hist_data_fields(nBars):
+    bar = str.encode("".join(comm.make_field(v) for v in ("20190902  09:30:00",
+        289.12, 290.5, 288.75, 289.9, 1234567, 289.4, 4321)))
+    head = str.encode(comm.make_field(IN.HISTORICAL_DATA) + comm.make_field(1)
+        + comm.make_field("20190902  09:30:00") + comm.make_field("20190903  09:30:00")
+        + comm.make_field(nBars))
+    return comm.read_fields(head + bar * nBars)
+
+
+def run(fields, columnar, trace):
+    """ decoding time, and when tracing: memory held and peak """
+    wrapper = KeepingWrapper()
+    decoder = Decoder(wrapper, MAX_CLIENT_VER, columnarHistData=columnar)
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    decoder.interpret(fields)
+    dt = time.perf_counter() - t0
+    if not trace:
+        return dt, 0, 0
+    (held, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dt, held, peak
+
+
+def main():
+    parser = argparse.ArgumentParser("per bar vs columnar historical data")
+    parser.add_argument("--bars", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fields = hist_data_fields(args.bars)
+    per100k = 100000 / args.bars
+    for (name, columnar) in (("per bar", False), ("columnar", True)):
+        # tracemalloc slows the decoding down, time it apart
+        dt = min(run(fields, columnar, False)[0] for _ in range(args.repeat))
+        (_, held, peak) = run(fields, columnar, True)
+        print("%-9s %8.1f ms  held %7.1f MB  peak %7.1f MB  (per 100k bars)" % (
+            name, dt * 1e3 * per100k, held / 1e6 * per100k, peak / 1e6 * per100k))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,95 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Time and memory needed to decode and keep pages of 1000 historical ticks:
+the HistoricalTick* objects collected in a list against the structured arrays
+of historicalTicksArray(), for each whatToShow.
+
+    python benchmarks/bench_hist_ticks.py --pages 200
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from ibapi import comm
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+class KeepingWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.pages = []
+
+    def historicalTicks(self, reqId, ticks, done):
+        self.pages.append(ticks)
+
+    def historicalTicksBidAsk(self, reqId, ticks, done):
+        self.pages.append(ticks)
+
+    def historicalTicksLast(self, reqId, ticks, done):
+        self.pages.append(ticks)
+
+    def historicalTicksArray(self, reqId, ticks, done):
+        self.pages.append(ticks)
+
+
+# whatToShow, msg id, fields of one tick
+TICKS = (
+    ("MIDPOINT", IN.HISTORICAL_TICKS, (1567411200, "", 289.12, 100)),
+    ("BID_ASK", IN.HISTORICAL_TICKS_BID_ASK, (1567411200, 2, 289.1, 289.2, 300, 200)),
+    ("TRADES", IN.HISTORICAL_TICKS_LAST, (1567411200, 3, 289.12, 100, "ISLAND", "  I")),
+)
+
+
+def page_fields(msgId, tickFields, nTicks):
+    tick = "".join(comm.make_field(v) for v in tickFields)
+    return comm.read_fields(str.encode(comm.make_field(msgId) + comm.make_field(1)
+        + comm.make_field(nTicks) + tick * nTicks + comm.make_field(0)))
+
+
+def run(pages, columnar, trace):
+    """ decoding time, and when tracing: memory held and peak """
+    wrapper = KeepingWrapper()
+    decoder = Decoder(wrapper, MAX_CLIENT_VER, columnarHistTicks=columnar)
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    for fields in pages:
+        decoder.interpret(fields)
+    dt = time.perf_counter() - t0
+    if not trace:
+        return dt, 0, 0
+    (held, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dt, held, peak
+
+
+def main():
+    parser = argparse.ArgumentParser("tick objects vs structured arrays")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for (whatToShow, msgId, tickFields) in TICKS:
+        pages = [page_fields(msgId, tickFields, 1000)] * args.pages
+        nTicks = 1000 * args.pages
+        print("%s, %d ticks" % (whatToShow, nTicks))
+        for (name, columnar) in (("objects", False), ("arrays", True)):
+            dt = min(run(pages, columnar, False)[0] for _ in range(args.repeat))
+            (_, held, peak) = run(pages, columnar, True)
+            print("  %-8s %8.1f ns/tick  held %6.1f B/tick  peak %7.1f MB" % (
+                name, dt * 1e9 / nTicks, held / nTicks, peak / 1e6))
+
+
+if "__main__" == __name__:
+    main()
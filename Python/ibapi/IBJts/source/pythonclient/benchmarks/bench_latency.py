@@ -0,0 +1,128 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Compares the tick latency (server write -> EWrapper callback) of the threaded
+EClient (EReader thread + Queue + run loop) against the AsyncEClient.
+A local server thread does the handshake and then sends tickString messages
+carrying their send timestamp.
+
+    python benchmarks/bench_latency.py --ticks 5000 --interval 0.0005
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import threading
+import time
+
+from ibapi import comm
+from ibapi.async_client import AsyncEClient
+from ibapi.client import EClient
+from ibapi.message import IN
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+class LatencyWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.latencies = []
+
+    def tickString(self, reqId, tickType, value:str):
+        self.latencies.append(time.perf_counter() - float(value))
+
+    def connectAck(self):
+        pass
+
+    def connectionClosed(self):
+        pass
+
+
+def recv_msg(sock, buf):
+    while True:
+        msgs = buf.read_msgs()
+        if msgs:
+            return msgs
+        buf.write(sock.recv(4096))
+
+
+def serve(server, nTicks, interval):
+    (sock, _) = server.accept()
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    prefix = b""
+    while len(prefix) < 4:
+        prefix += sock.recv(4 - len(prefix))
+    buf = comm.MsgBuffer()
+    recv_msg(sock, buf)
+
+    sock.sendall(comm.make_msg(comm.make_field(MAX_CLIENT_VER)
+                               + comm.make_field("20191002 12:00:00 EST")))
+    recv_msg(sock, buf)     # startApi
+    time.sleep(0.1)
+
+    for i in range(nTicks):
+        msg = comm.make_msg(comm.make_field(IN.TICK_STRING) + comm.make_field(6)
+            + comm.make_field(1) + comm.make_field(45)
+            + comm.make_field(repr(time.perf_counter())))
+        sock.sendall(msg)
+        deadline = time.perf_counter() + interval
+        while time.perf_counter() < deadline:
+            pass
+    sock.close()
+
+
+def start_server(nTicks, interval):
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    thread = threading.Thread(target=serve, args=(server, nTicks, interval))
+    thread.start()
+    return server, thread
+
+
+def run_threaded(port):
+    wrapper = LatencyWrapper()
+    app = EClient(wrapper)
+    app.connect("127.0.0.1", port, 0)
+    app.run()
+    return wrapper.latencies
+
+
+def run_async(port):
+    wrapper = LatencyWrapper()
+
+    async def main():
+        app = AsyncEClient(wrapper)
+        await app.connect("127.0.0.1", port, 0)
+        await app.run()
+
+    asyncio.run(main())
+    return wrapper.latencies
+
+
+def main():
+    parser = argparse.ArgumentParser("EClient vs AsyncEClient tick latency")
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--interval", type=float, default=0.0005,
+                        help="seconds between two ticks")
+    args = parser.parse_args()
+
+    for (name, fn) in (("threaded", run_threaded), ("asyncio", run_async)):
+        (server, thread) = start_server(args.ticks, args.interval)
+        latencies = fn(server.getsockname()[1])
+        thread.join()
+        server.close()
+        latencies.sort()
+        us = lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1e6
+        print("%-9s %6d ticks  mean %8.1f us  p50 %8.1f us  p99 %8.1f us  max %8.1f us" % (
+            name, len(latencies), statistics.mean(latencies) * 1e6, us(0.5),
+            us(0.99), latencies[-1] * 1e6))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,92 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Decodes a batch of OPEN_ORDER msgs (10k by default, as after a
+reqAllOpenOrders on a busy account) with Decoder.processOpenOrder(), and
+with the previous way of doing it: re-running the EWrapper introspection
+and calling the unbound OrderDecoder methods for every msg.
+
+    python benchmarks/bench_open_order.py --msgs 10000
+"""
+
+import argparse
+import time
+
+from ibapi.contract import Contract
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.order import Order
+from ibapi.order_state import OrderState
+from ibapi.orderdecoder import OrderDecoder
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.utils import FieldReader
+from ibapi.wrapper import EWrapper
+
+
+class CountingWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.n = 0
+
+    def openOrder(self, orderId, contract, order, orderState):
+        self.n += 1
+
+
+def open_order_msgs(nMsgs):
+    """ OPEN_ORDER msgs as sent by a server at MAX_CLIENT_VER """
+    symbols = (b"AAPL", b"MSFT", b"AMD", b"SPY", b"QQQ")
+    msgs = []
+    for i in range(nMsgs):
+        fields = [b"0"] * 130
+        symbol = symbols[i % len(symbols)]
+        fields[0:26] = (str(IN.OPEN_ORDER).encode(), str(1000 + i).encode(),
+            b"265598", symbol, b"STK", b"", b"0", b"", b"", b"SMART", b"USD",
+            symbol, b"NMS", (b"BUY", b"SELL")[i % 2], b"100", b"LMT",
+            ("%.2f" % (100 + i % 50)).encode(), b"", b"DAY", b"", b"DU123456",
+            b"O", b"0", b"Tradifact_entry", b"0", str(900000 + i).encode())
+        msgs.append(tuple(fields))
+    return msgs
+
+
+def process_open_order_introspect(decoder, fields):
+    """ how processOpenOrder() used to do it """
+    fields.skip()
+    contract = Contract()
+    order = Order()
+    orderState = OrderState()
+    decoder.discoverParams()
+    od = decoder.orderDecoder
+    (od.contract, od.order, od.orderState) = (contract, order, orderState)
+    od.version = decoder.serverVersion
+    od.serverVersion = decoder.serverVersion
+    for step in od.openOrderSteps:
+        func = getattr(step, "func", step)
+        args = getattr(step, "keywords", {})
+        getattr(OrderDecoder, func.__name__)(od, fields, **args)
+    decoder.wrapper.openOrder(order.orderId, contract, order, orderState)
+
+
+def main():
+    parser = argparse.ArgumentParser("OPEN_ORDER decoding benchmark")
+    parser.add_argument("--msgs", type=int, default=10000)
+    args = parser.parse_args()
+
+    msgs = open_order_msgs(args.msgs)
+    for (name, fn) in (("introspect", process_open_order_introspect),
+                       ("bound steps", Decoder.processOpenOrder)):
+        wrapper = CountingWrapper()
+        decoder = Decoder(wrapper, MAX_CLIENT_VER)
+        t0 = time.perf_counter()
+        for fields in msgs:
+            fn(decoder, FieldReader(fields))
+        dt = time.perf_counter() - t0
+        assert wrapper.n == len(msgs)
+        print("%-12s %8.3f s %10.0f orders/s" % (name, dt, len(msgs) / dt))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,123 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Replays a market depth stream into OrderBooks and reports the events/s:
+straight OrderBook.update() calls, then the full Decoder.interpret() ->
+OrderBookWrapper path.
+
+The stream is either a file of recorded msgs (the raw bytes as received from
+TWS, size prefix included) or a generated one: a 10 rows book on each side
+under a random walk of inserts, updates and deletes.
+
+    python benchmarks/bench_order_book.py --events 1000000
+    python benchmarks/bench_order_book.py --stream depth.bin
+"""
+
+import argparse
+import random
+import time
+
+from ibapi import comm
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.order_book import (OrderBook, OrderBookWrapper, DepthSideEnum,
+                              DepthOperationEnum)
+from ibapi.server_versions import MAX_CLIENT_VER
+
+
+def generate_stream(nEvents, nRows=10, seed=1):
+    """ msg payloads of updateMktDepthL2 events for reqId 1 """
+    rnd = random.Random(seed)
+    depth = [0, 0]
+    msgs = []
+    for _ in range(nEvents):
+        side = rnd.randrange(2)
+        r = rnd.random()
+        if depth[side] == 0 or (r < 0.15 and depth[side] < nRows):
+            operation = DepthOperationEnum.INSERT
+            position = rnd.randrange(depth[side] + 1)
+            depth[side] += 1
+        elif r < 0.30:
+            operation = DepthOperationEnum.DELETE
+            position = rnd.randrange(depth[side])
+            depth[side] -= 1
+        else:
+            operation = DepthOperationEnum.UPDATE
+            position = rnd.randrange(depth[side])
+        offset = (position + 1) * 0.01
+        price = 100. - offset if side == DepthSideEnum.BID else 100. + offset
+        msgs.append(str.encode(comm.make_field(IN.MARKET_DEPTH_L2)
+            + "".join(comm.make_field(v) for v in (1, 1, position, "ARCA",
+                operation, side, round(price, 2), rnd.randrange(1, 50) * 100, 0))))
+    return msgs
+
+
+def load_stream(fileName):
+    buf = comm.MsgBuffer()
+    with open(fileName, "rb") as f:
+        buf.write(f.read())
+    return [text for text in buf.read_msgs()
+            if int(text[:text.index(b"\0")]) in (IN.MARKET_DEPTH, IN.MARKET_DEPTH_L2)]
+
+
+def events(msgs):
+    """ (reqId, position, operation, side, price, size, marketMaker) """
+    evts = []
+    for text in msgs:
+        fields = comm.read_fields(text)
+        if int(fields[0]) == IN.MARKET_DEPTH_L2:
+            (_, _, reqId, position, mm, operation, side, price, size) = fields[:9]
+        else:
+            (_, _, reqId, position, operation, side, price, size) = fields[:8]
+            mm = b""
+        evts.append((int(reqId), int(position), int(operation), int(side),
+                     float(price), int(size), mm.decode()))
+    return evts
+
+
+def replay_books(evts):
+    books = {}
+    t0 = time.perf_counter()
+    for (reqId, position, operation, side, price, size, mm) in evts:
+        book = books.get(reqId)
+        if book is None:
+            book = books[reqId] = OrderBook()
+        book.update(position, operation, side, price, size, mm)
+    return time.perf_counter() - t0, books
+
+
+def replay_decoder(msgs):
+    wrapper = OrderBookWrapper()
+    decoder = Decoder(wrapper, MAX_CLIENT_VER)
+    fieldsList = [comm.read_fields(text) for text in msgs]
+    t0 = time.perf_counter()
+    for fields in fieldsList:
+        decoder.interpret(fields)
+    return time.perf_counter() - t0, wrapper.orderBooks
+
+
+def main():
+    parser = argparse.ArgumentParser("order book replay")
+    parser.add_argument("--events", type=int, default=1000000)
+    parser.add_argument("--stream", help="file of recorded msgs to replay")
+    args = parser.parse_args()
+
+    msgs = load_stream(args.stream) if args.stream else generate_stream(args.events)
+    evts = events(msgs)
+    print("%d depth events" % len(evts))
+
+    (dt, books) = replay_books(evts)
+    print("OrderBook.update()     %10.0f events/s  %6.0f ns/event" % (len(evts) / dt, dt * 1e9 / len(evts)))
+    (dt, wrapperBooks) = replay_decoder(msgs)
+    print("Decoder+OrderBookWrapper %8.0f events/s  %6.0f ns/event" % (len(evts) / dt, dt * 1e9 / len(evts)))
+    for (reqId, book) in books.items():
+        assert str(book) == str(wrapperBooks[reqId])
+        print("reqId %d: %s" % (reqId, book))
+
+
+if "__main__" == __name__:
+    main()
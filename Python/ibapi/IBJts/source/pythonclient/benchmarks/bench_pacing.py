@@ -0,0 +1,114 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Runs a burst of requests through a PacingScheduler on a simulated clock and
+reports how long each lane waited: a backfill of historical requests and a
+batch of contract details queued at once, with orders and cancels arriving
+every few hundred ms on top of them. Also reports the scheduler cost per msg.
+
+    python benchmarks/bench_pacing.py --hist 120 --contracts 500 --orders 100
+"""
+
+import argparse
+import collections
+import time
+
+from ibapi import comm
+from ibapi.message import OUT
+from ibapi.pacing import PacingScheduler, SendLaneEnum, OutMsgId2Lane
+from ibapi.server_versions import MAX_CLIENT_VER
+
+
+class SimClock:
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingConn:
+    def __init__(self, clock):
+        self.clock = clock
+        self.sent = []
+
+    def sendMsg(self, msg):
+        self.sent.append((self.clock.now, msg))
+
+
+def make_msg(msgId, reqId, *rest):
+    return comm.make_msg(comm.make_field(msgId) + comm.make_field(reqId)
+                         + "".join(comm.make_field(v) for v in rest))
+
+
+def main():
+    parser = argparse.ArgumentParser("pacing scheduler")
+    parser.add_argument("--hist", type=int, default=120, help="historical requests")
+    parser.add_argument("--contracts", type=int, default=500, help="contract details requests")
+    parser.add_argument("--orders", type=int, default=100, help="orders and cancels")
+    parser.add_argument("--orderEvery", type=float, default=0.25, help="seconds between orders")
+    args = parser.parse_args()
+
+    clock = SimClock()
+    conn = RecordingConn(clock)
+    pacer = PacingScheduler(conn, MAX_CLIENT_VER, clock)
+
+    queuedAt = {}
+    arrivals = [(i * args.orderEvery, make_msg(OUT.PLACE_ORDER if i % 2 else OUT.CANCEL_ORDER, i))
+                for i in range(args.orders)]
+    for reqId in range(args.hist):
+        msg = make_msg(OUT.REQ_HISTORICAL_DATA, reqId, "SYM%d" % (reqId % 40), "1 D")
+        queuedAt[msg] = 0.
+        pacer.sendMsg(msg)
+    for reqId in range(args.contracts):
+        msg = make_msg(OUT.REQ_CONTRACT_DATA, reqId, "SYM%d" % reqId)
+        queuedAt[msg] = 0.
+        pacer.sendMsg(msg)
+
+    print("expected wait of the last queued msg: %.1fs" % pacer.queuedRequests()[-1]["expectedWait"])
+
+    nCalls = 0
+    cpu = 0.
+    nMsgs = args.hist + args.contracts + args.orders
+    while len(conn.sent) < nMsgs:
+        while arrivals and arrivals[0][0] <= clock.now:
+            (_, msg) = arrivals.pop(0)
+            queuedAt[msg] = clock.now
+            pacer.sendMsg(msg)
+        t0 = time.perf_counter()
+        wait = pacer.sendReady()
+        cpu += time.perf_counter() - t0
+        nCalls += 1
+        nextArrival = arrivals[0][0] if arrivals else None
+        if wait is None:
+            if nextArrival is None:
+                break
+            wait = nextArrival - clock.now
+        elif nextArrival is not None:
+            wait = min(wait, nextArrival - clock.now)
+        clock.now += max(wait, 1e-6)
+
+    lane2waits = collections.defaultdict(list)
+    for (sentAt, msg) in conn.sent:
+        msgId = int(msg[4:msg.index(b"\0", 4)])
+        lane = OutMsgId2Lane.get(msgId, SendLaneEnum.CONTROL)
+        lane2waits[SendLaneEnum.to_str(lane)].append(sentAt - queuedAt[msg])
+
+    stamps = [sentAt for (sentAt, _) in conn.sent]
+    worstSec = max(sum(1 for t in stamps[i:i+60] if t < start + 1.)
+                   for (i, start) in enumerate(stamps))
+    print("%d msgs sent in %.1fs simulated, at most %d in any second" % (
+        len(stamps), stamps[-1], worstSec))
+    for (lane, waits) in sorted(lane2waits.items()):
+        waits.sort()
+        print("%-10s %5d msgs  wait median %7.3fs  max %7.3fs" % (
+            lane, len(waits), waits[len(waits) // 2], waits[-1]))
+    print("sendReady(): %d calls, %.1f us per msg sent" % (nCalls, cpu * 1e6 / nMsgs))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,104 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Measures the EReader -> Queue -> EClient.run() handoff, one queue item per
+msg against one queue item per packet (EClient.batchMsgs).
+The connection is replaced by an in-memory one handing out the packets of a
+synthetic tick burst, so only framing, queueing and decoding are timed.
+
+    python benchmarks/bench_queue.py --msgs 500000
+"""
+
+import argparse
+import time
+
+from ibapi import comm
+from ibapi.client import EClient
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.reader import EReader
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+class MemConnection:
+    def __init__(self, packets):
+        self.packets = iter(packets)
+        self.connected = True
+
+    def isConnected(self):
+        return self.connected
+
+    def recvMsgInto(self, msgBuf):
+        try:
+            data = next(self.packets)
+        except StopIteration:
+            self.connected = False
+            return 0
+        msgBuf.write(data)
+        return len(data)
+
+    def disconnect(self):
+        self.connected = False
+
+
+class CountingWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.n = 0
+
+    def tickPrice(self, reqId, tickType, price:float, attrib):
+        self.n += 1
+
+    def tickSize(self, reqId, tickType, size:int):
+        pass
+
+    def connectionClosed(self):
+        pass
+
+
+def make_packets(nMsgs, packetSize):
+    tick = comm.make_msg(comm.make_field(IN.TICK_PRICE) + comm.make_field(6)
+        + comm.make_field(1001) + comm.make_field(1) + comm.make_field(289.91)
+        + comm.make_field(300) + comm.make_field(0))
+    burst = tick * nMsgs
+    return [burst[i:i+packetSize] for i in range(0, len(burst), packetSize)]
+
+
+def run(packets, batchMsgs):
+    wrapper = CountingWrapper()
+    app = EClient(wrapper)
+    app.conn = MemConnection(packets)
+    app.serverVersion_ = MAX_CLIENT_VER
+    app.decoder = Decoder(wrapper, MAX_CLIENT_VER)
+    app.setConnState(EClient.CONNECTED)
+    reader = EReader(app.conn, app.msg_queue, batchMsgs)
+
+    t0 = time.perf_counter()
+    reader.start()
+    app.run()
+    dt = time.perf_counter() - t0
+    reader.join()
+    return wrapper.n, dt
+
+
+def main():
+    parser = argparse.ArgumentParser("EReader/EClient.run queue handoff benchmark")
+    parser.add_argument("--msgs", type=int, default=500000)
+    parser.add_argument("--packet", type=int, default=16384,
+                        help="size of each packet received by the EReader")
+    args = parser.parse_args()
+
+    packets = make_packets(args.msgs, args.packet)
+    for batchMsgs in (False, True):
+        (n, dt) = run(packets, batchMsgs)
+        assert n == args.msgs, "decoded %d msgs instead of %d" % (n, args.msgs)
+        print("batchMsgs=%-5s %8.3f s %10.0f msgs/s" % (batchMsgs, dt, n / dt))
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,90 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Measures how fast the EReader framing splits a burst of incoming data into
+messages: comm.read_msg (the old way, which copies the remainder for every
+message) against comm.MsgBuffer.
+
+    python benchmarks/bench_reader.py --size-mb 50 --chunk 1048576
+"""
+
+import argparse
+import time
+
+from ibapi import comm
+from ibapi.message import IN
+
+
+def make_burst(size_mb):
+    """ historical bars interleaved with ticks, roughly size_mb of data """
+    bar = comm.make_msg(comm.make_field(IN.HISTORICAL_DATA)
+        + comm.make_field(1) + comm.make_field("20190902  09:30:00")
+        + "".join(comm.make_field(v) for v in (289.12, 290.5, 288.75, 289.9, 1234567, 289.4, 4321)))
+    tick = comm.make_msg(comm.make_field(IN.TICK_PRICE) + comm.make_field(6)
+        + comm.make_field(1001) + comm.make_field(1) + comm.make_field(289.91)
+        + comm.make_field(300) + comm.make_field(0))
+    unit = bar * 20 + tick
+    burst = unit * (size_mb * 1024 * 1024 // len(unit) + 1)
+    return burst, 21 * (size_mb * 1024 * 1024 // len(unit) + 1)
+
+
+def chunks(burst, chunk):
+    return [burst[i:i+chunk] for i in range(0, len(burst), chunk)]
+
+
+def frame_read_msg(packets):
+    n = 0
+    buf = b""
+    for data in packets:
+        buf += data
+        while len(buf) > 0:
+            (size, msg, buf) = comm.read_msg(buf)
+            if msg:
+                n += 1
+            else:
+                break
+    return n
+
+
+def frame_msg_buffer(packets):
+    n = 0
+    buf = comm.MsgBuffer()
+    for data in packets:
+        buf.write(data)
+        n += len(buf.read_msgs())
+    return n
+
+
+def main():
+    parser = argparse.ArgumentParser("EReader framing benchmark")
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--chunk", type=int, default=1024 * 1024,
+                        help="size of each packet handed to the framing code")
+    parser.add_argument("--skip-read-msg", action="store_true",
+                        help="do not run the (quadratic) read_msg framing")
+    args = parser.parse_args()
+
+    burst, nMsgs = make_burst(args.size_mb)
+    packets = chunks(burst, args.chunk)
+    print("burst: %d bytes, %d msgs, %d packets of %d bytes" % (len(burst),
+        nMsgs, len(packets), args.chunk))
+
+    benches = [("MsgBuffer", frame_msg_buffer)]
+    if not args.skip_read_msg:
+        benches.append(("read_msg", frame_read_msg))
+
+    for (name, fn) in benches:
+        t0 = time.perf_counter()
+        n = fn(packets)
+        dt = time.perf_counter() - t0
+        assert n == nMsgs, "%s framed %d msgs instead of %d" % (name, n, nMsgs)
+        print("%-10s %8.3f s %12.0f frames/s %8.1f MB/s" % (name, dt, n / dt,
+            len(burst) / dt / 1024 / 1024))
+
+
+if "__main__" == __name__:
+    main()
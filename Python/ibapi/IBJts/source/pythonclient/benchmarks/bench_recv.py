@@ -0,0 +1,93 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Counts the recv syscalls needed to receive a bulk download over a local TCP
+socket: fixed recv(4096) reads against Connection.recvMsgInto() with the
+adaptive read size.
+
+    python benchmarks/bench_recv.py --size-mb 50
+"""
+
+import argparse
+import socket
+import threading
+import time
+
+from ibapi import comm
+from ibapi.connection import Connection
+
+
+def serve(server, payload):
+    (sock, _) = server.accept()
+    sock.sendall(payload)
+    sock.close()
+
+
+def start_server(payload):
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    thread = threading.Thread(target=serve, args=(server, payload))
+    thread.start()
+    return server, thread
+
+
+def recv_fixed(port, total):
+    sock = socket.create_connection(("127.0.0.1", port))
+    nCalls = 0
+    nRecvd = 0
+    while nRecvd < total:
+        buf = sock.recv(4096)
+        nCalls += 1
+        if not buf:
+            break
+        nRecvd += len(buf)
+    sock.close()
+    return nCalls, nRecvd
+
+
+def recv_adaptive(port, total, rcvBufSize):
+    conn = Connection("127.0.0.1", port, rcvBufSize)
+    conn.connect()
+    buf = comm.MsgBuffer()
+    nRecvd = 0
+    while nRecvd < total and conn.isConnected():
+        nRecvd += conn.recvMsgInto(buf)
+        buf.read_msgs()
+    stats = conn.recvStats()
+    conn.disconnect()
+    return stats["recvCalls"], nRecvd, stats
+
+
+def main():
+    parser = argparse.ArgumentParser("Connection receive path benchmark")
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--rcvbuf", type=int, default=4 * 1024 * 1024,
+                        help="SO_RCVBUF for the adaptive path, 0 for OS default")
+    args = parser.parse_args()
+
+    msg = comm.make_msg(comm.make_field(17) + comm.make_field(1)
+        + comm.make_field("20190902") + comm.make_field(289.12) * 6)
+    payload = msg * (args.size_mb * 1024 * 1024 // len(msg))
+
+    for (name, fn) in (("recv(4096)", lambda port: recv_fixed(port, len(payload))),
+                       ("recv_into", lambda port: recv_adaptive(port, len(payload), args.rcvbuf))):
+        (server, thread) = start_server(payload)
+        t0 = time.perf_counter()
+        res = fn(server.getsockname()[1])
+        dt = time.perf_counter() - t0
+        thread.join()
+        server.close()
+        (nCalls, nRecvd) = res[:2]
+        print("%-10s %8.3f s %9d syscalls %10.0f bytes/read" % (name, dt,
+            nCalls, nRecvd / nCalls))
+        if len(res) > 2:
+            print("           %s" % res[2])
+
+
+if "__main__" == __name__:
+    main()
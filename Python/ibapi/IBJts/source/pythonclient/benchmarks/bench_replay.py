@@ -0,0 +1,116 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Capture write rate and replay rate of wire_capture.
+
+Without --capture a synthetic session is generated first: --msgs msgs of
+tickPrice/tickSize/tickString and market depth for --symbols reqIds, spread
+over --hours of receive times. It is written with a CaptureWriter (timed),
+then replayed as fast as possible into an EWrapper whose callbacks do
+nothing, so the rate is the one of the decoding alone.
+
+    python benchmarks/bench_replay.py --msgs 1000000 --hours 6.5
+    python benchmarks/bench_replay.py --capture session.ibcap
+"""
+
+import argparse
+import inspect
+import os
+import random
+import tempfile
+import time
+
+from ibapi import comm
+from ibapi.message import IN
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.ticktype import TickTypeEnum
+from ibapi.wire_capture import CaptureWriter, read_capture, replay
+from ibapi.wrapper import EWrapper
+
+
+NoopWrapper = type("NoopWrapper", (EWrapper, ), {name: lambda self, *args: None
+    for (name, _) in inspect.getmembers(EWrapper, inspect.isfunction)
+    if name != "__init__"})
+
+
+def make_msg(*fields):
+    return "".join(comm.make_field(f) for f in fields).encode()
+
+
+def generate_session(nMsgs, nSymbols, hours, seed=1):
+    """ list of (recvTime ns, [msgs]) bursts """
+    rnd = random.Random(seed)
+    prices = [100. + i for i in range(nSymbols)]
+    bursts = []
+    t = 0
+    step = int(hours * 3600e9 / nMsgs)
+    n = 0
+    while n < nMsgs:
+        msgs = []
+        for _ in range(rnd.randint(1, 8)):
+            reqId = rnd.randrange(nSymbols)
+            prices[reqId] = round(prices[reqId] + rnd.choice((-0.01, 0., 0.01)), 2)
+            r = rnd.random()
+            if r < 0.35:
+                msgs.append(make_msg(IN.TICK_PRICE, 6, reqId,
+                    rnd.choice((TickTypeEnum.BID, TickTypeEnum.ASK, TickTypeEnum.LAST)),
+                    prices[reqId], rnd.randrange(1, 100) * 100, 0))
+            elif r < 0.65:
+                msgs.append(make_msg(IN.TICK_SIZE, 6, reqId,
+                    rnd.choice((TickTypeEnum.BID_SIZE, TickTypeEnum.ASK_SIZE,
+                                TickTypeEnum.VOLUME)), rnd.randrange(1, 1000) * 100))
+            elif r < 0.70:
+                msgs.append(make_msg(IN.TICK_STRING, 6, reqId, TickTypeEnum.LAST_TIMESTAMP,
+                                     str(1570000000 + t // 1000000000)))
+            else:
+                msgs.append(make_msg(IN.MARKET_DEPTH_L2, 1, 1000 + reqId,
+                    rnd.randrange(10), "ARCA", 1, rnd.randrange(2), prices[reqId],
+                    rnd.randrange(1, 50) * 100, 0))
+        bursts.append((t, msgs))
+        n += len(msgs)
+        t += step * len(msgs)
+    return bursts
+
+
+def main():
+    parser = argparse.ArgumentParser("wire capture and replay")
+    parser.add_argument("--capture", help="capture file to replay")
+    parser.add_argument("--msgs", type=int, default=1000000)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--hours", type=float, default=6.5)
+    args = parser.parse_args()
+
+    fileName = args.capture
+    if fileName is None:
+        bursts = generate_session(args.msgs, args.symbols, args.hours)
+        nMsgs = sum(len(msgs) for (_, msgs) in bursts)
+        (fd, fileName) = tempfile.mkstemp(suffix=".ibcap")
+        os.close(fd)
+        os.remove(fileName)
+        t0 = time.perf_counter()
+        capture = CaptureWriter(fileName, MAX_CLIENT_VER)
+        for (recvTime, msgs) in bursts:
+            capture.write(msgs, recvTime)
+        capture.close()
+        dt = time.perf_counter() - t0
+        print("capture: %d msgs in %d bursts, %.1f MB, %.0f msgs/s written" % (
+            nMsgs, len(bursts), os.path.getsize(fileName) / 1e6, nMsgs / dt))
+
+    times = [recvTime for (recvTime, msg) in read_capture(fileName) if type(msg) is bytes]
+    span = (times[-1] - times[0]) / 1e9 if times else 0.
+    t0 = time.perf_counter()
+    nMsgs = replay(fileName, NoopWrapper())
+    dt = time.perf_counter() - t0
+    print("replay:  %d msgs spanning %.0fs replayed in %.2fs, %.0f msgs/s, %.0fx real time" % (
+        nMsgs, span, dt, nMsgs / dt, span / dt if dt else 0.))
+
+    if args.capture is None:
+        os.remove(fileName)
+
+
+if "__main__" == __name__:
+    main()
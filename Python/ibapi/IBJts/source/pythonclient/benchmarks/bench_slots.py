@@ -0,0 +1,129 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Memory held by a trading day worth of value objects, with a per instance
+__dict__ (the default) and with __slots__ (IBAPI_SLOTTED=1), each measured
+in a process of its own since the mode is chosen at import time.
+
+The default day: 500 symbols with their ContractDetails, 390 1 min bars and
+720 5 sec real time bars each, 200k historical trades, 5000 orders and 20000
+executions with their commission reports.
+
+    python benchmarks/bench_slots.py --symbols 500
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+from ibapi import object_implem
+from ibapi.commission_report import CommissionReport
+from ibapi.common import BarData, RealTimeBar, HistoricalTickLast
+from ibapi.contract import ContractDetails
+from ibapi.execution import Execution
+from ibapi.order import Order
+
+
+def make_day(nSymbols):
+    day = {}
+    symbols = ["SYM%d" % i for i in range(nSymbols)]
+
+    day["contractDetails"] = []
+    for (i, symbol) in enumerate(symbols):
+        cd = ContractDetails()
+        cd.contract.conId = 1000 + i
+        cd.contract.symbol = symbol
+        cd.contract.secType = "STK"
+        cd.contract.exchange = "SMART"
+        cd.contract.currency = "USD"
+        cd.longName = symbol + " Inc"
+        day["contractDetails"].append(cd)
+
+    day["bars"] = []
+    day["realTimeBars"] = []
+    for symbol in symbols:
+        for m in range(390):
+            bar = BarData()
+            bar.date = "20191002  %02d:%02d:00" % (9 + (m + 30) // 60, (m + 30) % 60)
+            (bar.open, bar.high, bar.low, bar.close) = (100. + m, 101. + m, 99. + m, 100.5 + m)
+            (bar.volume, bar.average, bar.barCount) = (1000 + m, 100.2 + m, 10 + m)
+            day["bars"].append(bar)
+        for s in range(720):
+            day["realTimeBars"].append(RealTimeBar(1570023000 + 5 * s,
+                -1, 100. + s, 101. + s, 99. + s, 100.5 + s, 500 + s, 100.2 + s, 5))
+
+    day["ticks"] = []
+    for t in range(200 * nSymbols * 2):
+        tick = HistoricalTickLast()
+        (tick.time, tick.price, tick.size) = (1570023000 + t, 100. + t % 50, 100)
+        tick.exchange = "ISLAND"
+        tick.tickAttribLast.pastLimit = t % 7 == 0
+        day["ticks"].append(tick)
+
+    day["orders"] = []
+    for o in range(10 * nSymbols):
+        od = Order()
+        (od.orderId, od.action, od.totalQuantity) = (o, "BUY", 100)
+        (od.orderType, od.lmtPrice, od.tif) = ("LMT", 100. + o % 50, "DAY")
+        day["orders"].append(od)
+
+    day["executions"] = []
+    day["commissionReports"] = []
+    for e in range(40 * nSymbols):
+        execution = Execution()
+        (execution.execId, execution.orderId) = ("0001f4e8.%08d.01.01" % e, e // 4)
+        (execution.side, execution.shares, execution.price) = ("BOT", 25., 100. + e % 50)
+        day["executions"].append(execution)
+        report = CommissionReport()
+        (report.execId, report.commission, report.currency) = (execution.execId, 0.35, "USD")
+        day["commissionReports"].append(report)
+
+    return day
+
+
+def measure(nSymbols):
+    gc.collect()
+    tracemalloc.start()
+    day = make_day(nSymbols)
+    (held, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (held, {kind: len(objs) for (kind, objs) in day.items()})
+
+
+def measure_in_child(nSymbols, slotted):
+    env = dict(os.environ, IBAPI_SLOTTED="1" if slotted else "0")
+    out = subprocess.check_output([sys.executable, __file__, "--symbols",
+                                   str(nSymbols), "--child"], env=env)
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser("value objects w/ and w/o __slots__")
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--child", action="store_true",
+                        help="measures the mode of this process, prints json")
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.symbols) + (object_implem.slotted, )))
+        return
+
+    (dictHeld, counts, _) = measure_in_child(args.symbols, False)
+    (slotsHeld, _, slotted) = measure_in_child(args.symbols, True)
+    assert slotted
+
+    print(", ".join("%d %s" % (n, kind) for (kind, n) in counts.items()))
+    print("__dict__  %8.1f MB" % (dictHeld / 1e6))
+    print("__slots__ %8.1f MB  (%.2fx less)" % (slotsHeld / 1e6, dictHeld / slotsHeld))
+
+
+if "__main__" == __name__:
+    main()
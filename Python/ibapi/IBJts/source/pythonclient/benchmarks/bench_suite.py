@@ -0,0 +1,363 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Decoding and encoding throughput over a corpus with every IN msg type, plus
+the heavy requests encoded by EClient (placeOrder, reqHistoricalData,
+reqMktData, reqContractDetails).
+
+The corpus is generated: msgs mapped directly to an EWrapper method get
+fields typed after its signature, the others the smallest number of "1"
+fields that decodes into a callback. A recorded capture (wire_capture) can
+be used instead with --corpus, and the generated one written with
+--writeCorpus.
+
+For each msg type: comm.read_fields() rate, Decoder.interpret() rate into an
+EWrapper doing nothing, the end to end rate of both, and the peak bytes
+allocated (tracemalloc) while decoding one msg. For each request: the
+encoding rate down to the framed msg handed to the connection, and its
+allocated bytes.
+
+    python benchmarks/bench_suite.py --save before.json
+    python benchmarks/bench_suite.py --compare before.json --tolerance 10
+"""
+
+import argparse
+import collections
+import inspect
+import json
+import logging
+import os
+import platform
+import subprocess
+import time
+import timeit
+import tracemalloc
+
+from ibapi import comm
+from ibapi.client import EClient
+from ibapi.contract import Contract
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.order import Order
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.tag_value import TagValue
+from ibapi.wire_capture import CaptureWriter, read_capture
+from ibapi.wrapper import EWrapper
+
+
+MsgId2Name = {msgId: name for (name, msgId) in vars(IN).items()
+              if not name.startswith("_")}
+
+Callbacks = [name for (name, _) in inspect.getmembers(EWrapper, inspect.isfunction)
+             if name != "__init__"]
+
+# EWrapper w/ all the callbacks doing nothing, so that only decoding is timed
+NoopWrapper = type("NoopWrapper", (EWrapper, ), {name: lambda self, *args: None
+                                                 for name in Callbacks})
+
+
+class CallsWrapper(EWrapper):
+    """ only to tell if a generated msg did decode into a callback """
+
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.calls = []
+
+for name in Callbacks:
+    setattr(CallsWrapper, name,
+            (lambda name: lambda self, *args: self.calls.append(name))(name))
+
+
+class NullConnection:
+    """ takes the framed msgs in place of the socket """
+
+    def __init__(self):
+        self.nBytes = 0
+
+    def isConnected(self):
+        return True
+
+    def sendMsg(self, msg):
+        self.nBytes += len(msg)
+        return len(msg)
+
+
+def signature_fields(msgId, wrapperParams):
+    fields = [str(msgId).encode(), b"1"]
+    for (pname, param) in wrapperParams.items():
+        if pname != "self":
+            if param.annotation is int:
+                fields.append(b"1001")
+            elif param.annotation is float:
+                fields.append(b"289.91")
+            else:
+                fields.append(b"NetLiquidation")
+    return tuple(fields)
+
+
+def decodes(decoder, fields):
+    decoder.wrapper.calls.clear()
+    try:
+        decoder.interpret(fields)
+    except Exception:
+        return False
+    calls = decoder.wrapper.calls
+    return bool(calls) and (fields[0] == b"%d" % IN.ERR_MSG or "error" not in calls)
+
+
+def generate_corpus(serverVersion, maxFields=400):
+    """ {msgId: [fields]} for all the IN msgs """
+    decoder = Decoder(CallsWrapper(), serverVersion)
+    corpus = {}
+    for msgId in sorted(MsgId2Name):
+        sMsgId = str(msgId).encode()
+        handleInfo = decoder.msgId2handleInfo.get(msgId)
+        if msgId == IN.ERR_MSG:
+            candidates = [(sMsgId, b"2", b"-1", b"2104",
+                           b"Market data farm connection is OK:usfarm")]
+        elif handleInfo is not None and handleInfo.wrapperParams is not None:
+            candidates = [signature_fields(msgId, handleInfo.wrapperParams)]
+        else:
+            candidates = []
+        candidates += ((sMsgId, ) + (b"1", ) * n for n in range(1, maxFields))
+        for fields in candidates:
+            if decodes(decoder, fields):
+                corpus[msgId] = [fields]
+                break
+        else:
+            print("no sample decodes for %s" % MsgId2Name[msgId])
+    return corpus
+
+
+def load_corpus(fileName):
+    """ {msgId: [fields]} and the server version of a capture """
+    corpus = collections.defaultdict(list)
+    serverVersion = MAX_CLIENT_VER
+    for (_, msg) in read_capture(fileName):
+        if type(msg) is int:
+            serverVersion = msg
+        else:
+            fields = comm.read_fields(msg)
+            if fields:
+                corpus[int(fields[0])].append(fields)
+    return (dict(corpus), serverVersion)
+
+
+def write_corpus(fileName, corpus, serverVersion):
+    capture = CaptureWriter(fileName, serverVersion)
+    for (msgId, msgs) in sorted(corpus.items()):
+        capture.write([b"\0".join(fields) + b"\0" for fields in msgs], 0)
+    capture.close()
+
+
+def rate(fn, nItems, number, repeat):
+    """ items/s of the best of repeat runs """
+    best = min(timeit.repeat(fn, number=number, repeat=repeat))
+    return nItems * number / best
+
+
+def peak_bytes(fn):
+    """ peak of the memory allocated while running fn once; tracemalloc is
+    only on here as it slows the timed runs down a lot """
+    fn()    # warm up caches
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def bench_decoding(corpus, serverVersion, args):
+    decoder = Decoder(NoopWrapper(), serverVersion)
+    interpret = decoder.interpret
+    read_fields = comm.read_fields
+    results = {}
+    allPayloads = []
+    print("%-42s %12s %12s %12s %10s" % ("msg", "read_fields/s", "interpret/s",
+                                         "msgs/s", "bytes/msg"))
+    for (msgId, msgs) in sorted(corpus.items()):
+        payloads = [b"\0".join(fields) + b"\0" for fields in msgs]
+        allPayloads += payloads
+
+        def fn_read():
+            for payload in payloads:
+                read_fields(payload)
+
+        def fn_interpret():
+            for fields in msgs:
+                interpret(fields)
+
+        def fn_both():
+            for payload in payloads:
+                interpret(read_fields(payload))
+
+        n = len(msgs)
+        number = max(1, args.number // n)
+        result = {
+            "read_fields": rate(fn_read, n, number, args.repeat),
+            "interpret": rate(fn_interpret, n, number, args.repeat),
+            "msgs": rate(fn_both, n, number, args.repeat),
+            "bytes": peak_bytes(fn_both) / n,
+        }
+        name = "IN.%s" % MsgId2Name.get(msgId, msgId)
+        results[name] = result
+        print("%-42s %12.0f %12.0f %12.0f %10.0f" % (name, result["read_fields"],
+            result["interpret"], result["msgs"], result["bytes"]))
+
+    def fn_all():
+        for payload in allPayloads:
+            interpret(read_fields(payload))
+
+    n = len(allPayloads)
+    result = {"msgs": rate(fn_all, n, max(1, args.number // n), args.repeat),
+              "bytes": sum(result["bytes"] for result in results.values()) / len(results)}
+    results["IN.*"] = result
+    print("%-42s %12s %12s %12.0f %10.0f" % ("all of the above, one each", "", "",
+                                             result["msgs"], result["bytes"]))
+    return results
+
+
+def stock(symbol):
+    contract = Contract()
+    contract.symbol = symbol
+    contract.secType = "STK"
+    contract.exchange = "SMART"
+    contract.primaryExchange = "ISLAND"
+    contract.currency = "USD"
+    return contract
+
+
+def encoding_client(serverVersion):
+    client = EClient(NoopWrapper())
+    client.conn = NullConnection()
+    client.serverVersion_ = serverVersion
+    client.connState = EClient.CONNECTED
+    return client
+
+
+def bench_encoding(serverVersion, args):
+    client = encoding_client(serverVersion)
+    contract = stock("AAPL")
+    order = Order()
+    order.action = "BUY"
+    order.totalQuantity = 100
+    order.orderType = "LMT"
+    order.lmtPrice = 289.91
+    order.tif = "DAY"
+    order.account = "DU123456"
+    order.algoStrategy = "Adaptive"
+    order.algoParams = [TagValue("adaptivePriority", "Normal")]
+
+    requests = {
+        "OUT.placeOrder": lambda: client.placeOrder(1001, contract, order),
+        "OUT.reqHistoricalData": lambda: client.reqHistoricalData(
+            1001, contract, "20191018 16:00:00", "1 D", "1 min", "TRADES", 1, 1, False, []),
+        "OUT.reqMktData": lambda: client.reqMktData(1001, contract, "233,236", False,
+                                                    False, []),
+        "OUT.reqContractDetails": lambda: client.reqContractDetails(1001, contract),
+    }
+
+    results = {}
+    print()
+    print("%-42s %12s %10s %10s" % ("request", "msgs/s", "bytes/msg", "wire B"))
+    for (name, fn) in requests.items():
+        nBytes = client.conn.nBytes
+        fn()
+        wireBytes = client.conn.nBytes - nBytes
+        result = {"msgs": rate(fn, 1, args.number, args.repeat),
+                  "bytes": peak_bytes(fn)}
+        results[name] = result
+        print("%-42s %12.0f %10.0f %10d" % (name, result["msgs"], result["bytes"],
+                                            wireBytes))
+    return results
+
+
+def git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, fileName, tolerance):
+    """ prints what got slower or allocates more than tolerance percent """
+    with open(fileName) as f:
+        old = json.load(f)
+    print()
+    print("against %s (rev %s, %s):" % (fileName, old.get("rev"), old.get("date")))
+    (nSlower, nFaster) = (0, 0)
+    for (name, result) in results.items():
+        oldResult = old["results"].get(name)
+        if oldResult is None:
+            continue
+        for (key, value) in result.items():
+            oldValue = oldResult.get(key)
+            if not oldValue:
+                continue
+            change = (value / oldValue - 1.) * 100.
+            if key == "bytes":
+                if change > tolerance and value - oldValue > 64:
+                    print("  %-45s %-12s %10.0f -> %10.0f  %+6.1f%% allocated" % (
+                        name, key, oldValue, value, change))
+            elif change < -tolerance:
+                nSlower += 1
+                print("  %-45s %-12s %10.0f -> %10.0f  %+6.1f%%" % (
+                    name, key, oldValue, value, change))
+            elif change > tolerance:
+                nFaster += 1
+    print("%d rates slower, %d faster by more than %.0f%%" % (nSlower, nFaster, tolerance))
+    return nSlower
+
+
+def main():
+    parser = argparse.ArgumentParser("decoder/encoder benchmark suite")
+    parser.add_argument("--corpus", help="capture file used as corpus instead of generated msgs")
+    parser.add_argument("--writeCorpus", help="writes the generated corpus to this capture file")
+    parser.add_argument("--number", type=int, default=20000,
+                        help="msgs decoded/encoded per item and timing")
+    parser.add_argument("--repeat", type=int, default=5, help="timings per item, best kept")
+    parser.add_argument("--save", help="json file for the results")
+    parser.add_argument("--compare", help="json file saved by an earlier run")
+    parser.add_argument("--tolerance", type=float, default=10.,
+                        help="percent change reported by --compare")
+    args = parser.parse_args()
+
+    # the decoder logs the samples it has to reject
+    logging.disable(logging.CRITICAL)
+
+    if args.corpus:
+        (corpus, serverVersion) = load_corpus(args.corpus)
+    else:
+        serverVersion = MAX_CLIENT_VER
+        corpus = generate_corpus(serverVersion)
+        if args.writeCorpus:
+            write_corpus(args.writeCorpus, corpus, serverVersion)
+    print("corpus: %d msg types, %d msgs, server version %d" % (
+        len(corpus), sum(len(msgs) for msgs in corpus.values()), serverVersion))
+
+    results = bench_decoding(corpus, serverVersion, args)
+    results.update(bench_encoding(serverVersion, args))
+
+    if args.compare:
+        compare(results, args.compare, args.tolerance)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"rev": git_rev(),
+                       "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+                       "python": platform.python_version(),
+                       "serverVersion": serverVersion,
+                       "corpus": args.corpus,
+                       "results": results}, f, indent=1, sort_keys=True)
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,150 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+End to end EClient benchmark against the local TwsSimulator (started in
+this process, or an already running one with --port): connect, contract
+details and historical bars round trips through the RequestManager futures,
+sustained market data on --subs subscriptions, and the placeOrder -> Filled
+latency. The in process simulator shares the GIL with the client, a
+simulator in its own process gives numbers closer to a real TWS.
+
+    python benchmarks/bench_tws_sim.py --subs 20 --tickRate 2000 --seconds 5
+
+An application written against TWS can be run the same way by pointing it
+at a simulator started with: python -m ibapi.tws_sim --port 7497
+"""
+
+import argparse
+import concurrent.futures
+import statistics
+import threading
+import time
+
+from ibapi.client import EClient
+from ibapi.contract import Contract
+from ibapi.order import Order
+from ibapi.request_manager import RequestManager
+from ibapi.ticktype import TickTypeEnum
+from ibapi.tws_sim import TwsSimulator
+
+
+class App(RequestManager, EClient):
+    def __init__(self):
+        RequestManager.__init__(self)
+        EClient.__init__(self, wrapper=self)
+        self.nextOrderId = None
+        self.nTicks = 0
+        self.orderSent = {}
+        self.fillLatencies = []
+        self.allFilled = threading.Event()
+        self.nOrders = 0
+
+    def nextValidId(self, orderId:int):
+        self.nextOrderId = orderId
+
+    def tickPrice(self, reqId, tickType, price:float, attrib):
+        self.nTicks += 1
+
+    def tickSize(self, reqId, tickType, size:int):
+        # the others come with the tickPrice msgs
+        if tickType == TickTypeEnum.VOLUME:
+            self.nTicks += 1
+
+    def orderStatus(self, orderId, status, filled, remaining, avgFillPrice,
+                    permId, parentId, lastFillPrice, clientId, whyHeld, mktCapPrice):
+        if status == "Filled":
+            self.fillLatencies.append(time.perf_counter() - self.orderSent.pop(orderId))
+            if len(self.fillLatencies) == self.nOrders:
+                self.allFilled.set()
+
+
+def stock(symbol):
+    contract = Contract()
+    contract.symbol = symbol
+    contract.secType = "STK"
+    contract.exchange = "SMART"
+    contract.currency = "USD"
+    return contract
+
+
+def main():
+    parser = argparse.ArgumentParser("EClient against the TWS simulator")
+    parser.add_argument("--port", type=int, help="running simulator, else one is started")
+    parser.add_argument("--contracts", type=int, default=1000)
+    parser.add_argument("--hist", type=int, default=50, help="1 D of 1 min bars requests")
+    parser.add_argument("--subs", type=int, default=20)
+    parser.add_argument("--tickRate", type=float, default=2000., help="per subscription")
+    parser.add_argument("--seconds", type=float, default=5.)
+    parser.add_argument("--orders", type=int, default=200)
+    args = parser.parse_args()
+
+    sim = None
+    port = args.port
+    if port is None:
+        sim = TwsSimulator(tickRate=args.tickRate)
+        port = sim.start()
+
+    app = App()
+    t0 = time.perf_counter()
+    app.connect("127.0.0.1", port, 1)
+    thread = threading.Thread(target=app.run, daemon=True)
+    thread.start()
+    while app.nextOrderId is None:
+        time.sleep(0.001)
+    print("connect + startApi:   %8.1f ms" % ((time.perf_counter() - t0) * 1e3))
+
+    t0 = time.perf_counter()
+    futs = [app.reqContractDetailsFuture(stock("S%04d" % i), timeout=30)
+            for i in range(args.contracts)]
+    concurrent.futures.wait(futs)
+    dt = time.perf_counter() - t0
+    print("contract details:     %8.0f req/s" % (args.contracts / dt))
+
+    t0 = time.perf_counter()
+    futs = [app.reqHistoricalDataFuture(stock("S%04d" % i), "", "1 D", "1 min",
+                                        "TRADES", 1, 1, timeout=60)
+            for i in range(args.hist)]
+    concurrent.futures.wait(futs)
+    dt = time.perf_counter() - t0
+    nBars = sum(len(fut.result()) for fut in futs)
+    print("historical bars:      %8.0f bars/s (%d requests)" % (nBars / dt, args.hist))
+
+    for reqId in range(args.subs):
+        app.reqMktData(reqId, stock("S%04d" % reqId), "", False, False, [])
+    time.sleep(0.5)
+    (n0, t0) = (app.nTicks, time.perf_counter())
+    time.sleep(args.seconds)
+    (n1, t1) = (app.nTicks, time.perf_counter())
+    for reqId in range(args.subs):
+        app.cancelMktData(reqId)
+    print("market data:          %8.0f tick msgs/s decoded (%d subs at %.0f/s asked)" % (
+        (n1 - n0) / (t1 - t0), args.subs, args.tickRate))
+    time.sleep(0.5)
+
+    order = Order()
+    order.action = "BUY"
+    order.totalQuantity = 100
+    order.orderType = "MKT"
+    app.nOrders = args.orders
+    for i in range(args.orders):
+        orderId = app.nextOrderId + i
+        app.orderSent[orderId] = time.perf_counter()
+        app.placeOrder(orderId, stock("S0000"), order)
+        time.sleep(0.002)
+    app.allFilled.wait(30)
+    lat = sorted(app.fillLatencies)
+    print("placeOrder -> Filled: %8.1f us median  %8.1f us p99  (%d orders)" % (
+        statistics.median(lat) * 1e6, lat[int(0.99 * (len(lat) - 1))] * 1e6, len(lat)))
+
+    app.disconnect()
+    thread.join()
+    if sim is not None:
+        sim.stop()
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,143 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Sends brackets of 4 orders (entry, stop, target and time exit) over a local
+TCP socket from one or more threads: straight from Connection.sendMsg(),
+through the writer thread msg by msg, and through the writer thread in one
+burst() per bracket. Gives the time the sending thread spends per bracket,
+the send syscalls per bracket and the writer burst latency (first msg queued
+to burst written). Flat out the writer falls behind and its bursts grow,
+with --pause between brackets they are the bracket.
+
+    python benchmarks/bench_writer.py --brackets 5000 --threads 2 --nodelay
+    python benchmarks/bench_writer.py --brackets 2000 --pause 200
+"""
+
+import argparse
+import contextlib
+import socket
+import threading
+import time
+
+from ibapi import encoder
+from ibapi.connection import Connection
+from ibapi.contract import Contract
+from ibapi.order import Order
+from ibapi.server_versions import MAX_CLIENT_VER
+
+
+def drain(server, done):
+    (sock, _) = server.accept()
+    nBytes = 0
+    while True:
+        buf = sock.recv(1 << 20)
+        if not buf:
+            break
+        nBytes += len(buf)
+    sock.close()
+    done.append(nBytes)
+
+
+def bracket_msgs():
+    contract = Contract()
+    contract.conId = 400000000
+    contract.symbol = "SPY"
+    contract.secType = "OPT"
+    contract.lastTradeDateOrContractMonth = "20191018"
+    contract.strike = 290.
+    contract.right = "C"
+    contract.multiplier = "100"
+    contract.exchange = "SMART"
+    contract.currency = "USD"
+    encoders = encoder.forServerVersion(MAX_CLIENT_VER)
+    msgs = []
+    for (orderId, (orderType, price)) in enumerate((("LMT", 2.5), ("STP", 1.8),
+                                                    ("LMT", 3.4), ("MKT", 0)), 1001):
+        order = Order()
+        order.action = "BUY" if orderId == 1001 else "SELL"
+        order.totalQuantity = 10
+        order.orderType = orderType
+        order.lmtPrice = price
+        order.parentId = 0 if orderId == 1001 else 1001
+        order.transmit = orderId == 1004
+        msgs.append(encoders.placeOrder(orderId, contract, order))
+    return msgs
+
+
+def run(args, writerThread, useBurst):
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    done = []
+    drainer = threading.Thread(target=drain, args=(server, done))
+    drainer.start()
+
+    socketOptions = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)] if args.nodelay else []
+    conn = Connection("127.0.0.1", server.getsockname()[1],
+                      socketOptions=socketOptions, writerThread=writerThread)
+    conn.connect()
+    msgs = bracket_msgs()
+    nBrackets = args.brackets // args.threads
+    senderTimes = []
+    pause = args.pause / 1e6
+
+    def sender():
+        burst = conn.writer.burst if useBurst else contextlib.nullcontext
+        start = time.perf_counter()
+        paused = 0.
+        for _ in range(nBrackets):
+            with burst():
+                for msg in msgs:
+                    conn.sendMsg(msg)
+            if pause:
+                t = time.perf_counter()
+                time.sleep(pause)
+                paused += time.perf_counter() - t
+        senderTimes.append(time.perf_counter() - start - paused)
+
+    threads = [threading.Thread(target=sender) for _ in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # disconnect() waits for the writer to write what is queued
+    conn.disconnect()
+    stats = conn.sendStats()
+    drainer.join()
+    server.close()
+
+    nTotal = nBrackets * args.threads
+    assert done[0] == nTotal * sum(len(msg) for msg in msgs)
+    return (max(senderTimes) / nBrackets * 1e6, stats["sendCalls"] / nTotal, stats)
+
+
+def main():
+    parser = argparse.ArgumentParser("writer thread benchmark")
+    parser.add_argument("--brackets", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=1,
+                        help="threads sending brackets at the same time")
+    parser.add_argument("--pause", type=float, default=0.,
+                        help="us slept after each bracket")
+    parser.add_argument("--nodelay", action="store_true", help="sets TCP_NODELAY")
+    args = parser.parse_args()
+
+    print("%-18s %14s %14s %10s %10s %10s" % ("send path", "us/bracket", "sends/bracket",
+                                              "msgs/burst", "p50 us", "p99 us"))
+    for (name, writerThread, useBurst) in (("direct", False, False),
+                                           ("writer", True, False),
+                                           ("writer + burst", True, True)):
+        (usPerBracket, sendsPerBracket, stats) = run(args, writerThread, useBurst)
+        if writerThread:
+            print("%-18s %14.2f %14.2f %10.1f %10.1f %10.1f" % (name, usPerBracket,
+                  sendsPerBracket, stats["msgsPerBurst"], stats["latency"]["p50"],
+                  stats["latency"]["p99"]))
+        else:
+            print("%-18s %14.2f %14.2f" % (name, usPerBracket, sendsPerBracket))
+
+
+if "__main__" == __name__:
+    main()
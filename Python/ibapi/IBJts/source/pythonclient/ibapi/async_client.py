@@ -0,0 +1,189 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+asyncio flavour of the EClient.
+There is no EReader thread and no Queue: the AsyncConnection is made of
+asyncio streams and AsyncEClient.run() frames and decodes the incoming
+messages directly in the event loop, calling the EWrapper methods exactly
+as EClient.run() does. All the request methods are inherited from EClient
+and can be called from the event loop thread.
+
+    app = AsyncEClient(wrapper)
+    await app.connect("127.0.0.1", 7497, 0)
+    await app.run()
+"""
+
+import asyncio
+import logging
+
+from ibapi import (decoder, comm)
+from ibapi.client import EClient
+from ibapi.common import * # @UnusedWildImport
+from ibapi.utils import BadMessage
+from ibapi.errors import * #@UnusedWildImport
+from ibapi.server_versions import * # @UnusedWildImport
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncConnection:
+    RECV_SIZE = 65536
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.wrapper = None
+
+
+    async def connect(self):
+        (self.reader, self.writer) = await asyncio.open_connection(self.host,
+                                                                   self.port)
+
+
+    def disconnect(self):
+        if self.writer is not None:
+            logger.debug("disconnecting")
+            self.writer.close()
+            self.writer = None
+            self.reader = None
+            logger.debug("disconnected")
+            if self.wrapper:
+                self.wrapper.connectionClosed()
+
+
+    def isConnected(self):
+        return self.writer is not None
+
+
+    def sendMsg(self, msg):
+        """ queues the msg in the transport, it is written out as soon as the
+        event loop gets control back """
+        if not self.isConnected():
+            logger.debug("sendMsg attempted while not connected")
+            return 0
+        self.writer.write(msg)
+        return len(msg)
+
+
+    async def recvMsgInto(self, msgBuf):
+        """ waits for the next packet and appends it to the given
+        comm.MsgBuffer; returns the number of bytes received """
+        if not self.isConnected():
+            logger.debug("recvMsgInto attempted while not connected")
+            return 0
+        try:
+            buf = await self.reader.read(AsyncConnection.RECV_SIZE)
+        except ConnectionError:
+            logger.debug("exception from recvMsgInto", exc_info=True)
+            buf = b""
+
+        # receiving 0 bytes means the connection is either closed or broken
+        if len(buf) == 0:
+            logger.debug("socket either closed or broken, disconnecting")
+            self.disconnect()
+        else:
+            msgBuf.write(buf)
+
+        return len(buf)
+
+
+class AsyncEClient(EClient):
+    def reset(self):
+        super().reset()
+        self.msgBuf = None
+        self.pendingFields = []
+
+
+    async def connect(self, host, port, clientId):
+        """Coroutine version of EClient.connect(); it returns once the
+        server version is known and startApi was sent."""
+
+        try:
+            self.host = host
+            self.port = port
+            self.clientId = clientId
+            logger.debug("Connecting to %s:%d w/ id:%d", self.host, self.port, self.clientId)
+
+            self.conn = AsyncConnection(self.host, self.port)
+
+            await self.conn.connect()
+            self.setConnState(EClient.CONNECTING)
+
+            v100prefix = "API\0"
+            v100version = "v%d..%d" % (MIN_CLIENT_VER, MAX_CLIENT_VER)
+            msg = str.encode(v100prefix, 'ascii') + comm.make_msg(v100version)
+            logger.debug("REQUEST %s", msg)
+            self.conn.sendMsg(msg)
+
+            self.decoder = decoder.Decoder(self.wrapper, self.serverVersion(),
+                                           self.columnarHistData,
+                                           self.columnarHistTicks)
+            self.msgBuf = comm.MsgBuffer()
+
+            #sometimes I get news before the server version, thus the loop
+            serverFields = None
+            while serverFields is None:
+                if await self.conn.recvMsgInto(self.msgBuf) == 0:
+                    raise ConnectionError("connection closed during handshake")
+                for text in self.msgBuf.read_msgs():
+                    fields = comm.read_fields(text)
+                    if serverFields is not None:
+                        self.pendingFields.append(fields)
+                    elif len(fields) == 2:
+                        serverFields = fields
+                    else:
+                        self.decoder.interpret(fields)
+
+            (server_version, conn_time) = serverFields
+            server_version = int(server_version)
+            logger.debug("ANSWER Version:%d time:%s", server_version, conn_time)
+            self.connTime = conn_time
+            self.serverVersion_ = server_version
+            self.decoder.serverVersion = self.serverVersion()
+
+            self.setConnState(EClient.CONNECTED)
+
+            logger.info("sent startApi")
+            self.startApi()
+            self.wrapper.connectAck()
+        except OSError:
+            if self.wrapper:
+                self.wrapper.error(NO_VALID_ID, CONNECT_FAIL.code(), CONNECT_FAIL.msg())
+            logger.info("could not connect")
+            self.disconnect()
+            self.done = True
+
+
+    async def run(self):
+        """Coroutine version of EClient.run(): reads, frames and decodes the
+        incoming messages until disconnected."""
+
+        try:
+            # answers that came in the same packet as the server version
+            for fields in self.pendingFields:
+                self.decoder.interpret(fields)
+            self.pendingFields = []
+
+            while not self.done and self.isConnected():
+                await self.conn.recvMsgInto(self.msgBuf)
+                for text in self.msgBuf.read_msgs():
+                    if len(text) > MAX_MSG_LEN:
+                        self.wrapper.error(NO_VALID_ID, BAD_LENGTH.code(),
+                            "%s:%d:%s" % (BAD_LENGTH.msg(), len(text), text))
+                        self.disconnect()
+                        return
+                    try:
+                        self.decoder.interpret(comm.read_fields(text))
+                    except BadMessage:
+                        logger.info("BadMessage")
+                        self.conn.disconnect()
+                        break
+        finally:
+            self.disconnect()
@@ -14,11 +14,12 @@ It takes care of almost everything:
 The user just needs to override EWrapper methods to receive the answers.
 """
 
+import contextlib
 import logging
 import queue
 import socket
 
-from ibapi import (decoder, reader, comm)
+from ibapi import (decoder, encoder, reader, comm, pacing, wire_capture, log_mode)
 from ibapi.connection import Connection
 from ibapi.message import OUT
 from ibapi.common import * # @UnusedWildImport
@@ -45,6 +46,15 @@ class EClient(object):
         self.msg_queue = queue.Queue()
         self.wrapper = wrapper
         self.decoder = None
+        self.rcvBufSize = 0     # socket SO_RCVBUF, 0 keeps the OS default
+        self.socketOptions = [] # (level, option, value), eg (IPPROTO_TCP, TCP_NODELAY, 1)
+        self.writerThread = False # msgs written by a writer.ConnWriter thread
+        self.batchMsgs = False  # EReader queues one list of msgs per packet
+        self.columnarHistData = False  # one historicalDataColumns() per msg, numpy
+        self.columnarHistTicks = False # historicalTicksArray() per page, numpy
+        self.pacing = False     # msgs go through a pacing.PacingScheduler
+        self.captureFile = None # the EReader records the msgs there, see wire_capture
+        self.latencyTracer = None # latency.LatencyTracer timing the incoming msgs
         self.reset()
 
 
@@ -62,6 +72,7 @@ class EClient(object):
         self.optCapab = ""
         self.asynchronous = False
         self.reader = None
+        self.pacer = None
         self.decode = None
         self.setConnState(EClient.DISCONNECTED)
 
@@ -73,9 +84,16 @@ class EClient(object):
                                                  self.connState))
 
     def sendMsg(self, msg):
-        full_msg = comm.make_msg(msg)
-        logger.info("%s %s %s", "SENDING", current_fn_name(1), full_msg)
-        self.conn.sendMsg(full_msg)
+        """ msg: the fields, or the msg already framed by an encoder """
+        full_msg = msg if type(msg) is bytes else comm.make_msg(msg)
+        if log_mode.verbose:
+            logger.info("%s %s %s", "SENDING", current_fn_name(1), full_msg)
+        elif log_mode.wireSample:
+            log_mode.sampleSent(full_msg)
+        if self.pacer is not None:
+            self.pacer.sendMsg(full_msg)
+        else:
+            self.conn.sendMsg(full_msg)
 
 
     def logRequest(self, fnName, fnParams):
@@ -92,7 +110,8 @@ class EClient(object):
         """  Initiates the message exchange between the client application and
         the TWS/IB Gateway. """
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(),
@@ -132,7 +151,8 @@ class EClient(object):
             self.clientId = clientId
             logger.debug("Connecting to %s:%d w/ id:%d", self.host, self.port, self.clientId)
 
-            self.conn = Connection(self.host, self.port)
+            self.conn = Connection(self.host, self.port, self.rcvBufSize,
+                                   self.socketOptions, self.writerThread)
 
             self.conn.connect()
             self.setConnState(EClient.CONNECTING)
@@ -148,7 +168,10 @@ class EClient(object):
             logger.debug("REQUEST %s", msg2)
             self.conn.sendMsg(msg2)
 
-            self.decoder = decoder.Decoder(self.wrapper, self.serverVersion())
+            self.decoder = decoder.Decoder(self.wrapper, self.serverVersion(),
+                                           self.columnarHistData,
+                                           self.columnarHistTicks)
+            self.decoder.setTracer(self.latencyTracer)
             fields = []
 
             #sometimes I get news before the server version, thus the loop
@@ -173,8 +196,10 @@ class EClient(object):
 
             self.setConnState(EClient.CONNECTED)
 
-            self.reader = reader.EReader(self.conn, self.msg_queue)
-            self.reader.start()   # start thread
+            self.startReader()
+            if self.pacing:
+                self.pacer = pacing.PacingScheduler(self.conn, self.serverVersion())
+                self.pacer.start()
             logger.info("sent startApi")
             self.startApi()
             self.wrapper.connectAck()
@@ -186,25 +211,55 @@ class EClient(object):
             self.done = True
 
 
+    def startReader(self):
+        """ starts the EReader thread feeding msg_queue; overridden when
+        the msgs are read by someone else (client_pool.ClientPool) """
+        if hasattr(self.msg_queue, "wrapper"):
+            # msg_queue.BoundedQueue
+            self.msg_queue.wrapper = self.wrapper
+            self.msg_queue.conn = self.conn
+        capture = None
+        if self.captureFile:
+            capture = wire_capture.CaptureWriter(self.captureFile,
+                                                 self.serverVersion())
+        self.reader = reader.EReader(self.conn, self.msg_queue,
+                                     self.batchMsgs, capture,
+                                     self.latencyTracer)
+        self.reader.start()   # start thread
+
+
     def disconnect(self):
         """Call this function to terminate the connections with TWS.
         Calling this function does not cancel orders that have already been
         sent."""
 
         self.setConnState(EClient.DISCONNECTED)
+        if self.pacer is not None:
+            self.pacer.stop()
         if self.conn is not None:
             logger.info("disconnecting")
             self.conn.disconnect()
             self.wrapper.connectionClosed()
+            if self.latencyTracer is not None:
+                self.latencyTracer.connectionClosed()
             self.reset()
 
 
+    def burst(self):
+        """ context manager: with writerThread set, the msgs this thread sends
+        inside are written together, in as few syscalls as possible, at its end """
+        if self.conn is not None and self.conn.writer is not None:
+            return self.conn.writer.burst()
+        return contextlib.nullcontext()
+
+
     def isConnected(self):
         """Call this function to check if there is a connection with TWS"""
 
         connConnected = self.conn and self.conn.isConnected()
-        logger.debug("%s isConn: %s, connConnected: %s" % (id(self),
-            self.connState, str(connConnected)))
+        if log_mode.verbose:
+            logger.debug("%s isConn: %s, connConnected: %s" % (id(self),
+                self.connState, str(connConnected)))
         return EClient.CONNECTED == self.connState and connConnected
 
     def keyboardInterrupt(self):
@@ -225,18 +280,26 @@ class EClient(object):
                         or not self.msg_queue.empty()):
                 try:
                     try:
-                        text = self.msg_queue.get(block=True, timeout=0.2)
-                        if len(text) > MAX_MSG_LEN:
-                            self.wrapper.error(NO_VALID_ID, BAD_LENGTH.code(),
-                                "%s:%d:%s" % (BAD_LENGTH.msg(), len(text), text))
-                            self.disconnect()
-                            break
+                        item = self.msg_queue.get(block=True, timeout=0.2)
                     except queue.Empty:
                         logger.debug("queue.get: empty")
                     else:
-                        fields = comm.read_fields(text)
-                        logger.debug("fields %s", fields)
-                        self.decoder.interpret(fields)
+                        if self.latencyTracer is not None:
+                            dequeuedTime = self.latencyTracer.clock()
+                        # in batch mode the EReader queues lists of msgs
+                        texts = item if type(item) is list else (item, )
+                        for text in texts:
+                            if len(text) > MAX_MSG_LEN:
+                                self.wrapper.error(NO_VALID_ID, BAD_LENGTH.code(),
+                                    "%s:%d:%s" % (BAD_LENGTH.msg(), len(text), text))
+                                self.disconnect()
+                                return
+                            if self.latencyTracer is not None:
+                                self.latencyTracer.dequeued(text, dequeuedTime)
+                            fields = comm.read_fields(text)
+                            if log_mode.verbose:
+                                logger.debug("fields %s", fields)
+                            self.decoder.interpret(fields)
                 except (KeyboardInterrupt, SystemExit):
                     logger.info("detected KeyboardInterrupt, SystemExit")
                     self.keyboardInterrupt()
@@ -245,9 +308,10 @@ class EClient(object):
                     logger.info("BadMessage")
                     self.conn.disconnect()
 
-                logger.debug("conn:%d queue.sz:%d",
-                             self.isConnected(),
-                             self.msg_queue.qsize())
+                if log_mode.verbose:
+                    logger.debug("conn:%d queue.sz:%d",
+                                 self.isConnected(),
+                                 self.msg_queue.qsize())
         finally:
             self.disconnect()
 
@@ -255,7 +319,8 @@ class EClient(object):
     def reqCurrentTime(self):
         """Asks the current system time on the server side."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(),
@@ -281,7 +346,8 @@ class EClient(object):
         """The default detail level is ERROR. For more details, see API
         Logging."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(),
@@ -335,91 +401,22 @@ class EClient(object):
         mktDataOptions:TagValueList - For internal use only.
             Use default value XYZ. """
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(),
                                NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_DELTA_NEUTRAL:
-            if contract.deltaNeutralContract:
-                self.wrapper.error(reqId, UPDATE_TWS.code(),
-                    UPDATE_TWS.msg() + "  It does not support delta-neutral orders.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_REQ_MKT_DATA_CONID:
-            if contract.conId > 0:
-                self.wrapper.error(reqId, UPDATE_TWS.code(),
-                    UPDATE_TWS.msg() + "  It does not support conId parameter.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
-            if contract.tradingClass:
-                self.wrapper.error( reqId, UPDATE_TWS.code(),
-                    UPDATE_TWS.msg() + "  It does not support tradingClass parameter in reqMktData.")
-                return
-
-        VERSION = 11
-
-        # send req mkt data msg
-        flds = []
-        flds += [make_field(OUT.REQ_MKT_DATA),
-            make_field(VERSION),
-            make_field(reqId)]
-
-        # send contract fields
-        if self.serverVersion() >= MIN_SERVER_VER_REQ_MKT_DATA_CONID:
-            flds += [make_field(contract.conId),]
-
-        flds += [make_field(contract.symbol),
-            make_field(contract.secType),
-            make_field(contract.lastTradeDateOrContractMonth),
-            make_field(contract.strike),
-            make_field(contract.right),
-            make_field(contract.multiplier), # srv v15 and above
-            make_field(contract.exchange),
-            make_field(contract.primaryExchange), # srv v14 and above
-            make_field(contract.currency),
-            make_field(contract.localSymbol) ] # srv v2 and above
-
-        if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
-            flds += [make_field(contract.tradingClass),]
-
-        # Send combo legs for BAG requests (srv v8 and above)
-        if contract.secType == "BAG":
-            comboLegsCount = len(contract.comboLegs) if contract.comboLegs else 0
-            flds += [make_field(comboLegsCount),]
-            for comboLeg in contract.comboLegs:
-                    flds += [make_field(comboLeg.conId),
-                        make_field( comboLeg.ratio),
-                        make_field( comboLeg.action),
-                        make_field( comboLeg.exchange)]
-
-        if self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL:
-            if contract.deltaNeutralContract:
-                flds += [make_field(True),
-                    make_field(contract.deltaNeutralContract.conId),
-                    make_field(contract.deltaNeutralContract.delta),
-                    make_field(contract.deltaNeutralContract.price)]
-            else:
-                flds += [make_field(False),]
-
-        flds += [make_field(genericTickList), # srv v31 and above
-            make_field(snapshot)] # srv v35 and above
-
-        if self.serverVersion() >= MIN_SERVER_VER_REQ_SMART_COMPONENTS:
-            flds += [make_field(regulatorySnapshot),]
-
-        # send mktDataOptions parameter
-        if self.serverVersion() >= MIN_SERVER_VER_LINKING:
-            #current doc says this part if for "internal use only" -> won't support it
-            if mktDataOptions:
-                raise NotImplementedError("not supported")
-            mktDataOptionsStr = ""
-            flds += [make_field(mktDataOptionsStr),]
+        try:
+            msg = encoder.forServerVersion(self.serverVersion()).reqMktData(
+                reqId, contract, genericTickList, snapshot,
+                regulatorySnapshot, mktDataOptions)
+        except encoder.UnsupportedByServer as ex:
+            self.wrapper.error(reqId, UPDATE_TWS.code(), UPDATE_TWS.msg() + str(ex))
+            return
 
-        msg = "".join(flds)
         self.sendMsg(msg)
 
 
@@ -430,21 +427,14 @@ class EClient(object):
         reqId: TickerId - The ID that was specified in the call to
             reqMktData(). """
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        VERSION = 2
-
-        # send req mkt data msg
-        flds = []
-        flds += [make_field(OUT.CANCEL_MKT_DATA),
-            make_field(VERSION),
-            make_field(reqId)]
-
-        msg = "".join(flds)
+        msg = encoder.forServerVersion(self.serverVersion()).cancelMktData(reqId)
         self.sendMsg(msg)
 
 
@@ -460,7 +450,8 @@ class EClient(object):
         marketDataType:int - 1 for real-time streaming market data or 2 for
             frozen market data"""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -483,7 +474,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def reqSmartComponents(self, reqId: int, bboExchange: str):
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -502,7 +494,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def reqMarketRule(self, marketRuleId: int):
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -520,7 +513,8 @@ class EClient(object):
 
     def reqTickByTickData(self, reqId: int, contract: Contract, tickType: str,
                           numberOfTicks: int, ignoreSize: bool):
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -560,7 +554,8 @@ class EClient(object):
         self.sendMsg(msg)
 
     def cancelTickByTickData(self, reqId: int):
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -592,7 +587,8 @@ class EClient(object):
         optionPrice:double - The price of the option.
         underPrice:double - Price of the underlying."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -653,7 +649,8 @@ class EClient(object):
 
         reqId:TickerId - The request ID.  """
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -684,7 +681,8 @@ class EClient(object):
         volatility:double - The volatility.
         underPrice:double - Price of the underlying."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -745,7 +743,8 @@ class EClient(object):
 
         reqId:TickerId - The request ID.  """
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -783,7 +782,8 @@ class EClient(object):
              be overridden and the out-of-the money option would be exercised.
             Values are: 0 = no, 1 = yes."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -841,517 +841,20 @@ class EClient(object):
         order:Order - This structure contains the details of tradedhe order.
             Note: Each client MUST connect with a unique clientId."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(orderId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_DELTA_NEUTRAL:
-            if contract.deltaNeutralContract:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support delta-neutral orders.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_SCALE_ORDERS2:
-            if order.scaleSubsLevelSize != UNSET_INTEGER:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support Subsequent Level Size for Scale orders.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_ALGO_ORDERS:
-            if order.algoStrategy:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support algo orders.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_NOT_HELD:
-            if order.notHeld:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support notHeld parameter.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_SEC_ID_TYPE:
-            if contract.secIdType or contract.secId:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support secIdType and secId parameters.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_PLACE_ORDER_CONID:
-            if contract.conId and contract.conId > 0:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support conId parameter.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_SSHORTX:
-            if order.exemptCode != -1:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                    "  It does not support exemptCode parameter.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_SSHORTX:
-            if contract.comboLegs:
-                for comboLeg in contract.comboLegs:
-                    if comboLeg.exemptCode != -1:
-                        self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                            "  It does not support exemptCode parameter.")
-                        return
-
-        if self.serverVersion() < MIN_SERVER_VER_HEDGE_ORDERS:
-            if order.hedgeType:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                    "  It does not support hedge orders.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_OPT_OUT_SMART_ROUTING:
-            if order.optOutSmartRouting:
-                self.wrapper.error( orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                    "  It does not support optOutSmartRouting parameter.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_DELTA_NEUTRAL_CONID:
-            if order.deltaNeutralConId > 0 \
-                    or order.deltaNeutralSettlingFirm  \
-                    or order.deltaNeutralClearingAccount  \
-                    or order.deltaNeutralClearingIntent:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                    "  It does not support deltaNeutral parameters: ConId, SettlingFirm, ClearingAccount, ClearingIntent.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_DELTA_NEUTRAL_OPEN_CLOSE:
-            if order.deltaNeutralOpenClose \
-                    or order.deltaNeutralShortSale \
-                    or order.deltaNeutralShortSaleSlot > 0  \
-                    or order.deltaNeutralDesignatedLocation:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support deltaNeutral parameters: OpenClose, ShortSale, ShortSaleSlot, DesignatedLocation.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_SCALE_ORDERS3:
-            if order.scalePriceIncrement > 0 and order.scalePriceIncrement != UNSET_DOUBLE:
-                if order.scalePriceAdjustValue != UNSET_DOUBLE \
-                        or order.scalePriceAdjustInterval != UNSET_INTEGER \
-                        or order.scaleProfitOffset != UNSET_DOUBLE \
-                        or order.scaleAutoReset  \
-                        or order.scaleInitPosition != UNSET_INTEGER \
-                        or order.scaleInitFillQty != UNSET_INTEGER \
-                        or order.scaleRandomPercent:
-                    self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                            "  It does not support Scale order parameters: PriceAdjustValue, PriceAdjustInterval, " +
-                            "ProfitOffset, AutoReset, InitPosition, InitFillQty and RandomPercent")
-                    return
-
-        if self.serverVersion() < MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE and contract.secType == "BAG":
-            if order.orderComboLegs:
-                for orderComboLeg in order.orderComboLegs:
-                    if orderComboLeg.price != UNSET_DOUBLE:
-                        self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                                "  It does not support per-leg prices for order combo legs.")
-                        return
-
-        if self.serverVersion() < MIN_SERVER_VER_TRAILING_PERCENT:
-            if order.trailingPercent != UNSET_DOUBLE:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support trailing percent parameter")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
-            if contract.tradingClass:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support tradingClass parameter in placeOrder.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_SCALE_TABLE:
-            if order.scaleTable or order.activeStartTime or order.activeStopTime:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support scaleTable, activeStartTime and activeStopTime parameters")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_ALGO_ID:
-            if order.algoId:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support algoId parameter")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_ORDER_SOLICITED:
-            if order.solicited:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support order solicited parameter.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_MODELS_SUPPORT:
-            if order.modelCode:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support model code parameter.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_EXT_OPERATOR:
-            if order.extOperator:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support ext operator parameter")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_SOFT_DOLLAR_TIER:
-            if order.softDollarTier.name or order.softDollarTier.val:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        " It does not support soft dollar tier")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_CASH_QTY:
-            if order.cashQty:
-                self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        " It does not support cash quantity parameter")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_DECISION_MAKER and (order.mifid2DecisionMaker != "" or order.mifid2DecisionAlgo != ""):
-            self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        " It does not support MIFID II decision maker parameters")
-            return
-
-        if self.serverVersion() < MIN_SERVER_VER_MIFID_EXECUTION and (order.mifid2ExecutionTrader != "" or order.mifid2ExecutionAlgo != ""):
-            self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        " It does not support MIFID II execution parameters")
-            return
-
-        if self.serverVersion() < MIN_SERVER_VER_AUTO_PRICE_FOR_HEDGE and order.dontUseAutoPriceForHedge:
-            self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        " It does not support dontUseAutoPriceForHedge parameter")
-            return
-
-        if self.serverVersion() < MIN_SERVER_VER_ORDER_CONTAINER and order.isOmsContainer:
-            self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        " It does not support oms container parameter")
-            return
-
-        if self.serverVersion() < MIN_SERVER_VER_PRICE_MGMT_ALGO and order.usePriceMgmtAlgo:
-            self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() + " It does not support Use price management algo requests")
+        try:
+            msg = encoder.forServerVersion(self.serverVersion()).placeOrder(
+                orderId, contract, order)
+        except encoder.UnsupportedByServer as ex:
+            self.wrapper.error(orderId, UPDATE_TWS.code(), UPDATE_TWS.msg() + str(ex))
             return
 
-        VERSION = 27 if (self.serverVersion() < MIN_SERVER_VER_NOT_HELD) else 45
-
-        # send place order msg
-        flds = []
-        flds += [make_field(OUT.PLACE_ORDER)]
-
-        if self.serverVersion() < MIN_SERVER_VER_ORDER_CONTAINER:
-            flds += [make_field(VERSION)]
-
-        flds += [make_field(orderId)]
-
-        # send contract fields
-        if self.serverVersion() >= MIN_SERVER_VER_PLACE_ORDER_CONID:
-            flds.append(make_field( contract.conId))
-        flds += [make_field( contract.symbol),
-            make_field( contract.secType),
-            make_field( contract.lastTradeDateOrContractMonth),
-            make_field( contract.strike),
-            make_field( contract.right),
-            make_field( contract.multiplier), # srv v15 and above
-            make_field( contract.exchange),
-            make_field( contract.primaryExchange), # srv v14 and above
-            make_field( contract.currency),
-            make_field( contract.localSymbol)] # srv v2 and above
-        if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
-            flds.append(make_field( contract.tradingClass))
-
-        if self.serverVersion() >= MIN_SERVER_VER_SEC_ID_TYPE:
-            flds += [make_field( contract.secIdType),
-                make_field( contract.secId)]
-
-        # send main order fields
-        flds.append(make_field( order.action))
-
-        if self.serverVersion() >= MIN_SERVER_VER_FRACTIONAL_POSITIONS:
-            flds.append(make_field(order.totalQuantity))
-        else:
-            flds.append(make_field(int(order.totalQuantity)))
-
-        flds.append(make_field(order.orderType))
-        if self.serverVersion() < MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE:
-            flds.append(make_field(
-                order.lmtPrice if order.lmtPrice != UNSET_DOUBLE else 0))
-        else:
-            flds.append(make_field_handle_empty( order.lmtPrice))
-        if self.serverVersion() < MIN_SERVER_VER_TRAILING_PERCENT:
-            flds.append(make_field(
-                order.auxPrice if order.auxPrice != UNSET_DOUBLE else 0))
-        else:
-            flds.append(make_field_handle_empty( order.auxPrice))
-
-        # send extended order fields
-            flds += [make_field( order.tif),
-            make_field( order.ocaGroup),
-            make_field( order.account),
-            make_field( order.openClose),
-            make_field( order.origin),
-            make_field( order.orderRef),
-            make_field( order.transmit),
-            make_field( order.parentId),      # srv v4 and above
-            make_field( order.blockOrder),    # srv v5 and above
-            make_field( order.sweepToFill),   # srv v5 and above
-            make_field( order.displaySize),   # srv v5 and above
-            make_field( order.triggerMethod), # srv v5 and above
-            make_field( order.outsideRth),    # srv v5 and above
-            make_field( order.hidden)]        # srv v7 and above
-
-        # Send combo legs for BAG requests (srv v8 and above)
-        if contract.secType == "BAG":
-            comboLegsCount = len(contract.comboLegs) if contract.comboLegs else 0
-            flds.append(make_field(comboLegsCount))
-            if comboLegsCount > 0:
-                for comboLeg in contract.comboLegs:
-                    assert comboLeg
-                    flds += [make_field(comboLeg.conId),
-                        make_field( comboLeg.ratio),
-                        make_field( comboLeg.action),
-                        make_field( comboLeg.exchange),
-                        make_field( comboLeg.openClose),
-                        make_field( comboLeg.shortSaleSlot),      #srv v35 and above
-                        make_field( comboLeg.designatedLocation)] # srv v35 and above
-                    if self.serverVersion() >= MIN_SERVER_VER_SSHORTX_OLD:
-                        flds.append(make_field(comboLeg.exemptCode))
-
-        # Send order combo legs for BAG requests
-        if self.serverVersion() >= MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE and contract.secType == "BAG":
-            orderComboLegsCount = len(order.orderComboLegs) if order.orderComboLegs else 0
-            flds.append(make_field( orderComboLegsCount))
-            if orderComboLegsCount:
-                for orderComboLeg in order.orderComboLegs:
-                    assert orderComboLeg
-                    flds.append(make_field_handle_empty( orderComboLeg.price))
-
-        if self.serverVersion() >= MIN_SERVER_VER_SMART_COMBO_ROUTING_PARAMS and contract.secType == "BAG":
-                smartComboRoutingParamsCount = len(order.smartComboRoutingParams) if order.smartComboRoutingParams else 0
-                flds.append(make_field( smartComboRoutingParamsCount))
-                if smartComboRoutingParamsCount > 0:
-                    for tagValue in order.smartComboRoutingParams:
-                        flds += [make_field(tagValue.tag),
-                            make_field(tagValue.value)]
-
-        ######################################################################
-        # Send the shares allocation.
-        #
-        # This specifies the number of order shares allocated to each Financial
-        # Advisor managed account. The format of the allocation string is as
-        # follows:
-        #                      <account_code1>/<number_shares1>,<account_code2>/<number_shares2>,...N
-        # E.g.
-        #              To allocate 20 shares of a 100 share order to account 'U101' and the
-        #      residual 80 to account 'U203' enter the following share allocation string:
-        #          U101/20,U203/80
-        #####################################################################
-        # send deprecated sharesAllocation field
-        flds += [make_field( ""),            # srv v9 and above
-
-            make_field( order.discretionaryAmt), # srv v10 and above
-            make_field( order.goodAfterTime), # srv v11 and above
-            make_field( order.goodTillDate), # srv v12 and above
-
-            make_field( order.faGroup),      # srv v13 and above
-            make_field( order.faMethod),     # srv v13 and above
-            make_field( order.faPercentage), # srv v13 and above
-            make_field( order.faProfile)]    # srv v13 and above
-
-        if self.serverVersion() >= MIN_SERVER_VER_MODELS_SUPPORT:
-            flds.append(make_field( order.modelCode))
-
-        # institutional short saleslot data (srv v18 and above)
-        flds += [make_field( order.shortSaleSlot),   # 0 for retail, 1 or 2 for institutions
-            make_field( order.designatedLocation)]   # populate only when shortSaleSlot = 2.
-        if self.serverVersion() >= MIN_SERVER_VER_SSHORTX_OLD:
-            flds.append(make_field( order.exemptCode))
-
-        # not needed anymore
-        #bool isVolOrder = (order.orderType.CompareNoCase("VOL") == 0)
-
-        # srv v19 and above fields
-        flds.append(make_field( order.ocaType))
-        #if( self.serverVersion() < 38) {
-        # will never happen
-        #      send( /* order.rthOnly */ false);
-        #}
-        flds += [make_field( order.rule80A),
-            make_field( order.settlingFirm),
-            make_field( order.allOrNone),
-            make_field_handle_empty( order.minQty),
-            make_field_handle_empty( order.percentOffset),
-            make_field( order.eTradeOnly),
-            make_field( order.firmQuoteOnly),
-            make_field_handle_empty( order.nbboPriceCap),
-            make_field( order.auctionStrategy), # AUCTION_MATCH, AUCTION_IMPROVEMENT, AUCTION_TRANSPARENT
-            make_field_handle_empty( order.startingPrice),
-            make_field_handle_empty( order.stockRefPrice),
-            make_field_handle_empty( order.delta),
-            make_field_handle_empty( order.stockRangeLower),
-            make_field_handle_empty( order.stockRangeUpper),
-
-            make_field( order.overridePercentageConstraints),    #srv v22 and above
-
-            # Volatility orders (srv v26 and above)
-            make_field_handle_empty( order.volatility),
-            make_field_handle_empty( order.volatilityType),
-            make_field( order.deltaNeutralOrderType),             # srv v28 and above
-            make_field_handle_empty( order.deltaNeutralAuxPrice)] # srv v28 and above
-
-        if self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL_CONID and order.deltaNeutralOrderType:
-            flds += [make_field( order.deltaNeutralConId),
-                make_field( order.deltaNeutralSettlingFirm),
-                make_field( order.deltaNeutralClearingAccount),
-                make_field( order.deltaNeutralClearingIntent)]
-
-        if self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL_OPEN_CLOSE and order.deltaNeutralOrderType:
-            flds += [make_field( order.deltaNeutralOpenClose),
-                make_field( order.deltaNeutralShortSale),
-                make_field( order.deltaNeutralShortSaleSlot),
-                make_field( order.deltaNeutralDesignatedLocation)]
-
-        flds += [make_field( order.continuousUpdate),
-            make_field_handle_empty( order.referencePriceType),
-            make_field_handle_empty( order.trailStopPrice)] # srv v30 and above
-
-        if self.serverVersion() >= MIN_SERVER_VER_TRAILING_PERCENT:
-            flds.append(make_field_handle_empty( order.trailingPercent))
-
-        # SCALE orders
-        if self.serverVersion() >= MIN_SERVER_VER_SCALE_ORDERS2:
-            flds += [make_field_handle_empty( order.scaleInitLevelSize),
-                make_field_handle_empty( order.scaleSubsLevelSize)]
-        else:
-                # srv v35 and above)
-            flds += [make_field( ""), # for not supported scaleNumComponents
-                make_field_handle_empty(order.scaleInitLevelSize)] # for scaleComponentSize
-
-        flds.append(make_field_handle_empty( order.scalePriceIncrement))
-
-        if self.serverVersion() >= MIN_SERVER_VER_SCALE_ORDERS3 \
-            and order.scalePriceIncrement != UNSET_DOUBLE \
-            and order.scalePriceIncrement > 0.0:
-
-            flds += [make_field_handle_empty( order.scalePriceAdjustValue),
-                make_field_handle_empty( order.scalePriceAdjustInterval),
-                make_field_handle_empty( order.scaleProfitOffset),
-                make_field( order.scaleAutoReset),
-                make_field_handle_empty( order.scaleInitPosition),
-                make_field_handle_empty( order.scaleInitFillQty),
-                make_field( order.scaleRandomPercent)]
-
-        if self.serverVersion() >= MIN_SERVER_VER_SCALE_TABLE:
-            flds += [make_field( order.scaleTable),
-                make_field( order.activeStartTime),
-                make_field( order.activeStopTime)]
-
-        # HEDGE orders
-        if self.serverVersion() >= MIN_SERVER_VER_HEDGE_ORDERS:
-            flds.append(make_field( order.hedgeType))
-            if order.hedgeType:
-                flds.append(make_field( order.hedgeParam))
-
-        if self.serverVersion() >= MIN_SERVER_VER_OPT_OUT_SMART_ROUTING:
-            flds.append(make_field( order.optOutSmartRouting))
-
-        if self.serverVersion() >= MIN_SERVER_VER_PTA_ORDERS:
-            flds += [make_field( order.clearingAccount),
-                make_field( order.clearingIntent)]
-
-        if self.serverVersion() >= MIN_SERVER_VER_NOT_HELD:
-            flds.append(make_field( order.notHeld))
-
-        if self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL:
-            if contract.deltaNeutralContract:
-                flds += [make_field(True),
-                    make_field(contract.deltaNeutralContract.conId),
-                    make_field(contract.deltaNeutralContract.delta),
-                    make_field(contract.deltaNeutralContract.price)]
-            else:
-                flds.append(make_field(False))
-
-        if self.serverVersion() >= MIN_SERVER_VER_ALGO_ORDERS:
-            flds.append(make_field( order.algoStrategy))
-            if order.algoStrategy:
-                algoParamsCount = len(order.algoParams) if order.algoParams else 0
-                flds.append(make_field(algoParamsCount))
-                if algoParamsCount > 0:
-                    for algoParam in order.algoParams:
-                        flds += [make_field(algoParam.tag),
-                            make_field(algoParam.value)]
-
-        if self.serverVersion() >= MIN_SERVER_VER_ALGO_ID:
-            flds.append(make_field( order.algoId))
-
-        flds.append(make_field( order.whatIf)) # srv v36 and above
-
-        # send miscOptions parameter
-        if self.serverVersion() >= MIN_SERVER_VER_LINKING:
-            miscOptionsStr = ""
-            if order.orderMiscOptions:
-                for tagValue in order.orderMiscOptions:
-                    miscOptionsStr += str(tagValue)
-            flds.append(make_field( miscOptionsStr))
-
-        if self.serverVersion() >= MIN_SERVER_VER_ORDER_SOLICITED:
-            flds.append(make_field(order.solicited))
-
-        if self.serverVersion() >= MIN_SERVER_VER_RANDOMIZE_SIZE_AND_PRICE:
-            flds += [make_field(order.randomizeSize),
-                make_field(order.randomizePrice)]
-
-        if self.serverVersion() >= MIN_SERVER_VER_PEGGED_TO_BENCHMARK:
-            if order.orderType == "PEG BENCH":
-                flds += [make_field(order.referenceContractId),
-                    make_field(order.isPeggedChangeAmountDecrease),
-                    make_field(order.peggedChangeAmount),
-                    make_field(order.referenceChangeAmount),
-                    make_field(order.referenceExchangeId)]
-
-            flds.append(make_field(len(order.conditions)))
-
-            if len(order.conditions) > 0:
-                for cond in order.conditions:
-                    flds.append(make_field(cond.type()))
-                    flds += cond.make_fields()
-
-                flds += [make_field(order.conditionsIgnoreRth),
-                    make_field(order.conditionsCancelOrder)]
-
-            flds += [make_field(order.adjustedOrderType),
-                make_field(order.triggerPrice),
-                make_field(order.lmtPriceOffset),
-                make_field(order.adjustedStopPrice),
-                make_field(order.adjustedStopLimitPrice),
-                make_field(order.adjustedTrailingAmount),
-                make_field(order.adjustableTrailingUnit)]
-
-        if self.serverVersion() >= MIN_SERVER_VER_EXT_OPERATOR:
-            flds.append(make_field( order.extOperator))
-
-        if self.serverVersion() >= MIN_SERVER_VER_SOFT_DOLLAR_TIER:
-            flds += [make_field(order.softDollarTier.name),
-                make_field(order.softDollarTier.val)]
-
-        if self.serverVersion() >= MIN_SERVER_VER_CASH_QTY:
-            flds.append(make_field( order.cashQty))
-
-        if self.serverVersion() >= MIN_SERVER_VER_DECISION_MAKER:
-            flds.append(make_field( order.mifid2DecisionMaker))
-            flds.append(make_field( order.mifid2DecisionAlgo))
-
-        if self.serverVersion() >= MIN_SERVER_VER_MIFID_EXECUTION:
-            flds.append(make_field( order.mifid2ExecutionTrader))
-            flds.append(make_field( order.mifid2ExecutionAlgo))
-
-        if self.serverVersion() >= MIN_SERVER_VER_AUTO_PRICE_FOR_HEDGE:
-            flds.append(make_field(order.dontUseAutoPriceForHedge))
-
-        if self.serverVersion() >= MIN_SERVER_VER_ORDER_CONTAINER:
-            flds.append(make_field(order.isOmsContainer))
-
-        if self.serverVersion() >= MIN_SERVER_VER_D_PEG_ORDERS:
-            flds.append(make_field(order.discretionaryUpToLimitPrice))
-
-        if self.serverVersion() >= MIN_SERVER_VER_PRICE_MGMT_ALGO:
-            flds.append(make_field_handle_empty(UNSET_INTEGER if order.usePriceMgmtAlgo == None else 1 if order.usePriceMgmtAlgo else 0))
-
-        msg = "".join(flds)
         self.sendMsg(msg)
 
 
@@ -1361,18 +864,14 @@ class EClient(object):
         orderId:OrderId - The order ID that was specified previously in the call
             to placeOrder()"""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        VERSION = 1
-
-        msg = make_field(OUT.CANCEL_ORDER) \
-            + make_field(VERSION) \
-            + make_field(orderId)
-
+        msg = encoder.forServerVersion(self.serverVersion()).cancelOrder(orderId)
         self.sendMsg(msg)
 
 
@@ -1386,7 +885,8 @@ class EClient(object):
         orderId will be generated. This association will persist over multiple
         API and TWS sessions.  """
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1412,7 +912,8 @@ class EClient(object):
         associated with the client. If set to FALSE, no association will be
         made."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1435,7 +936,8 @@ class EClient(object):
         Note:  No association is made between the returned orders and the
         requesting client."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1456,7 +958,8 @@ class EClient(object):
         If the order was created in TWS, it also gets canceled. If the order
         was initiated in the API, it also gets canceled."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1479,7 +982,8 @@ class EClient(object):
 
         numIds:int - deprecated"""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1510,7 +1014,8 @@ class EClient(object):
         acctCode:str -The account code for which to receive account and
             portfolio updates."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1583,7 +1088,8 @@ class EClient(object):
             $LEDGER:ALL - Single flag to relay all cash balance tags* in all
             currencies."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1605,7 +1111,8 @@ class EClient(object):
 
         reqId:int - The ID of the data request being canceled."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1623,7 +1130,8 @@ class EClient(object):
     def reqPositions(self):
         """Requests real-time position data for all accounts."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1645,7 +1153,8 @@ class EClient(object):
     def cancelPositions(self):
         """Cancels real-time position updates."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1670,7 +1179,8 @@ class EClient(object):
         Results are delivered via EWrapper.positionMulti() and
         EWrapper.positionMultiEnd() """
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1694,7 +1204,8 @@ class EClient(object):
 
     def cancelPositionsMulti(self, reqId:int):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1718,7 +1229,8 @@ class EClient(object):
                                 ledgerAndNLV:bool):
         """Requests account updates for account and/or model."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1743,7 +1255,8 @@ class EClient(object):
 
     def cancelAccountUpdatesMulti(self, reqId:int):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1769,7 +1282,8 @@ class EClient(object):
 
     def reqPnL(self, reqId: int, account: str, modelCode: str):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1789,7 +1303,8 @@ class EClient(object):
 
     def cancelPnL(self, reqId: int):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1807,7 +1322,8 @@ class EClient(object):
 
     def reqPnLSingle(self, reqId: int, account: str, modelCode: str, conid: int):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1828,7 +1344,8 @@ class EClient(object):
 
     def cancelPnLSingle(self, reqId: int):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1864,7 +1381,8 @@ class EClient(object):
 
         NOTE: Time format must be 'yyyymmdd-hh:mm:ss' Eg: '20030702-14:55'"""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -1908,70 +1426,20 @@ class EClient(object):
         contract:Contract - The summary description of the contract being looked
             up."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_SEC_ID_TYPE:
-            if contract.secIdType or contract.secId:
-                self.wrapper.error( reqId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support secIdType and secId parameters.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
-            if contract.tradingClass:
-                self.wrapper.error( reqId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support tradingClass parameter in reqContractDetails.")
-                return
-
-        if self.serverVersion() < MIN_SERVER_VER_LINKING:
-            if contract.primaryExchange:
-                self.wrapper.error( reqId, UPDATE_TWS.code(), UPDATE_TWS.msg() +
-                        "  It does not support primaryExchange parameter in reqContractDetails.")
-                return
-
-        VERSION = 8
-
-        # send req mkt data msg
-        flds = []
-        flds += [make_field(OUT.REQ_CONTRACT_DATA),
-            make_field( VERSION)]
-
-        if self.serverVersion() >= MIN_SERVER_VER_CONTRACT_DATA_CHAIN:
-            flds += [make_field( reqId),]
-
-        # send contract fields
-        flds += [make_field(contract.conId), # srv v37 and above
-            make_field(contract.symbol),
-            make_field(contract.secType),
-            make_field(contract.lastTradeDateOrContractMonth),
-            make_field(contract.strike),
-            make_field(contract.right),
-            make_field(contract.multiplier)] # srv v15 and above
-
-        if self.serverVersion() >= MIN_SERVER_VER_PRIMARYEXCH:
-            flds += [make_field(contract.exchange),
-                make_field(contract.primaryExchange)]
-        elif self.serverVersion() >= MIN_SERVER_VER_LINKING:
-            if (contract.primaryExchange and
-                (contract.exchange == "BEST" or contract.exchange == "SMART")):
-                flds += [make_field(contract.exchange + ":" + contract.primaryExchange),]
-            else:
-                flds += [make_field(contract.exchange),]
-
-        flds += [make_field( contract.currency),
-            make_field( contract.localSymbol)]
-        if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
-            flds += [make_field(contract.tradingClass), ]
-        flds += [make_field(contract.includeExpired),] # srv v31 and above
-
-        if self.serverVersion() >= MIN_SERVER_VER_SEC_ID_TYPE:
-            flds += [make_field( contract.secIdType),
-                make_field( contract.secId)]
+        try:
+            msg = encoder.forServerVersion(self.serverVersion()).reqContractDetails(
+                reqId, contract)
+        except encoder.UnsupportedByServer as ex:
+            self.wrapper.error(reqId, UPDATE_TWS.code(), UPDATE_TWS.msg() + str(ex))
+            return
 
-        msg = "".join(flds)
         self.sendMsg(msg)
 
 
@@ -1981,7 +1449,8 @@ class EClient(object):
 
     def reqMktDepthExchanges(self):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2017,7 +1486,8 @@ class EClient(object):
         mktDepthOptions:TagValueList - For internal use only. Use default value
             XYZ."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2090,7 +1560,8 @@ class EClient(object):
             reqMktDepth().
         isSmartDepth:bool - specifies SMART depth request"""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2129,7 +1600,8 @@ class EClient(object):
         the currencyent day and any new ones. If set to FALSE, will only
         return new bulletins. """
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2147,7 +1619,8 @@ class EClient(object):
     def cancelNewsBulletins(self):
         """Call this function to stop receiving news bulletins."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2171,7 +1644,8 @@ class EClient(object):
 
         Note:  This request can only be made when connected to a FA managed account."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2195,7 +1669,8 @@ class EClient(object):
             2 = PROFILE
             3 = ACCOUNT ALIASES"""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2222,7 +1697,8 @@ class EClient(object):
         cxml: str - The XML string containing the new FA configuration
             information.  """
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2300,74 +1776,23 @@ class EClient(object):
         chartOptions:TagValueList - For internal use only. Use default value XYZ. """
 
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(),
                                NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
-            if contract.tradingClass or contract.conId > 0:
-                self.wrapper.error(reqId, UPDATE_TWS.code(),
-                    UPDATE_TWS.msg() + "  It does not support conId and tradingClass parameters in reqHistoricalData.")
-                return
-
-        VERSION = 6
-
-        # send req mkt data msg
-        flds = []
-        flds += [make_field(OUT.REQ_HISTORICAL_DATA),]
-
-        if self.serverVersion() < MIN_SERVER_VER_SYNT_REALTIME_BARS:
-            flds += [make_field(VERSION),]
-
-        flds += [make_field(reqId),]
-
-        # send contract fields
-        if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
-            flds += [make_field(contract.conId),]
-        flds += [make_field(contract.symbol),
-            make_field(contract.secType),
-            make_field(contract.lastTradeDateOrContractMonth),
-            make_field(contract.strike),
-            make_field(contract.right),
-            make_field(contract.multiplier),
-            make_field(contract.exchange),
-            make_field(contract.primaryExchange),
-            make_field(contract.currency),
-            make_field(contract.localSymbol)]
-        if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
-            flds += [make_field( contract.tradingClass),]
-        flds += [make_field(contract.includeExpired), # srv v31 and above
-            make_field(endDateTime), # srv v20 and above
-            make_field(barSizeSetting), # srv v20 and above
-            make_field(durationStr),
-            make_field(useRTH),
-            make_field(whatToShow),
-            make_field(formatDate)] # srv v16 and above
-
-        # Send combo legs for BAG requests
-        if contract.secType == "BAG":
-            flds += [make_field(len(contract.comboLegs)),]
-            for comboLeg in contract.comboLegs:
-                flds += [make_field( comboLeg.conId),
-                    make_field( comboLeg.ratio),
-                    make_field( comboLeg.action),
-                    make_field( comboLeg.exchange)]
-
-        if self.serverVersion() >= MIN_SERVER_VER_SYNT_REALTIME_BARS:
-            flds += [make_field(keepUpToDate), ]
-
-        # send chartOptions parameter
-        if self.serverVersion() >= MIN_SERVER_VER_LINKING:
-            chartOptionsStr = ""
-            if chartOptions:
-                for tagValue in chartOptions:
-                    chartOptionsStr += str(tagValue)
-            flds += [make_field( chartOptionsStr),]
+        try:
+            msg = encoder.forServerVersion(self.serverVersion()).reqHistoricalData(
+                reqId, contract, endDateTime, durationStr,
+                barSizeSetting, whatToShow, useRTH, formatDate, keepUpToDate,
+                chartOptions)
+        except encoder.UnsupportedByServer as ex:
+            self.wrapper.error(reqId, UPDATE_TWS.code(), UPDATE_TWS.msg() + str(ex))
+            return
 
-        msg = "".join(flds)
         self.sendMsg(msg)
 
     def cancelHistoricalData(self, reqId:TickerId):
@@ -2378,18 +1803,14 @@ class EClient(object):
         reqId:TickerId - The ticker ID. Must be a unique value."""
 
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        VERSION = 1
-
-        msg = make_field(OUT.CANCEL_HISTORICAL_DATA) \
-           + make_field(VERSION)   \
-           + make_field(reqId)
-
+        msg = encoder.forServerVersion(self.serverVersion()).cancelHistoricalData(reqId)
         self.sendMsg(msg)
 
     # Note that formatData parameter affects intraday bars only
@@ -2398,7 +1819,8 @@ class EClient(object):
     def reqHeadTimeStamp(self, reqId:TickerId, contract:Contract,
                                                  whatToShow: str, useRTH: int, formatDate: int):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2434,7 +1856,8 @@ class EClient(object):
 
     def cancelHeadTimeStamp(self, reqId: TickerId):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2455,7 +1878,8 @@ class EClient(object):
     def reqHistogramData(self, tickerId: int, contract: Contract,
                      useRTH: bool, timePeriod: str):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2490,7 +1914,8 @@ class EClient(object):
 
     def cancelHistogramData(self, tickerId: int):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2509,7 +1934,8 @@ class EClient(object):
                            endDateTime: str, numberOfTicks: int, whatToShow: str, useRth: int,
                            ignoreSize: bool, miscOptions: TagValueList):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2561,7 +1987,8 @@ class EClient(object):
     def reqScannerParameters(self):
         """Requests an XML string that describes all possible scanner queries."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2586,7 +2013,8 @@ class EClient(object):
         scannerSubscriptionOptions:TagValueList - For internal use only.
             Use default value XYZ."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2652,7 +2080,8 @@ class EClient(object):
     def cancelScannerSubscription(self, reqId:int):
         """reqId:int - The ticker ID. Must be a unique value."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2700,7 +2129,8 @@ class EClient(object):
                 partially or completely outside.
         realTimeBarOptions:TagValueList - For internal use only. Use default value XYZ."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2755,7 +2185,8 @@ class EClient(object):
 
         reqId:TickerId - The Id that was specified in the call to reqRealTimeBars(). """
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2802,7 +2233,8 @@ class EClient(object):
             RESC (analyst estimates)
             CalendarReport (company calendar) """
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2854,7 +2286,8 @@ class EClient(object):
 
         reqId:TickerId - The ID of the data request."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2880,7 +2313,8 @@ class EClient(object):
 
     def reqNewsProviders(self):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2899,7 +2333,8 @@ class EClient(object):
 
     def reqNewsArticle(self, reqId: int, providerCode: str, articleId: str, newsArticleOptions: TagValueList):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2932,7 +2367,8 @@ class EClient(object):
     def reqHistoricalNews(self, reqId: int, conId: int, providerCodes: str,
                       startDateTime: str, endDateTime: str, totalResults: int, historicalNewsOptions: TagValueList):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -2977,7 +2413,8 @@ class EClient(object):
         reqId:int - The unique number that will be associated with the
             response """
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3002,7 +2439,8 @@ class EClient(object):
         groupId:int - The ID of the group, currently it is a number from 1 to 7.
             This is the display group subscription request sent by the API to TWS."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3033,7 +2471,8 @@ class EClient(object):
                 Examples: 8314@SMART for IBM SMART; 8314@ARCA for IBM @ARCA.
             combo = if any combo is selected."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3057,7 +2496,8 @@ class EClient(object):
     def unsubscribeFromGroupEvents(self, reqId:int):
         """reqId:int - The requestId specified in subscribeToGroupEvents()."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3081,7 +2521,8 @@ class EClient(object):
         """For IB's internal purpose. Allows to provide means of verification
         between the TWS and third party programs."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3111,7 +2552,8 @@ class EClient(object):
         """For IB's internal purpose. Allows to provide means of verification
         between the TWS and third party programs."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3136,7 +2578,8 @@ class EClient(object):
         """For IB's internal purpose. Allows to provide means of verification
         between the TWS and third party programs."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3167,7 +2610,8 @@ class EClient(object):
         """For IB's internal purpose. Allows to provide means of verification
         between the TWS and third party programs."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3199,7 +2643,8 @@ class EClient(object):
         i.e. STK underlyingConId the contract ID of the underlying security.
         Response comes via EWrapper.securityDefinitionOptionParameter()"""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3227,7 +2672,8 @@ class EClient(object):
         registered professional advisors and hedge and mutual funds who have
         configured Soft Dollar Tiers in Account Management."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3241,7 +2687,8 @@ class EClient(object):
 
     def reqFamilyCodes(self):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3259,7 +2706,8 @@ class EClient(object):
 
     def reqMatchingSymbols(self, reqId:int, pattern:str):
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -3282,7 +2730,8 @@ class EClient(object):
         Each completed order will be fed back through the
         completedOrder() function on the EWrapper."""
 
-        self.logRequest(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logRequest(current_fn_name(), vars())
 
         if not self.isConnected():
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
@@ -0,0 +1,220 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Several connections to the same TWS/IBGW, each one with its own clientId, used
+as one: a large backfill or contract sweep is not bound to what a single
+connection gets through.
+
+Each connection is a PoolClient (a RequestManager + EClient). They do not have
+their own EReader thread and run() loop: a single ClientPool thread waits on
+all the sockets with a selector, frames the msgs and decodes them right away,
+which settles the futures. The req*Future() methods of the pool send each
+request on the connected client with the fewest requests in flight:
+
+    pool = ClientPool(size=4)
+    pool.connect("127.0.0.1", 7497, firstClientId=10)
+    futs = [pool.reqHistoricalDataFuture(c, "", "1 D", "1 min", "TRADES", 1, 1)
+            for c in contracts]
+    concurrent.futures.wait(futs)
+    pool.disconnect()
+
+Only requests answered through the futures go through the pool; the
+callbacks of anything else (eg error() with no reqId) go to the EWrapper of
+each PoolClient, a subclass can be given as clientClass.
+"""
+
+import logging
+import selectors
+import threading
+
+from ibapi import comm
+from ibapi.client import EClient
+from ibapi.common import * # @UnusedWildImport
+from ibapi.contract import Contract
+from ibapi.request_manager import RequestManager
+from ibapi.utils import BadMessage
+
+
+logger = logging.getLogger(__name__)
+
+
+class PoolClient(RequestManager, EClient):
+    """ one connection of a ClientPool """
+
+    def __init__(self):
+        RequestManager.__init__(self)
+        EClient.__init__(self, wrapper=self)
+        self.msgBuf = comm.MsgBuffer()
+
+
+    def startReader(self):
+        # the ClientPool thread reads the socket
+        pass
+
+
+class ClientPool:
+    RECV_SIZE = 65536
+
+    def __init__(self, size:int=4, clientClass=PoolClient):
+        self.clients = [clientClass() for _ in range(size)]
+        self.selector = selectors.DefaultSelector()
+        self.lock = threading.Lock()
+        self.thread = None
+
+
+    def connect(self, host, port, firstClientId:int):
+        """ connects the clients with clientIds firstClientId,
+        firstClientId + 1, ... and starts the reading thread; returns the
+        number of clients connected """
+        nConnected = 0
+        for (idx, client) in enumerate(self.clients):
+            client.connect(host, port, firstClientId + idx)
+            if client.isConnected():
+                self.selector.register(client.conn.socket, selectors.EVENT_READ, client)
+                nConnected += 1
+            else:
+                logger.error("pool client %d could not connect", firstClientId + idx)
+        if nConnected:
+            self.thread = threading.Thread(target=self.run, name="ClientPool",
+                                           daemon=True)
+            self.thread.start()
+        return nConnected
+
+
+    def disconnect(self):
+        for client in self.clients:
+            if client.isConnected():
+                self._close(client)
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+
+
+    def isConnected(self):
+        return any(client.isConnected() for client in self.clients)
+
+
+    def _close(self, client):
+        with self.lock:
+            if client.conn is not None and client.conn.socket is not None:
+                try:
+                    self.selector.unregister(client.conn.socket)
+                except (KeyError, ValueError):
+                    pass
+        client.disconnect()
+
+
+    def run(self):
+        """ reads and decodes the msgs of all the clients until they are
+        all disconnected """
+        try:
+            while True:
+                with self.lock:
+                    if not self.selector.get_map():
+                        break
+                for (key, _) in self.selector.select(timeout=0.2):
+                    self._read(key.fileobj, key.data)
+            logger.debug("ClientPool thread finished")
+        except Exception:
+            logger.exception("unhandled exception in ClientPool thread")
+        finally:
+            # nothing reads them any more, their pending futures fail
+            for client in self.clients:
+                if client.isConnected():
+                    self._close(client)
+
+
+    def _read(self, sock, client):
+        buf = client.msgBuf
+        view = buf.reserve(ClientPool.RECV_SIZE)
+        try:
+            n = sock.recv_into(view, ClientPool.RECV_SIZE)
+        except OSError:
+            n = 0
+        finally:
+            view.release()
+        if n == 0:
+            logger.info("pool client %s: connection closed", client.clientId)
+            self._close(client)
+            return
+        buf.commit(n)
+
+        for text in buf.read_msgs():
+            try:
+                client.decoder.interpret(comm.read_fields(text))
+            except BadMessage:
+                logger.info("pool client %s: BadMessage", client.clientId)
+                self._close(client)
+                return
+
+
+    def leastLoaded(self) -> PoolClient:
+        """ the connected client with the fewest requests in flight """
+        connected = [client for client in self.clients if client.isConnected()]
+        if not connected:
+            raise ConnectionError("no connected client in the pool")
+        return min(connected, key=PoolClient.pendingCount)
+
+
+    def pendingCount(self) -> int:
+        return sum(client.pendingCount() for client in self.clients)
+
+
+    ##### requests, as the RequestManager ones
+
+    def reqContractDetailsFuture(self, contract:Contract, timeout:float=None):
+        return self.leastLoaded().reqContractDetailsFuture(contract, timeout)
+
+
+    def reqHistoricalDataFuture(self, contract:Contract, endDateTime:str,
+                                durationStr:str, barSizeSetting:str,
+                                whatToShow:str, useRTH:int, formatDate:int,
+                                chartOptions:TagValueList=None,
+                                timeout:float=None):
+        return self.leastLoaded().reqHistoricalDataFuture(contract, endDateTime,
+            durationStr, barSizeSetting, whatToShow, useRTH, formatDate,
+            chartOptions, timeout)
+
+
+    def reqHistoricalTicksFuture(self, contract:Contract, startDateTime:str,
+                                 endDateTime:str, numberOfTicks:int,
+                                 whatToShow:str, useRth:int, ignoreSize:bool,
+                                 miscOptions:TagValueList=None,
+                                 timeout:float=None):
+        return self.leastLoaded().reqHistoricalTicksFuture(contract,
+            startDateTime, endDateTime, numberOfTicks, whatToShow, useRth,
+            ignoreSize, miscOptions, timeout)
+
+
+    def reqHeadTimeStampFuture(self, contract:Contract, whatToShow:str,
+                               useRTH:int, formatDate:int, timeout:float=None):
+        return self.leastLoaded().reqHeadTimeStampFuture(contract, whatToShow,
+            useRTH, formatDate, timeout)
+
+
+    def reqHistogramDataFuture(self, contract:Contract, useRTH:bool,
+                               timePeriod:str, timeout:float=None):
+        return self.leastLoaded().reqHistogramDataFuture(contract, useRTH,
+            timePeriod, timeout)
+
+
+    def reqSecDefOptParamsFuture(self, underlyingSymbol:str,
+                                 futFopExchange:str, underlyingSecType:str,
+                                 underlyingConId:int, timeout:float=None):
+        return self.leastLoaded().reqSecDefOptParamsFuture(underlyingSymbol,
+            futFopExchange, underlyingSecType, underlyingConId, timeout)
+
+
+    def reqMatchingSymbolsFuture(self, pattern:str, timeout:float=None):
+        return self.leastLoaded().reqMatchingSymbolsFuture(pattern, timeout)
+
+
+    def reqFundamentalDataFuture(self, contract:Contract, reportType:str,
+                                 fundamentalDataOptions:TagValueList=None,
+                                 timeout:float=None):
+        return self.leastLoaded().reqFundamentalDataFuture(contract, reportType,
+            fundamentalDataOptions, timeout)
@@ -0,0 +1,103 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Decoding of the bulk msgs straight into NumPy arrays, one array per column
+or one structured array, instead of one Python object (and for the bars, one
+wrapper call) per row.
+NumPy is not a dependency of the API: this module is only imported when a
+columnar mode is asked for (see Decoder's columnarHistData and
+columnarHistTicks).
+"""
+
+import numpy
+
+
+def to_str(col) -> numpy.ndarray:
+    """ decoded as FieldReader.str(), a non UTF-8 byte does not raise """
+    return numpy.array([s.decode(errors="backslashreplace") for s in col],
+                       dtype=str)
+
+
+def to_float(col) -> numpy.ndarray:
+    """ empty fields give 0, as FieldReader.float() """
+    try:
+        return numpy.fromiter(map(float, col), numpy.float64, len(col))
+    except ValueError:
+        return numpy.fromiter((float(s or 0) for s in col), numpy.float64,
+                              len(col))
+
+
+def to_int(col) -> numpy.ndarray:
+    """ empty fields give 0, as FieldReader.int() """
+    try:
+        return numpy.fromiter(map(int, col), numpy.int64, len(col))
+    except ValueError:
+        return numpy.fromiter((int(s or 0) for s in col), numpy.int64,
+                              len(col))
+
+
+def bar_columns(raw:tuple, stride:int) -> tuple:
+    """ raw holds the fields of the bars, stride fields per bar:
+    date, open, high, low, close, volume, average, [extra,] barCount.
+    Returns (dates, open, high, low, close, volume, average, barCount). """
+    return (to_str(raw[0::stride]),
+            to_float(raw[1::stride]),
+            to_float(raw[2::stride]),
+            to_float(raw[3::stride]),
+            to_float(raw[4::stride]),
+            to_int(raw[5::stride]),
+            to_float(raw[6::stride]),
+            to_int(raw[stride-1::stride]))
+
+
+HistTickDtype = numpy.dtype([("time", numpy.int64), ("price", numpy.float64),
+                             ("size", numpy.int64)])
+
+HistTickBidAskDtype = numpy.dtype([("time", numpy.int64), ("mask", numpy.uint8),
+    ("priceBid", numpy.float64), ("priceAsk", numpy.float64),
+    ("sizeBid", numpy.int64), ("sizeAsk", numpy.int64)])
+
+
+def hist_ticks(raw:tuple) -> numpy.ndarray:
+    """ MIDPOINT ticks, 4 fields per tick: time, (unused), price, size """
+    ticks = numpy.empty(len(raw) // 4, HistTickDtype)
+    ticks["time"] = to_int(raw[0::4])
+    ticks["price"] = to_float(raw[2::4])
+    ticks["size"] = to_int(raw[3::4])
+    return ticks
+
+
+def hist_ticks_bid_ask(raw:tuple) -> numpy.ndarray:
+    """ BID_ASK ticks, 6 fields per tick: time, mask, priceBid, priceAsk,
+    sizeBid, sizeAsk. mask bit 0 is askPastHigh, bit 1 bidPastLow. """
+    ticks = numpy.empty(len(raw) // 6, HistTickBidAskDtype)
+    ticks["time"] = to_int(raw[0::6])
+    ticks["mask"] = to_int(raw[1::6])
+    ticks["priceBid"] = to_float(raw[2::6])
+    ticks["priceAsk"] = to_float(raw[3::6])
+    ticks["sizeBid"] = to_int(raw[4::6])
+    ticks["sizeAsk"] = to_int(raw[5::6])
+    return ticks
+
+
+def hist_ticks_last(raw:tuple) -> numpy.ndarray:
+    """ TRADES ticks, 6 fields per tick: time, mask, price, size, exchange,
+    specialConditions. mask bit 0 is pastLimit, bit 1 unreported. The two
+    strings are as wide as the longest one of the page. """
+    exchange = to_str(raw[4::6])
+    specialConditions = to_str(raw[5::6])
+    ticks = numpy.empty(len(exchange), [("time", numpy.int64),
+        ("mask", numpy.uint8), ("price", numpy.float64), ("size", numpy.int64),
+        ("exchange", exchange.dtype),
+        ("specialConditions", specialConditions.dtype)])
+    ticks["time"] = to_int(raw[0::6])
+    ticks["mask"] = to_int(raw[1::6])
+    ticks["price"] = to_float(raw[2::6])
+    ticks["size"] = to_int(raw[3::6])
+    ticks["exchange"] = exchange
+    ticks["specialConditions"] = specialConditions
+    return ticks
@@ -61,6 +61,82 @@ def read_msg(buf:bytes) -> tuple:
         return (size, "", buf)
 
 
+class MsgBuffer:
+    """ Growable receive buffer for size prefixed low level messages.
+
+    Incoming bytes are appended at the write offset and complete messages are
+    sliced out at the read offset, so the not yet consumed tail is never
+    copied once per message (as it happens with read_msg). The unread bytes
+    are moved back to the start of the buffer only when there is no more room
+    at the end, and the buffer doubles in size when even that is not enough.
+    """
+
+    def __init__(self, capacity:int=65536):
+        self.buf = bytearray(capacity)
+        self.rpos = 0
+        self.wpos = 0
+
+    def __len__(self):
+        return self.wpos - self.rpos
+
+    def reserve(self, size:int) -> memoryview:
+        """ returns a writable view of at least size bytes at the write
+        offset; call commit() with the number of bytes actually written and
+        release the view before the next reserve() """
+        self._make_room(size)
+        return memoryview(self.buf)[self.wpos:]
+
+    def commit(self, size:int):
+        self.wpos += size
+
+    def write(self, data:bytes):
+        size = len(data)
+        if size:
+            self._make_room(size)
+            self.buf[self.wpos:self.wpos+size] = data
+            self.wpos += size
+
+    def _make_room(self, size:int):
+        if len(self.buf) - self.wpos >= size:
+            return
+        pending = self.wpos - self.rpos
+        if self.rpos > 0:
+            self.buf[0:pending] = self.buf[self.rpos:self.wpos]
+            self.rpos = 0
+            self.wpos = pending
+        if len(self.buf) - self.wpos < size:
+            capacity = len(self.buf)
+            while capacity - pending < size:
+                capacity *= 2
+            self.buf.extend(bytes(capacity - len(self.buf)))
+
+    def read_msgs(self) -> list:
+        """ extracts all the complete msg payloads currently in the buffer """
+        msgs = []
+        buf = self.buf
+        view = memoryview(buf)
+        rpos = self.rpos
+        wpos = self.wpos
+        unpack_from = _SIZE_PREFIX.unpack_from
+        while wpos - rpos >= 4:
+            size = unpack_from(buf, rpos)[0]
+            end = rpos + 4 + size
+            if end > wpos:
+                break
+            msgs.append(bytes(view[rpos+4:end]))
+            rpos = end
+        view.release()
+
+        if rpos == wpos:
+            rpos = wpos = 0
+        self.rpos = rpos
+        self.wpos = wpos
+        return msgs
+
+
+_SIZE_PREFIX = struct.Struct("!I")
+
+
 def read_fields(buf:bytes) -> tuple:
 
     if isinstance(buf, str):
@@ -3,11 +3,14 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
  and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
 """
 
-from ibapi.object_implem import Object 
+from ibapi.object_implem import Object, valueSlots
 from ibapi import utils
 
 class CommissionReport(Object):
 
+    __slots__ = valueSlots("execId", "commission", "currency", "realizedPNL", "yield_",
+                           "yieldRedemptionDate")
+
     def __init__(self):
         self.execId = ""
         self.commission = 0. 
@@ -6,7 +6,7 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
 import sys
 
 from ibapi.enum_implem import Enum
-from ibapi.object_implem import Object
+from ibapi.object_implem import Object, valueSlots
 
 
 NO_VALID_ID = -1
@@ -44,6 +44,9 @@ ListOfHistoricalTickBidAsk = list
 ListOfHistoricalTickLast = list
 
 class BarData(Object):
+    __slots__ = valueSlots("date", "open", "high", "low", "close", "volume", "barCount",
+                           "average")
+
     def __init__(self):
         self.date = ""
         self.open = 0.
@@ -59,6 +62,9 @@ class BarData(Object):
             self.low, self.close, self.volume, self.average, self.barCount)
 
 class RealTimeBar(Object):
+    __slots__ = valueSlots("time", "endTime", "open_", "high", "low", "close", "volume",
+                           "wap", "count")
+
     def __init__(self, time = 0, endTime = -1, open_ = 0., high = 0., low = 0., close = 0., volume = 0., wap = 0., count = 0):
         self.time = time
         self.endTime = endTime
@@ -115,6 +121,8 @@ class SmartComponent(Object):
         return "BitNumber: %d, Exchange: %s, ExchangeLetter: %s" % (self.bitNumber, self.exchange, self.exchangeLetter)
 
 class TickAttrib(Object):
+    __slots__ = valueSlots("canAutoExecute", "pastLimit", "preOpen")
+
     def __init__(self):
         self.canAutoExecute = False
         self.pastLimit = False
@@ -124,6 +132,8 @@ class TickAttrib(Object):
         return "CanAutoExecute: %d, PastLimit: %d, PreOpen: %d" % (self.canAutoExecute, self.pastLimit, self.preOpen)
 
 class TickAttribBidAsk(Object):
+    __slots__ = valueSlots("bidPastLow", "askPastHigh")
+
     def __init__(self):
         self.bidPastLow = False
         self.askPastHigh = False
@@ -132,6 +142,8 @@ class TickAttribBidAsk(Object):
         return "BidPastLow: %d, AskPastHigh: %d" % (self.bidPastLow, self.askPastHigh)
 
 class TickAttribLast(Object):
+    __slots__ = valueSlots("pastLimit", "unreported")
+
     def __init__(self):
         self.pastLimit = False
         self.unreported = False
@@ -156,6 +168,8 @@ class PriceIncrement(Object):
         return "LowEdge: %f, Increment: %f" % (self.lowEdge, self.increment)
 
 class HistoricalTick(Object):
+    __slots__ = valueSlots("time", "price", "size")
+
     def __init__(self):
         self.time = 0
         self.price = 0.
@@ -165,6 +179,9 @@ class HistoricalTick(Object):
         return "Time: %d, Price: %f, Size: %d" % (self.time, self.price, self.size)
 
 class HistoricalTickBidAsk(Object):
+    __slots__ = valueSlots("time", "tickAttribBidAsk", "priceBid", "priceAsk", "sizeBid",
+                           "sizeAsk")
+
     def __init__(self):
         self.time = 0
         self.tickAttribBidAsk = TickAttribBidAsk()
@@ -177,6 +194,9 @@ class HistoricalTickBidAsk(Object):
         return "Time: %d, TickAttriBidAsk: %s, PriceBid: %f, PriceAsk: %f, SizeBid: %d, SizeAsk: %d" % (self.time, self.tickAttribBidAsk, self.priceBid, self.priceAsk, self.sizeBid, self.sizeAsk)
 
 class HistoricalTickLast(Object):
+    __slots__ = valueSlots("time", "tickAttribLast", "price", "size", "exchange",
+                           "specialConditions")
+
     def __init__(self):
         self.time = 0
         self.tickAttribLast = TickAttribLast()
@@ -10,10 +10,14 @@ It allows us to keep some other info along with it.
 """
 
 
+import select
 import socket
 import threading
 import logging
+import time
 
+from ibapi import comm, log_mode
+from ibapi.writer import ConnWriter
 from ibapi.common import * # @UnusedWildImport
 from ibapi.errors import * # @UnusedWildImport
 
@@ -24,12 +28,33 @@ logger = logging.getLogger(__name__)
 
 
 class Connection:
-    def __init__(self, host, port):
+    MIN_RECV_SIZE = 4096
+    MAX_RECV_SIZE = 1024 * 1024
+
+    def __init__(self, host, port, rcvBufSize=0, socketOptions=(),
+                 writerThread=False):
         self.host = host
         self.port = port
         self.socket = None
         self.wrapper = None
         self.lock = threading.Lock()
+        self.rcvBufSize = rcvBufSize    # SO_RCVBUF, 0 keeps the OS default
+        # (level, option, value) for setsockopt(), eg TCP_NODELAY
+        self.socketOptions = socketOptions
+        # sendMsg() queues the msgs for a writer.ConnWriter thread
+        self.writerThread = writerThread
+        self.writer = None
+        self.nSendCalls = 0
+        self.nSentBytes = 0
+        self.recvSize = Connection.MIN_RECV_SIZE
+        self.avgBurstSize = 0.
+        self.nRecvCalls = 0
+        self.nRecvBytes = 0
+        self.nRecvBursts = 0
+        self.maxRecvBytes = 0
+        # recvTime is the perf_counter_ns of the last burst, latency tracing
+        self.traceRecv = False
+        self.recvTime = 0
 
 
     def connect(self):
@@ -40,6 +65,12 @@ class Connection:
             if self.wrapper:
                 self.wrapper.error(NO_VALID_ID, FAIL_CREATE_SOCK.code(), FAIL_CREATE_SOCK.msg())
 
+        if self.rcvBufSize:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                                   self.rcvBufSize)
+        for (level, option, value) in self.socketOptions:
+            self.socket.setsockopt(level, option, value)
+
         try:
             self.socket.connect((self.host, self.port))
         except socket.error:
@@ -48,8 +79,15 @@ class Connection:
 
         self.socket.settimeout(1)   #non-blocking
 
+        if self.writerThread:
+            self.writer = ConnWriter(self)
+            self.writer.start()
+
 
     def disconnect(self):
+        if self.writer is not None:
+            # what is queued goes out first
+            self.writer.stop()
         self.lock.acquire()
         try:
             if self.socket is not None:
@@ -69,24 +107,40 @@ class Connection:
 
     def sendMsg(self, msg):
 
-        logger.debug("acquiring lock")
+        if self.writer is not None:
+            if not self.isConnected():
+                logger.debug("sendMsg attempted while not connected")
+                return 0
+            return self.writer.sendMsg(msg)
+
+        verbose = log_mode.verbose
+        if verbose:
+            logger.debug("acquiring lock")
         self.lock.acquire()
-        logger.debug("acquired lock")
+        if verbose:
+            logger.debug("acquired lock")
         if not self.isConnected():
             logger.debug("sendMsg attempted while not connected, releasing lock")
             self.lock.release()
             return 0
         try:
-            nSent = self.socket.send(msg)
+            # sendall() as send() may write only part of the msg
+            self.socket.sendall(msg)
+            nSent = len(msg)
+            self.nSendCalls += 1
+            self.nSentBytes += nSent
         except socket.error:
             logger.debug("exception from sendMsg %s", sys.exc_info())
             raise
         finally:
-            logger.debug("releasing lock")
+            if verbose:
+                logger.debug("releasing lock")
             self.lock.release()
-            logger.debug("release lock")
+            if verbose:
+                logger.debug("release lock")
 
-        logger.debug("sendMsg: sent: %d", nSent)
+        if verbose:
+            logger.debug("sendMsg: sent: %d", nSent)
 
         return nSent
 
@@ -111,17 +165,102 @@ class Connection:
         return buf
 
 
-    def _recvAllMsg(self):
-        cont = True
-        allbuf = b""
+    def recvMsgInto(self, msgBuf):
+        """ same as recvMsg() but the data is received straight into the
+        given comm.MsgBuffer; returns the number of bytes received """
+        if not self.isConnected():
+            logger.debug("recvMsgInto attempted while not connected")
+            return 0
+        try:
+            nRecvd = self._recvAllInto(msgBuf)
+            # receiving 0 bytes outside a timeout means the connection is either
+            # closed or broken
+            if nRecvd == 0:
+                logger.debug("socket either closed or broken, disconnecting")
+                self.disconnect()
+        except socket.timeout:
+            logger.debug("socket timeout from recvMsgInto %s", sys.exc_info())
+            nRecvd = 0
 
-        while cont and self.socket is not None:
-            buf = self.socket.recv(4096)
-            allbuf += buf
-            logger.debug("len %d raw:%s|", len(buf), buf)
+        return nRecvd
 
-            if len(buf) < 4096:
-                cont = False
 
-        return allbuf
+    def recvStats(self):
+        """ counters of the receive path, to check how many syscalls are
+        needed for a given amount of data """
+        return {
+            "recvCalls": self.nRecvCalls,
+            "recvBytes": self.nRecvBytes,
+            "bursts": self.nRecvBursts,
+            "bytesPerRecv": self.nRecvBytes / self.nRecvCalls if self.nRecvCalls else 0.,
+            "maxRecvBytes": self.maxRecvBytes,
+            "avgBurstSize": self.avgBurstSize,
+            "recvSize": self.recvSize}
 
+
+    def sendStats(self):
+        """ counters of the send path, the ones of the writer thread with
+        the latency of its bursts when there is one """
+        if self.writer is not None:
+            return self.writer.stats()
+        return {
+            "msgs": self.nSendCalls,
+            "bytes": self.nSentBytes,
+            "sendCalls": self.nSendCalls}
+
+
+    def _recvAllMsg(self):
+        msgBuf = comm.MsgBuffer(self.recvSize)
+        self._recvAllInto(msgBuf)
+        return bytes(msgBuf.buf[msgBuf.rpos:msgBuf.wpos])
+
+
+    def _recvAllInto(self, msgBuf):
+        nRecvd = 0
+
+        while self.socket is not None:
+            # the previous read filled the whole buffer: read again only if
+            # more is already there, not to wait the socket timeout for it
+            if nRecvd and not select.select([self.socket], [], [], 0)[0]:
+                break
+            size = self.recvSize
+            view = msgBuf.reserve(size)
+            try:
+                n = self.socket.recv_into(view, size)
+            except socket.timeout:
+                if nRecvd == 0:
+                    raise
+                break
+            finally:
+                view.release()
+            msgBuf.commit(n)
+            if self.traceRecv and nRecvd == 0:
+                self.recvTime = time.perf_counter_ns()
+            nRecvd += n
+            self.nRecvCalls += 1
+            self.maxRecvBytes = max(self.maxRecvBytes, n)
+            if log_mode.verbose:
+                logger.debug("recv_into len %d", n)
+
+            if n < size:
+                break
+
+            # the kernel had more than we asked for, read bigger chunks
+            if self.recvSize < Connection.MAX_RECV_SIZE:
+                self.recvSize *= 2
+
+        self.nRecvBytes += nRecvd
+        if nRecvd > 0:
+            self.nRecvBursts += 1
+            self._adaptRecvSize(nRecvd)
+
+        return nRecvd
+
+
+    def _adaptRecvSize(self, burstSize):
+        """ shrinks the read size back towards the typical burst size once the
+        large bursts are over """
+        self.avgBurstSize += (burstSize - self.avgBurstSize) / 8
+        while (self.recvSize > Connection.MIN_RECV_SIZE
+                and self.recvSize >= 4 * self.avgBurstSize):
+            self.recvSize //= 2
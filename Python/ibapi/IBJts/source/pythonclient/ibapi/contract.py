@@ -12,7 +12,7 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
 """
 
 
-from ibapi.object_implem import Object
+from ibapi.object_implem import Object, valueSlots
 
 
 (SAME_POS, OPEN_POS, CLOSE_POS, UNKNOWN_POS) = range(4)
@@ -57,6 +57,12 @@ class DeltaNeutralContract(Object):
 
 
 class Contract(Object):
+    __slots__ = valueSlots("conId", "symbol", "secType", "lastTradeDateOrContractMonth",
+                           "strike", "right", "multiplier", "exchange", "primaryExchange",
+                           "currency", "localSymbol", "tradingClass", "includeExpired",
+                           "secIdType", "secId", "comboLegsDescrip", "comboLegs",
+                           "deltaNeutralContract")
+
     def __init__(self):
         self.conId = 0
         self.symbol = ""
@@ -110,6 +116,18 @@ class Contract(Object):
 
 
 class ContractDetails(Object):
+    __slots__ = valueSlots("contract", "marketName", "minTick", "orderTypes",
+                           "validExchanges", "priceMagnifier", "underConId", "longName",
+                           "contractMonth", "industry", "category", "subcategory",
+                           "timeZoneId", "tradingHours", "liquidHours", "evRule",
+                           "evMultiplier", "mdSizeMultiplier", "aggGroup", "underSymbol",
+                           "underSecType", "marketRuleIds", "secIdList",
+                           "realExpirationDate", "lastTradeTime", "cusip", "ratings",
+                           "descAppend", "bondType", "couponType", "callable", "putable",
+                           "coupon", "convertible", "maturity", "issueDate",
+                           "nextOptionDate", "nextOptionType", "nextOptionPartial",
+                           "notes")
+
     def __init__(self):
         self.contract = Contract()
         self.marketName = ""
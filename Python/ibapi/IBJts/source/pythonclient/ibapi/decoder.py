@@ -40,23 +40,78 @@ class HandleInfo(Object):
         return s
 
 
+def decodeStr(field:bytes) -> str:
+    try:
+        return field.decode('UTF-8')
+    except UnicodeDecodeError:
+        return field.decode('latin-1')
+
+
+def compileSignatureDecoder(name, method, wrapperParams):
+    """ Generates the function decoding the fields of a msg mapped to the
+    given (bound) wrapper method, the same way as interpretWithSignature()
+    but w/o any introspection at run time: the field converters are chosen
+    once from the param annotations and the call is a single expression. """
+
+    converters = {}
+    args = []
+    fieldIdx = 2 #bypass msgId and versionId
+    for (pname, param) in wrapperParams.items():
+        if pname != "self":
+            if param.annotation is int:
+                conv = int
+            elif param.annotation is float:
+                conv = float
+            else:
+                conv = decodeStr
+            converters["conv%d" % fieldIdx] = conv
+            args.append("conv%d(fields[%d])" % (fieldIdx, fieldIdx))
+            fieldIdx += 1
+
+    src = ("def decode_%s(fields):\n"
+           "    if len(fields) != %d:\n"
+           "        badLength(fields)\n"
+           "        return\n"
+           "    method(%s)\n") % (name, fieldIdx, ", ".join(args))
+
+    def badLength(fields):
+        logger.error("diff len fields and params %d %d for fields: %s and method: %s",
+                     len(fields), fieldIdx - 1, fields, method)
+
+    namespace = dict(converters, method=method, badLength=badLength)
+    exec(src, namespace)
+    return namespace["decode_%s" % name]
+
+
 class Decoder(Object):
-    def __init__(self, wrapper, serverVersion):
+    def __init__(self, wrapper, serverVersion, columnarHistData=False,
+                 columnarHistTicks=False):
         self.wrapper = wrapper
         self.serverVersion = serverVersion
+        # historicalDataColumns() once per msg instead of historicalData()
+        # per bar, and historicalTicksArray() with a structured array instead
+        # of historicalTicks*() with a list of objects; both need numpy
+        self.columnarHistData = columnarHistData
+        self.columnarHistTicks = columnarHistTicks
+        if columnarHistData or columnarHistTicks:
+            from ibapi import columnar
+            self.columnar = columnar
         self.discoverParams()
         #self.printParams()
+        self.compileDecoders()
+        self.orderDecoder = OrderDecoder(None, None, None, None, serverVersion)
+        self.tracer = None
 
 
     def processTickPriceMsg(self, fields):
-        next(fields)
-        decode(int, fields)
+        fields.skip()
+        fields.int()
 
-        reqId = decode(int, fields)
-        tickType = decode(int, fields)
-        price = decode(float, fields)
-        size = decode(int, fields) # ver 2 field
-        attrMask = decode(int, fields) # ver 3 field
+        reqId = fields.int()
+        tickType = fields.int()
+        price = fields.float()
+        size = fields.int() # ver 2 field
+        attrMask = fields.int() # ver 3 field
 
         attrib = TickAttrib()
 
@@ -91,32 +146,32 @@ class Decoder(Object):
 
     def processOrderStatusMsg(self, fields):
 
-        next(fields)
+        fields.skip()
         if self.serverVersion < MIN_SERVER_VER_MARKET_CAP_PRICE:
-            decode(int, fields)
-        orderId = decode(int, fields)
-        status = decode(str, fields)
+            fields.int()
+        orderId = fields.int()
+        status = fields.str()
 
         if self.serverVersion >= MIN_SERVER_VER_FRACTIONAL_POSITIONS:
-            filled = decode(float, fields)
+            filled = fields.float()
         else:
-            filled = decode(int, fields)
+            filled = fields.int()
 
         if self.serverVersion >= MIN_SERVER_VER_FRACTIONAL_POSITIONS:
-            remaining = decode(float, fields)
+            remaining = fields.float()
         else:
-            remaining = decode(int, fields)
+            remaining = fields.int()
 
-        avgFillPrice = decode(float, fields)
+        avgFillPrice = fields.float()
 
-        permId = decode(int, fields) # ver 2 field
-        parentId = decode(int, fields) # ver 3 field
-        lastFillPrice = decode(float, fields) # ver 4 field
-        clientId = decode(int, fields) # ver 5 field
-        whyHeld = decode(str, fields) # ver 6 field
+        permId = fields.int() # ver 2 field
+        parentId = fields.int() # ver 3 field
+        lastFillPrice = fields.float() # ver 4 field
+        clientId = fields.int() # ver 5 field
+        whyHeld = fields.str() # ver 6 field
 
         if self.serverVersion >= MIN_SERVER_VER_MARKET_CAP_PRICE:
-            mktCapPrice = decode(float, fields)
+            mktCapPrice = fields.float()
         else:
             mktCapPrice = None
 
@@ -126,132 +181,62 @@ class Decoder(Object):
 
     def processOpenOrder(self, fields):
 
-        next(fields)
-        
-        order = Order()
-        contract = Contract()
-        orderState = OrderState()
+        fields.skip()
+
+        od = self.orderDecoder
+        od.contract = Contract()
+        od.order = Order()
+        od.orderState = OrderState()
+        od.serverVersion = self.serverVersion
 
         if self.serverVersion < MIN_SERVER_VER_ORDER_CONTAINER:
-            version = decode(int, fields)
+            od.version = fields.int()
         else:
-            version = self.serverVersion
+            od.version = self.serverVersion
 
-        
-        OrderDecoder.__init__(self, contract, order, orderState, version, self.serverVersion)
+        od.decodeOpenOrder(fields)
 
-        # read orderId
-        OrderDecoder.decodeOrderId(self, fields)
-
-        # read contract fields
-        OrderDecoder.decodeContractFields(self, fields)
-
-        # read order fields
-        OrderDecoder.decodeAction(self, fields)
-        OrderDecoder.decodeTotalQuantity(self, fields)
-        OrderDecoder.decodeOrderType(self, fields)
-        OrderDecoder.decodeLmtPrice(self, fields)
-        OrderDecoder.decodeAuxPrice(self, fields)
-        OrderDecoder.decodeTIF(self, fields)
-        OrderDecoder.decodeOcaGroup(self, fields)
-        OrderDecoder.decodeAccount(self, fields)
-        OrderDecoder.decodeOpenClose(self, fields)
-        OrderDecoder.decodeOrigin(self, fields)
-        OrderDecoder.decodeOrderRef(self, fields)
-        OrderDecoder.decodeClientId(self, fields)
-        OrderDecoder.decodePermId(self, fields)
-        OrderDecoder.decodeOutsideRth(self, fields)
-        OrderDecoder.decodeHidden(self, fields)
-        OrderDecoder.decodeDiscretionaryAmt(self, fields)
-        OrderDecoder.decodeGoodAfterTime(self, fields)
-        OrderDecoder.skipSharesAllocation(self, fields)
-        OrderDecoder.decodeFAParams(self, fields)
-        OrderDecoder.decodeModelCode(self, fields)
-        OrderDecoder.decodeGoodTillDate(self, fields)
-        OrderDecoder.decodeRule80A(self, fields)
-        OrderDecoder.decodePercentOffset(self, fields)
-        OrderDecoder.decodeSettlingFirm(self, fields)
-        OrderDecoder.decodeShortSaleParams(self, fields)
-        OrderDecoder.decodeAuctionStrategy(self, fields)
-        OrderDecoder.decodeBoxOrderParams(self, fields)
-        OrderDecoder.decodePegToStkOrVolOrderParams(self, fields)
-        OrderDecoder.decodeDisplaySize(self, fields)
-        OrderDecoder.decodeBlockOrder(self, fields)
-        OrderDecoder.decodeSweepToFill(self, fields)
-        OrderDecoder.decodeAllOrNone(self, fields)
-        OrderDecoder.decodeMinQty(self, fields)
-        OrderDecoder.decodeOcaType(self, fields)
-        OrderDecoder.decodeETradeOnly(self, fields)
-        OrderDecoder.decodeFirmQuoteOnly(self, fields)
-        OrderDecoder.decodeNbboPriceCap(self, fields)
-        OrderDecoder.decodeParentId(self, fields)
-        OrderDecoder.decodeTriggerMethod(self, fields)
-        OrderDecoder.decodeVolOrderParams(self, fields, True)
-        OrderDecoder.decodeTrailParams(self, fields)
-        OrderDecoder.decodeBasisPoints(self, fields)
-        OrderDecoder.decodeComboLegs(self, fields)
-        OrderDecoder.decodeSmartComboRoutingParams(self, fields)
-        OrderDecoder.decodeScaleOrderParams(self, fields)
-        OrderDecoder.decodeHedgeParams(self, fields)
-        OrderDecoder.decodeOptOutSmartRouting(self, fields)
-        OrderDecoder.decodeClearingParams(self, fields)
-        OrderDecoder.decodeNotHeld(self, fields)
-        OrderDecoder.decodeDeltaNeutral(self, fields)
-        OrderDecoder.decodeAlgoParams(self, fields)
-        OrderDecoder.decodeSolicited(self, fields)
-        OrderDecoder.decodeWhatIfInfoAndCommission(self, fields)
-        OrderDecoder.decodeVolRandomizeFlags(self, fields)
-        OrderDecoder.decodePegToBenchParams(self, fields)
-        OrderDecoder.decodeConditions(self, fields)
-        OrderDecoder.decodeAdjustedOrderParams(self, fields)
-        OrderDecoder.decodeSoftDollarTier(self, fields)
-        OrderDecoder.decodeCashQty(self, fields)
-        OrderDecoder.decodeDontUseAutoPriceForHedge(self, fields)
-        OrderDecoder.decodeIsOmsContainers(self, fields)
-        OrderDecoder.decodeDiscretionaryUpToLimitPrice(self, fields)
-        OrderDecoder.decodeUsePriceMgmtAlgo(self, fields)
-
-        self.wrapper.openOrder(order.orderId, contract, order, orderState)
+        self.wrapper.openOrder(od.order.orderId, od.contract, od.order, od.orderState)
 
 
     def processPortfolioValueMsg(self, fields):
 
-        next(fields)
-        version = decode(int, fields)
+        fields.skip()
+        version = fields.int()
 
         # read contract fields
         contract = Contract()
-        contract.conId = decode(int, fields) # ver 6 field
-        contract.symbol = decode(str, fields)
-        contract.secType = decode(str, fields)
-        contract.lastTradeDateOrContractMonth = decode(str, fields)
-        contract.strike = decode(float, fields)
-        contract.right = decode(str, fields)
+        contract.conId = fields.int() # ver 6 field
+        contract.symbol = fields.str()
+        contract.secType = fields.str()
+        contract.lastTradeDateOrContractMonth = fields.str()
+        contract.strike = fields.float()
+        contract.right = fields.str()
 
         if version >= 7:
-            contract.multiplier = decode(str, fields)
-            contract.primaryExchange = decode(str, fields)
+            contract.multiplier = fields.str()
+            contract.primaryExchange = fields.str()
 
-        contract.currency = decode(str, fields)
-        contract.localSymbol = decode(str, fields) # ver 2 field
+        contract.currency = fields.str()
+        contract.localSymbol = fields.str() # ver 2 field
         if version >= 8:
-            contract.tradingClass = decode(str, fields)
+            contract.tradingClass = fields.str()
 
         if self.serverVersion >= MIN_SERVER_VER_FRACTIONAL_POSITIONS:
-            position = decode(float, fields)
+            position = fields.float()
         else:
-            position = decode(int, fields)
+            position = fields.int()
 
-        marketPrice = decode(float, fields)
-        marketValue = decode(float, fields)
-        averageCost = decode(float, fields) # ver 3 field
-        unrealizedPNL = decode(float, fields) # ver 3 field
-        realizedPNL = decode(float, fields) # ver 3 field
+        marketPrice = fields.float()
+        marketValue = fields.float()
+        averageCost = fields.float() # ver 3 field
+        unrealizedPNL = fields.float() # ver 3 field
+        realizedPNL = fields.float() # ver 3 field
 
-        accountName = decode(str, fields) # ver 4 field
+        accountName = fields.str() # ver 4 field
 
         if version == 6 and self.serverVersion == 39:
-            contract.primaryExchange = decode(str, fields)
+            contract.primaryExchange = fields.str()
 
         self.wrapper.updatePortfolio( contract,
             position, marketPrice, marketValue, averageCost,
@@ -260,161 +245,161 @@ class Decoder(Object):
 
     def processContractDataMsg(self, fields):
 
-        next(fields)
-        version = decode(int, fields)
+        fields.skip()
+        version = fields.int()
 
         reqId = -1
         if version >= 3:
-            reqId = decode(int, fields)
+            reqId = fields.int()
 
         contract = ContractDetails()
-        contract.contract.symbol = decode(str, fields)
-        contract.contract.secType = decode(str, fields)
+        contract.contract.symbol = fields.str()
+        contract.contract.secType = fields.str()
         self.readLastTradeDate(fields, contract, False)
-        contract.contract.strike = decode(float, fields)
-        contract.contract.right = decode(str, fields)
-        contract.contract.exchange = decode(str, fields)
-        contract.contract.currency = decode(str, fields)
-        contract.contract.localSymbol = decode(str, fields)
-        contract.marketName = decode(str, fields)
-        contract.contract.tradingClass = decode(str, fields)
-        contract.contract.conId = decode(int, fields)
-        contract.minTick = decode(float, fields)
+        contract.contract.strike = fields.float()
+        contract.contract.right = fields.str()
+        contract.contract.exchange = fields.str()
+        contract.contract.currency = fields.str()
+        contract.contract.localSymbol = fields.str()
+        contract.marketName = fields.str()
+        contract.contract.tradingClass = fields.str()
+        contract.contract.conId = fields.int()
+        contract.minTick = fields.float()
         if self.serverVersion >= MIN_SERVER_VER_MD_SIZE_MULTIPLIER:
-            contract.mdSizeMultiplier = decode(int, fields)
-        contract.contract.multiplier = decode(str, fields)
-        contract.orderTypes = decode(str, fields)
-        contract.validExchanges = decode(str, fields)
-        contract.priceMagnifier = decode(int, fields) # ver 2 field
+            contract.mdSizeMultiplier = fields.int()
+        contract.contract.multiplier = fields.str()
+        contract.orderTypes = fields.str()
+        contract.validExchanges = fields.str()
+        contract.priceMagnifier = fields.int() # ver 2 field
         if version >= 4:
-            contract.underConId = decode(int, fields)
+            contract.underConId = fields.int()
         if version >= 5:
-            contract.longName = decode(str, fields)
-            contract.contract.primaryExchange = decode(str, fields)
+            contract.longName = fields.str()
+            contract.contract.primaryExchange = fields.str()
         if version >= 6:
-            contract.contractMonth = decode(str, fields)
-            contract.industry = decode(str, fields)
-            contract.category = decode(str, fields)
-            contract.subcategory = decode(str, fields)
-            contract.timeZoneId = decode(str, fields)
-            contract.tradingHours = decode(str, fields)
-            contract.liquidHours = decode(str, fields)
+            contract.contractMonth = fields.str()
+            contract.industry = fields.str()
+            contract.category = fields.str()
+            contract.subcategory = fields.str()
+            contract.timeZoneId = fields.str()
+            contract.tradingHours = fields.str()
+            contract.liquidHours = fields.str()
         if version >= 8:
-            contract.evRule = decode(str, fields)
-            contract.evMultiplier = decode(int, fields)
+            contract.evRule = fields.str()
+            contract.evMultiplier = fields.int()
         if version >= 7:
-            secIdListCount = decode(int, fields)
+            secIdListCount = fields.int()
             if secIdListCount > 0:
                 contract.secIdList = []
                 for _ in range(secIdListCount):
                     tagValue = TagValue()
-                    tagValue.tag = decode(str, fields)
-                    tagValue.value = decode(str, fields)
+                    tagValue.tag = fields.str()
+                    tagValue.value = fields.str()
                     contract.secIdList.append(tagValue)
 
         if self.serverVersion >= MIN_SERVER_VER_AGG_GROUP:
-            contract.aggGroup = decode(int, fields)
+            contract.aggGroup = fields.int()
 
         if self.serverVersion >= MIN_SERVER_VER_UNDERLYING_INFO:
-            contract.underSymbol = decode(str, fields)
-            contract.underSecType = decode(str, fields)
+            contract.underSymbol = fields.str()
+            contract.underSecType = fields.str()
 
         if self.serverVersion >= MIN_SERVER_VER_MARKET_RULES:
-            contract.marketRuleIds = decode(str, fields)
+            contract.marketRuleIds = fields.str()
 
         if self.serverVersion >= MIN_SERVER_VER_REAL_EXPIRATION_DATE:
-            contract.realExpirationDate = decode(str, fields)
+            contract.realExpirationDate = fields.str()
 
         self.wrapper.contractDetails(reqId, contract)
 
 
     def processBondContractDataMsg(self, fields):
 
-        next(fields)
-        version = decode(int, fields)
+        fields.skip()
+        version = fields.int()
 
         reqId = -1
         if version >= 3:
-            reqId = decode(int, fields)
+            reqId = fields.int()
 
         contract = ContractDetails()
-        contract.contract.symbol = decode(str, fields)
-        contract.contract.secType = decode(str, fields)
-        contract.cusip = decode(str, fields)
-        contract.coupon = decode(int, fields)
+        contract.contract.symbol = fields.str()
+        contract.contract.secType = fields.str()
+        contract.cusip = fields.str()
+        contract.coupon = fields.int()
         self.readLastTradeDate(fields, contract, True)
-        contract.issueDate = decode(str, fields)
-        contract.ratings = decode(str, fields)
-        contract.bondType = decode(str, fields)
-        contract.couponType = decode(str, fields)
-        contract.convertible = decode(bool, fields)
-        contract.callable = decode(bool, fields)
-        contract.putable = decode(bool, fields)
-        contract.descAppend = decode(str, fields)
-        contract.contract.exchange = decode(str, fields)
-        contract.contract.currency = decode(str, fields)
-        contract.marketName = decode(str, fields)
-        contract.contract.tradingClass = decode(str, fields)
-        contract.contract.conId = decode(int, fields)
-        contract.minTick = decode(float, fields)
+        contract.issueDate = fields.str()
+        contract.ratings = fields.str()
+        contract.bondType = fields.str()
+        contract.couponType = fields.str()
+        contract.convertible = fields.bool()
+        contract.callable = fields.bool()
+        contract.putable = fields.bool()
+        contract.descAppend = fields.str()
+        contract.contract.exchange = fields.str()
+        contract.contract.currency = fields.str()
+        contract.marketName = fields.str()
+        contract.contract.tradingClass = fields.str()
+        contract.contract.conId = fields.int()
+        contract.minTick = fields.float()
         if self.serverVersion >= MIN_SERVER_VER_MD_SIZE_MULTIPLIER:
-            contract.mdSizeMultiplier = decode(int, fields)
-        contract.orderTypes = decode(str, fields)
-        contract.validExchanges = decode(str, fields)
-        contract.nextOptionDate = decode(str, fields) # ver 2 field
-        contract.nextOptionType = decode(str, fields) # ver 2 field
-        contract.nextOptionPartial = decode(bool, fields) # ver 2 field
-        contract.notes = decode(str, fields) # ver 2 field
+            contract.mdSizeMultiplier = fields.int()
+        contract.orderTypes = fields.str()
+        contract.validExchanges = fields.str()
+        contract.nextOptionDate = fields.str() # ver 2 field
+        contract.nextOptionType = fields.str() # ver 2 field
+        contract.nextOptionPartial = fields.bool() # ver 2 field
+        contract.notes = fields.str() # ver 2 field
         if version >= 4:
-            contract.longName = decode(str, fields)
+            contract.longName = fields.str()
         if version >= 6:
-            contract.evRule = decode(str, fields)
-            contract.evMultiplier = decode(int, fields)
+            contract.evRule = fields.str()
+            contract.evMultiplier = fields.int()
         if version >= 5:
-            secIdListCount = decode(int, fields)
+            secIdListCount = fields.int()
             if secIdListCount > 0:
                 contract.secIdList = []
                 for _ in range(secIdListCount):
                     tagValue = TagValue()
-                    tagValue.tag = decode(str, fields)
-                    tagValue.value = decode(str, fields)
+                    tagValue.tag = fields.str()
+                    tagValue.value = fields.str()
                     contract.secIdList.append(tagValue)
 
         if self.serverVersion >= MIN_SERVER_VER_AGG_GROUP:
-            contract.aggGroup = decode(int, fields)
+            contract.aggGroup = fields.int()
 
         if self.serverVersion >= MIN_SERVER_VER_MARKET_RULES:
-            contract.marketRuleIds = decode(str, fields)
+            contract.marketRuleIds = fields.str()
 
         self.wrapper.bondContractDetails(reqId, contract)
 
     def processScannerDataMsg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(int, fields)
+        fields.skip()
+        fields.int()
+        reqId = fields.int()
 
-        numberOfElements = decode(int, fields)
+        numberOfElements = fields.int()
 
         for _ in range(numberOfElements):
             data = ScanData()
             data.contract = ContractDetails()
 
-            data.rank = decode(int, fields)
-            data.contract.contract.conId = decode(int, fields) # ver 3 field
-            data.contract.contract.symbol = decode(str, fields)
-            data.contract.contract.secType = decode(str, fields)
-            data.contract.contract.lastTradeDateOrContractMonth = decode(str, fields)
-            data.contract.contract.strike = decode(float, fields)
-            data.contract.contract.right = decode(str, fields)
-            data.contract.contract.exchange = decode(str, fields)
-            data.contract.contract.currency = decode(str, fields)
-            data.contract.contract.localSymbol = decode(str, fields)
-            data.contract.marketName = decode(str, fields)
-            data.contract.contract.tradingClass = decode(str, fields)
-            data.distance = decode(str, fields)
-            data.benchmark = decode(str, fields)
-            data.projection = decode(str, fields)
-            data.legsStr = decode(str, fields)
+            data.rank = fields.int()
+            data.contract.contract.conId = fields.int() # ver 3 field
+            data.contract.contract.symbol = fields.str()
+            data.contract.contract.secType = fields.str()
+            data.contract.contract.lastTradeDateOrContractMonth = fields.str()
+            data.contract.contract.strike = fields.float()
+            data.contract.contract.right = fields.str()
+            data.contract.contract.exchange = fields.str()
+            data.contract.contract.currency = fields.str()
+            data.contract.contract.localSymbol = fields.str()
+            data.contract.marketName = fields.str()
+            data.contract.contract.tradingClass = fields.str()
+            data.distance = fields.str()
+            data.benchmark = fields.str()
+            data.projection = fields.str()
+            data.legsStr = fields.str()
             self.wrapper.scannerData(reqId, data.rank, data.contract,
                 data.distance, data.benchmark, data.projection, data.legsStr)
 
@@ -422,97 +407,104 @@ class Decoder(Object):
 
 
     def processExecutionDataMsg(self, fields):
-        next(fields)
+        fields.skip()
         version = self.serverVersion
 
         if(self.serverVersion < MIN_SERVER_VER_LAST_LIQUIDITY):
-            version = decode(int, fields)
+            version = fields.int()
 
         reqId = -1
         if version >= 7:
-            reqId = decode(int, fields)
+            reqId = fields.int()
 
-        orderId = decode(int, fields)
+        orderId = fields.int()
 
         # decode contract fields
         contract = Contract()
-        contract.conId = decode(int, fields) # ver 5 field
-        contract.symbol = decode(str, fields)
-        contract.secType = decode(str, fields)
-        contract.lastTradeDateOrContractMonth = decode(str, fields)
-        contract.strike = decode(float, fields)
-        contract.right = decode(str, fields)
+        contract.conId = fields.int() # ver 5 field
+        contract.symbol = fields.str()
+        contract.secType = fields.str()
+        contract.lastTradeDateOrContractMonth = fields.str()
+        contract.strike = fields.float()
+        contract.right = fields.str()
         if version >= 9:
-            contract.multiplier = decode(str, fields)
-        contract.exchange = decode(str, fields)
-        contract.currency = decode(str, fields)
-        contract.localSymbol = decode(str, fields)
+            contract.multiplier = fields.str()
+        contract.exchange = fields.str()
+        contract.currency = fields.str()
+        contract.localSymbol = fields.str()
         if version >= 10:
-            contract.tradingClass = decode(str, fields)
+            contract.tradingClass = fields.str()
 
         # decode execution fields
         execution = Execution()
         execution.orderId = orderId
-        execution.execId = decode(str, fields)
-        execution.time = decode(str, fields)
-        execution.acctNumber = decode(str, fields)
-        execution.exchange = decode(str, fields)
-        execution.side = decode(str, fields)
+        execution.execId = fields.str()
+        execution.time = fields.str()
+        execution.acctNumber = fields.str()
+        execution.exchange = fields.str()
+        execution.side = fields.str()
 
         if self.serverVersion >= MIN_SERVER_VER_FRACTIONAL_POSITIONS:
-                execution.shares = decode(float, fields)
+                execution.shares = fields.float()
         else:
-                execution.shares = decode(int, fields)
+                execution.shares = fields.int()
 
-        execution.price = decode(float, fields)
-        execution.permId = decode(int, fields) # ver 2 field
-        execution.clientId = decode(int, fields)  # ver 3 field
-        execution.liquidation = decode(int, fields) # ver 4 field
+        execution.price = fields.float()
+        execution.permId = fields.int() # ver 2 field
+        execution.clientId = fields.int()  # ver 3 field
+        execution.liquidation = fields.int() # ver 4 field
 
         if version >= 6:
-            execution.cumQty = decode(float, fields)
-            execution.avgPrice = decode(float, fields)
+            execution.cumQty = fields.float()
+            execution.avgPrice = fields.float()
 
         if version >= 8:
-            execution.orderRef = decode(str, fields)
+            execution.orderRef = fields.str()
 
         if version >= 9:
-            execution.evRule = decode(str, fields)
-            execution.evMultiplier = decode(float, fields)
+            execution.evRule = fields.str()
+            execution.evMultiplier = fields.float()
         if self.serverVersion >= MIN_SERVER_VER_MODELS_SUPPORT:
-            execution.modelCode = decode(str, fields)
+            execution.modelCode = fields.str()
         if self.serverVersion >= MIN_SERVER_VER_LAST_LIQUIDITY:
-            execution.lastLiquidity = decode(int, fields)
+            execution.lastLiquidity = fields.int()
 
         self.wrapper.execDetails(reqId, contract, execution)
 
 
     def processHistoricalDataMsg(self, fields):
-        next(fields)
+        fields.skip()
 
         if self.serverVersion < MIN_SERVER_VER_SYNT_REALTIME_BARS:
-            decode(int, fields)
+            fields.int()
 
-        reqId = decode(int, fields)
-        startDateStr = decode(str, fields) # ver 2 field
-        endDateStr = decode(str, fields) # ver 2 field
+        reqId = fields.int()
+        startDateStr = fields.str() # ver 2 field
+        endDateStr = fields.str() # ver 2 field
 
-        itemCount = decode(int, fields)
+        itemCount = fields.int()
+
+        if self.columnarHistData:
+            stride = 8 if self.serverVersion >= MIN_SERVER_VER_SYNT_REALTIME_BARS else 9
+            self.wrapper.historicalDataColumns(reqId,
+                *self.columnar.bar_columns(fields.take(itemCount * stride), stride))
+            self.wrapper.historicalDataEnd(reqId, startDateStr, endDateStr)
+            return
 
         for _ in range(itemCount):
             bar = BarData()
-            bar.date = decode(str, fields)
-            bar.open = decode(float, fields)
-            bar.high = decode(float, fields)
-            bar.low = decode(float, fields)
-            bar.close = decode(float, fields)
-            bar.volume = decode(int, fields)
-            bar.average = decode(float, fields)
+            bar.date = fields.str()
+            bar.open = fields.float()
+            bar.high = fields.float()
+            bar.low = fields.float()
+            bar.close = fields.float()
+            bar.volume = fields.int()
+            bar.average = fields.float()
 
             if self.serverVersion < MIN_SERVER_VER_SYNT_REALTIME_BARS:
-                decode(str, fields)
+                fields.str()
 
-            bar.barCount = decode(int, fields) # ver 3 field
+            bar.barCount = fields.int() # ver 3 field
 
             self.wrapper.historicalData(reqId, bar)
 
@@ -520,35 +512,35 @@ class Decoder(Object):
         self.wrapper.historicalDataEnd(reqId, startDateStr, endDateStr)
 
     def processHistoricalDataUpdateMsg(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
+        fields.skip()
+        reqId = fields.int()
         bar = BarData()
-        bar.barCount = decode(int, fields)
-        bar.date = decode(str, fields)
-        bar.open = decode(float, fields)
-        bar.close = decode(float, fields)
-        bar.high = decode(float, fields)
-        bar.low = decode(float, fields)
-        bar.average = decode(float, fields)
-        bar.volume = decode(int, fields)
+        bar.barCount = fields.int()
+        bar.date = fields.str()
+        bar.open = fields.float()
+        bar.close = fields.float()
+        bar.high = fields.float()
+        bar.low = fields.float()
+        bar.average = fields.float()
+        bar.volume = fields.int()
         self.wrapper.historicalDataUpdate(reqId, bar)
 
     def processRealTimeBarMsg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(int, fields)
+        fields.skip()
+        fields.int()
+        reqId = fields.int()
 
         bar = RealTimeBar()
-        bar.time = decode(int, fields)
-        bar.open = decode(float, fields)
-        bar.high = decode(float, fields)
-        bar.low = decode(float, fields)
-        bar.close = decode(float, fields)
-        bar.volume = decode(int, fields)
-        bar.wap = decode(float, fields)
-        bar.count = decode(int, fields)
+        bar.time = fields.int()
+        bar.open_ = fields.float()
+        bar.high = fields.float()
+        bar.low = fields.float()
+        bar.close = fields.float()
+        bar.volume = fields.int()
+        bar.wap = fields.float()
+        bar.count = fields.int()
 
-        self.wrapper.realtimeBar(reqId, bar.time, bar.open, bar.high, bar.low, bar.close, bar.volume, bar.wap, bar.count)
+        self.wrapper.realtimeBar(reqId, bar.time, bar.open_, bar.high, bar.low, bar.close, bar.volume, bar.wap, bar.count)
 
     def processTickOptionComputationMsg(self, fields):
         optPrice = None
@@ -558,13 +550,13 @@ class Decoder(Object):
         theta = None
         undPrice = None
 
-        next(fields)
-        version = decode(int, fields)
-        reqId = decode(int, fields)
-        tickTypeInt = decode(int, fields)
+        fields.skip()
+        version = fields.int()
+        reqId = fields.int()
+        tickTypeInt = fields.int()
 
-        impliedVol = decode(float, fields)
-        delta = decode(float, fields)
+        impliedVol = fields.float()
+        delta = fields.float()
 
         if impliedVol < 0:    # -1 is the "not computed" indicator
             impliedVol = None
@@ -575,8 +567,8 @@ class Decoder(Object):
             tickTypeInt == TickTypeEnum.MODEL_OPTION or \
                         tickTypeInt == TickTypeEnum.DELAYED_MODEL_OPTION:
 
-            optPrice = decode(float, fields)
-            pvDividend = decode(float, fields)
+            optPrice = fields.float()
+            pvDividend = fields.float()
 
             if optPrice == -1:    # -1 is the "not computed" indicator
                 optPrice = None
@@ -584,10 +576,10 @@ class Decoder(Object):
                 pvDividend = None
 
         if version >= 6:
-            gamma = decode(float, fields)
-            vega = decode(float, fields)
-            theta = decode(float, fields)
-            undPrice = decode(float, fields)
+            gamma = fields.float()
+            vega = fields.float()
+            theta = fields.float()
+            undPrice = fields.float()
 
             if gamma == -2:  # -2 is the "not yet computed" indicator
                 gamma = None
@@ -604,120 +596,120 @@ class Decoder(Object):
 
 
     def processDeltaNeutralValidationMsg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(int, fields)
+        fields.skip()
+        fields.int()
+        reqId = fields.int()
 
         deltaNeutralContract = DeltaNeutralContract()
 
-        deltaNeutralContract.conId = decode(int, fields)
-        deltaNeutralContract.delta = decode(float, fields)
-        deltaNeutralContract.price = decode(float, fields)
+        deltaNeutralContract.conId = fields.int()
+        deltaNeutralContract.delta = fields.float()
+        deltaNeutralContract.price = fields.float()
 
         self.wrapper.deltaNeutralValidation(reqId, deltaNeutralContract)
 
 
     def processMarketDataTypeMsg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(int, fields)
-        marketDataType = decode(int, fields)
+        fields.skip()
+        fields.int()
+        reqId = fields.int()
+        marketDataType = fields.int()
 
         self.wrapper.marketDataType(reqId, marketDataType)
 
     def processCommissionReportMsg(self, fields):
-        next(fields)
-        decode(int, fields)
+        fields.skip()
+        fields.int()
 
         commissionReport = CommissionReport()
-        commissionReport.execId = decode(str, fields)
-        commissionReport.commission = decode(float, fields)
-        commissionReport.currency = decode(str, fields)
-        commissionReport.realizedPNL = decode(float, fields)
-        commissionReport.yield_ = decode(float, fields)
-        commissionReport.yieldRedemptionDate = decode(int, fields)
+        commissionReport.execId = fields.str()
+        commissionReport.commission = fields.float()
+        commissionReport.currency = fields.str()
+        commissionReport.realizedPNL = fields.float()
+        commissionReport.yield_ = fields.float()
+        commissionReport.yieldRedemptionDate = fields.int()
 
         self.wrapper.commissionReport(commissionReport)
 
 
     def processPositionDataMsg(self, fields):
-        next(fields)
-        version = decode(int, fields)
+        fields.skip()
+        version = fields.int()
 
-        account = decode(str, fields)
+        account = fields.str()
 
         # decode contract fields
         contract = Contract()
-        contract.conId = decode(int, fields)
-        contract.symbol = decode(str, fields)
-        contract.secType = decode(str, fields)
-        contract.lastTradeDateOrContractMonth = decode(str, fields)
-        contract.strike = decode(float, fields)
-        contract.right = decode(str, fields)
-        contract.multiplier = decode(str, fields)
-        contract.exchange = decode(str, fields)
-        contract.currency = decode(str, fields)
-        contract.localSymbol = decode(str, fields)
+        contract.conId = fields.int()
+        contract.symbol = fields.str()
+        contract.secType = fields.str()
+        contract.lastTradeDateOrContractMonth = fields.str()
+        contract.strike = fields.float()
+        contract.right = fields.str()
+        contract.multiplier = fields.str()
+        contract.exchange = fields.str()
+        contract.currency = fields.str()
+        contract.localSymbol = fields.str()
         if version >= 2:
-            contract.tradingClass = decode(str, fields)
+            contract.tradingClass = fields.str()
 
         if self.serverVersion >= MIN_SERVER_VER_FRACTIONAL_POSITIONS:
-            position = decode(float, fields)
+            position = fields.float()
         else:
-            position = decode(int, fields)
+            position = fields.int()
 
         avgCost = 0.
         if version >= 3:
-            avgCost = decode(float, fields)
+            avgCost = fields.float()
 
         self.wrapper.position(account, contract, position, avgCost)
 
 
     def processPositionMultiMsg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(int, fields)
-        account = decode(str, fields)
+        fields.skip()
+        fields.int()
+        reqId = fields.int()
+        account = fields.str()
 
         # decode contract fields
         contract = Contract()
-        contract.conId = decode(int, fields)
-        contract.symbol = decode(str, fields)
-        contract.secType = decode(str, fields)
-        contract.lastTradeDateOrContractMonth = decode(str, fields)
-        contract.strike = decode(float, fields)
-        contract.right = decode(str, fields)
-        contract.multiplier = decode(str, fields)
-        contract.exchange = decode(str, fields)
-        contract.currency = decode(str, fields)
-        contract.localSymbol = decode(str, fields)
-        contract.tradingClass = decode(str, fields)
-        position = decode(float, fields)
-        avgCost = decode(float, fields)
-        modelCode = decode(str, fields)
+        contract.conId = fields.int()
+        contract.symbol = fields.str()
+        contract.secType = fields.str()
+        contract.lastTradeDateOrContractMonth = fields.str()
+        contract.strike = fields.float()
+        contract.right = fields.str()
+        contract.multiplier = fields.str()
+        contract.exchange = fields.str()
+        contract.currency = fields.str()
+        contract.localSymbol = fields.str()
+        contract.tradingClass = fields.str()
+        position = fields.float()
+        avgCost = fields.float()
+        modelCode = fields.str()
 
         self.wrapper.positionMulti(reqId, account, modelCode, contract, position, avgCost)
 
 
     def processSecurityDefinitionOptionParameterMsg(self, fields):
-        next(fields)
+        fields.skip()
 
-        reqId = decode(int, fields)
-        exchange = decode(str, fields)
-        underlyingConId = decode(int, fields)
-        tradingClass = decode(str, fields)
-        multiplier = decode(str, fields)
+        reqId = fields.int()
+        exchange = fields.str()
+        underlyingConId = fields.int()
+        tradingClass = fields.str()
+        multiplier = fields.str()
 
-        expCount = decode(int, fields)
+        expCount = fields.int()
         expirations = set()
         for _ in range(expCount):
-            expiration = decode(str, fields)
+            expiration = fields.str()
             expirations.add(expiration)
 
-        strikeCount = decode(int, fields)
+        strikeCount = fields.int()
         strikes = set()
         for _ in range(strikeCount):
-            strike = decode(float, fields)
+            strike = fields.float()
             strikes.add(strike)
 
         self.wrapper.securityDefinitionOptionParameter(reqId, exchange,
@@ -725,338 +717,353 @@ class Decoder(Object):
 
 
     def processSecurityDefinitionOptionParameterEndMsg(self, fields):
-        next(fields)
+        fields.skip()
 
-        reqId = decode(int, fields)
+        reqId = fields.int()
         self.wrapper.securityDefinitionOptionParameterEnd(reqId)
 
 
     def processSoftDollarTiersMsg(self, fields):
-        next(fields)
+        fields.skip()
 
-        reqId = decode(int, fields)
-        nTiers = decode(int, fields)
+        reqId = fields.int()
+        nTiers = fields.int()
 
         tiers = []
         for _ in range(nTiers):
                 tier = SoftDollarTier()
-                tier.name = decode(str, fields)
-                tier.val = decode(str, fields)
-                tier.displayName = decode(str, fields)
+                tier.name = fields.str()
+                tier.val = fields.str()
+                tier.displayName = fields.str()
                 tiers.append(tier)
 
         self.wrapper.softDollarTiers(reqId, tiers)
 
 
     def processFamilyCodesMsg(self, fields):
-        next(fields)
+        fields.skip()
 
-        nFamilyCodes = decode(int, fields)
+        nFamilyCodes = fields.int()
         familyCodes = []
         for _ in range(nFamilyCodes):
             famCode = FamilyCode()
-            famCode.accountID = decode(str, fields)
-            famCode.familyCodeStr = decode(str, fields)
+            famCode.accountID = fields.str()
+            famCode.familyCodeStr = fields.str()
             familyCodes.append(famCode)
 
         self.wrapper.familyCodes(familyCodes)
 
 
     def processSymbolSamplesMsg(self, fields):
-        next(fields)
+        fields.skip()
 
-        reqId = decode(int, fields)
-        nContractDescriptions = decode(int, fields)
+        reqId = fields.int()
+        nContractDescriptions = fields.int()
         contractDescriptions = []
         for _ in range(nContractDescriptions):
             conDesc = ContractDescription()
-            conDesc.contract.conId = decode(int, fields)
-            conDesc.contract.symbol = decode(str, fields)
-            conDesc.contract.secType = decode(str, fields)
-            conDesc.contract.primaryExchange = decode(str, fields)
-            conDesc.contract.currency = decode(str, fields)
+            conDesc.contract.conId = fields.int()
+            conDesc.contract.symbol = fields.str()
+            conDesc.contract.secType = fields.str()
+            conDesc.contract.primaryExchange = fields.str()
+            conDesc.contract.currency = fields.str()
 
-            nDerivativeSecTypes = decode(int, fields)
+            nDerivativeSecTypes = fields.int()
             conDesc.derivativeSecTypes = []
             for _ in range(nDerivativeSecTypes):
-                derivSecType = decode(str, fields)
+                derivSecType = fields.str()
                 conDesc.derivativeSecTypes.append(derivSecType)
             contractDescriptions.append(conDesc)
 
         self.wrapper.symbolSamples(reqId, contractDescriptions)
 
     def processSmartComponents(self,fields):
-        next(fields)
-        reqId = decode(int, fields)
-        n = decode(int, fields)
+        fields.skip()
+        reqId = fields.int()
+        n = fields.int()
 
         smartComponentMap = []
         for _ in range(n):
             smartComponent = SmartComponent()
-            smartComponent.bitNumber = decode(int, fields)
-            smartComponent.exchange = decode(str, fields)
-            smartComponent.exchangeLetter = decode(str, fields)
+            smartComponent.bitNumber = fields.int()
+            smartComponent.exchange = fields.str()
+            smartComponent.exchangeLetter = fields.str()
             smartComponentMap.append(smartComponent)
 
         self.wrapper.smartComponents(reqId, smartComponentMap)
 
     def processTickReqParams(self,fields):
-        next(fields)
-        tickerId = decode(int, fields)
-        minTick = decode(float, fields)
-        bboExchange = decode(str, fields)
-        snapshotPermissions = decode(int, fields)
+        fields.skip()
+        tickerId = fields.int()
+        minTick = fields.float()
+        bboExchange = fields.str()
+        snapshotPermissions = fields.int()
         self.wrapper.tickReqParams(tickerId, minTick, bboExchange, snapshotPermissions)
 
     def processMktDepthExchanges(self,fields):
-        next(fields)
+        fields.skip()
         depthMktDataDescriptions = []
-        nDepthMktDataDescriptions = decode(int, fields)
+        nDepthMktDataDescriptions = fields.int()
 
         if nDepthMktDataDescriptions > 0:
             for _ in range(nDepthMktDataDescriptions):
                 desc = DepthMktDataDescription()
-                desc.exchange = decode(str, fields)
-                desc.secType = decode(str, fields)
+                desc.exchange = fields.str()
+                desc.secType = fields.str()
                 if self.serverVersion >= MIN_SERVER_VER_SERVICE_DATA_TYPE:
-                    desc.listingExch = decode(str, fields)
-                    desc.serviceDataType = decode(str, fields)
-                    desc.aggGroup = decode(int, fields)
+                    desc.listingExch = fields.str()
+                    desc.serviceDataType = fields.str()
+                    desc.aggGroup = fields.int()
                 else:
-                    decode(int,fields) #boolean notSuppIsL2
+                    fields.int() #boolean notSuppIsL2
                 depthMktDataDescriptions.append(desc)
 
         self.wrapper.mktDepthExchanges(depthMktDataDescriptions)
 
     def processHeadTimestamp(self,fields):
-        next(fields)
-        reqId = decode(int, fields)
-        headTimestamp = decode(str, fields)
+        fields.skip()
+        reqId = fields.int()
+        headTimestamp = fields.str()
         self.wrapper.headTimestamp(reqId,headTimestamp)
 
     def processTickNews(self,fields):
-        next(fields)
-        tickerId = decode( int, fields)
-        timeStamp = decode(int, fields)
-        providerCode = decode(str, fields)
-        articleId = decode(str, fields)
-        headline = decode(str, fields)
-        extraData = decode(str, fields)
+        fields.skip()
+        tickerId = fields.int()
+        timeStamp = fields.int()
+        providerCode = fields.str()
+        articleId = fields.str()
+        headline = fields.str()
+        extraData = fields.str()
         self.wrapper.tickNews(tickerId, timeStamp, providerCode, articleId, headline, extraData)
 
     def processNewsProviders(self,fields):
-        next(fields)
+        fields.skip()
         newsProviders = []
-        nNewsProviders = decode(int, fields)
+        nNewsProviders = fields.int()
         if nNewsProviders > 0:
             for _ in range(nNewsProviders):
                 provider = NewsProvider()
-                provider.code = decode(str, fields)
-                provider.name = decode(str, fields)
+                provider.code = fields.str()
+                provider.name = fields.str()
                 newsProviders.append(provider)
 
         self.wrapper.newsProviders(newsProviders)
 
     def processNewsArticle(self,fields):
-        next(fields)
-        reqId = decode(int, fields)
-        articleType = decode(int, fields)
-        articleText = decode(str, fields)
+        fields.skip()
+        reqId = fields.int()
+        articleType = fields.int()
+        articleText = fields.str()
         self.wrapper.newsArticle(reqId, articleType, articleText)
 
     def processHistoricalNews(self,fields):
-        next(fields)
-        requestId = decode(int, fields)
-        time = decode(str, fields)
-        providerCode = decode(str, fields)
-        articleId = decode(str, fields)
-        headline = decode(str, fields)
+        fields.skip()
+        requestId = fields.int()
+        time = fields.str()
+        providerCode = fields.str()
+        articleId = fields.str()
+        headline = fields.str()
         self.wrapper.historicalNews(requestId, time, providerCode, articleId, headline)
 
     def processHistoricalNewsEnd(self,fields):
-        next(fields)
-        reqId = decode(int, fields)
-        hasMore = decode(bool, fields)
+        fields.skip()
+        reqId = fields.int()
+        hasMore = fields.bool()
         self.wrapper.historicalNewsEnd(reqId, hasMore)
 
     def processHistogramData(self,fields):
-        next(fields)
-        reqId = decode(int, fields)
-        numPoints = decode(int, fields)
+        fields.skip()
+        reqId = fields.int()
+        numPoints = fields.int()
 
         histogram = []
         for _ in range(numPoints):
             dataPoint = HistogramData()
-            dataPoint.price = decode(float,fields)
-            dataPoint.count = decode(int,fields)
+            dataPoint.price = fields.float()
+            dataPoint.count = fields.int()
             histogram.append(dataPoint)
 
         self.wrapper.histogramData(reqId, histogram)
 
     def processRerouteMktDataReq(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        conId = decode(int, fields)
-        exchange = decode(str, fields)
+        fields.skip()
+        reqId = fields.int()
+        conId = fields.int()
+        exchange = fields.str()
 
         self.wrapper.rerouteMktDataReq(reqId, conId, exchange)
 
     def processRerouteMktDepthReq(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        conId = decode(int, fields)
-        exchange = decode(str, fields)
+        fields.skip()
+        reqId = fields.int()
+        conId = fields.int()
+        exchange = fields.str()
 
         self.wrapper.rerouteMktDepthReq(reqId, conId, exchange)
 
     def processMarketRuleMsg(self, fields):
-        next(fields)
-        marketRuleId = decode(int, fields)
+        fields.skip()
+        marketRuleId = fields.int()
 
-        nPriceIncrements = decode(int, fields)
+        nPriceIncrements = fields.int()
         priceIncrements = []
 
         if nPriceIncrements > 0:
             for _ in range(nPriceIncrements):
                 prcInc = PriceIncrement()
-                prcInc.lowEdge = decode(float, fields)
-                prcInc.increment = decode(float, fields)
+                prcInc.lowEdge = fields.float()
+                prcInc.increment = fields.float()
                 priceIncrements.append(prcInc)
 
         self.wrapper.marketRule(marketRuleId, priceIncrements)
 
     def processPnLMsg(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        dailyPnL = decode(float, fields)
+        fields.skip()
+        reqId = fields.int()
+        dailyPnL = fields.float()
         unrealizedPnL = None
         realizedPnL = None
 
         if self.serverVersion >= MIN_SERVER_VER_UNREALIZED_PNL:
-            unrealizedPnL = decode(float, fields)
+            unrealizedPnL = fields.float()
 
         if self.serverVersion >= MIN_SERVER_VER_REALIZED_PNL:
-            realizedPnL = decode(float, fields)
+            realizedPnL = fields.float()
 
         self.wrapper.pnl(reqId, dailyPnL, unrealizedPnL, realizedPnL)
 
     def processPnLSingleMsg(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        pos = decode(int, fields)
-        dailyPnL = decode(float, fields)
+        fields.skip()
+        reqId = fields.int()
+        pos = fields.int()
+        dailyPnL = fields.float()
         unrealizedPnL = None
         realizedPnL = None
 
         if self.serverVersion >= MIN_SERVER_VER_UNREALIZED_PNL:
-            unrealizedPnL = decode(float, fields)
+            unrealizedPnL = fields.float()
 
         if self.serverVersion >= MIN_SERVER_VER_REALIZED_PNL:
-            realizedPnL = decode(float, fields)
+            realizedPnL = fields.float()
 
-        value = decode(float, fields)
+        value = fields.float()
 
         self.wrapper.pnlSingle(reqId, pos, dailyPnL, unrealizedPnL, realizedPnL, value)
 
     def processHistoricalTicks(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        tickCount = decode(int, fields)
+        fields.skip()
+        reqId = fields.int()
+        tickCount = fields.int()
+
+        if self.columnarHistTicks:
+            ticks = self.columnar.hist_ticks(fields.take(tickCount * 4))
+            self.wrapper.historicalTicksArray(reqId, ticks, fields.bool())
+            return
 
         ticks = []
 
         for _ in range(tickCount):
             historicalTick = HistoricalTick()
-            historicalTick.time = decode(int, fields)
-            next(fields) # for consistency
-            historicalTick.price = decode(float, fields)
-            historicalTick.size = decode(int, fields)
+            historicalTick.time = fields.int()
+            fields.skip() # for consistency
+            historicalTick.price = fields.float()
+            historicalTick.size = fields.int()
             ticks.append(historicalTick)
 
-        done = decode(bool, fields)
+        done = fields.bool()
 
         self.wrapper.historicalTicks(reqId, ticks, done)
 
     def processHistoricalTicksBidAsk(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        tickCount = decode(int, fields)
+        fields.skip()
+        reqId = fields.int()
+        tickCount = fields.int()
+
+        if self.columnarHistTicks:
+            ticks = self.columnar.hist_ticks_bid_ask(fields.take(tickCount * 6))
+            self.wrapper.historicalTicksArray(reqId, ticks, fields.bool())
+            return
 
         ticks = []
 
         for _ in range(tickCount):
             historicalTickBidAsk = HistoricalTickBidAsk()
-            historicalTickBidAsk.time = decode(int, fields)
-            mask = decode(int, fields)
+            historicalTickBidAsk.time = fields.int()
+            mask = fields.int()
             tickAttribBidAsk = TickAttribBidAsk()
             tickAttribBidAsk.askPastHigh = mask & 1 != 0
             tickAttribBidAsk.bidPastLow = mask & 2 != 0
             historicalTickBidAsk.tickAttribBidAsk = tickAttribBidAsk
-            historicalTickBidAsk.priceBid = decode(float, fields)
-            historicalTickBidAsk.priceAsk = decode(float, fields)
-            historicalTickBidAsk.sizeBid = decode(int, fields)
-            historicalTickBidAsk.sizeAsk = decode(int, fields)
+            historicalTickBidAsk.priceBid = fields.float()
+            historicalTickBidAsk.priceAsk = fields.float()
+            historicalTickBidAsk.sizeBid = fields.int()
+            historicalTickBidAsk.sizeAsk = fields.int()
             ticks.append(historicalTickBidAsk)
 
-        done = decode(bool, fields)
+        done = fields.bool()
 
         self.wrapper.historicalTicksBidAsk(reqId, ticks, done)
 
     def processHistoricalTicksLast(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        tickCount = decode(int, fields)
+        fields.skip()
+        reqId = fields.int()
+        tickCount = fields.int()
+
+        if self.columnarHistTicks:
+            ticks = self.columnar.hist_ticks_last(fields.take(tickCount * 6))
+            self.wrapper.historicalTicksArray(reqId, ticks, fields.bool())
+            return
 
         ticks = []
 
         for _ in range(tickCount):
             historicalTickLast = HistoricalTickLast()
-            historicalTickLast.time = decode(int, fields)
-            mask = decode(int, fields)
+            historicalTickLast.time = fields.int()
+            mask = fields.int()
             tickAttribLast = TickAttribLast()
             tickAttribLast.pastLimit = mask & 1 != 0
             tickAttribLast.unreported = mask & 2 != 0
             historicalTickLast.tickAttribLast = tickAttribLast
-            historicalTickLast.price = decode(float, fields)
-            historicalTickLast.size = decode(int, fields)
-            historicalTickLast.exchange = decode(str, fields)
-            historicalTickLast.specialConditions = decode(str, fields)
+            historicalTickLast.price = fields.float()
+            historicalTickLast.size = fields.int()
+            historicalTickLast.exchange = fields.str()
+            historicalTickLast.specialConditions = fields.str()
             ticks.append(historicalTickLast)
 
-        done = decode(bool, fields)
+        done = fields.bool()
 
         self.wrapper.historicalTicksLast(reqId, ticks, done)
 
     def processTickByTickMsg(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        tickType = decode(int, fields)
-        time = decode(int, fields)
+        fields.skip()
+        reqId = fields.int()
+        tickType = fields.int()
+        time = fields.int()
 
         if tickType == 0:
             # None
             pass
         elif tickType == 1 or tickType == 2:
             # Last or AllLast
-            price = decode(float, fields)
-            size = decode(int, fields)
-            mask = decode(int, fields)
+            price = fields.float()
+            size = fields.int()
+            mask = fields.int()
 
             tickAttribLast = TickAttribLast()
             tickAttribLast.pastLimit = mask & 1 != 0
             tickAttribLast.unreported = mask & 2 != 0
-            exchange = decode(str, fields)
-            specialConditions = decode(str, fields)
+            exchange = fields.str()
+            specialConditions = fields.str()
 
             self.wrapper.tickByTickAllLast(reqId, tickType, time, price, size, tickAttribLast,
                                            exchange, specialConditions)
         elif tickType == 3:
             # BidAsk
-            bidPrice = decode(float, fields)
-            askPrice = decode(float, fields)
-            bidSize = decode(int, fields)
-            askSize = decode(int, fields)
-            mask = decode(int, fields)
+            bidPrice = fields.float()
+            askPrice = fields.float()
+            bidSize = fields.int()
+            askSize = fields.int()
+            mask = fields.int()
             tickAttribBidAsk = TickAttribBidAsk()
             tickAttribBidAsk.bidPastLow = mask & 1 != 0
             tickAttribBidAsk.askPastHigh = mask & 2 != 0
@@ -1065,123 +1072,61 @@ class Decoder(Object):
                                           askSize, tickAttribBidAsk)
         elif tickType == 4:
             # MidPoint
-            midPoint = decode(float, fields)
+            midPoint = fields.float()
 
             self.wrapper.tickByTickMidPoint(reqId, time, midPoint)
 
     def processOrderBoundMsg(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        apiClientId = decode(int, fields)
-        apiOrderId = decode(int, fields)
+        fields.skip()
+        reqId = fields.int()
+        apiClientId = fields.int()
+        apiOrderId = fields.int()
 
         self.wrapper.orderBound(reqId, apiClientId, apiOrderId)
 
     def processMarketDepthL2Msg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(int, fields)
-
-        position = decode(int, fields)
-        marketMaker = decode(str, fields)
-        operation = decode(int, fields)
-        side = decode(int, fields)
-        price = decode(float, fields)
-        size = decode(int, fields)
+        fields.skip()
+        fields.int()
+        reqId = fields.int()
+
+        position = fields.int()
+        marketMaker = fields.str()
+        operation = fields.int()
+        side = fields.int()
+        price = fields.float()
+        size = fields.int()
         isSmartDepth = False
 
         if self.serverVersion >= MIN_SERVER_VER_SMART_DEPTH:
-            isSmartDepth = decode(bool, fields)
+            isSmartDepth = fields.bool()
 
         self.wrapper.updateMktDepthL2(reqId, position, marketMaker,
                         operation, side, price, size, isSmartDepth)
 
 
     def processCompletedOrderMsg(self, fields):
-        next(fields)
-        
-        order = Order()
-        contract = Contract()
-        orderState = OrderState()
+        fields.skip()
 
-        OrderDecoder.__init__(self, contract, order, orderState, UNSET_INTEGER, self.serverVersion)
+        od = self.orderDecoder
+        od.contract = Contract()
+        od.order = Order()
+        od.orderState = OrderState()
+        od.version = UNSET_INTEGER
+        od.serverVersion = self.serverVersion
 
-        # read contract fields
-        OrderDecoder.decodeContractFields(self, fields)
-
-        # read order fields
-        OrderDecoder.decodeAction(self, fields)
-        OrderDecoder.decodeTotalQuantity(self, fields)
-        OrderDecoder.decodeOrderType(self, fields)
-        OrderDecoder.decodeLmtPrice(self, fields)
-        OrderDecoder.decodeAuxPrice(self, fields)
-        OrderDecoder.decodeTIF(self, fields)
-        OrderDecoder.decodeOcaGroup(self, fields)
-        OrderDecoder.decodeAccount(self, fields)
-        OrderDecoder.decodeOpenClose(self, fields)
-        OrderDecoder.decodeOrigin(self, fields)
-        OrderDecoder.decodeOrderRef(self, fields)
-        OrderDecoder.decodePermId(self, fields)
-        OrderDecoder.decodeOutsideRth(self, fields)
-        OrderDecoder.decodeHidden(self, fields)
-        OrderDecoder.decodeDiscretionaryAmt(self, fields)
-        OrderDecoder.decodeGoodAfterTime(self, fields)
-        OrderDecoder.decodeFAParams(self, fields)
-        OrderDecoder.decodeModelCode(self, fields)
-        OrderDecoder.decodeGoodTillDate(self, fields)
-        OrderDecoder.decodeRule80A(self, fields)
-        OrderDecoder.decodePercentOffset(self, fields)
-        OrderDecoder.decodeSettlingFirm(self, fields)
-        OrderDecoder.decodeShortSaleParams(self, fields)
-        OrderDecoder.decodeBoxOrderParams(self, fields)
-        OrderDecoder.decodePegToStkOrVolOrderParams(self, fields)
-        OrderDecoder.decodeDisplaySize(self, fields)
-        OrderDecoder.decodeSweepToFill(self, fields)
-        OrderDecoder.decodeAllOrNone(self, fields)
-        OrderDecoder.decodeMinQty(self, fields)
-        OrderDecoder.decodeOcaType(self, fields)
-        OrderDecoder.decodeTriggerMethod(self, fields)
-        OrderDecoder.decodeVolOrderParams(self, fields, False)
-        OrderDecoder.decodeTrailParams(self, fields)
-        OrderDecoder.decodeComboLegs(self, fields)
-        OrderDecoder.decodeSmartComboRoutingParams(self, fields)
-        OrderDecoder.decodeScaleOrderParams(self, fields)
-        OrderDecoder.decodeHedgeParams(self, fields)
-        OrderDecoder.decodeClearingParams(self, fields)
-        OrderDecoder.decodeNotHeld(self, fields)
-        OrderDecoder.decodeDeltaNeutral(self, fields)
-        OrderDecoder.decodeAlgoParams(self, fields)
-        OrderDecoder.decodeSolicited(self, fields)
-        OrderDecoder.decodeOrderStatus(self, fields)
-        OrderDecoder.decodeVolRandomizeFlags(self, fields)
-        OrderDecoder.decodePegToBenchParams(self, fields)
-        OrderDecoder.decodeConditions(self, fields)
-        OrderDecoder.decodeStopPriceAndLmtPriceOffset(self, fields)
-        OrderDecoder.decodeCashQty(self, fields)
-        OrderDecoder.decodeDontUseAutoPriceForHedge(self, fields)
-        OrderDecoder.decodeIsOmsContainers(self, fields)
-        OrderDecoder.decodeAutoCancelDate(self, fields)
-        OrderDecoder.decodeFilledQuantity(self, fields)
-        OrderDecoder.decodeRefFuturesConId(self, fields)
-        OrderDecoder.decodeAutoCancelParent(self, fields)
-        OrderDecoder.decodeShareholder(self, fields)
-        OrderDecoder.decodeImbalanceOnly(self, fields)
-        OrderDecoder.decodeRouteMarketableToBbo(self, fields)
-        OrderDecoder.decodeParentPermId(self, fields)
-        OrderDecoder.decodeCompletedTime(self, fields)
-        OrderDecoder.decodeCompletedStatus(self, fields)
-
-        self.wrapper.completedOrder(contract, order, orderState)
+        od.decodeCompletedOrder(fields)
+
+        self.wrapper.completedOrder(od.contract, od.order, od.orderState)
 
     def processCompletedOrdersEndMsg(self, fields):
-        next(fields)
+        fields.skip()
 
         self.wrapper.completedOrdersEnd()
 
     ######################################################################
 
     def readLastTradeDate(self, fields, contract: ContractDetails, isBond: bool):
-        lastTradeDateOrContractMonth = decode(str, fields)
+        lastTradeDateOrContractMonth = fields.str()
         if lastTradeDateOrContractMonth is not None:
             splitted = lastTradeDateOrContractMonth.split()
             if len(splitted) > 0:
@@ -1215,6 +1160,17 @@ class Decoder(Object):
             #     logger.debug("\tparam %s %s %s", pname, param.name, param.annotation)
 
 
+    def compileDecoders(self):
+        """ builds the fast decoders for the msgs handled w/ the wrapper
+        method signature; call it again if self.wrapper is replaced """
+        self.msgId2decodeFn = {}
+        for (msgId, handleInfo) in self.msgId2handleInfo.items():
+            if handleInfo.wrapperMeth is not None and handleInfo.wrapperParams is not None:
+                name = handleInfo.wrapperMeth.__name__
+                self.msgId2decodeFn[msgId] = compileSignatureDecoder(name,
+                    getattr(self.wrapper, name), handleInfo.wrapperParams)
+
+
     def printParams(self):
         for (_, handleInfo) in self.msgId2handleInfo.items():
             if handleInfo.wrapperMeth is not None:
@@ -1266,6 +1222,11 @@ class Decoder(Object):
         sMsgId = fields[0]
         nMsgId = int(sMsgId)
 
+        decodeFn = self.msgId2decodeFn.get(nMsgId, None)
+        if decodeFn is not None:
+            decodeFn(fields)
+            return
+
         handleInfo = self.msgId2handleInfo.get(nMsgId, None)
 
         if handleInfo is None:
@@ -1277,7 +1238,7 @@ class Decoder(Object):
                 logger.debug("In interpret(), handleInfo: %s", handleInfo)
                 self.interpretWithSignature(fields, handleInfo)
             elif handleInfo.processMeth is not None:
-                handleInfo.processMeth(self, iter(fields))
+                handleInfo.processMeth(self, FieldReader(fields))
         except BadMessage:
                 theBadMsg = ",".join(fields)
                 self.wrapper.error(NO_VALID_ID, BAD_MESSAGE.code(),
@@ -1285,6 +1246,27 @@ class Decoder(Object):
                 raise
 
 
+    def setTracer(self, tracer):
+        """ times interpret() with a latency.LatencyTracer, or stops with
+        None; the untraced interpret() is left as it is """
+        self.tracer = tracer
+        if tracer is not None:
+            self.interpret = self.interpretTraced
+        else:
+            self.__dict__.pop("interpret", None)
+
+
+    def interpretTraced(self, fields):
+        if len(fields) == 0:
+            return
+        clock = self.tracer.clock
+        dispatchedTime = clock()
+        try:
+            Decoder.interpret(self, fields)
+        finally:
+            self.tracer.dispatched(fields, dispatchedTime, clock())
+
+
     msgId2handleInfo = {
         IN.TICK_PRICE: HandleInfo(proc=processTickPriceMsg),
         IN.TICK_SIZE: HandleInfo(wrap=EWrapper.tickSize),
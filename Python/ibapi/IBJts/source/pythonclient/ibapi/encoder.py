@@ -0,0 +1,808 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Precompiled encoders of the heavy requests.
+
+Each request is described once by a schema: the list of its fields in wire
+order, the fields only sent from (or before) some server version, the ones
+sent under a condition on the parameters, the loops over combo legs/tag
+values and the checks that refuse parameters the server version does not
+support. For a server version the schema is compiled into a plain Python
+function, so the MIN_SERVER_VER_* tests are resolved once and the encoding
+of a request is a straight sequence of appends with the constant fields
+merged together. The function returns the msg framed for the wire.
+
+The fields are the ones that make_field()/make_field_handle_empty() give,
+the functions are cached per server version and shared by all the clients:
+
+    encoders = encoder.forServerVersion(client.serverVersion())
+    msg = encoders.placeOrder(orderId, contract, order)
+"""
+
+import logging
+import operator
+import re
+import struct
+
+from ibapi.common import UNSET_INTEGER, UNSET_DOUBLE
+from ibapi.message import OUT
+from ibapi.server_versions import * # @UnusedWildImport
+
+
+logger = logging.getLogger(__name__)
+
+
+class UnsupportedByServer(Exception):
+    """ a parameter is not supported by the server version, the text is the
+    one appended to UPDATE_TWS.msg() """
+
+
+class Field:
+    """ a field, the expression is evaluated in the encoder """
+    __slots__ = ("expr", )
+
+    def __init__(self, expr):
+        self.expr = expr
+
+
+class FieldOrEmpty(Field):
+    """ a field sent empty when UNSET_INTEGER/UNSET_DOUBLE """
+    __slots__ = ()
+
+
+class Fields(Field):
+    """ a list of fields already made by make_field() """
+    __slots__ = ()
+
+
+class Const:
+    """ a field known when compiling """
+    __slots__ = ("value", )
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Since:
+    """ items sent to the servers >= minVer, orElse to the older ones """
+    __slots__ = ("minVer", "items", "orElse")
+
+    def __init__(self, minVer, *items, orElse=()):
+        self.minVer = minVer
+        self.items = items
+        self.orElse = tuple(orElse)
+
+
+def Before(maxVer, *items):
+    """ items sent to the servers < maxVer """
+    return Since(maxVer, orElse=items)
+
+
+class When:
+    """ items sent when cond is true, orElse when false """
+    __slots__ = ("cond", "items", "orElse")
+
+    def __init__(self, cond, *items, orElse=()):
+        self.cond = cond
+        self.items = items
+        self.orElse = tuple(orElse)
+
+
+class ForEach:
+    """ items sent for each element of seq, named var """
+    __slots__ = ("var", "seq", "items")
+
+    def __init__(self, var, seq, *items):
+        self.var = var
+        self.seq = seq
+        self.items = items
+
+
+class Check:
+    """ the servers < maxVer refuse the request when cond is true """
+    __slots__ = ("maxVer", "cond", "text")
+
+    def __init__(self, maxVer, cond, text):
+        self.maxVer = maxVer
+        self.cond = cond
+        self.text = text
+
+
+class Code:
+    """ a statement run at this point of the encoding """
+    __slots__ = ("stmt", )
+
+    def __init__(self, stmt):
+        self.stmt = stmt
+
+
+class ContractBlock:
+    """ contract fields encoded once per (conId, request, server version) by
+    the contractCache, the items can only use the contract """
+    __slots__ = ("items", )
+
+    def __init__(self, *items):
+        self.items = items
+
+
+class Request:
+    __slots__ = ("name", "params", "items")
+
+    def __init__(self, name, params, *items):
+        self.name = name
+        self.params = params
+        self.items = items
+
+
+def CONTRACT_FIELDS(prefix="contract"):
+    return (Field(prefix + ".symbol"),
+            Field(prefix + ".secType"),
+            Field(prefix + ".lastTradeDateOrContractMonth"),
+            Field(prefix + ".strike"),
+            Field(prefix + ".right"),
+            Field(prefix + ".multiplier"),       # srv v15 and above
+            Field(prefix + ".exchange"),
+            Field(prefix + ".primaryExchange"),  # srv v14 and above
+            Field(prefix + ".currency"),
+            Field(prefix + ".localSymbol"))      # srv v2 and above
+
+
+DELTA_NEUTRAL_CONTRACT = When("contract.deltaNeutralContract",
+    Const(True),
+    Field("contract.deltaNeutralContract.conId"),
+    Field("contract.deltaNeutralContract.delta"),
+    Field("contract.deltaNeutralContract.price"),
+    orElse=[Const(False)])
+
+
+PLACE_ORDER = Request("placeOrder", ("orderId", "contract", "order"),
+    Check(MIN_SERVER_VER_DELTA_NEUTRAL, "contract.deltaNeutralContract",
+        "  It does not support delta-neutral orders."),
+    Check(MIN_SERVER_VER_SCALE_ORDERS2, "order.scaleSubsLevelSize != UNSET_INTEGER",
+        "  It does not support Subsequent Level Size for Scale orders."),
+    Check(MIN_SERVER_VER_ALGO_ORDERS, "order.algoStrategy",
+        "  It does not support algo orders."),
+    Check(MIN_SERVER_VER_NOT_HELD, "order.notHeld",
+        "  It does not support notHeld parameter."),
+    Check(MIN_SERVER_VER_SEC_ID_TYPE, "contract.secIdType or contract.secId",
+        "  It does not support secIdType and secId parameters."),
+    Check(MIN_SERVER_VER_PLACE_ORDER_CONID, "contract.conId and contract.conId > 0",
+        "  It does not support conId parameter."),
+    Check(MIN_SERVER_VER_SSHORTX, "order.exemptCode != -1",
+        "  It does not support exemptCode parameter."),
+    Check(MIN_SERVER_VER_SSHORTX,
+        "contract.comboLegs and any(comboLeg.exemptCode != -1 for comboLeg in contract.comboLegs)",
+        "  It does not support exemptCode parameter."),
+    Check(MIN_SERVER_VER_HEDGE_ORDERS, "order.hedgeType",
+        "  It does not support hedge orders."),
+    Check(MIN_SERVER_VER_OPT_OUT_SMART_ROUTING, "order.optOutSmartRouting",
+        "  It does not support optOutSmartRouting parameter."),
+    Check(MIN_SERVER_VER_DELTA_NEUTRAL_CONID,
+        "order.deltaNeutralConId > 0 or order.deltaNeutralSettlingFirm"
+        " or order.deltaNeutralClearingAccount or order.deltaNeutralClearingIntent",
+        "  It does not support deltaNeutral parameters: ConId, SettlingFirm, ClearingAccount, ClearingIntent."),
+    Check(MIN_SERVER_VER_DELTA_NEUTRAL_OPEN_CLOSE,
+        "order.deltaNeutralOpenClose or order.deltaNeutralShortSale"
+        " or order.deltaNeutralShortSaleSlot > 0 or order.deltaNeutralDesignatedLocation",
+        "  It does not support deltaNeutral parameters: OpenClose, ShortSale, ShortSaleSlot, DesignatedLocation."),
+    Check(MIN_SERVER_VER_SCALE_ORDERS3,
+        "order.scalePriceIncrement > 0 and order.scalePriceIncrement != UNSET_DOUBLE"
+        " and (order.scalePriceAdjustValue != UNSET_DOUBLE"
+        " or order.scalePriceAdjustInterval != UNSET_INTEGER"
+        " or order.scaleProfitOffset != UNSET_DOUBLE or order.scaleAutoReset"
+        " or order.scaleInitPosition != UNSET_INTEGER"
+        " or order.scaleInitFillQty != UNSET_INTEGER or order.scaleRandomPercent)",
+        "  It does not support Scale order parameters: PriceAdjustValue, PriceAdjustInterval, "
+        "ProfitOffset, AutoReset, InitPosition, InitFillQty and RandomPercent"),
+    Check(MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE,
+        "contract.secType == 'BAG' and order.orderComboLegs and"
+        " any(orderComboLeg.price != UNSET_DOUBLE for orderComboLeg in order.orderComboLegs)",
+        "  It does not support per-leg prices for order combo legs."),
+    Check(MIN_SERVER_VER_TRAILING_PERCENT, "order.trailingPercent != UNSET_DOUBLE",
+        "  It does not support trailing percent parameter"),
+    Check(MIN_SERVER_VER_TRADING_CLASS, "contract.tradingClass",
+        "  It does not support tradingClass parameter in placeOrder."),
+    Check(MIN_SERVER_VER_SCALE_TABLE,
+        "order.scaleTable or order.activeStartTime or order.activeStopTime",
+        "  It does not support scaleTable, activeStartTime and activeStopTime parameters"),
+    Check(MIN_SERVER_VER_ALGO_ID, "order.algoId",
+        "  It does not support algoId parameter"),
+    Check(MIN_SERVER_VER_ORDER_SOLICITED, "order.solicited",
+        "  It does not support order solicited parameter."),
+    Check(MIN_SERVER_VER_MODELS_SUPPORT, "order.modelCode",
+        "  It does not support model code parameter."),
+    Check(MIN_SERVER_VER_EXT_OPERATOR, "order.extOperator",
+        "  It does not support ext operator parameter"),
+    Check(MIN_SERVER_VER_SOFT_DOLLAR_TIER,
+        "order.softDollarTier.name or order.softDollarTier.val",
+        " It does not support soft dollar tier"),
+    Check(MIN_SERVER_VER_CASH_QTY, "order.cashQty",
+        " It does not support cash quantity parameter"),
+    Check(MIN_SERVER_VER_DECISION_MAKER,
+        "order.mifid2DecisionMaker != '' or order.mifid2DecisionAlgo != ''",
+        " It does not support MIFID II decision maker parameters"),
+    Check(MIN_SERVER_VER_MIFID_EXECUTION,
+        "order.mifid2ExecutionTrader != '' or order.mifid2ExecutionAlgo != ''",
+        " It does not support MIFID II execution parameters"),
+    Check(MIN_SERVER_VER_AUTO_PRICE_FOR_HEDGE, "order.dontUseAutoPriceForHedge",
+        " It does not support dontUseAutoPriceForHedge parameter"),
+    Check(MIN_SERVER_VER_ORDER_CONTAINER, "order.isOmsContainer",
+        " It does not support oms container parameter"),
+    Check(MIN_SERVER_VER_PRICE_MGMT_ALGO, "order.usePriceMgmtAlgo",
+        " It does not support Use price management algo requests"),
+
+    Const(OUT.PLACE_ORDER),
+    Before(MIN_SERVER_VER_ORDER_CONTAINER,  # VERSION
+        Since(MIN_SERVER_VER_NOT_HELD, Const(45), orElse=[Const(27)])),
+    Field("orderId"),
+
+    # send contract fields
+    ContractBlock(
+        Since(MIN_SERVER_VER_PLACE_ORDER_CONID, Field("contract.conId")),
+        *CONTRACT_FIELDS(),
+        Since(MIN_SERVER_VER_TRADING_CLASS, Field("contract.tradingClass")),
+        Since(MIN_SERVER_VER_SEC_ID_TYPE,
+            Field("contract.secIdType"),
+            Field("contract.secId"))),
+
+    # send main order fields
+    Field("order.action"),
+    Since(MIN_SERVER_VER_FRACTIONAL_POSITIONS,
+        Field("order.totalQuantity"),
+        orElse=[Field("int(order.totalQuantity)")]),
+    Field("order.orderType"),
+    Since(MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE,
+        FieldOrEmpty("order.lmtPrice"),
+        orElse=[Field("order.lmtPrice if order.lmtPrice != UNSET_DOUBLE else 0")]),
+    Since(MIN_SERVER_VER_TRAILING_PERCENT,
+        FieldOrEmpty("order.auxPrice"),
+        # the extended order fields have always been sent with the auxPrice
+        # of the servers >= MIN_SERVER_VER_TRAILING_PERCENT only
+        Field("order.tif"),
+        Field("order.ocaGroup"),
+        Field("order.account"),
+        Field("order.openClose"),
+        Field("order.origin"),
+        Field("order.orderRef"),
+        Field("order.transmit"),
+        Field("order.parentId"),       # srv v4 and above
+        Field("order.blockOrder"),     # srv v5 and above
+        Field("order.sweepToFill"),    # srv v5 and above
+        Field("order.displaySize"),    # srv v5 and above
+        Field("order.triggerMethod"),  # srv v5 and above
+        Field("order.outsideRth"),     # srv v5 and above
+        Field("order.hidden"),         # srv v7 and above
+        orElse=[Field("order.auxPrice if order.auxPrice != UNSET_DOUBLE else 0")]),
+
+    # Send combo legs for BAG requests (srv v8 and above)
+    When("contract.secType == 'BAG'",
+        Field("len(contract.comboLegs) if contract.comboLegs else 0"),
+        When("contract.comboLegs",
+            ForEach("comboLeg", "contract.comboLegs",
+                Field("comboLeg.conId"),
+                Field("comboLeg.ratio"),
+                Field("comboLeg.action"),
+                Field("comboLeg.exchange"),
+                Field("comboLeg.openClose"),
+                Field("comboLeg.shortSaleSlot"),       # srv v35 and above
+                Field("comboLeg.designatedLocation"),  # srv v35 and above
+                Since(MIN_SERVER_VER_SSHORTX_OLD, Field("comboLeg.exemptCode")))),
+        # Send order combo legs for BAG requests
+        Since(MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE,
+            Field("len(order.orderComboLegs) if order.orderComboLegs else 0"),
+            When("order.orderComboLegs",
+                ForEach("orderComboLeg", "order.orderComboLegs",
+                    FieldOrEmpty("orderComboLeg.price")))),
+        Since(MIN_SERVER_VER_SMART_COMBO_ROUTING_PARAMS,
+            Field("len(order.smartComboRoutingParams) if order.smartComboRoutingParams else 0"),
+            When("order.smartComboRoutingParams",
+                ForEach("tagValue", "order.smartComboRoutingParams",
+                    Field("tagValue.tag"),
+                    Field("tagValue.value"))))),
+
+    # deprecated sharesAllocation field, srv v9 and above
+    Const(""),
+    Field("order.discretionaryAmt"),  # srv v10 and above
+    Field("order.goodAfterTime"),     # srv v11 and above
+    Field("order.goodTillDate"),      # srv v12 and above
+    Field("order.faGroup"),           # srv v13 and above
+    Field("order.faMethod"),          # srv v13 and above
+    Field("order.faPercentage"),      # srv v13 and above
+    Field("order.faProfile"),         # srv v13 and above
+    Since(MIN_SERVER_VER_MODELS_SUPPORT, Field("order.modelCode")),
+
+    # institutional short saleslot data (srv v18 and above)
+    Field("order.shortSaleSlot"),       # 0 for retail, 1 or 2 for institutions
+    Field("order.designatedLocation"),  # populate only when shortSaleSlot = 2.
+    Since(MIN_SERVER_VER_SSHORTX_OLD, Field("order.exemptCode")),
+
+    # srv v19 and above fields
+    Field("order.ocaType"),
+    Field("order.rule80A"),
+    Field("order.settlingFirm"),
+    Field("order.allOrNone"),
+    FieldOrEmpty("order.minQty"),
+    FieldOrEmpty("order.percentOffset"),
+    Field("order.eTradeOnly"),
+    Field("order.firmQuoteOnly"),
+    FieldOrEmpty("order.nbboPriceCap"),
+    Field("order.auctionStrategy"),  # AUCTION_MATCH, AUCTION_IMPROVEMENT, AUCTION_TRANSPARENT
+    FieldOrEmpty("order.startingPrice"),
+    FieldOrEmpty("order.stockRefPrice"),
+    FieldOrEmpty("order.delta"),
+    FieldOrEmpty("order.stockRangeLower"),
+    FieldOrEmpty("order.stockRangeUpper"),
+    Field("order.overridePercentageConstraints"),  # srv v22 and above
+
+    # Volatility orders (srv v26 and above)
+    FieldOrEmpty("order.volatility"),
+    FieldOrEmpty("order.volatilityType"),
+    Field("order.deltaNeutralOrderType"),         # srv v28 and above
+    FieldOrEmpty("order.deltaNeutralAuxPrice"),   # srv v28 and above
+    Since(MIN_SERVER_VER_DELTA_NEUTRAL_CONID,
+        When("order.deltaNeutralOrderType",
+            Field("order.deltaNeutralConId"),
+            Field("order.deltaNeutralSettlingFirm"),
+            Field("order.deltaNeutralClearingAccount"),
+            Field("order.deltaNeutralClearingIntent"))),
+    Since(MIN_SERVER_VER_DELTA_NEUTRAL_OPEN_CLOSE,
+        When("order.deltaNeutralOrderType",
+            Field("order.deltaNeutralOpenClose"),
+            Field("order.deltaNeutralShortSale"),
+            Field("order.deltaNeutralShortSaleSlot"),
+            Field("order.deltaNeutralDesignatedLocation"))),
+    Field("order.continuousUpdate"),
+    FieldOrEmpty("order.referencePriceType"),
+    FieldOrEmpty("order.trailStopPrice"),  # srv v30 and above
+    Since(MIN_SERVER_VER_TRAILING_PERCENT, FieldOrEmpty("order.trailingPercent")),
+
+    # SCALE orders
+    Since(MIN_SERVER_VER_SCALE_ORDERS2,
+        FieldOrEmpty("order.scaleInitLevelSize"),
+        FieldOrEmpty("order.scaleSubsLevelSize"),
+        orElse=[Const(""),                                # for not supported scaleNumComponents
+                FieldOrEmpty("order.scaleInitLevelSize")]),  # for scaleComponentSize
+    FieldOrEmpty("order.scalePriceIncrement"),
+    Since(MIN_SERVER_VER_SCALE_ORDERS3,
+        When("order.scalePriceIncrement != UNSET_DOUBLE and order.scalePriceIncrement > 0.0",
+            FieldOrEmpty("order.scalePriceAdjustValue"),
+            FieldOrEmpty("order.scalePriceAdjustInterval"),
+            FieldOrEmpty("order.scaleProfitOffset"),
+            Field("order.scaleAutoReset"),
+            FieldOrEmpty("order.scaleInitPosition"),
+            FieldOrEmpty("order.scaleInitFillQty"),
+            Field("order.scaleRandomPercent"))),
+    Since(MIN_SERVER_VER_SCALE_TABLE,
+        Field("order.scaleTable"),
+        Field("order.activeStartTime"),
+        Field("order.activeStopTime")),
+
+    # HEDGE orders
+    Since(MIN_SERVER_VER_HEDGE_ORDERS,
+        Field("order.hedgeType"),
+        When("order.hedgeType", Field("order.hedgeParam"))),
+    Since(MIN_SERVER_VER_OPT_OUT_SMART_ROUTING, Field("order.optOutSmartRouting")),
+    Since(MIN_SERVER_VER_PTA_ORDERS,
+        Field("order.clearingAccount"),
+        Field("order.clearingIntent")),
+    Since(MIN_SERVER_VER_NOT_HELD, Field("order.notHeld")),
+    Since(MIN_SERVER_VER_DELTA_NEUTRAL, DELTA_NEUTRAL_CONTRACT),
+    Since(MIN_SERVER_VER_ALGO_ORDERS,
+        Field("order.algoStrategy"),
+        When("order.algoStrategy",
+            Field("len(order.algoParams) if order.algoParams else 0"),
+            When("order.algoParams",
+                ForEach("algoParam", "order.algoParams",
+                    Field("algoParam.tag"),
+                    Field("algoParam.value"))))),
+    Since(MIN_SERVER_VER_ALGO_ID, Field("order.algoId")),
+    Field("order.whatIf"),  # srv v36 and above
+
+    # send miscOptions parameter
+    Since(MIN_SERVER_VER_LINKING,
+        Field("''.join(str(tagValue) for tagValue in order.orderMiscOptions)"
+              " if order.orderMiscOptions else ''")),
+    Since(MIN_SERVER_VER_ORDER_SOLICITED, Field("order.solicited")),
+    Since(MIN_SERVER_VER_RANDOMIZE_SIZE_AND_PRICE,
+        Field("order.randomizeSize"),
+        Field("order.randomizePrice")),
+    Since(MIN_SERVER_VER_PEGGED_TO_BENCHMARK,
+        When("order.orderType == 'PEG BENCH'",
+            Field("order.referenceContractId"),
+            Field("order.isPeggedChangeAmountDecrease"),
+            Field("order.peggedChangeAmount"),
+            Field("order.referenceChangeAmount"),
+            Field("order.referenceExchangeId")),
+        Field("len(order.conditions)"),
+        When("len(order.conditions) > 0",
+            ForEach("cond", "order.conditions",
+                Field("cond.type()"),
+                Fields("cond.make_fields()")),
+            Field("order.conditionsIgnoreRth"),
+            Field("order.conditionsCancelOrder")),
+        Field("order.adjustedOrderType"),
+        Field("order.triggerPrice"),
+        Field("order.lmtPriceOffset"),
+        Field("order.adjustedStopPrice"),
+        Field("order.adjustedStopLimitPrice"),
+        Field("order.adjustedTrailingAmount"),
+        Field("order.adjustableTrailingUnit")),
+    Since(MIN_SERVER_VER_EXT_OPERATOR, Field("order.extOperator")),
+    Since(MIN_SERVER_VER_SOFT_DOLLAR_TIER,
+        Field("order.softDollarTier.name"),
+        Field("order.softDollarTier.val")),
+    Since(MIN_SERVER_VER_CASH_QTY, Field("order.cashQty")),
+    Since(MIN_SERVER_VER_DECISION_MAKER,
+        Field("order.mifid2DecisionMaker"),
+        Field("order.mifid2DecisionAlgo")),
+    Since(MIN_SERVER_VER_MIFID_EXECUTION,
+        Field("order.mifid2ExecutionTrader"),
+        Field("order.mifid2ExecutionAlgo")),
+    Since(MIN_SERVER_VER_AUTO_PRICE_FOR_HEDGE, Field("order.dontUseAutoPriceForHedge")),
+    Since(MIN_SERVER_VER_ORDER_CONTAINER, Field("order.isOmsContainer")),
+    Since(MIN_SERVER_VER_D_PEG_ORDERS, Field("order.discretionaryUpToLimitPrice")),
+    Since(MIN_SERVER_VER_PRICE_MGMT_ALGO,
+        FieldOrEmpty("UNSET_INTEGER if order.usePriceMgmtAlgo == None"
+                     " else 1 if order.usePriceMgmtAlgo else 0")))
+
+
+CANCEL_ORDER = Request("cancelOrder", ("orderId", ),
+    Const(OUT.CANCEL_ORDER),
+    Const(1),  # VERSION
+    Field("orderId"))
+
+
+REQ_MKT_DATA = Request("reqMktData", ("reqId", "contract", "genericTickList",
+                                      "snapshot", "regulatorySnapshot",
+                                      "mktDataOptions"),
+    Check(MIN_SERVER_VER_DELTA_NEUTRAL, "contract.deltaNeutralContract",
+        "  It does not support delta-neutral orders."),
+    Check(MIN_SERVER_VER_REQ_MKT_DATA_CONID, "contract.conId > 0",
+        "  It does not support conId parameter."),
+    Check(MIN_SERVER_VER_TRADING_CLASS, "contract.tradingClass",
+        "  It does not support tradingClass parameter in reqMktData."),
+
+    Const(OUT.REQ_MKT_DATA),
+    Const(11),  # VERSION
+    Field("reqId"),
+
+    # send contract fields
+    ContractBlock(
+        Since(MIN_SERVER_VER_REQ_MKT_DATA_CONID, Field("contract.conId")),
+        *CONTRACT_FIELDS(),
+        Since(MIN_SERVER_VER_TRADING_CLASS, Field("contract.tradingClass"))),
+
+    # Send combo legs for BAG requests (srv v8 and above)
+    When("contract.secType == 'BAG'",
+        Field("len(contract.comboLegs) if contract.comboLegs else 0"),
+        ForEach("comboLeg", "contract.comboLegs",
+            Field("comboLeg.conId"),
+            Field("comboLeg.ratio"),
+            Field("comboLeg.action"),
+            Field("comboLeg.exchange"))),
+
+    Since(MIN_SERVER_VER_DELTA_NEUTRAL, DELTA_NEUTRAL_CONTRACT),
+    Field("genericTickList"),  # srv v31 and above
+    Field("snapshot"),         # srv v35 and above
+    Since(MIN_SERVER_VER_REQ_SMART_COMPONENTS, Field("regulatorySnapshot")),
+
+    # send mktDataOptions parameter
+    Since(MIN_SERVER_VER_LINKING,
+        # current doc says this part if for "internal use only" -> won't support it
+        When("mktDataOptions", Code("raise NotImplementedError('not supported')")),
+        Const("")))
+
+
+CANCEL_MKT_DATA = Request("cancelMktData", ("reqId", ),
+    Const(OUT.CANCEL_MKT_DATA),
+    Const(2),  # VERSION
+    Field("reqId"))
+
+
+REQ_HISTORICAL_DATA = Request("reqHistoricalData", ("reqId", "contract",
+                                                    "endDateTime", "durationStr",
+                                                    "barSizeSetting", "whatToShow",
+                                                    "useRTH", "formatDate",
+                                                    "keepUpToDate", "chartOptions"),
+    Check(MIN_SERVER_VER_TRADING_CLASS, "contract.tradingClass or contract.conId > 0",
+        "  It does not support conId and tradingClass parameters in reqHistoricalData."),
+
+    Const(OUT.REQ_HISTORICAL_DATA),
+    Before(MIN_SERVER_VER_SYNT_REALTIME_BARS, Const(6)),  # VERSION
+    Field("reqId"),
+
+    # send contract fields
+    ContractBlock(
+        Since(MIN_SERVER_VER_TRADING_CLASS, Field("contract.conId")),
+        *CONTRACT_FIELDS(),
+        Since(MIN_SERVER_VER_TRADING_CLASS, Field("contract.tradingClass")),
+        Field("contract.includeExpired")),  # srv v31 and above
+    Field("endDateTime"),              # srv v20 and above
+    Field("barSizeSetting"),           # srv v20 and above
+    Field("durationStr"),
+    Field("useRTH"),
+    Field("whatToShow"),
+    Field("formatDate"),               # srv v16 and above
+
+    # Send combo legs for BAG requests
+    When("contract.secType == 'BAG'",
+        Field("len(contract.comboLegs)"),
+        ForEach("comboLeg", "contract.comboLegs",
+            Field("comboLeg.conId"),
+            Field("comboLeg.ratio"),
+            Field("comboLeg.action"),
+            Field("comboLeg.exchange"))),
+
+    Since(MIN_SERVER_VER_SYNT_REALTIME_BARS, Field("keepUpToDate")),
+
+    # send chartOptions parameter
+    Since(MIN_SERVER_VER_LINKING,
+        Field("''.join(str(tagValue) for tagValue in chartOptions)"
+              " if chartOptions else ''")))
+
+
+CANCEL_HISTORICAL_DATA = Request("cancelHistoricalData", ("reqId", ),
+    Const(OUT.CANCEL_HISTORICAL_DATA),
+    Const(1),  # VERSION
+    Field("reqId"))
+
+
+REQ_CONTRACT_DETAILS = Request("reqContractDetails", ("reqId", "contract"),
+    Check(MIN_SERVER_VER_SEC_ID_TYPE, "contract.secIdType or contract.secId",
+        "  It does not support secIdType and secId parameters."),
+    Check(MIN_SERVER_VER_TRADING_CLASS, "contract.tradingClass",
+        "  It does not support tradingClass parameter in reqContractDetails."),
+    Check(MIN_SERVER_VER_LINKING, "contract.primaryExchange",
+        "  It does not support primaryExchange parameter in reqContractDetails."),
+
+    Const(OUT.REQ_CONTRACT_DATA),
+    Const(8),  # VERSION
+    Since(MIN_SERVER_VER_CONTRACT_DATA_CHAIN, Field("reqId")),
+
+    # send contract fields
+    ContractBlock(
+        Field("contract.conId"),  # srv v37 and above
+        Field("contract.symbol"),
+        Field("contract.secType"),
+        Field("contract.lastTradeDateOrContractMonth"),
+        Field("contract.strike"),
+        Field("contract.right"),
+        Field("contract.multiplier"),  # srv v15 and above
+        Since(MIN_SERVER_VER_PRIMARYEXCH,
+            Field("contract.exchange"),
+            Field("contract.primaryExchange"),
+            orElse=[Since(MIN_SERVER_VER_LINKING,
+                When("contract.primaryExchange and"
+                     " (contract.exchange == 'BEST' or contract.exchange == 'SMART')",
+                    Field("contract.exchange + ':' + contract.primaryExchange"),
+                    orElse=[Field("contract.exchange")]))]),
+        Field("contract.currency"),
+        Field("contract.localSymbol"),
+        Since(MIN_SERVER_VER_TRADING_CLASS, Field("contract.tradingClass")),
+        Field("contract.includeExpired"),  # srv v31 and above
+        Since(MIN_SERVER_VER_SEC_ID_TYPE,
+            Field("contract.secIdType"),
+            Field("contract.secId"))))
+
+
+REQUESTS = (PLACE_ORDER, CANCEL_ORDER, REQ_MKT_DATA, CANCEL_MKT_DATA,
+            REQ_HISTORICAL_DATA, CANCEL_HISTORICAL_DATA, REQ_CONTRACT_DETAILS)
+
+
+def fieldText(val) -> str:
+    """ make_field() without the terminator """
+    if val is None:
+        raise ValueError("Cannot send None to TWS")
+    # bool type is encoded as int
+    if type(val) is bool:
+        return "1" if val else "0"
+    return str(val)
+
+
+class ContractCache:
+    """ the contract fields of the requests, encoded, by conId for each
+    (request, server version), so the same contract sent in several requests
+    (or orders) is encoded once per request kind
+
+    Each entry keeps the values of the contract attributes it was encoded
+    from, and their types, compared at each use: a contract changed since,
+    or another Contract with the same conId and other fields, is encoded
+    again and replaces the entry. The types matter since equal values can
+    be encoded differently (a strike of 100 is sent as "100", 100.0 as
+    "100.0"). The contracts without conId are not cached. When full, the
+    oldest entry of the kind makes room.
+
+    The compiled encoders look their entries up themselves, in the dict of
+    their kind, and only call miss(). """
+
+    def __init__(self, maxSize:int=10000):
+        self.maxSize = maxSize
+        # (request, server version): {conId: (values, types of the values, fields)}
+        self.blocks = {}
+
+    def __len__(self):
+        return sum(len(blocks) for blocks in list(self.blocks.values()))
+
+    def kindBlocks(self, kind) -> dict:
+        return self.blocks.setdefault(kind, {})
+
+    def miss(self, contract, blocks:dict, values:tuple, encode) -> str:
+        """ encodes the contract fields and keeps them in blocks, by conId
+        values: the attributes the fields are made of, conId first """
+        text = encode(contract)
+        conId = values[0]
+        if conId and self.maxSize:
+            if conId not in blocks and len(blocks) >= self.maxSize:
+                try:
+                    del blocks[next(iter(blocks))]
+                except (StopIteration, KeyError, RuntimeError):
+                    # emptied or changed by another thread meanwhile
+                    pass
+            blocks[conId] = (values, tuple(map(type, values)), text)
+        return text
+
+    def invalidate(self, conId:int=None):
+        """ drops the entries of conId, all of them by default """
+        for blocks in list(self.blocks.values()):
+            if conId is None:
+                blocks.clear()
+            else:
+                blocks.pop(conId, None)
+
+
+# shared by all the encoders, set maxSize to 0 to encode the contracts each
+# time; it is bound when compiling, so it is not to be replaced
+contractCache = ContractCache()
+
+
+class Compiler:
+    """ generates the source of the encoder of a Request for a server version
+
+    The fields are appended, as str without their terminator, to the list f
+    which is joined and encoded once at the end: cheaper than appending each
+    field to a bytearray. The str, int and float fields are converted inline,
+    the others (bool, None, ...) go through fieldText(). """
+
+    def __init__(self, serverVersion):
+        self.serverVersion = serverVersion
+        self.lines = []
+        self.consts = []
+        # the contractFields() of a ContractBlock and the contract
+        # attributes it uses
+        self.blockSource = ""
+        self.blockAttrs = ()
+
+    def emit(self, depth, line):
+        self.flushConsts(depth)
+        self.lines.append("    " * depth + line)
+
+    def flushConsts(self, depth):
+        if self.consts:
+            # only consts at the same depth are merged
+            consts = self.consts
+            self.consts = []
+            self.lines.append("    " * depth + "a(%r)" % "\0".join(consts))
+
+    def compileChecks(self, items, depth):
+        for item in items:
+            if type(item) is Check and self.serverVersion < item.maxVer:
+                self.emit(depth, "if %s:" % item.cond)
+                self.emit(depth + 1, "raise UnsupportedByServer(%r)" % item.text)
+
+    def compileItems(self, items, depth):
+        for item in items:
+            cls = type(item)
+            if cls is Const:
+                self.consts.append(fieldText(item.value))
+            elif cls is Field:
+                self.emit(depth, "x = %s" % item.expr)
+                self.emit(depth, "t = type(x)")
+                self.emit(depth, "a(x if t is str else str(x) if t is int or t is float"
+                                 " else fieldText(x))")
+            elif cls is FieldOrEmpty:
+                self.emit(depth, "x = %s" % item.expr)
+                self.emit(depth, "a('' if x == %r or x == %r else fieldText(x))"
+                                 % (UNSET_DOUBLE, UNSET_INTEGER))
+            elif cls is Fields:
+                self.emit(depth, "for x in %s:" % item.expr)
+                self.emit(depth + 1, "a(x[:-1])")
+            elif cls is Since:
+                self.compileItems(item.items if self.serverVersion >= item.minVer
+                                  else item.orElse, depth)
+            elif cls is When:
+                self.emit(depth, "if %s:" % item.cond)
+                self.compileBlock(item.items, depth + 1)
+                if item.orElse:
+                    self.emit(depth, "else:")
+                    self.compileBlock(item.orElse, depth + 1)
+            elif cls is ForEach:
+                self.emit(depth, "for %s in %s:" % (item.var, item.seq))
+                self.compileBlock(item.items, depth + 1)
+            elif cls is Code:
+                self.emit(depth, item.stmt)
+            elif cls is ContractBlock:
+                self.compileContractBlock(item, depth)
+            elif cls is not Check:
+                raise TypeError("unknown schema item %s" % item)
+
+    def compileBlock(self, items, depth):
+        nLines = len(self.lines)
+        self.compileItems(items, depth)
+        self.flushConsts(depth)
+        if len(self.lines) == nLines:
+            self.lines.append("    " * depth + "pass")
+
+    def compileContractBlock(self, block, depth):
+        compiler = Compiler(self.serverVersion)
+        compiler.lines = ["def contractFields(contract):"]
+        compiler.emit(1, "f = []")
+        compiler.emit(1, "a = f.append")
+        compiler.compileItems(block.items, 1)
+        compiler.flushConsts(1)
+        compiler.lines.append("    return '\\0'.join(f)")
+        self.blockSource = "\n".join(compiler.lines) + "\n\n"
+        attrs = ["conId"] + re.findall(r"\bcontract\.(\w+)", "\n".join(compiler.lines))
+        self.blockAttrs = tuple(sorted(set(attrs), key=attrs.index))
+        self.emit(depth, "v = contractValues(contract)")
+        self.emit(depth, "e = contractBlocks.get(v[0])")
+        self.emit(depth, "a(e[2] if e is not None and e[0] == v and e[1] == tuple(map(type, v))"
+                         " else contractCache.miss(contract, contractBlocks, v, contractFields))")
+
+    def source(self, request):
+        self.lines = ["def %s(%s):" % (request.name, ", ".join(request.params))]
+        self.compileChecks(request.items, 1)
+        self.emit(1, "f = []")
+        self.emit(1, "a = f.append")
+        self.compileItems(request.items, 1)
+        self.flushConsts(1)
+        self.lines.append("    b = ('\\0'.join(f) + '\\0').encode()")
+        self.lines.append("    return packSize(len(b)) + b")
+        return self.blockSource + "\n".join(self.lines) + "\n"
+
+
+def compileRequest(request, serverVersion):
+    compiler = Compiler(serverVersion)
+    source = compiler.source(request)
+    namespace = {
+        "UNSET_INTEGER": UNSET_INTEGER,
+        "UNSET_DOUBLE": UNSET_DOUBLE,
+        "UnsupportedByServer": UnsupportedByServer,
+        "fieldText": fieldText,
+        "packSize": struct.Struct("!I").pack,
+        "contractCache": contractCache,
+    }
+    if compiler.blockAttrs:
+        namespace["contractValues"] = operator.attrgetter(*compiler.blockAttrs)
+        namespace["contractBlocks"] = contractCache.kindBlocks((request.name, serverVersion))
+    exec(compile(source, "<encoder %s v%d>" % (request.name, serverVersion), "exec"),
+         namespace)
+    fn = namespace[request.name]
+    fn.source = source
+    return fn
+
+
+class Encoders:
+    """ the compiled encoders of all the REQUESTS for a server version, as
+    attributes named like the EClient requests """
+
+    def __init__(self, serverVersion):
+        self.serverVersion = serverVersion
+        for request in REQUESTS:
+            setattr(self, request.name, compileRequest(request, serverVersion))
+
+
+_encoders = {}
+
+
+def forServerVersion(serverVersion) -> Encoders:
+    """ compiled on first use, then shared """
+    encoders = _encoders.get(serverVersion)
+    if encoders is None:
+        logger.debug("compiling the request encoders for server version %s",
+                     serverVersion)
+        encoders = _encoders[serverVersion] = Encoders(serverVersion)
+    return encoders
@@ -38,4 +38,7 @@ BAD_MESSAGE = CodeMsgPair(508, "Bad message")
 SOCKET_EXCEPTION = CodeMsgPair(509, "Exception caught while reading socket - ")
 FAIL_CREATE_SOCK = CodeMsgPair(520, "Failed to create socket")
 SSL_FAIL = CodeMsgPair(530, "SSL specific error: ")
+MSG_QUEUE_FULL = CodeMsgPair(540, "Incoming message queue is full, disconnecting")
+SEND_TIMEOUT = CodeMsgPair(541, "Outgoing messages not taken by the socket in time, disconnecting")
+SEND_FAILED = CodeMsgPair(542, "Sending a message failed, the queued messages are dropped - ")
  
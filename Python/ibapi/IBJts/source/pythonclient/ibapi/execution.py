@@ -5,10 +5,15 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
 
 
 
-from ibapi.object_implem import Object
+from ibapi.object_implem import Object, valueSlots
 
 class Execution(Object):
 
+    __slots__ = valueSlots("execId", "time", "acctNumber", "exchange", "side", "shares",
+                           "price", "permId", "clientId", "orderId", "liquidation",
+                           "cumQty", "avgPrice", "orderRef", "evRule", "evMultiplier",
+                           "modelCode", "lastLiquidity")
+
     def __init__(self):
         self.execId = ""
         self.time =  ""
@@ -0,0 +1,193 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Latency tracing of the incoming msgs, from the socket to the EWrapper
+callback. With a LatencyTracer set on the EClient before connect(), each msg
+gets 4 timestamps (time.perf_counter_ns):
+- recv: Connection.recvMsgInto() got the first bytes of the packet
+- framed: the EReader took the msg out of the packet
+- dequeued: EClient.run() got it from the msg_queue
+- dispatched: Decoder.interpret() starts decoding it, and when the decoding
+  and the callback are done
+which give, per msg type, a histogram of each segment:
+- frame: recv -> framed
+- queue: framed -> dequeued
+- fields: dequeued -> dispatched, splitting the fields
+- interpret: dispatched -> callback returned
+- total: recv -> callback returned
+
+    app.latencyTracer = LatencyTracer(dumpFile="latency.txt")
+    app.connect(...)
+    ...
+    app.latencyTracer.stats()["TICK_PRICE"]["total"]["p99"]   # us
+    print(app.latencyTracer.report())
+
+The report is logged (and written to dumpFile) when the EClient disconnects.
+
+When no tracer is set nothing is timed: the Connection and the EReader test
+one attribute per packet, EClient.run() one per queue item and
+Decoder.interpret() is not touched at all, Decoder.setTracer() swapping it.
+"""
+
+import logging
+import time
+
+from ibapi.message import IN
+
+
+logger = logging.getLogger(__name__)
+
+
+MsgId2Name = {msgId: name for (name, msgId) in vars(IN).items()
+              if not name.startswith("_")}
+
+SEGMENTS = ("frame", "queue", "fields", "interpret", "total")
+
+
+class TracedMsg(bytes):
+    """ msg payload along with its recv and framed timestamps, so they
+    follow the msg through any msg_queue (reordered or conflated) """
+
+    def __new__(cls, msg, recvTime, framedTime):
+        self = super().__new__(cls, msg)
+        self.recvTime = recvTime
+        self.framedTime = framedTime
+        return self
+
+
+class LatencyHistogram:
+    """ log-linear histogram of ns durations: exact below 16ns, then 8
+    buckets per power of 2, so the percentiles are within 12.5% """
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket(ns):
+        shift = ns.bit_length() - 4
+        if shift <= 0:
+            return ns
+        return (shift << 3) + (ns >> shift)
+
+    @staticmethod
+    def bucketTop(idx):
+        """ largest ns in the bucket """
+        if idx < 16:
+            return idx
+        shift = (idx >> 3) - 1
+        return ((idx - (shift << 3) + 1) << shift) - 1
+
+    def record(self, ns):
+        if ns < 0:
+            ns = 0
+        idx = self.bucket(ns)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.count += 1
+        self.sum += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, pct):
+        """ upper bound in ns of the pct percentile """
+        if self.count == 0:
+            return 0
+        rank = pct / 100. * self.count
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                return min(self.bucketTop(idx), self.max)
+        return self.max
+
+
+class LatencyTracer:
+    def __init__(self, dumpFile=None, clock=time.perf_counter_ns):
+        self.dumpFile = dumpFile
+        self.clock = clock
+        # (msgId, segment) -> LatencyHistogram; only updated by the thread
+        # decoding the msgs, read from any
+        self.histograms = {}
+        self.pending = None
+
+
+    def histogram(self, msgId, segment):
+        key = (msgId, segment)
+        hist = self.histograms.get(key)
+        if hist is None:
+            hist = self.histograms[key] = LatencyHistogram()
+        return hist
+
+
+    def dequeued(self, msg, dequeuedTime):
+        """ EClient.run() is about to decode msg """
+        recvTime = getattr(msg, "recvTime", None)
+        if recvTime is None:
+            self.pending = None
+        else:
+            self.pending = (recvTime, msg.framedTime, dequeuedTime)
+
+
+    def dispatched(self, fields, dispatchedTime, doneTime):
+        """ Decoder.interpret() is done with fields """
+        msgId = int(fields[0])
+        self.histogram(msgId, "interpret").record(doneTime - dispatchedTime)
+        if self.pending is not None:
+            (recvTime, framedTime, dequeuedTime) = self.pending
+            self.pending = None
+            if recvTime:
+                self.histogram(msgId, "frame").record(framedTime - recvTime)
+                self.histogram(msgId, "total").record(doneTime - recvTime)
+            self.histogram(msgId, "queue").record(dequeuedTime - framedTime)
+            self.histogram(msgId, "fields").record(dispatchedTime - dequeuedTime)
+
+
+    def stats(self) -> dict:
+        """ {msg name: {segment: {count, mean, p50, p99, max}}}, in us """
+        stats = {}
+        for ((msgId, segment), hist) in list(self.histograms.items()):
+            if hist.count == 0:
+                continue
+            stats.setdefault(MsgId2Name.get(msgId, str(msgId)), {})[segment] = {
+                "count": hist.count,
+                "mean": hist.sum / hist.count / 1e3,
+                "p50": hist.percentile(50) / 1e3,
+                "p99": hist.percentile(99) / 1e3,
+                "max": hist.max / 1e3}
+        return stats
+
+
+    def report(self) -> str:
+        lines = ["%-32s %-10s %9s %10s %10s %10s" % ("msg", "segment", "count",
+                                                     "p50 us", "p99 us", "max us")]
+        for (name, segments) in sorted(self.stats().items()):
+            for segment in SEGMENTS:
+                if segment in segments:
+                    s = segments[segment]
+                    lines.append("%-32s %-10s %9d %10.1f %10.1f %10.1f" % (
+                        name, segment, s["count"], s["p50"], s["p99"], s["max"]))
+        return "\n".join(lines)
+
+
+    def reset(self):
+        self.histograms = {}
+        self.pending = None
+
+
+    def connectionClosed(self):
+        """ logs the report, and writes it to dumpFile if any """
+        if not self.histograms:
+            return
+        report = self.report()
+        logger.info("incoming msgs latency:\n%s", report)
+        if self.dumpFile:
+            with open(self.dumpFile, "w") as f:
+                f.write(report + "\n")
@@ -0,0 +1,75 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+How much the client logs per msg.
+
+In the default VERBOSE mode each EClient request logs its name and
+parameters (found by walking the stack frame and copying the locals), each
+sent msg is logged with the name of the request, each default EWrapper
+callback logs its name and parameters and the Connection/EReader/EClient.run()
+log their progress at debug level for each msg. All of it is done even when
+the loggers would drop the records, since the parameters are gathered first.
+
+In PRODUCTION mode none of this happens: each of these places only tests
+log_mode.verbose. The errors and the connection events are logged as before.
+Some visibility can be kept with a sampled wire trace: 1 msg in sample
+of each direction is logged at INFO level, raw, without any frame walking.
+
+    from ibapi import log_mode
+    log_mode.setLogMode(log_mode.PRODUCTION, sample=1000)
+
+The IBAPI_LOG_MODE environment variable ("production" or "verbose") and
+IBAPI_WIRE_SAMPLE give the mode at import time.
+"""
+
+import itertools
+import logging
+import os
+
+
+logger = logging.getLogger(__name__)
+
+
+(VERBOSE, PRODUCTION) = ("verbose", "production")
+
+verbose = os.environ.get("IBAPI_LOG_MODE", VERBOSE).lower() != PRODUCTION
+# log 1 msg in wireSample each way when not verbose, 0 for none
+wireSample = int(os.environ.get("IBAPI_WIRE_SAMPLE", "0"))
+
+# itertools.count is atomic under the GIL, the Reader and the sending
+# threads can share them
+_nSent = itertools.count(1)
+_nRecvd = 0
+
+
+def setLogMode(mode, sample=0):
+    global verbose, wireSample
+    if mode not in (VERBOSE, PRODUCTION):
+        raise ValueError("unknown log mode %s" % mode)
+    verbose = mode == VERBOSE
+    wireSample = sample
+
+
+def logMode():
+    return VERBOSE if verbose else PRODUCTION
+
+
+def sampleSent(msg):
+    """ msg framed for the wire, from EClient.sendMsg() """
+    if next(_nSent) % wireSample == 0:
+        logger.info("SENT %s", msg)
+
+
+def sampleReceived(msgs):
+    """ msg payloads framed by the EReader from one packet """
+    global _nRecvd
+    n = _nRecvd + len(msgs)
+    # the msg numbered by the last multiple of wireSample reached
+    k = n - n % wireSample
+    if k > _nRecvd:
+        logger.info("RECEIVED %s", msgs[k - _nRecvd - 1])
+    _nRecvd = n
@@ -0,0 +1,385 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Queues that can replace the plain Queue between the EReader and EClient.run().
+
+The LaneQueue puts each incoming msg in a lane, based on its msg id (the
+first field), and get() always serves the highest priority lane that is not
+empty, so order and execution events never wait behind a big burst of
+historical or reference data. The order is kept inside each lane.
+
+    app = EClient(wrapper)
+    app.msg_queue = LaneQueue()
+    app.connect(...)
+
+The ConflatingQueue is a LaneQueue that, in addition, keeps only the latest
+update per (reqId, tickType) for the top of book tick msgs that are still
+waiting in the queue. This only happens when the consumer is lagging behind:
+if EClient.run() keeps up there is nothing queued to conflate with. Order and
+execution msgs are never conflated, nor the RTVolume and RT Trade Volume tick
+strings, which are trade prints rather than latest values.
+
+The BoundedQueue is a queue of limited size with a policy for when it is
+full: block the EReader (which stops reading the socket), drop the oldest
+market data msgs, or disconnect with an error. It keeps the msgs in the
+order received, or serves them by lane like the LaneQueue with lanePriority.
+"""
+
+import collections
+import queue
+import time
+
+from ibapi.common import NO_VALID_ID
+from ibapi.enum_implem import Enum
+from ibapi.errors import MSG_QUEUE_FULL
+from ibapi.message import IN
+from ibapi.ticktype import TickTypeEnum
+
+
+MsgLaneEnum = Enum("ORDERS", "MKT_DATA", "BULK")
+OverflowPolicyEnum = Enum("BLOCK", "DROP_OLDEST_MKT_DATA", "DISCONNECT")
+
+MsgId2Lane = {}
+for msgId in (IN.ORDER_STATUS, IN.ERR_MSG, IN.OPEN_ORDER, IN.OPEN_ORDER_END,
+              IN.NEXT_VALID_ID, IN.EXECUTION_DATA, IN.EXECUTION_DATA_END,
+              IN.COMMISSION_REPORT, IN.ORDER_BOUND):
+    MsgId2Lane[msgId] = MsgLaneEnum.ORDERS
+for msgId in (IN.CONTRACT_DATA, IN.CONTRACT_DATA_END, IN.BOND_CONTRACT_DATA,
+              IN.HISTORICAL_DATA, IN.SCANNER_PARAMETERS, IN.SCANNER_DATA,
+              IN.FUNDAMENTAL_DATA, IN.SECURITY_DEFINITION_OPTION_PARAMETER,
+              IN.SECURITY_DEFINITION_OPTION_PARAMETER_END, IN.SOFT_DOLLAR_TIERS,
+              IN.FAMILY_CODES, IN.SYMBOL_SAMPLES, IN.MKT_DEPTH_EXCHANGES,
+              IN.SMART_COMPONENTS, IN.NEWS_ARTICLE, IN.NEWS_PROVIDERS,
+              IN.HISTORICAL_NEWS, IN.HISTORICAL_NEWS_END, IN.HEAD_TIMESTAMP,
+              IN.HISTOGRAM_DATA, IN.MARKET_RULE, IN.HISTORICAL_TICKS,
+              IN.HISTORICAL_TICKS_BID_ASK, IN.HISTORICAL_TICKS_LAST,
+              IN.COMPLETED_ORDER, IN.COMPLETED_ORDERS_END):
+    MsgId2Lane[msgId] = MsgLaneEnum.BULK
+# anything else (ticks, depth, bars, account updates, ...) goes in MKT_DATA
+
+
+def msg_id(text:bytes) -> int:
+    """ the msg id is the first field of the msg payload """
+    return int(text[:text.index(b"\0")])
+
+
+def msg_lane(text:bytes) -> int:
+    return MsgId2Lane.get(msg_id(text), MsgLaneEnum.MKT_DATA)
+
+
+# all these have: msgId, version, reqId, tickType, ...
+ConflatedMsgIds = frozenset((IN.TICK_PRICE, IN.TICK_SIZE, IN.TICK_GENERIC,
+    IN.TICK_STRING, IN.TICK_EFP, IN.TICK_OPTION_COMPUTATION))
+# the TICK_STRING tick types of the trade prints, each of them is kept
+TradePrintTickTypes = frozenset(str(tickType).encode() for tickType in
+    (TickTypeEnum.RT_VOLUME, TickTypeEnum.RT_TRD_VOLUME))
+
+
+def conflation_key(text:bytes):
+    """ (msgId, reqId, tickType) for the msgs that can be conflated, None
+    for the others """
+    fields = text.split(b"\0", 4)
+    msgId = int(fields[0])
+    if msgId in ConflatedMsgIds and len(fields) == 5:
+        if msgId == IN.TICK_STRING and fields[3] in TradePrintTickTypes:
+            return None
+        return (msgId, fields[2], fields[3])
+    return None
+
+
+class LaneQueue(queue.Queue):
+    """ queue.Queue serving the msgs by lane priority. It also accepts the
+    lists of msgs queued by the EReader in batch mode, they are split by lane
+    and count as one item per lane. """
+
+    def _init(self, maxsize):
+        self.lanes = [collections.deque() for _ in MsgLaneEnum.idx2name]
+        self.nMsgs = [0] * len(self.lanes)
+        self.maxDepth = [0] * len(self.lanes)
+        self.depth = 0
+
+    def _qsize(self):
+        return self.depth
+
+    def _put(self, item):
+        if type(item) is list:
+            byLane = collections.defaultdict(list)
+            for text in item:
+                byLane[msg_lane(text)].append(text)
+            for (laneIdx, texts) in byLane.items():
+                self._putInLane(laneIdx, texts, len(texts))
+        else:
+            self._putInLane(msg_lane(item), item, 1)
+
+    def _putInLane(self, laneIdx, item, nMsgs):
+        lane = self.lanes[laneIdx]
+        lane.append(item)
+        self.depth += 1
+        self.nMsgs[laneIdx] += nMsgs
+        if len(lane) > self.maxDepth[laneIdx]:
+            self.maxDepth[laneIdx] = len(lane)
+
+    def _get(self):
+        for lane in self.lanes:
+            if lane:
+                self.depth -= 1
+                return lane.popleft()
+
+    def _dropOldest(self, laneIdx):
+        """ removes the oldest item of the lane, returns the number of msgs
+        in it or 0 if the lane is empty """
+        lane = self.lanes[laneIdx]
+        if not lane:
+            return 0
+        self.depth -= 1
+        item = lane.popleft()
+        return len(item) if type(item) is list else 1
+
+    def laneStats(self) -> dict:
+        """ per lane: current depth, highest depth seen and total msgs """
+        with self.mutex:
+            return {MsgLaneEnum.to_str(laneIdx): {
+                        "depth": len(lane),
+                        "maxDepth": self.maxDepth[laneIdx],
+                        "msgs": self.nMsgs[laneIdx]}
+                    for (laneIdx, lane) in enumerate(self.lanes)}
+
+
+class ConflatingQueue(LaneQueue):
+    """ LaneQueue where a tick update replaces the queued one with the same
+    (msgId, reqId, tickType). The surviving update moves to the back of the
+    MKT_DATA lane, so the updates are still delivered in the order of their
+    latest value. """
+
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        self.lanes[MsgLaneEnum.MKT_DATA] = collections.OrderedDict()
+        self.seq = 0
+        self.nDropped = 0
+        self.nMerged = 0
+        self.msgId2nDropped = collections.Counter()
+
+    def _putInLane(self, laneIdx, item, nMsgs):
+        if laneIdx != MsgLaneEnum.MKT_DATA:
+            super()._putInLane(laneIdx, item, nMsgs)
+            return
+
+        lane = self.lanes[laneIdx]
+        for text in (item if type(item) is list else (item, )):
+            key = conflation_key(text)
+            if key is None:
+                key = self.seq
+                self.seq += 1
+            nUpdates = 1
+            if key in lane:
+                (_, nUpdates) = lane.pop(key)
+                nUpdates += 1
+                self.nDropped += 1
+                self.msgId2nDropped[key[0]] += 1
+            else:
+                self.depth += 1
+            lane[key] = (text, nUpdates)
+        self.nMsgs[laneIdx] += nMsgs
+        if len(lane) > self.maxDepth[laneIdx]:
+            self.maxDepth[laneIdx] = len(lane)
+
+    def _get(self):
+        for (laneIdx, lane) in enumerate(self.lanes):
+            if lane:
+                self.depth -= 1
+                if laneIdx != MsgLaneEnum.MKT_DATA:
+                    return lane.popleft()
+                (_, (text, nUpdates)) = lane.popitem(last=False)
+                if nUpdates > 1:
+                    self.nMerged += 1
+                return text
+
+    def _dropOldest(self, laneIdx):
+        if laneIdx != MsgLaneEnum.MKT_DATA:
+            return super()._dropOldest(laneIdx)
+        lane = self.lanes[laneIdx]
+        if not lane:
+            return 0
+        self.depth -= 1
+        lane.popitem(last=False)
+        return 1
+
+    def conflationStats(self) -> dict:
+        """ dropped: stale updates discarded, merged: delivered updates that
+        stood for more than one received update, byMsgId: dropped per msg id """
+        with self.mutex:
+            return {"dropped": self.nDropped,
+                    "merged": self.nMerged,
+                    "byMsgId": dict(self.msgId2nDropped)}
+
+
+class BoundedQueue(LaneQueue):
+    """ queue holding at most maxsize items.
+
+    It serves the msgs in the order they were received, unless lanePriority
+    is set: then it serves them by lane like the LaneQueue, and e.g. an
+    ERR_MSG can overtake the HISTORICAL_DATA it is about.
+
+    When it is full, put() applies the policy:
+    - BLOCK: wait for room, the EReader stops reading from the socket
+    - DROP_OLDEST_MKT_DATA: discard the oldest msgs of the MKT_DATA lane;
+        if there are none it blocks, order msgs are never dropped
+    - DISCONNECT: report MSG_QUEUE_FULL to the wrapper and raise queue.Full,
+        upon which the EReader closes the connection
+
+    In batch mode an item is the list of msgs of a packet, which is only
+    dropped if all its msgs are market data. With lanePriority it is split
+    by lane into as many items, so a put() done with maxsize - 1 items
+    queued can take it up to maxsize + 2.
+
+    The first time the queue reaches highWaterMark items (and again after it
+    went back below half of it) wrapper.msgQueueHighWater() is called. The
+    wrapper is called without the queue lock held.
+
+    A put() waiting for room gives up, dropping its item, once conn (the
+    Connection, set by EClient.startReader()) is closed: the EReader does not
+    outlive an EClient.run() that stopped with the queue full. """
+
+    # seconds between the checks of the connection while waiting for room
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, maxsize, policy=OverflowPolicyEnum.BLOCK,
+                 highWaterMark=None, lanePriority=False):
+        if maxsize <= 0:
+            raise ValueError("a BoundedQueue needs a maxsize")
+        self.policy = policy
+        self.highWaterMark = highWaterMark or max(1, maxsize * 8 // 10)
+        self.lanePriority = lanePriority
+        self.wrapper = None
+        self.conn = None
+        super().__init__(maxsize)
+
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        self.seq = 0            # arrival order when not lanePriority
+        self.maxQsize = 0
+        self.aboveHighWater = False
+        self.nHighWater = 0
+        self.nDropped = 0
+        self.nOverflows = 0
+
+    def put(self, item, block=True, timeout=None):
+        with self.not_full:
+            overflow = (self.policy == OverflowPolicyEnum.DISCONNECT
+                        and self._qsize() >= self.maxsize)
+            if overflow:
+                self.nOverflows += 1
+            else:
+                crossed = self._putWaiting(item, block, timeout)
+                if crossed is None:
+                    return
+                depth = self._qsize()
+
+        if overflow:
+            if self.wrapper:
+                self.wrapper.error(NO_VALID_ID, MSG_QUEUE_FULL.code(),
+                                   MSG_QUEUE_FULL.msg())
+            raise queue.Full
+        if crossed and self.wrapper:
+            self.wrapper.msgQueueHighWater(depth, self.maxsize)
+
+    def _putWaiting(self, item, block, timeout):
+        """ queue.Queue.put() with not_full held, True when the high water
+        mark is crossed, None when the item is dropped as the connection is
+        closed """
+        if (self.policy == OverflowPolicyEnum.DROP_OLDEST_MKT_DATA
+                and self._qsize() >= self.maxsize):
+            while self._qsize() >= self.maxsize:
+                nDropped = self._dropOldest(MsgLaneEnum.MKT_DATA)
+                if nDropped == 0:
+                    break
+                self.nDropped += nDropped
+
+        # same as queue.Queue.put(), but for the closed connection
+        if not block:
+            if self._qsize() >= self.maxsize:
+                raise queue.Full
+        elif timeout is not None and timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number")
+        else:
+            endtime = None if timeout is None else time.monotonic() + timeout
+            while self._qsize() >= self.maxsize:
+                if self.conn is not None and not self.conn.isConnected():
+                    return None
+                wait = self.POLL_INTERVAL
+                if endtime is not None:
+                    remaining = endtime - time.monotonic()
+                    if remaining <= 0.0:
+                        raise queue.Full
+                    wait = min(wait, remaining)
+                self.not_full.wait(wait)
+        self._put(item)
+        self.unfinished_tasks += 1
+        self.not_empty.notify()
+
+        depth = self._qsize()
+        if depth > self.maxQsize:
+            self.maxQsize = depth
+        if not self.aboveHighWater and depth >= self.highWaterMark:
+            self.aboveHighWater = True
+            self.nHighWater += 1
+            return True
+        return False
+
+    def _put(self, item):
+        if self.lanePriority:
+            super()._put(item)
+        elif type(item) is list:
+            # one item, in MKT_DATA only if it can be dropped as a whole
+            msgLanes = [msg_lane(text) for text in item]
+            laneIdx = MsgLaneEnum.MKT_DATA
+            for msgLane in msgLanes:
+                self.nMsgs[msgLane] += 1
+                if msgLane != MsgLaneEnum.MKT_DATA:
+                    laneIdx = msgLane
+            self._putInLane(laneIdx, item, 0)
+        else:
+            self._putInLane(msg_lane(item), item, 1)
+
+    def _putInLane(self, laneIdx, item, nMsgs):
+        if not self.lanePriority:
+            item = (self.seq, item)
+            self.seq += 1
+        super()._putInLane(laneIdx, item, nMsgs)
+
+    def _get(self):
+        if self.lanePriority:
+            item = super()._get()
+        else:
+            # the oldest of the lane heads
+            lane = min((lane for lane in self.lanes if lane),
+                       key=lambda lane: lane[0][0])
+            self.depth -= 1
+            (_, item) = lane.popleft()
+        if self.aboveHighWater and self.depth < self.highWaterMark // 2:
+            self.aboveHighWater = False
+        return item
+
+    def _dropOldest(self, laneIdx):
+        if self.lanePriority:
+            return super()._dropOldest(laneIdx)
+        lane = self.lanes[laneIdx]
+        if not lane:
+            return 0
+        self.depth -= 1
+        (_, item) = lane.popleft()
+        return len(item) if type(item) is list else 1
+
+    def queueStats(self) -> dict:
+        with self.mutex:
+            return {"depth": self._qsize(),
+                    "maxsize": self.maxsize,
+                    "maxDepth": self.maxQsize,
+                    "highWaterMark": self.highWaterMark,
+                    "highWaterCrossings": self.nHighWater,
+                    "dropped": self.nDropped,
+                    "overflows": self.nOverflows}
@@ -3,7 +3,25 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
  and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
 """
 
+import os
+
+
+# IBAPI_SLOTTED=1 in the environment when ibapi is imported gives the value
+# objects received in bulk (BarData, Contract, Order, ...) __slots__ instead
+# of a per instance __dict__: less memory, but no attributes of one's own
+# and no vars() on them
+slotted = os.environ.get("IBAPI_SLOTTED", "") not in ("", "0")
+
+
+def valueSlots(*names) -> tuple:
+    """ __slots__ of a bulk value object: its attributes in slotted mode,
+    otherwise a __dict__ (and weakref support) as any plain class """
+    return names if slotted else ("__dict__", "__weakref__")
+
+
 class Object(object):
+    # no __dict__ for the subclasses that list their attributes in __slots__
+    __slots__ = ()
 
     def __str__(self):
         return "Object"
@@ -11,4 +29,4 @@ class Object(object):
     def __repr__(self):
         return str(id(self)) + ": " + self.__str__()
 
-  
+
@@ -5,7 +5,7 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
 
 
 from ibapi.common import UNSET_INTEGER, UNSET_DOUBLE
-from ibapi.object_implem import Object
+from ibapi.object_implem import Object, valueSlots
 from ibapi.softdollartier import SoftDollarTier
 
 # enum Origin
@@ -25,6 +25,51 @@ class OrderComboLeg(Object):
 
 
 class Order(Object):
+    __slots__ = valueSlots("softDollarTier", "orderId", "clientId", "permId", "action",
+                           "totalQuantity", "orderType", "lmtPrice", "auxPrice", "tif",
+                           "activeStartTime", "activeStopTime", "ocaGroup", "ocaType",
+                           "orderRef", "transmit", "parentId", "blockOrder",
+                           "sweepToFill", "displaySize", "triggerMethod", "outsideRth",
+                           "hidden", "goodAfterTime", "goodTillDate", "rule80A",
+                           "allOrNone", "minQty", "percentOffset",
+                           "overridePercentageConstraints", "trailStopPrice",
+                           "trailingPercent", "faGroup", "faProfile", "faMethod",
+                           "faPercentage", "designatedLocation", "openClose", "origin",
+                           "shortSaleSlot", "exemptCode", "discretionaryAmt",
+                           "eTradeOnly", "firmQuoteOnly", "nbboPriceCap",
+                           "optOutSmartRouting", "auctionStrategy", "startingPrice",
+                           "stockRefPrice", "delta", "stockRangeLower", "stockRangeUpper",
+                           "randomizePrice", "randomizeSize", "volatility",
+                           "volatilityType", "deltaNeutralOrderType",
+                           "deltaNeutralAuxPrice", "deltaNeutralConId",
+                           "deltaNeutralSettlingFirm", "deltaNeutralClearingAccount",
+                           "deltaNeutralClearingIntent", "deltaNeutralOpenClose",
+                           "deltaNeutralShortSale", "deltaNeutralShortSaleSlot",
+                           "deltaNeutralDesignatedLocation", "continuousUpdate",
+                           "referencePriceType", "basisPoints", "basisPointsType",
+                           "scaleInitLevelSize", "scaleSubsLevelSize",
+                           "scalePriceIncrement", "scalePriceAdjustValue",
+                           "scalePriceAdjustInterval", "scaleProfitOffset",
+                           "scaleAutoReset", "scaleInitPosition", "scaleInitFillQty",
+                           "scaleRandomPercent", "scaleTable", "hedgeType", "hedgeParam",
+                           "account", "settlingFirm", "clearingAccount", "clearingIntent",
+                           "algoStrategy", "algoParams", "smartComboRoutingParams",
+                           "algoId", "whatIf", "notHeld", "solicited", "modelCode",
+                           "orderComboLegs", "orderMiscOptions", "referenceContractId",
+                           "peggedChangeAmount", "isPeggedChangeAmountDecrease",
+                           "referenceChangeAmount", "referenceExchangeId",
+                           "adjustedOrderType", "triggerPrice", "adjustedStopPrice",
+                           "adjustedStopLimitPrice", "adjustedTrailingAmount",
+                           "adjustableTrailingUnit", "lmtPriceOffset", "conditions",
+                           "conditionsCancelOrder", "conditionsIgnoreRth", "extOperator",
+                           "cashQty", "mifid2DecisionMaker", "mifid2DecisionAlgo",
+                           "mifid2ExecutionTrader", "mifid2ExecutionAlgo",
+                           "dontUseAutoPriceForHedge", "isOmsContainer",
+                           "discretionaryUpToLimitPrice", "autoCancelDate",
+                           "filledQuantity", "refFuturesConId", "autoCancelParent",
+                           "shareholder", "imbalanceOnly", "routeMarketableToBbo",
+                           "parentPermId", "usePriceMgmtAlgo")
+
     def __init__(self):
         self.softDollarTier = SoftDollarTier("", "", "")
         # order identifier
@@ -0,0 +1,208 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Order book maintained from the updateMktDepth()/updateMktDepthL2() events.
+
+Each side of an OrderBook is a pair of preallocated arrays (prices, sizes)
+plus the list of market makers, indexed by the row position the events refer
+to. An update touches one row; an insert or a delete shifts the rows below it
+with a slice copy, which is bounded by the number of rows requested. No object
+is created per event, the book only grows when more rows than expected come.
+
+The OrderBookWrapper keeps one OrderBook per reqId and calls
+orderBookUpdate() after applying each event:
+
+    class App(OrderBookWrapper, EClient):
+        def __init__(self):
+            OrderBookWrapper.__init__(self)
+            EClient.__init__(self, wrapper=self)
+
+        def orderBookUpdate(self, reqId, book):
+            print(book.microprice(), book.imbalance(5))
+"""
+
+import array
+import logging
+
+from ibapi.common import TickerId
+from ibapi.enum_implem import Enum
+from ibapi.wrapper import EWrapper
+
+
+logger = logging.getLogger(__name__)
+
+
+DepthSideEnum = Enum("ASK", "BID")
+DepthOperationEnum = Enum("INSERT", "UPDATE", "DELETE")
+
+
+class OrderBook:
+    def __init__(self, numRows:int=10):
+        self.numRows = max(1, numRows)
+        self.prices = [array.array("d", bytes(8 * self.numRows)) for _ in DepthSideEnum.idx2name]
+        self.sizes = [array.array("q", bytes(8 * self.numRows)) for _ in DepthSideEnum.idx2name]
+        self.marketMakers = [[""] * self.numRows for _ in DepthSideEnum.idx2name]
+        self.depth = [0, 0]
+        self.nEvents = 0
+
+
+    def _grow(self, numRows):
+        """ new arrays, the views handed out before keep the old ones """
+        logger.debug("growing order book from %d to %d rows", self.numRows, numRows)
+        extra = numRows - self.numRows
+        for side in DepthSideEnum.idx2name:
+            self.prices[side] = self.prices[side] + array.array("d", bytes(8 * extra))
+            self.sizes[side] = self.sizes[side] + array.array("q", bytes(8 * extra))
+            self.marketMakers[side] = self.marketMakers[side] + [""] * extra
+        self.numRows = numRows
+
+
+    def update(self, position:int, operation:int, side:int, price:float,
+               size:int, marketMaker:str=""):
+        """ applies one depth event, with the args of updateMktDepth(L2) """
+        self.nEvents += 1
+        depth = self.depth[side]
+        prices = self.prices[side]
+        sizes = self.sizes[side]
+
+        if operation == DepthOperationEnum.UPDATE and position < depth:
+            prices[position] = price
+            sizes[position] = size
+            self.marketMakers[side][position] = marketMaker
+
+        elif operation == DepthOperationEnum.DELETE:
+            if position >= depth:
+                return
+            prices[position:depth-1] = prices[position+1:depth]
+            sizes[position:depth-1] = sizes[position+1:depth]
+            mms = self.marketMakers[side]
+            mms[position:depth-1] = mms[position+1:depth]
+            self.depth[side] = depth - 1
+
+        else:
+            # insert, or update of a row we do not have yet
+            if depth == self.numRows:
+                self._grow(2 * self.numRows)
+                prices = self.prices[side]
+                sizes = self.sizes[side]
+            position = min(position, depth)
+            prices[position+1:depth+1] = prices[position:depth]
+            sizes[position+1:depth+1] = sizes[position:depth]
+            mms = self.marketMakers[side]
+            mms[position+1:depth+1] = mms[position:depth]
+            prices[position] = price
+            sizes[position] = size
+            mms[position] = marketMaker
+            self.depth[side] = depth + 1
+
+
+    def clear(self):
+        self.depth = [0, 0]
+
+
+    def top(self, side:int, nRows:int=None):
+        """ (prices, sizes) of the first nRows of a side, as memoryviews of
+        the book's arrays: no copy is made, they show the book as it is until
+        the next event. Use list() or bytes() on them to keep a snapshot. """
+        n = self.depth[side] if nRows is None else min(nRows, self.depth[side])
+        return (memoryview(self.prices[side])[:n],
+                memoryview(self.sizes[side])[:n])
+
+
+    def bestBid(self):
+        """ (price, size) or None """
+        if self.depth[DepthSideEnum.BID] == 0:
+            return None
+        return (self.prices[DepthSideEnum.BID][0], self.sizes[DepthSideEnum.BID][0])
+
+
+    def bestAsk(self):
+        """ (price, size) or None """
+        if self.depth[DepthSideEnum.ASK] == 0:
+            return None
+        return (self.prices[DepthSideEnum.ASK][0], self.sizes[DepthSideEnum.ASK][0])
+
+
+    def mid(self):
+        if self.depth[DepthSideEnum.BID] == 0 or self.depth[DepthSideEnum.ASK] == 0:
+            return None
+        return (self.prices[DepthSideEnum.BID][0] + self.prices[DepthSideEnum.ASK][0]) / 2
+
+
+    def spread(self):
+        if self.depth[DepthSideEnum.BID] == 0 or self.depth[DepthSideEnum.ASK] == 0:
+            return None
+        return self.prices[DepthSideEnum.ASK][0] - self.prices[DepthSideEnum.BID][0]
+
+
+    def microprice(self):
+        """ the top of book prices weighted by the size on the other side,
+        None if a side is empty """
+        if self.depth[DepthSideEnum.BID] == 0 or self.depth[DepthSideEnum.ASK] == 0:
+            return None
+        bidPrice = self.prices[DepthSideEnum.BID][0]
+        askPrice = self.prices[DepthSideEnum.ASK][0]
+        bidSize = self.sizes[DepthSideEnum.BID][0]
+        askSize = self.sizes[DepthSideEnum.ASK][0]
+        if bidSize + askSize == 0:
+            return (bidPrice + askPrice) / 2
+        return (bidPrice * askSize + askPrice * bidSize) / (bidSize + askSize)
+
+
+    def imbalance(self, nRows:int=1):
+        """ (bid size - ask size) / (bid size + ask size) over the first
+        nRows of each side: from -1 (all asks) to 1 (all bids), None if
+        there is no size at all """
+        bidSize = sum(self.top(DepthSideEnum.BID, nRows)[1])
+        askSize = sum(self.top(DepthSideEnum.ASK, nRows)[1])
+        if bidSize + askSize == 0:
+            return None
+        return (bidSize - askSize) / (bidSize + askSize)
+
+
+    def __str__(self):
+        return "OrderBook bids: %s asks: %s" % tuple(
+            list(zip(*(view.tolist() for view in self.top(side))))
+            for side in (DepthSideEnum.BID, DepthSideEnum.ASK))
+
+
+class OrderBookWrapper(EWrapper):
+    """ EWrapper keeping an OrderBook per market depth reqId in orderBooks.
+    The books are created on the first event of a reqId; cancelMktDepth()
+    does not remove them, del orderBooks[reqId] does. """
+
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.orderBooks = {}
+        self.orderBookRows = 10     # initial rows of a new book
+
+
+    def _orderBook(self, reqId):
+        book = self.orderBooks.get(reqId)
+        if book is None:
+            book = self.orderBooks[reqId] = OrderBook(self.orderBookRows)
+        return book
+
+
+    def updateMktDepth(self, reqId:TickerId, position:int, operation:int,
+                       side:int, price:float, size:int):
+        book = self._orderBook(reqId)
+        book.update(position, operation, side, price, size)
+        self.orderBookUpdate(reqId, book)
+
+
+    def updateMktDepthL2(self, reqId:TickerId, position:int, marketMaker:str,
+                         operation:int, side:int, price:float, size:int,
+                         isSmartDepth:bool):
+        book = self._orderBook(reqId)
+        book.update(position, operation, side, price, size, marketMaker)
+        self.orderBookUpdate(reqId, book)
+
+
+    def orderBookUpdate(self, reqId:TickerId, book:OrderBook):
+        """ called after each depth event was applied to the book """
+        pass
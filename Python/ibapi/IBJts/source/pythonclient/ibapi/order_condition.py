@@ -38,7 +38,7 @@ class OrderCondition(Object):
         return self
 
     def decode(self, fields):
-        connector = decode(str, fields)
+        connector = fields.str()
         self.isConjunctionConnection = connector == "a"
 
     def make_fields(self):
@@ -60,9 +60,9 @@ class ExecutionCondition(OrderCondition):
 
     def decode(self, fields):
         OrderCondition.decode(self, fields)
-        self.secType = decode(str, fields)
-        self.exchange = decode(str, fields)
-        self.symbol = decode(str, fields)
+        self.secType = fields.str()
+        self.exchange = fields.str()
+        self.symbol = fields.str()
 
     def make_fields(self):
         flds = OrderCondition.make_fields(self) + \
@@ -89,8 +89,8 @@ class OperatorCondition(OrderCondition):
 
     def decode(self, fields):
         OrderCondition.decode(self, fields)
-        self.isMore = decode(bool, fields)
-        text = decode(str, fields)
+        self.isMore = fields.bool()
+        text = fields.str()
         self.setValueFromString(text)
 
     def make_fields(self):
@@ -135,8 +135,8 @@ class ContractCondition(OperatorCondition):
 
     def decode(self, fields):
         OperatorCondition.decode(self, fields)
-        self.conId = decode(int, fields)
-        self.exchange = decode(str, fields)
+        self.conId = fields.int()
+        self.exchange = fields.str()
 
     def make_fields(self):
         flds = OperatorCondition.make_fields(self) + \
@@ -192,7 +192,7 @@ class PriceCondition(ContractCondition):
 
     def decode(self, fields):
         ContractCondition.decode(self, fields)
-        self.triggerMethod = decode(int, fields)
+        self.triggerMethod = fields.int()
 
     def make_fields(self):
         flds = ContractCondition.make_fields(self) + \
@@ -3,6 +3,8 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
  and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
 """
 
+import functools
+
 from ibapi import order_condition
 from ibapi.object_implem import Object
 from ibapi.utils import * # @UnusedWildImport
@@ -16,428 +18,570 @@ from ibapi.softdollartier import SoftDollarTier
 logger = logging.getLogger(__name__)
 
 class OrderDecoder(Object):
+    """ Decodes the OPEN_ORDER and COMPLETED_ORDER msgs into self.contract,
+    self.order and self.orderState. The Decoder keeps one per connection and
+    only swaps in new objects (and the versions) for each msg: the sequences
+    of decode steps are bound once, here. """
+
     def __init__(self, contract, order, orderState, version, serverVersion):
         self.contract = contract
         self.order = order
         self.orderState = orderState
         self.version = version
         self.serverVersion = serverVersion
-        self.discoverParams()
+
+        self.openOrderSteps = (
+            self.decodeOrderId,
+            self.decodeContractFields,
+            self.decodeAction,
+            self.decodeTotalQuantity,
+            self.decodeOrderType,
+            self.decodeLmtPrice,
+            self.decodeAuxPrice,
+            self.decodeTIF,
+            self.decodeOcaGroup,
+            self.decodeAccount,
+            self.decodeOpenClose,
+            self.decodeOrigin,
+            self.decodeOrderRef,
+            self.decodeClientId,
+            self.decodePermId,
+            self.decodeOutsideRth,
+            self.decodeHidden,
+            self.decodeDiscretionaryAmt,
+            self.decodeGoodAfterTime,
+            self.skipSharesAllocation,
+            self.decodeFAParams,
+            self.decodeModelCode,
+            self.decodeGoodTillDate,
+            self.decodeRule80A,
+            self.decodePercentOffset,
+            self.decodeSettlingFirm,
+            self.decodeShortSaleParams,
+            self.decodeAuctionStrategy,
+            self.decodeBoxOrderParams,
+            self.decodePegToStkOrVolOrderParams,
+            self.decodeDisplaySize,
+            self.decodeBlockOrder,
+            self.decodeSweepToFill,
+            self.decodeAllOrNone,
+            self.decodeMinQty,
+            self.decodeOcaType,
+            self.decodeETradeOnly,
+            self.decodeFirmQuoteOnly,
+            self.decodeNbboPriceCap,
+            self.decodeParentId,
+            self.decodeTriggerMethod,
+            functools.partial(self.decodeVolOrderParams, readOpenOrderAttribs=True),
+            self.decodeTrailParams,
+            self.decodeBasisPoints,
+            self.decodeComboLegs,
+            self.decodeSmartComboRoutingParams,
+            self.decodeScaleOrderParams,
+            self.decodeHedgeParams,
+            self.decodeOptOutSmartRouting,
+            self.decodeClearingParams,
+            self.decodeNotHeld,
+            self.decodeDeltaNeutral,
+            self.decodeAlgoParams,
+            self.decodeSolicited,
+            self.decodeWhatIfInfoAndCommission,
+            self.decodeVolRandomizeFlags,
+            self.decodePegToBenchParams,
+            self.decodeConditions,
+            self.decodeAdjustedOrderParams,
+            self.decodeSoftDollarTier,
+            self.decodeCashQty,
+            self.decodeDontUseAutoPriceForHedge,
+            self.decodeIsOmsContainers,
+            self.decodeDiscretionaryUpToLimitPrice,
+            self.decodeUsePriceMgmtAlgo)
+
+        self.completedOrderSteps = (
+            self.decodeContractFields,
+            self.decodeAction,
+            self.decodeTotalQuantity,
+            self.decodeOrderType,
+            self.decodeLmtPrice,
+            self.decodeAuxPrice,
+            self.decodeTIF,
+            self.decodeOcaGroup,
+            self.decodeAccount,
+            self.decodeOpenClose,
+            self.decodeOrigin,
+            self.decodeOrderRef,
+            self.decodePermId,
+            self.decodeOutsideRth,
+            self.decodeHidden,
+            self.decodeDiscretionaryAmt,
+            self.decodeGoodAfterTime,
+            self.decodeFAParams,
+            self.decodeModelCode,
+            self.decodeGoodTillDate,
+            self.decodeRule80A,
+            self.decodePercentOffset,
+            self.decodeSettlingFirm,
+            self.decodeShortSaleParams,
+            self.decodeBoxOrderParams,
+            self.decodePegToStkOrVolOrderParams,
+            self.decodeDisplaySize,
+            self.decodeSweepToFill,
+            self.decodeAllOrNone,
+            self.decodeMinQty,
+            self.decodeOcaType,
+            self.decodeTriggerMethod,
+            functools.partial(self.decodeVolOrderParams, readOpenOrderAttribs=False),
+            self.decodeTrailParams,
+            self.decodeComboLegs,
+            self.decodeSmartComboRoutingParams,
+            self.decodeScaleOrderParams,
+            self.decodeHedgeParams,
+            self.decodeClearingParams,
+            self.decodeNotHeld,
+            self.decodeDeltaNeutral,
+            self.decodeAlgoParams,
+            self.decodeSolicited,
+            self.decodeOrderStatus,
+            self.decodeVolRandomizeFlags,
+            self.decodePegToBenchParams,
+            self.decodeConditions,
+            self.decodeStopPriceAndLmtPriceOffset,
+            self.decodeCashQty,
+            self.decodeDontUseAutoPriceForHedge,
+            self.decodeIsOmsContainers,
+            self.decodeAutoCancelDate,
+            self.decodeFilledQuantity,
+            self.decodeRefFuturesConId,
+            self.decodeAutoCancelParent,
+            self.decodeShareholder,
+            self.decodeImbalanceOnly,
+            self.decodeRouteMarketableToBbo,
+            self.decodeParentPermId,
+            self.decodeCompletedTime,
+            self.decodeCompletedStatus)
+
+    def decodeOpenOrder(self, fields):
+        for step in self.openOrderSteps:
+            step(fields)
+
+    def decodeCompletedOrder(self, fields):
+        for step in self.completedOrderSteps:
+            step(fields)
 
     def decodeOrderId(self, fields):
-        self.order.orderId = decode(int, fields)
+        self.order.orderId = fields.int()
 
     def decodeContractFields(self, fields):
-        self.contract.conId = decode(int, fields)
-        self.contract.symbol = decode(str, fields)
-        self.contract.secType = decode(str, fields)
-        self.contract.lastTradeDateOrContractMonth = decode(str, fields)
-        self.contract.strike = decode(float, fields)
-        self.contract.right = decode(str, fields)
+        self.contract.conId = fields.int()
+        self.contract.symbol = fields.str()
+        self.contract.secType = fields.str()
+        self.contract.lastTradeDateOrContractMonth = fields.str()
+        self.contract.strike = fields.float()
+        self.contract.right = fields.str()
         if self.version >= 32:
-            self.contract.multiplier = decode(str, fields)
-        self.contract.exchange = decode(str, fields)
-        self.contract.currency = decode(str, fields)
-        self.contract.localSymbol = decode(str, fields)
+            self.contract.multiplier = fields.str()
+        self.contract.exchange = fields.str()
+        self.contract.currency = fields.str()
+        self.contract.localSymbol = fields.str()
         if self.version >= 32:
-            self.contract.tradingClass = decode(str, fields)
+            self.contract.tradingClass = fields.str()
 
     def decodeAction(self, fields):
-        self.order.action = decode(str, fields)
+        self.order.action = fields.str()
 
     def decodeTotalQuantity(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_FRACTIONAL_POSITIONS:
-            self.order.totalQuantity = decode(float, fields)
+            self.order.totalQuantity = fields.float()
         else:
-            self.order.totalQuantity = decode(int, fields)
+            self.order.totalQuantity = fields.int()
 
     def decodeOrderType(self, fields):
-        self.order.orderType = decode(str, fields)
+        self.order.orderType = fields.str()
 
     def decodeLmtPrice(self, fields):
         if self.version < 29:
-            self.order.lmtPrice = decode(float, fields)
+            self.order.lmtPrice = fields.float()
         else:
-            self.order.lmtPrice = decode(float, fields, SHOW_UNSET)
+            self.order.lmtPrice = fields.float_unset()
 
     def decodeAuxPrice(self, fields):
         if self.version < 30:
-            self.order.auxPrice = decode(float, fields)
+            self.order.auxPrice = fields.float()
         else:
-            self.order.auxPrice = decode(float, fields, SHOW_UNSET)
+            self.order.auxPrice = fields.float_unset()
 
     def decodeTIF(self, fields):
-        self.order.tif = decode(str, fields)
+        self.order.tif = fields.str()
         
     def decodeOcaGroup(self, fields):
-        self.order.ocaGroup = decode(str, fields)
+        self.order.ocaGroup = fields.str()
         
     def decodeAccount(self, fields):
-        self.order.account = decode(str, fields)
+        self.order.account = fields.str()
 
     def decodeOpenClose(self, fields):
-        self.order.openClose = decode(str, fields)
+        self.order.openClose = fields.str()
 
     def decodeOrigin(self, fields):
-        self.order.origin = decode(int, fields)
+        self.order.origin = fields.int()
 
     def decodeOrderRef(self, fields):
-        self.order.orderRef = decode(str, fields)
+        self.order.orderRef = fields.str()
         
     def decodeClientId(self, fields):
-        self.order.clientId = decode(int, fields)
+        self.order.clientId = fields.int()
         
     def decodePermId(self, fields):
-        self.order.permId = decode(int, fields)
+        self.order.permId = fields.int()
 
     def decodeOutsideRth(self, fields):
-        self.order.outsideRth = decode(bool, fields)
+        self.order.outsideRth = fields.bool()
 
     def decodeHidden(self, fields):
-        self.order.hidden = decode(bool, fields)
+        self.order.hidden = fields.bool()
 
     def decodeDiscretionaryAmt(self, fields):
-        self.order.discretionaryAmt = decode(float, fields)
+        self.order.discretionaryAmt = fields.float()
 
     def decodeGoodAfterTime(self, fields):
-        self.order.goodAfterTime = decode(str, fields)
+        self.order.goodAfterTime = fields.str()
         
     def skipSharesAllocation(self, fields):
-        _sharesAllocation = decode(str, fields) # deprecated
+        _sharesAllocation = fields.str() # deprecated
 
     def decodeFAParams(self, fields):
-        self.order.faGroup = decode(str, fields)
-        self.order.faMethod = decode(str, fields)
-        self.order.faPercentage = decode(str, fields)
-        self.order.faProfile = decode(str, fields)
+        self.order.faGroup = fields.str()
+        self.order.faMethod = fields.str()
+        self.order.faPercentage = fields.str()
+        self.order.faProfile = fields.str()
 
     def decodeModelCode(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_MODELS_SUPPORT:
-            self.order.modelCode = decode(str, fields)
+            self.order.modelCode = fields.str()
 
     def decodeGoodTillDate(self, fields):
-        self.order.goodTillDate = decode(str, fields)
+        self.order.goodTillDate = fields.str()
 
     def decodeRule80A(self, fields):
-        self.order.rule80A = decode(str, fields)
+        self.order.rule80A = fields.str()
         
     def decodePercentOffset(self, fields):
-        self.order.percentOffset = decode(float, fields, SHOW_UNSET)
+        self.order.percentOffset = fields.float_unset()
         
     def decodeSettlingFirm(self, fields):
-        self.order.settlingFirm = decode(str, fields)
+        self.order.settlingFirm = fields.str()
 
     def decodeShortSaleParams(self, fields):
-        self.order.shortSaleSlot = decode(int, fields)
-        self.order.designatedLocation = decode(str, fields)
+        self.order.shortSaleSlot = fields.int()
+        self.order.designatedLocation = fields.str()
         if self.serverVersion == MIN_SERVER_VER_SSHORTX_OLD:
-            decode(int, fields)
+            fields.int()
         elif self.version >= 23:
-            self.order.exemptCode = decode(int, fields)
+            self.order.exemptCode = fields.int()
 
     def decodeAuctionStrategy(self, fields):
-        self.order.auctionStrategy = decode(int, fields)
+        self.order.auctionStrategy = fields.int()
 
     def decodeBoxOrderParams(self, fields):
-        self.order.startingPrice = decode(float, fields, SHOW_UNSET)
-        self.order.stockRefPrice = decode(float, fields, SHOW_UNSET)
-        self.order.delta = decode(float, fields, SHOW_UNSET)
+        self.order.startingPrice = fields.float_unset()
+        self.order.stockRefPrice = fields.float_unset()
+        self.order.delta = fields.float_unset()
 
     def decodePegToStkOrVolOrderParams(self, fields):
-        self.order.stockRangeLower = decode(float, fields, SHOW_UNSET)
-        self.order.stockRangeUpper = decode(float, fields, SHOW_UNSET)
+        self.order.stockRangeLower = fields.float_unset()
+        self.order.stockRangeUpper = fields.float_unset()
 
     def decodeDisplaySize(self, fields):
-        self.order.displaySize = decode(int, fields)
+        self.order.displaySize = fields.int()
 
     def decodeBlockOrder(self, fields):
-        self.order.blockOrder = decode(bool, fields)
+        self.order.blockOrder = fields.bool()
 
     def decodeSweepToFill(self, fields):
-        self.order.sweepToFill = decode(bool, fields)
+        self.order.sweepToFill = fields.bool()
 
     def decodeAllOrNone(self, fields):
-        self.order.allOrNone = decode(bool, fields)
+        self.order.allOrNone = fields.bool()
 
     def decodeMinQty(self, fields):
-        self.order.minQty = decode(int, fields, SHOW_UNSET)
+        self.order.minQty = fields.int_unset()
         
     def decodeOcaType(self, fields):
-        self.order.ocaType = decode(int, fields)
+        self.order.ocaType = fields.int()
 
     def decodeETradeOnly(self, fields):
-        self.order.eTradeOnly = decode(bool, fields)
+        self.order.eTradeOnly = fields.bool()
 
     def decodeFirmQuoteOnly(self, fields):
-        self.order.firmQuoteOnly = decode(bool, fields)
+        self.order.firmQuoteOnly = fields.bool()
 
     def decodeNbboPriceCap(self, fields):
-        self.order.nbboPriceCap = decode(float, fields, SHOW_UNSET)
+        self.order.nbboPriceCap = fields.float_unset()
         
     def decodeParentId(self, fields):
-        self.order.parentId = decode(int, fields)
+        self.order.parentId = fields.int()
                 
     def decodeTriggerMethod(self, fields):
-        self.order.triggerMethod = decode(int, fields)
+        self.order.triggerMethod = fields.int()
 
 
     def decodeVolOrderParams(self, fields, readOpenOrderAttribs):
-        self.order.volatility = decode(float, fields, SHOW_UNSET)
-        self.order.volatilityType = decode(int, fields)
-        self.order.deltaNeutralOrderType = decode(str, fields)
-        self.order.deltaNeutralAuxPrice = decode(float, fields, SHOW_UNSET)
+        self.order.volatility = fields.float_unset()
+        self.order.volatilityType = fields.int()
+        self.order.deltaNeutralOrderType = fields.str()
+        self.order.deltaNeutralAuxPrice = fields.float_unset()
 
         if self.version >= 27 and self.order.deltaNeutralOrderType:
-            self.order.deltaNeutralConId = decode(int, fields)
+            self.order.deltaNeutralConId = fields.int()
             if readOpenOrderAttribs:
-                self.order.deltaNeutralSettlingFirm = decode(str, fields)
-                self.order.deltaNeutralClearingAccount = decode(str, fields)
-                self.order.deltaNeutralClearingIntent = decode(str, fields)
+                self.order.deltaNeutralSettlingFirm = fields.str()
+                self.order.deltaNeutralClearingAccount = fields.str()
+                self.order.deltaNeutralClearingIntent = fields.str()
 
         if self.version >= 31 and self.order.deltaNeutralOrderType:
             if readOpenOrderAttribs:
-                self.order.deltaNeutralOpenClose = decode(str, fields)
-            self.order.deltaNeutralShortSale = decode(bool, fields)
-            self.order.deltaNeutralShortSaleSlot = decode(int, fields)
-            self.order.deltaNeutralDesignatedLocation = decode(str, fields)
+                self.order.deltaNeutralOpenClose = fields.str()
+            self.order.deltaNeutralShortSale = fields.bool()
+            self.order.deltaNeutralShortSaleSlot = fields.int()
+            self.order.deltaNeutralDesignatedLocation = fields.str()
 
-        self.order.continuousUpdate = decode(bool, fields)
-        self.order.referencePriceType = decode(int, fields)
+        self.order.continuousUpdate = fields.bool()
+        self.order.referencePriceType = fields.int()
 
     def decodeTrailParams(self, fields):
-        self.order.trailStopPrice = decode(float, fields, SHOW_UNSET)
+        self.order.trailStopPrice = fields.float_unset()
         if self.version >= 30:
-            self.order.trailingPercent = decode(float, fields, SHOW_UNSET)
+            self.order.trailingPercent = fields.float_unset()
 
     def decodeBasisPoints(self, fields):
-        self.order.basisPoints = decode(float, fields, SHOW_UNSET)
-        self.order.basisPointsType = decode(int, fields, SHOW_UNSET)
+        self.order.basisPoints = fields.float_unset()
+        self.order.basisPointsType = fields.int_unset()
         
     def decodeComboLegs(self, fields):
-        self.contract.comboLegsDescrip = decode(str, fields)
+        self.contract.comboLegsDescrip = fields.str()
 
         if self.version >= 29:
-            comboLegsCount = decode(int, fields)
+            comboLegsCount = fields.int()
 
             if comboLegsCount > 0:
                 self.contract.comboLegs = []
                 for _ in range(comboLegsCount):
                     comboLeg = ComboLeg()
-                    comboLeg.conId = decode(int, fields)
-                    comboLeg.ratio = decode(int, fields)
-                    comboLeg.action = decode(str, fields)
-                    comboLeg.exchange = decode(str, fields)
-                    comboLeg.openClose = decode(int, fields)
-                    comboLeg.shortSaleSlot = decode(int, fields)
-                    comboLeg.designatedLocation = decode(str, fields)
-                    comboLeg.exemptCode = decode(int, fields)
+                    comboLeg.conId = fields.int()
+                    comboLeg.ratio = fields.int()
+                    comboLeg.action = fields.str()
+                    comboLeg.exchange = fields.str()
+                    comboLeg.openClose = fields.int()
+                    comboLeg.shortSaleSlot = fields.int()
+                    comboLeg.designatedLocation = fields.str()
+                    comboLeg.exemptCode = fields.int()
                     self.contract.comboLegs.append(comboLeg)
 
-            orderComboLegsCount = decode(int, fields)
+            orderComboLegsCount = fields.int()
             if orderComboLegsCount > 0:
                 self.order.orderComboLegs = []
                 for _ in range(orderComboLegsCount):
                     orderComboLeg = OrderComboLeg()
-                    orderComboLeg.price = decode(float, fields, SHOW_UNSET)
+                    orderComboLeg.price = fields.float_unset()
                     self.order.orderComboLegs.append(orderComboLeg)
 
 
     def decodeSmartComboRoutingParams(self, fields):
         if self.version >= 26:
-            smartComboRoutingParamsCount = decode(int, fields)
+            smartComboRoutingParamsCount = fields.int()
             if smartComboRoutingParamsCount > 0:
                 self.order.smartComboRoutingParams = []
                 for _ in range(smartComboRoutingParamsCount):
                     tagValue = TagValue()
-                    tagValue.tag = decode(str, fields)
-                    tagValue.value = decode(str, fields)
+                    tagValue.tag = fields.str()
+                    tagValue.value = fields.str()
                     self.order.smartComboRoutingParams.append(tagValue)
 
     def decodeScaleOrderParams(self, fields):
         if self.version >= 20:
-            self.order.scaleInitLevelSize = decode(int, fields, SHOW_UNSET)
-            self.order.scaleSubsLevelSize = decode(int, fields, SHOW_UNSET)
+            self.order.scaleInitLevelSize = fields.int_unset()
+            self.order.scaleSubsLevelSize = fields.int_unset()
         else:
-            self.order.notSuppScaleNumComponents = decode(int, fields, SHOW_UNSET)
-            self.order.scaleInitLevelSize = decode(int, fields, SHOW_UNSET)
+            fields.skip() # notSuppScaleNumComponents, unused
+            self.order.scaleInitLevelSize = fields.int_unset()
 
-        self.order.scalePriceIncrement = decode(float, fields, SHOW_UNSET)
+        self.order.scalePriceIncrement = fields.float_unset()
 
         if self.version >= 28 and self.order.scalePriceIncrement != UNSET_DOUBLE \
                 and self.order.scalePriceIncrement > 0.0:
-            self.order.scalePriceAdjustValue = decode(float, fields, SHOW_UNSET)
-            self.order.scalePriceAdjustInterval = decode(int, fields, SHOW_UNSET)
-            self.order.scaleProfitOffset = decode(float, fields, SHOW_UNSET)
-            self.order.scaleAutoReset = decode(bool, fields)
-            self.order.scaleInitPosition = decode(int, fields, SHOW_UNSET)
-            self.order.scaleInitFillQty = decode(int, fields, SHOW_UNSET)
-            self.order.scaleRandomPercent = decode(bool, fields)
+            self.order.scalePriceAdjustValue = fields.float_unset()
+            self.order.scalePriceAdjustInterval = fields.int_unset()
+            self.order.scaleProfitOffset = fields.float_unset()
+            self.order.scaleAutoReset = fields.bool()
+            self.order.scaleInitPosition = fields.int_unset()
+            self.order.scaleInitFillQty = fields.int_unset()
+            self.order.scaleRandomPercent = fields.bool()
 
 
     def decodeHedgeParams(self, fields):
         if self.version >= 24:
-            self.order.hedgeType = decode(str, fields)
+            self.order.hedgeType = fields.str()
             if self.order.hedgeType:
-                self.order.hedgeParam = decode(str, fields)
+                self.order.hedgeParam = fields.str()
 
     def decodeOptOutSmartRouting(self, fields):
         if self.version >= 25:
-            self.order.optOutSmartRouting = decode(bool, fields)
+            self.order.optOutSmartRouting = fields.bool()
 
     def decodeClearingParams(self, fields):
-        self.order.clearingAccount = decode(str, fields)
-        self.order.clearingIntent = decode(str, fields)
+        self.order.clearingAccount = fields.str()
+        self.order.clearingIntent = fields.str()
 
     def decodeNotHeld(self, fields):
         if self.version >= 22:
-            self.order.notHeld = decode(bool, fields)
+            self.order.notHeld = fields.bool()
             
     def decodeDeltaNeutral(self, fields):
         if self.version >= 20:
-            deltaNeutralContractPresent = decode(bool, fields)
+            deltaNeutralContractPresent = fields.bool()
             if deltaNeutralContractPresent:
                 self.contract.deltaNeutralContract = DeltaNeutralContract()
-                self.contract.deltaNeutralContract.conId = decode(int, fields)
-                self.contract.deltaNeutralContract.delta = decode(float, fields)
-                self.contract.deltaNeutralContract.price = decode(float, fields)
+                self.contract.deltaNeutralContract.conId = fields.int()
+                self.contract.deltaNeutralContract.delta = fields.float()
+                self.contract.deltaNeutralContract.price = fields.float()
             
     def decodeAlgoParams(self, fields):
         if self.version >= 21:
-            self.order.algoStrategy = decode(str, fields)
+            self.order.algoStrategy = fields.str()
             if self.order.algoStrategy:
-                algoParamsCount = decode(int, fields)
+                algoParamsCount = fields.int()
                 if algoParamsCount > 0:
                     self.order.algoParams = []
                     for _ in range(algoParamsCount):
                         tagValue = TagValue()
-                        tagValue.tag = decode(str, fields)
-                        tagValue.value = decode(str, fields)
+                        tagValue.tag = fields.str()
+                        tagValue.value = fields.str()
                         self.order.algoParams.append(tagValue)
 
     def decodeSolicited(self, fields):
         if self.version >= 33:
-            self.order.solicited = decode(bool, fields)
+            self.order.solicited = fields.bool()
 
     def decodeOrderStatus(self, fields):
-        self.orderState.status = decode(str, fields)
+        self.orderState.status = fields.str()
 
     def decodeWhatIfInfoAndCommission(self, fields):
-        self.order.whatIf = decode(bool, fields)
+        self.order.whatIf = fields.bool()
         OrderDecoder.decodeOrderStatus(self, fields)
         if self.serverVersion >= MIN_SERVER_VER_WHAT_IF_EXT_FIELDS:
-            self.orderState.initMarginBefore = decode(str, fields)
-            self.orderState.maintMarginBefore = decode(str, fields)
-            self.orderState.equityWithLoanBefore = decode(str, fields)
-            self.orderState.initMarginChange = decode(str, fields)
-            self.orderState.maintMarginChange = decode(str, fields)
-            self.orderState.equityWithLoanChange = decode(str, fields)
-
-        self.orderState.initMarginAfter = decode(str, fields)
-        self.orderState.maintMarginAfter = decode(str, fields)
-        self.orderState.equityWithLoanAfter = decode(str, fields)
-
-        self.orderState.commission = decode(float, fields, SHOW_UNSET)
-        self.orderState.minCommission = decode(float, fields, SHOW_UNSET)
-        self.orderState.maxCommission = decode(float, fields, SHOW_UNSET)
-        self.orderState.commissionCurrency = decode(str, fields)
-        self.orderState.warningText = decode(str, fields)
+            self.orderState.initMarginBefore = fields.str()
+            self.orderState.maintMarginBefore = fields.str()
+            self.orderState.equityWithLoanBefore = fields.str()
+            self.orderState.initMarginChange = fields.str()
+            self.orderState.maintMarginChange = fields.str()
+            self.orderState.equityWithLoanChange = fields.str()
+
+        self.orderState.initMarginAfter = fields.str()
+        self.orderState.maintMarginAfter = fields.str()
+        self.orderState.equityWithLoanAfter = fields.str()
+
+        self.orderState.commission = fields.float_unset()
+        self.orderState.minCommission = fields.float_unset()
+        self.orderState.maxCommission = fields.float_unset()
+        self.orderState.commissionCurrency = fields.str()
+        self.orderState.warningText = fields.str()
 
     def decodeVolRandomizeFlags(self, fields):
         if self.version >= 34:
-            self.order.randomizeSize = decode(bool, fields)
-            self.order.randomizePrice = decode(bool, fields)
+            self.order.randomizeSize = fields.bool()
+            self.order.randomizePrice = fields.bool()
         
     def decodePegToBenchParams(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_PEGGED_TO_BENCHMARK:
             if self.order.orderType == "PEG BENCH":
-                self.order.referenceContractId = decode(int, fields)
-                self.order.isPeggedChangeAmountDecrease = decode(bool, fields)
-                self.order.peggedChangeAmount = decode(float, fields)
-                self.order.referenceChangeAmount = decode(float, fields)
-                self.order.referenceExchangeId = decode(str, fields)
+                self.order.referenceContractId = fields.int()
+                self.order.isPeggedChangeAmountDecrease = fields.bool()
+                self.order.peggedChangeAmount = fields.float()
+                self.order.referenceChangeAmount = fields.float()
+                self.order.referenceExchangeId = fields.str()
         
     def decodeConditions(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_PEGGED_TO_BENCHMARK:
-            conditionsSize = decode(int, fields)
+            conditionsSize = fields.int()
             if conditionsSize > 0:
                 self.order.conditions = []
                 for _ in range(conditionsSize):
-                    conditionType = decode(int, fields)
+                    conditionType = fields.int()
                     condition = order_condition.Create(conditionType)
                     condition.decode(fields)
                     self.order.conditions.append(condition)
 
-                self.order.conditionsIgnoreRth = decode(bool, fields)
-                self.order.conditionsCancelOrder = decode(bool, fields)
+                self.order.conditionsIgnoreRth = fields.bool()
+                self.order.conditionsCancelOrder = fields.bool()
         
             
     def decodeAdjustedOrderParams(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_PEGGED_TO_BENCHMARK:
-            self.order.adjustedOrderType = decode(str, fields)
-            self.order.triggerPrice = decode(float, fields)
+            self.order.adjustedOrderType = fields.str()
+            self.order.triggerPrice = fields.float()
             OrderDecoder.decodeStopPriceAndLmtPriceOffset(self, fields)
-            self.order.adjustedStopPrice = decode(float, fields)
-            self.order.adjustedStopLimitPrice = decode(float, fields)
-            self.order.adjustedTrailingAmount = decode(float, fields)
-            self.order.adjustableTrailingUnit = decode(int, fields)
+            self.order.adjustedStopPrice = fields.float()
+            self.order.adjustedStopLimitPrice = fields.float()
+            self.order.adjustedTrailingAmount = fields.float()
+            self.order.adjustableTrailingUnit = fields.int()
             
     def decodeStopPriceAndLmtPriceOffset(self, fields):
-            self.order.trailStopPrice = decode(float, fields)
-            self.order.lmtPriceOffset = decode(float, fields)
+            self.order.trailStopPrice = fields.float()
+            self.order.lmtPriceOffset = fields.float()
             
     def decodeSoftDollarTier(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_SOFT_DOLLAR_TIER:
-            name = decode(str, fields)
-            value = decode(str, fields)
-            displayName = decode(str, fields)
+            name = fields.str()
+            value = fields.str()
+            displayName = fields.str()
             self.order.softDollarTier = SoftDollarTier(name, value, displayName)
 
     def decodeCashQty(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_CASH_QTY:
-            self.order.cashQty = decode(float,fields)
+            self.order.cashQty = fields.float()
 
     def decodeDontUseAutoPriceForHedge(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_AUTO_PRICE_FOR_HEDGE:
-            self.order.dontUseAutoPriceForHedge = decode(bool,fields)
+            self.order.dontUseAutoPriceForHedge = fields.bool()
 
     def decodeIsOmsContainers(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_ORDER_CONTAINER:
-            self.order.isOmsContainer = decode(bool, fields)
+            self.order.isOmsContainer = fields.bool()
 
     def decodeDiscretionaryUpToLimitPrice(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_D_PEG_ORDERS:
-            self.order.discretionaryUpToLimitPrice = decode(bool, fields)
+            self.order.discretionaryUpToLimitPrice = fields.bool()
 
     def decodeAutoCancelDate(self, fields):
-        self.order.autoCancelDate = decode(str, fields)
+        self.order.autoCancelDate = fields.str()
 
     def decodeFilledQuantity(self, fields):
-        self.order.filledQuantity = decode(float, fields)
+        self.order.filledQuantity = fields.float()
 
     def decodeRefFuturesConId(self, fields):
-        self.order.refFuturesConId = decode(int, fields)
+        self.order.refFuturesConId = fields.int()
 
     def decodeAutoCancelParent(self, fields):
-        self.order.autoCancelParent = decode(bool, fields)
+        self.order.autoCancelParent = fields.bool()
 
     def decodeShareholder(self, fields):
-        self.order.shareholder = decode(str, fields)
+        self.order.shareholder = fields.str()
 
     def decodeImbalanceOnly(self, fields):
-        self.order.imbalanceOnly = decode(bool, fields)
+        self.order.imbalanceOnly = fields.bool()
 
     def decodeRouteMarketableToBbo(self, fields):
-        self.order.routeMarketableToBbo = decode(bool, fields)
+        self.order.routeMarketableToBbo = fields.bool()
 
     def decodeParentPermId(self, fields):
-        self.order.parentPermId = decode(int, fields)
+        self.order.parentPermId = fields.int()
 
     def decodeCompletedTime(self, fields):
-        self.orderState.completedTime = decode(str, fields)
+        self.orderState.completedTime = fields.str()
 
     def decodeCompletedStatus(self, fields):
-        self.orderState.completedStatus = decode(str, fields)
+        self.orderState.completedStatus = fields.str()
 
     def decodeUsePriceMgmtAlgo(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_PRICE_MGMT_ALGO:
-            self.order.usePriceMgmtAlgo = decode(bool, fields)
+            self.order.usePriceMgmtAlgo = fields.bool()
@@ -0,0 +1,345 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Outbound pacing: the PacingScheduler sits between EClient.sendMsg() and the
+Connection and holds back the msgs that would break the TWS limits:
+- at most 50 msgs per second, all msgs included
+- at most 60 historical data requests (bars, ticks, head timestamp,
+  histogram) in any 10 minutes
+- no identical historical request (same fields but the reqId) within
+  15 seconds
+
+Each limit is a TokenBucket. The queued msgs are kept in lanes served by
+priority: orders and cancels first, then the other control msgs
+(subscriptions, account, ...), then the bulk reference data requests and last
+the historical data requests, so an order is never stuck behind a backfill.
+Only historical requests wait on their own limits; the other lanes only wait
+for the msgs/sec one. The cancels go in the CONTROL lane, ahead of the bulk
+and historical requests they cancel: a cancel of such a request still
+queued (scanner subscription, fundamental data, historical data, head
+timestamp, histogram) drops the request instead of overtaking it.
+
+A failed send stops the scheduler: the error goes to the wrapper and the
+queued msgs, as the ones sent after, are dropped.
+
+It is used by the threaded EClient when its pacing attribute is set before
+connect(); the AsyncEClient does not use it:
+
+    app.pacing = True
+    app.connect(...)
+    ...
+    app.pacer.queuedRequests()   # what is waiting, and for how long
+"""
+
+import collections
+import logging
+import threading
+import time
+
+from ibapi.common import NO_VALID_ID
+from ibapi.enum_implem import Enum
+from ibapi.errors import SEND_FAILED
+from ibapi.message import OUT
+from ibapi.server_versions import (MIN_SERVER_VER_SYNT_REALTIME_BARS,
+                                   MIN_SERVER_VER_SCANNER_GENERIC_OPTS)
+
+
+logger = logging.getLogger(__name__)
+
+
+SendLaneEnum = Enum("ORDERS", "CONTROL", "BULK", "HISTORICAL")
+
+OutMsgId2Lane = {}
+for msgId in (OUT.PLACE_ORDER, OUT.CANCEL_ORDER, OUT.REQ_GLOBAL_CANCEL,
+              OUT.EXERCISE_OPTIONS):
+    OutMsgId2Lane[msgId] = SendLaneEnum.ORDERS
+for msgId in (OUT.REQ_CONTRACT_DATA, OUT.REQ_SEC_DEF_OPT_PARAMS,
+              OUT.REQ_MATCHING_SYMBOLS, OUT.REQ_FUNDAMENTAL_DATA,
+              OUT.REQ_SCANNER_SUBSCRIPTION, OUT.REQ_SCANNER_PARAMETERS,
+              OUT.REQ_HISTORICAL_NEWS, OUT.REQ_NEWS_ARTICLE,
+              OUT.REQ_MKT_DEPTH_EXCHANGES, OUT.REQ_SMART_COMPONENTS,
+              OUT.REQ_SOFT_DOLLAR_TIERS, OUT.REQ_FAMILY_CODES,
+              OUT.REQ_MARKET_RULE, OUT.REQ_NEWS_PROVIDERS,
+              OUT.REQ_COMPLETED_ORDERS):
+    OutMsgId2Lane[msgId] = SendLaneEnum.BULK
+for msgId in (OUT.REQ_HISTORICAL_DATA, OUT.REQ_HISTORICAL_TICKS,
+              OUT.REQ_HEAD_TIMESTAMP, OUT.REQ_HISTOGRAM_DATA):
+    OutMsgId2Lane[msgId] = SendLaneEnum.HISTORICAL
+# anything else goes in CONTROL
+
+# cancel msg id: (msg id of the request cancelled, index of the reqId field),
+# for the requests queued in a lane below the one of their cancel
+Cancels = {
+    OUT.CANCEL_SCANNER_SUBSCRIPTION: (OUT.REQ_SCANNER_SUBSCRIPTION, 2),
+    OUT.CANCEL_FUNDAMENTAL_DATA: (OUT.REQ_FUNDAMENTAL_DATA, 2),
+    OUT.CANCEL_HISTORICAL_DATA: (OUT.REQ_HISTORICAL_DATA, 2),
+    OUT.CANCEL_HEAD_TIMESTAMP: (OUT.REQ_HEAD_TIMESTAMP, 1),
+    OUT.CANCEL_HISTOGRAM_DATA: (OUT.REQ_HISTOGRAM_DATA, 1)}
+CancelledMsgIds = frozenset(reqMsgId for (reqMsgId, _) in Cancels.values())
+
+
+class TokenBucket:
+    """ rate tokens per second, holding at most capacity tokens. Over any
+    period T at most capacity + rate * T tokens are taken. """
+
+    def __init__(self, rate:float, capacity:float, now:float=0.):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.stamp = now
+
+    @classmethod
+    def forLimit(cls, nMsgs, period, burst, now=0.):
+        """ a bucket that never lets more than nMsgs through in any period,
+        with up to burst of them at once """
+        return cls((nMsgs - burst) / period, burst, now)
+
+    def copy(self):
+        bucket = TokenBucket(self.rate, self.capacity, self.stamp)
+        bucket.tokens = self.tokens
+        return bucket
+
+    def _refill(self, now):
+        if now > self.stamp:
+            self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+
+    def waitTime(self, now) -> float:
+        """ seconds until a token is available """
+        self._refill(now)
+        if self.tokens >= 1 - 1e-9:   # rounding of the refill
+            return 0.
+        return (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class QueuedMsg:
+    __slots__ = ("msg", "msgId", "lane", "key", "reqId", "queuedAt")
+
+    def __init__(self, msg, msgId, lane, key, reqId, queuedAt):
+        self.msg = msg
+        self.msgId = msgId
+        self.lane = lane
+        self.key = key
+        self.reqId = reqId
+        self.queuedAt = queuedAt
+
+
+class PacingScheduler:
+    MSGS_PER_SEC = 50
+    MSGS_BURST = 5
+    HIST_REQS = 60
+    HIST_PERIOD = 600.
+    HIST_BURST = 10
+    IDENTICAL_DELAY = 15.
+
+    def __init__(self, conn, serverVersion, clock=time.monotonic):
+        self.conn = conn
+        self.serverVersion = serverVersion
+        self.clock = clock
+        now = clock()
+        self.msgBucket = TokenBucket.forLimit(self.MSGS_PER_SEC, 1.,
+                                              self.MSGS_BURST, now)
+        self.histBucket = TokenBucket.forLimit(self.HIST_REQS, self.HIST_PERIOD,
+                                               self.HIST_BURST, now)
+        self.key2lastSent = {}
+        self.lanes = [collections.deque() for _ in SendLaneEnum.idx2name]
+        self.cond = threading.Condition()
+        self.thread = None
+        self.stopped = False
+        self.queuedSinceTaken = False
+        self.nSent = 0
+        self.nDelayed = 0
+        self.nCancelled = 0
+
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="PacingScheduler",
+                                       daemon=True)
+        self.thread.start()
+
+
+    def stop(self):
+        """ the msgs still queued are dropped """
+        nQueued = self._dropAll()
+        if nQueued:
+            logger.warning("pacing: dropped %d queued msgs", nQueued)
+
+
+    def _dropAll(self) -> int:
+        """ stops queueing, returns the number of msgs dropped """
+        with self.cond:
+            self.stopped = True
+            nQueued = sum(len(lane) for lane in self.lanes)
+            for lane in self.lanes:
+                lane.clear()
+            self.cond.notify()
+        return nQueued
+
+
+    def run(self):
+        while True:
+            wait = self.sendReady()
+            with self.cond:
+                if self.stopped:
+                    break
+                # else a msg queued while sending could wait for nothing
+                if not self.queuedSinceTaken:
+                    self.cond.wait(wait)
+
+
+    def sendMsg(self, msg:bytes):
+        """ queues a framed msg (size prefix included) """
+        fields = msg[4:].split(b"\0")
+        msgId = int(fields[0])
+        lane = OutMsgId2Lane.get(msgId, SendLaneEnum.CONTROL)
+        key = None
+        reqId = None
+        if lane == SendLaneEnum.HISTORICAL or msgId in CancelledMsgIds:
+            reqIdIdx = self._reqIdIdx(msgId)
+            reqId = fields[reqIdIdx]
+            if lane == SendLaneEnum.HISTORICAL:
+                # same request with another reqId
+                key = tuple(fields[:reqIdIdx] + fields[reqIdIdx+1:])
+        with self.cond:
+            if self.stopped:
+                logger.debug("pacing: stopped, msg %d dropped", msgId)
+                return
+            if msgId in Cancels:
+                (reqMsgId, reqIdIdx) = Cancels[msgId]
+                if self._dropQueued(reqMsgId, fields[reqIdIdx]):
+                    return
+            self.lanes[lane].append(QueuedMsg(msg, msgId, lane, key, reqId,
+                                              self.clock()))
+            self.queuedSinceTaken = True
+            self.cond.notify()
+
+
+    def _reqIdIdx(self, msgId) -> int:
+        """ index of the reqId field of a historical or cancellable request """
+        if msgId == OUT.REQ_HISTORICAL_DATA:
+            return 1 if self.serverVersion >= MIN_SERVER_VER_SYNT_REALTIME_BARS else 2
+        if msgId == OUT.REQ_SCANNER_SUBSCRIPTION:
+            return 1 if self.serverVersion >= MIN_SERVER_VER_SCANNER_GENERIC_OPTS else 2
+        if msgId == OUT.REQ_FUNDAMENTAL_DATA:
+            return 2
+        return 1
+
+
+    def _dropQueued(self, msgId, reqId) -> bool:
+        """ removes the queued request, False if it is not queued (any
+        more). Called with self.cond held. """
+        lane = self.lanes[OutMsgId2Lane.get(msgId, SendLaneEnum.CONTROL)]
+        for (i, item) in enumerate(lane):
+            if item.msgId == msgId and item.reqId == reqId:
+                del lane[i]
+                self.nCancelled += 1
+                return True
+        return False
+
+
+    def _waitFor(self, item, now, msgBucket, histBucket, key2lastSent) -> float:
+        wait = msgBucket.waitTime(now)
+        if item.lane == SendLaneEnum.HISTORICAL:
+            wait = max(wait, histBucket.waitTime(now))
+            lastSent = key2lastSent.get(item.key)
+            if lastSent is not None:
+                wait = max(wait, lastSent + self.IDENTICAL_DELAY - now)
+        return wait
+
+
+    def _take(self, item, now, msgBucket, histBucket, key2lastSent):
+        msgBucket.take(now)
+        if item.lane == SendLaneEnum.HISTORICAL:
+            histBucket.take(now)
+            key2lastSent[item.key] = now
+
+
+    def sendReady(self):
+        """ sends what the limits allow now, by lane priority; returns the
+        seconds until the next msg can go, None if nothing is queued.
+        The msgs are taken with self.cond held and sent after releasing it,
+        a slow socket does not block the threads queueing msgs. """
+        with self.cond:
+            (ready, nextWait) = self._takeReady()
+        for (i, item) in enumerate(ready):
+            try:
+                self.conn.sendMsg(item.msg)
+            except OSError as ex:
+                nDropped = len(ready) - i + self._dropAll()
+                logger.error("pacing: send failed, %d msgs dropped", nDropped,
+                             exc_info=True)
+                if self.conn.wrapper:
+                    self.conn.wrapper.error(NO_VALID_ID, SEND_FAILED.code(),
+                                            SEND_FAILED.msg() + str(ex))
+                return None
+        return nextWait
+
+
+    def _takeReady(self):
+        """ (msgs to send now in order, seconds until the next one) """
+        self.queuedSinceTaken = False
+        taken = []
+        while True:
+            now = self.clock()
+            nextWait = None
+            ready = None
+            for lane in self.lanes:
+                if not lane:
+                    continue
+                item = lane[0]
+                wait = self._waitFor(item, now, self.msgBucket, self.histBucket,
+                                     self.key2lastSent)
+                if wait <= 0:
+                    ready = lane
+                    break
+                nextWait = wait if nextWait is None else min(nextWait, wait)
+                if item.lane != SendLaneEnum.HISTORICAL:
+                    break   # the lanes below wait for the same msgs/sec bucket
+            if ready is None:
+                return (taken, nextWait)
+
+            ready.popleft()
+            self._take(item, now, self.msgBucket, self.histBucket, self.key2lastSent)
+            if now > item.queuedAt:
+                self.nDelayed += 1
+            self.nSent += 1
+            taken.append(item)
+
+
+    def queuedRequests(self) -> list:
+        """ the queued msgs in the order they should be sent, with the
+        seconds they have been waiting and the expected remaining wait """
+        with self.cond:
+            now = self.clock()
+            msgBucket = self.msgBucket.copy()
+            histBucket = self.histBucket.copy()
+            key2lastSent = dict(self.key2lastSent)
+            t = now
+            queued = []
+            for lane in self.lanes:
+                for item in lane:
+                    t += max(0., self._waitFor(item, t, msgBucket, histBucket,
+                                               key2lastSent))
+                    self._take(item, t, msgBucket, histBucket, key2lastSent)
+                    queued.append({"msgId": item.msgId,
+                                   "lane": SendLaneEnum.to_str(item.lane),
+                                   "waited": now - item.queuedAt,
+                                   "expectedWait": t - now})
+            return queued
+
+
+    def pacingStats(self) -> dict:
+        with self.cond:
+            return {"sent": self.nSent,
+                    "delayed": self.nDelayed,
+                    "cancelledQueued": self.nCancelled,
+                    "queued": {SendLaneEnum.to_str(laneIdx): len(lane)
+                               for (laneIdx, lane) in enumerate(self.lanes)}}
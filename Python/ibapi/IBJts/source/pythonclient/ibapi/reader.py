@@ -9,45 +9,74 @@ The EReader runs in a separate threads and is responsible for receiving the
 incoming messages.
 It will read the packets from the wire, use the low level IB messaging to
 remove the size prefix and put the rest in a Queue.
+The packets are accumulated in a comm.MsgBuffer so that a large burst is split
+into messages in a single pass, without copying the remainder for each message.
 """
 
 import logging
+import queue
+import time
 from threading import Thread
 
-from ibapi import comm
+from ibapi import comm, log_mode
+from ibapi.latency import TracedMsg
 
 
 logger = logging.getLogger(__name__)
 
 
 class EReader(Thread):
-    def __init__(self, conn, msg_queue):
+    def __init__(self, conn, msg_queue, batchMsgs=False, capture=None,
+                 tracer=None):
         super().__init__()
         self.conn = conn
         self.msg_queue = msg_queue
+        # put all the msgs framed from one packet as a single list
+        self.batchMsgs = batchMsgs
+        # wire_capture.CaptureWriter recording the msgs, closed at the end
+        self.capture = capture
+        # latency.LatencyTracer, the msgs are queued as TracedMsg
+        self.tracer = tracer
+        if tracer is not None:
+            self.conn.traceRecv = True
 
     def run(self):
         try:
-            buf = b""
+            buf = comm.MsgBuffer()
             while self.conn.isConnected():
 
-                data = self.conn.recvMsg()
-                logger.debug("reader loop, recvd size %d", len(data))
-                buf += data
+                nRecvd = self.conn.recvMsgInto(buf)
+                if log_mode.verbose:
+                    logger.debug("reader loop, recvd size %d", nRecvd)
 
-                while len(buf) > 0:
-                    (size, msg, buf) = comm.read_msg(buf)
-                    #logger.debug("resp %s", buf.decode('ascii'))
-                    logger.debug("size:%d msg.size:%d msg:|%s| buf:%s|", size,
-                        len(msg), buf, "|")
-
-                    if msg:
-                        self.msg_queue.put(msg)
+                msgs = buf.read_msgs()
+                if log_mode.wireSample and msgs and not log_mode.verbose:
+                    log_mode.sampleReceived(msgs)
+                if self.capture is not None and msgs:
+                    self.capture.write(msgs, time.monotonic_ns())
+                if self.tracer is not None and msgs:
+                    framedTime = time.perf_counter_ns()
+                    recvTime = self.conn.recvTime
+                    msgs = [TracedMsg(msg, recvTime, framedTime) for msg in msgs]
+                try:
+                    if self.batchMsgs:
+                        if msgs:
+                            self.msg_queue.put(msgs)
                     else:
-                        logger.debug("more incoming packet(s) are needed ")
-                        break
+                        for msg in msgs:
+                            self.msg_queue.put(msg)
+                except queue.Full:
+                    # a msg_queue.BoundedQueue w/ the DISCONNECT policy
+                    logger.error("incoming msg queue is full, disconnecting")
+                    self.conn.disconnect()
+
+                if len(buf) > 0 and log_mode.verbose:
+                    logger.debug("more incoming packet(s) are needed ")
 
             logger.debug("EReader thread finished")
         except:
             logger.exception('unhandled exception in EReader thread')
+        finally:
+            if self.capture is not None:
+                self.capture.close()
 
@@ -0,0 +1,407 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Request/response on top of the EClient/EWrapper callbacks.
+
+The RequestManager is an EWrapper to be mixed in with the EClient. Its
+req*Future() methods allocate a reqId, send the request and return a future
+that gets the answers collected for that reqId once the end marker arrives
+(or an exception on error, timeout or disconnection). Any number of them can
+be in flight at the same time:
+
+    class App(RequestManager, MyWrapper, EClient):
+        def __init__(self):
+            RequestManager.__init__(self)
+            MyWrapper.__init__(self)
+            EClient.__init__(self, wrapper=self)
+
+    futs = [app.reqContractDetailsFuture(c, timeout=10) for c in contracts]
+    concurrent.futures.wait(futs)
+
+The answers for the reqIds it did not allocate go on to the next class in
+the MRO (MyWrapper above), so the usual callbacks still work for the other
+requests. A subclass overriding one of the callbacks below must call super().
+
+With asyncFutures set (eg with the AsyncEClient), the futures are asyncio
+ones bound to the running loop, so they can be awaited directly:
+
+    details = await asyncio.gather(*(app.reqContractDetailsFuture(c)
+                                     for c in contracts))
+"""
+
+import asyncio
+import concurrent.futures
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from ibapi.common import * # @UnusedWildImport
+from ibapi.contract import Contract, ContractDetails
+from ibapi.wrapper import EWrapper
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestError(Exception):
+    """ the error() received for a request """
+    def __init__(self, reqId, errorCode, errorString):
+        Exception.__init__(self, "reqId %d: %d %s" % (reqId, errorCode, errorString))
+        self.reqId = reqId
+        self.errorCode = errorCode
+        self.errorString = errorString
+
+
+class PendingRequest:
+    __slots__ = ("reqId", "future", "items", "cancel", "loop", "timer")
+
+    def __init__(self, reqId, future, cancel, loop):
+        self.reqId = reqId
+        self.future = future
+        self.items = []
+        self.cancel = cancel
+        self.loop = loop
+        self.timer = None
+
+
+class RequestManager(EWrapper):
+    FIRST_REQ_ID = 100000000    # above the ids an app usually picks
+
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.asyncFutures = False
+        self.reqIdSeq = itertools.count(RequestManager.FIRST_REQ_ID)
+        self.pendingReqs = {}
+        self.pendingLock = threading.Lock()
+        self.deadlines = []     # heap of (deadline, reqId) for thread futures
+        self.deadlineCond = threading.Condition(self.pendingLock)
+        self.timeoutThread = None
+
+
+    def nextReqId(self) -> int:
+        """ thread safe, the ids are never reused """
+        return next(self.reqIdSeq)
+
+
+    def startRequest(self, send, cancel=None, timeout:float=None):
+        """ allocates a reqId and calls send(reqId); the future gets the
+        list of answers. cancel(reqId), if given, is called upon timeout. """
+        reqId = self.nextReqId()
+        if self.asyncFutures:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+        else:
+            loop = None
+            future = concurrent.futures.Future()
+        pending = PendingRequest(reqId, future, cancel, loop)
+
+        with self.pendingLock:
+            self.pendingReqs[reqId] = pending
+            if timeout is not None and loop is None:
+                heapq.heappush(self.deadlines, (time.monotonic() + timeout, reqId))
+                if self.timeoutThread is None:
+                    self.timeoutThread = threading.Thread(target=self._expireRequests,
+                        name="RequestManager timeouts", daemon=True)
+                    self.timeoutThread.start()
+                self.deadlineCond.notify()
+        if timeout is not None and loop is not None:
+            pending.timer = loop.call_later(timeout, self._timeoutRequest, reqId)
+
+        if self.isConnected():
+            send(reqId)
+        else:
+            self._popPending(reqId)
+            self._settle(pending, None, ConnectionError("not connected"))
+        return future
+
+
+    def pendingCount(self) -> int:
+        with self.pendingLock:
+            return len(self.pendingReqs)
+
+
+    def _expireRequests(self):
+        with self.deadlineCond:
+            while True:
+                if not self.deadlines:
+                    self.deadlineCond.wait()
+                    continue
+                (deadline, reqId) = self.deadlines[0]
+                now = time.monotonic()
+                if deadline > now:
+                    self.deadlineCond.wait(deadline - now)
+                    continue
+                heapq.heappop(self.deadlines)
+                self.deadlineCond.release()
+                try:
+                    self._timeoutRequest(reqId)
+                finally:
+                    self.deadlineCond.acquire()
+
+
+    def _timeoutRequest(self, reqId):
+        pending = self._popPending(reqId)
+        if pending is None:
+            return
+        logger.info("request %d timed out", reqId)
+        if pending.cancel is not None:
+            try:
+                pending.cancel(reqId)
+            except Exception:
+                logger.exception("cancelling request %d", reqId)
+        self._settle(pending, None, TimeoutError("request %d timed out" % reqId))
+
+
+    def _popPending(self, reqId):
+        with self.pendingLock:
+            return self.pendingReqs.pop(reqId, None)
+
+
+    @staticmethod
+    def _settle(pending, result, exc=None):
+        def settle():
+            if pending.timer is not None:
+                pending.timer.cancel()
+            if pending.future.done():
+                return
+            if exc is not None:
+                pending.future.set_exception(exc)
+            else:
+                pending.future.set_result(result)
+
+        if pending.loop is None:
+            settle()
+        else:
+            pending.loop.call_soon_threadsafe(settle)
+
+
+    def _addItem(self, reqId, item) -> bool:
+        """ False if the reqId is not one of ours """
+        pending = self.pendingReqs.get(reqId)
+        if pending is None:
+            return False
+        pending.items.append(item)
+        return True
+
+
+    def _finish(self, reqId, result=None) -> bool:
+        """ resolves the future with result, or the items collected so far
+        if result is None; False if the reqId is not one of ours """
+        pending = self._popPending(reqId)
+        if pending is None:
+            return False
+        self._settle(pending, pending.items if result is None else result)
+        return True
+
+
+    ##### requests
+
+    def reqContractDetailsFuture(self, contract:Contract, timeout:float=None):
+        """ future of the list of ContractDetails """
+        return self.startRequest(
+            lambda reqId: self.reqContractDetails(reqId, contract),
+            timeout=timeout)
+
+
+    def reqHistoricalDataFuture(self, contract:Contract, endDateTime:str,
+                                durationStr:str, barSizeSetting:str,
+                                whatToShow:str, useRTH:int, formatDate:int,
+                                chartOptions:TagValueList=None,
+                                timeout:float=None):
+        """ future of the list of BarData, or of the tuple of columns when
+        the client's columnarHistData is set. No keepUpToDate. """
+        return self.startRequest(
+            lambda reqId: self.reqHistoricalData(reqId, contract, endDateTime,
+                durationStr, barSizeSetting, whatToShow, useRTH, formatDate,
+                False, chartOptions or []),
+            self.cancelHistoricalData, timeout)
+
+
+    def reqHistoricalTicksFuture(self, contract:Contract, startDateTime:str,
+                                 endDateTime:str, numberOfTicks:int,
+                                 whatToShow:str, useRth:int, ignoreSize:bool,
+                                 miscOptions:TagValueList=None,
+                                 timeout:float=None):
+        """ future of the list of HistoricalTick*, or of the list of pages
+        when the client's columnarHistTicks is set """
+        return self.startRequest(
+            lambda reqId: self.reqHistoricalTicks(reqId, contract,
+                startDateTime, endDateTime, numberOfTicks, whatToShow, useRth,
+                ignoreSize, miscOptions or []),
+            timeout=timeout)
+
+
+    def reqHeadTimeStampFuture(self, contract:Contract, whatToShow:str,
+                               useRTH:int, formatDate:int, timeout:float=None):
+        """ future of the head timestamp str """
+        return self.startRequest(
+            lambda reqId: self.reqHeadTimeStamp(reqId, contract, whatToShow,
+                                                useRTH, formatDate),
+            self.cancelHeadTimeStamp, timeout)
+
+
+    def reqHistogramDataFuture(self, contract:Contract, useRTH:bool,
+                               timePeriod:str, timeout:float=None):
+        """ future of the list of HistogramData """
+        return self.startRequest(
+            lambda reqId: self.reqHistogramData(reqId, contract, useRTH,
+                                                timePeriod),
+            self.cancelHistogramData, timeout)
+
+
+    def reqSecDefOptParamsFuture(self, underlyingSymbol:str,
+                                 futFopExchange:str, underlyingSecType:str,
+                                 underlyingConId:int, timeout:float=None):
+        """ future of the list of (exchange, underlyingConId, tradingClass,
+        multiplier, expirations, strikes) """
+        return self.startRequest(
+            lambda reqId: self.reqSecDefOptParams(reqId, underlyingSymbol,
+                futFopExchange, underlyingSecType, underlyingConId),
+            timeout=timeout)
+
+
+    def reqMatchingSymbolsFuture(self, pattern:str, timeout:float=None):
+        """ future of the list of ContractDescription """
+        return self.startRequest(
+            lambda reqId: self.reqMatchingSymbols(reqId, pattern),
+            timeout=timeout)
+
+
+    def reqFundamentalDataFuture(self, contract:Contract, reportType:str,
+                                 fundamentalDataOptions:TagValueList=None,
+                                 timeout:float=None):
+        """ future of the report str """
+        return self.startRequest(
+            lambda reqId: self.reqFundamentalData(reqId, contract, reportType,
+                fundamentalDataOptions or []),
+            self.cancelFundamentalData, timeout)
+
+
+    ##### answers
+
+    def error(self, reqId:TickerId, errorCode:int, errorString:str):
+        # 2100-2199 are warnings, the request goes on
+        if not 2100 <= errorCode < 2200:
+            pending = self._popPending(reqId)
+            if pending is not None:
+                self._settle(pending, None, RequestError(reqId, errorCode, errorString))
+                return
+        super().error(reqId, errorCode, errorString)
+
+
+    def connectionClosed(self):
+        with self.pendingLock:
+            pendings = list(self.pendingReqs.values())
+            self.pendingReqs.clear()
+        for pending in pendings:
+            self._settle(pending, None, ConnectionError("connection closed"))
+        super().connectionClosed()
+
+
+    def contractDetails(self, reqId:int, contractDetails:ContractDetails):
+        if not self._addItem(reqId, contractDetails):
+            super().contractDetails(reqId, contractDetails)
+
+
+    def bondContractDetails(self, reqId:int, contractDetails:ContractDetails):
+        if not self._addItem(reqId, contractDetails):
+            super().bondContractDetails(reqId, contractDetails)
+
+
+    def contractDetailsEnd(self, reqId:int):
+        if not self._finish(reqId):
+            super().contractDetailsEnd(reqId)
+
+
+    def historicalData(self, reqId:int, bar:BarData):
+        if not self._addItem(reqId, bar):
+            super().historicalData(reqId, bar)
+
+
+    def historicalDataColumns(self, reqId:int, *columns):
+        pending = self.pendingReqs.get(reqId)
+        if pending is None:
+            super().historicalDataColumns(reqId, *columns)
+        else:
+            pending.items = columns
+
+
+    def historicalDataEnd(self, reqId:int, start:str, end:str):
+        if not self._finish(reqId):
+            super().historicalDataEnd(reqId, start, end)
+
+
+    def _historicalTicks(self, reqId, ticks, done) -> bool:
+        pending = self.pendingReqs.get(reqId)
+        if pending is None:
+            return False
+        if type(ticks) is list:
+            pending.items.extend(ticks)
+        else:
+            pending.items.append(ticks)     # one columnar page
+        if done:
+            self._finish(reqId)
+        return True
+
+
+    def historicalTicks(self, reqId:int, ticks:ListOfHistoricalTick, done:bool):
+        if not self._historicalTicks(reqId, ticks, done):
+            super().historicalTicks(reqId, ticks, done)
+
+
+    def historicalTicksBidAsk(self, reqId:int, ticks:ListOfHistoricalTickBidAsk,
+                              done:bool):
+        if not self._historicalTicks(reqId, ticks, done):
+            super().historicalTicksBidAsk(reqId, ticks, done)
+
+
+    def historicalTicksLast(self, reqId:int, ticks:ListOfHistoricalTickLast,
+                            done:bool):
+        if not self._historicalTicks(reqId, ticks, done):
+            super().historicalTicksLast(reqId, ticks, done)
+
+
+    def historicalTicksArray(self, reqId:int, ticks, done:bool):
+        if not self._historicalTicks(reqId, ticks, done):
+            super().historicalTicksArray(reqId, ticks, done)
+
+
+    def headTimestamp(self, reqId:int, headTimestamp:str):
+        if not self._finish(reqId, headTimestamp):
+            super().headTimestamp(reqId, headTimestamp)
+
+
+    def histogramData(self, reqId:int, items:HistogramData):
+        if not self._finish(reqId, items):
+            super().histogramData(reqId, items)
+
+
+    def securityDefinitionOptionParameter(self, reqId:int, exchange:str,
+            underlyingConId:int, tradingClass:str, multiplier:str,
+            expirations:SetOfString, strikes:SetOfFloat):
+        if not self._addItem(reqId, (exchange, underlyingConId, tradingClass,
+                                     multiplier, expirations, strikes)):
+            super().securityDefinitionOptionParameter(reqId, exchange,
+                underlyingConId, tradingClass, multiplier, expirations, strikes)
+
+
+    def securityDefinitionOptionParameterEnd(self, reqId:int):
+        if not self._finish(reqId):
+            super().securityDefinitionOptionParameterEnd(reqId)
+
+
+    def symbolSamples(self, reqId:int,
+                      contractDescriptions:ListOfContractDescription):
+        if not self._finish(reqId, contractDescriptions):
+            super().symbolSamples(reqId, contractDescriptions)
+
+
+    def fundamentalData(self, reqId:TickerId, data:str):
+        if not self._finish(reqId, data):
+            super().fundamentalData(reqId, data)
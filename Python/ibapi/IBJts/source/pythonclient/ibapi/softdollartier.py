@@ -4,10 +4,12 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
 """
 
 
-from ibapi.object_implem import Object
+from ibapi.object_implem import Object, valueSlots
 
  
 class SoftDollarTier(Object):
+    __slots__ = valueSlots("name", "val", "displayName")
+
     def __init__(self, name = "", val = "", displayName = ""):
         self.name = name
         self.val = val
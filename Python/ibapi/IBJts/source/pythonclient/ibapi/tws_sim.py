@@ -0,0 +1,671 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Local stand-in for TWS/IBGW, to run tests and benchmarks with no TWS and no
+network. It speaks the API\\0 handshake (always at server version
+MAX_CLIENT_VER) and answers:
+- startApi: managedAccounts() and nextValidId()
+- reqContractDetails, reqMarketRule, reqHistoricalData, reqHeadTimeStamp,
+  reqCurrentTime, reqIds, reqAccountSummary
+- reqMktData: tickPrice/tickSize stream at tickRate ticks/s per subscription,
+  over a random walk of the instrument price, until cancelMktData
+- placeOrder: openOrder() and orderStatus() Submitted, then after fillDelay
+  the fill (execDetails(), openOrder() and orderStatus() Filled,
+  commissionReport()) for MKT orders and marketable LMT orders; the other
+  LMT and STP orders rest until the price crosses them. An order with
+  transmit off is held until an order of its bracket (same parent) is
+  transmitted; the children are PreSubmitted until their parent fills, and
+  when one fills its siblings are cancelled (OCA). cancelOrder cancels a
+  working order and its children.
+- the start up requests of the usual frameworks (positions, open orders,
+  account updates, executions, completed orders) with just their end marker
+The other msgs are logged and ignored.
+
+Each instrument is made up from its symbol the first time it is seen. Any
+request can be answered differently, or a new one handled, with the handlers
+dict (OUT msg id -> fn(session, fields), the fields as str); session.send()
+writes an answer and broadcast() sends to all the connected clients:
+
+    sim = TwsSimulator(tickRate=1000)
+    sim.handlers[OUT.REQ_NEWS_PROVIDERS] = lambda session, fields: \\
+        session.send(IN.NEWS_PROVIDERS, 0)
+    port = sim.start()          # in a background thread
+    ...
+    sim.stop()
+
+or from the command line:
+
+    python -m ibapi.tws_sim --port 7497 --tickRate 100 --fillDelay 0.05
+"""
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import logging
+import random
+import threading
+import time
+import zlib
+
+from ibapi import comm
+from ibapi.message import IN, OUT
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.ticktype import TickTypeEnum
+
+
+logger = logging.getLogger(__name__)
+
+
+UNSET_DOUBLE_STR = "1.7976931348623157E308"
+
+# marketRuleId -> [(lowEdge, increment)]
+MARKET_RULES = {
+    26: [(0., 0.01)],
+    110: [(0., 0.01), (3., 0.05)],
+}
+
+BAR_SIZE_SECS = {"sec": 1, "secs": 1, "min": 60, "mins": 60, "hour": 3600,
+                 "hours": 3600, "day": 86400, "week": 7 * 86400,
+                 "month": 30 * 86400}
+DURATION_SECS = {"S": 1, "D": 86400, "W": 7 * 86400, "M": 30 * 86400,
+                 "Y": 365 * 86400}
+
+
+class SimInstrument:
+    def __init__(self, symbol:str, secType:str="STK"):
+        self.symbol = symbol
+        self.secType = secType
+        self.conId = zlib.crc32(("%s:%s" % (symbol, secType)).encode()) & 0x7fffffff
+        self.rnd = random.Random(self.conId)
+        self.price = 20. + self.conId % 480
+        self.marketRuleId = 110 if secType in ("OPT", "FOP") else 26
+        self.minTick = 0.01
+        self.volume = 0
+        self.restingOrders = []
+
+    def step(self):
+        """ moves the price by one tick at most """
+        self.price = max(self.minTick, round(self.price
+            + self.rnd.choice((-self.minTick, 0., self.minTick)), 2))
+        return self.price
+
+
+class SimOrder:
+    def __init__(self, session, orderId, instrument, fields):
+        self.session = session
+        self.orderId = orderId
+        self.instrument = instrument
+        self.contractFields = fields
+        self.action = fields["action"]
+        self.totalQuantity = float(fields["totalQuantity"])
+        self.orderType = fields["orderType"]
+        self.lmtPrice = float(fields["lmtPrice"] or 0.)
+        self.auxPrice = float(fields["auxPrice"] or 0.)
+        self.orderRef = fields["orderRef"]
+        self.parentId = int(fields["parentId"] or 0)
+        self.transmit = fields["transmit"] != "0"
+        self.permId = 0
+        self.filled = 0.
+        self.status = "Inactive"    # not transmitted yet
+
+    def fillPrice(self, price):
+        """ the price it fills at given the market price, None if it does
+        not """
+        buy = self.action == "BUY"
+        if self.orderType == "MKT":
+            return price
+        if self.orderType == "LMT":
+            if (buy and price <= self.lmtPrice) or (not buy and price >= self.lmtPrice):
+                return self.lmtPrice
+            return None
+        if self.orderType == "STP":
+            if (buy and price >= self.auxPrice) or (not buy and price <= self.auxPrice):
+                return price
+            return None
+        return None
+
+
+class SimSession:
+    """ one client connection """
+
+    def __init__(self, sim, reader, writer):
+        self.sim = sim
+        self.reader = reader
+        self.writer = writer
+        self.clientId = None
+        self.marketDataType = 1
+        self.subscriptions = {}     # reqId -> streaming task
+        self.timers = set()         # pending asyncio.TimerHandle
+        self.closed = False
+
+
+    def send(self, *fields):
+        if self.closed:
+            return
+        self.writer.write(comm.make_msg("".join(comm.make_field(f) for f in fields)))
+
+
+    def callLater(self, delay, fn, *args):
+        """ loop.call_later() cancelled if the session closes first """
+        def call():
+            self.timers.discard(handle)
+            fn(*args)
+        handle = self.sim.loop.call_later(delay, call)
+        self.timers.add(handle)
+
+
+    async def run(self):
+        try:
+            await self.reader.readexactly(4)    # API\0
+            buf = comm.MsgBuffer()
+            while not buf.read_msgs():          # v100..151 range
+                data = await self.reader.read(4096)
+                if not data:
+                    return
+                buf.write(data)
+            self.send(MAX_CLIENT_VER, time.strftime("%Y%m%d %H:%M:%S") + " EST")
+            await self.writer.drain()
+
+            while True:
+                data = await self.reader.read(65536)
+                if not data:
+                    break
+                buf.write(data)
+                for text in buf.read_msgs():
+                    fields = [f.decode(errors="replace") for f in comm.read_fields(text)]
+                    try:
+                        self.sim.handle(self, fields)
+                    except Exception:
+                        logger.exception("client %s: cannot handle %s", self.clientId, fields)
+                await self.writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.closed = True
+            for task in self.subscriptions.values():
+                task.cancel()
+            for handle in self.timers:
+                handle.cancel()
+            self.sim.sessionClosed(self)
+            self.sim.sessions.discard(self)
+            self.writer.close()
+            logger.info("client %s disconnected", self.clientId)
+
+
+class TwsSimulator:
+    def __init__(self, host:str="127.0.0.1", port:int=0, tickRate:float=10.,
+                 histBars:int=None, maxHistBars:int=100000, fillDelay:float=0.,
+                 account:str="DU123456", commission:float=1.):
+        self.host = host
+        self.port = port
+        self.tickRate = tickRate        # per market data subscription
+        self.histBars = histBars        # fixed nb of bars, else from the request
+        self.maxHistBars = maxHistBars
+        self.fillDelay = fillDelay
+        self.account = account
+        self.commission = commission
+        self.instruments = {}
+        self.sessions = set()
+        self.orders = {}                # (clientId, orderId) -> SimOrder
+        self.nextOrderId = 1
+        self.permIdSeq = itertools.count(1000000)
+        self.execIdSeq = itertools.count(1)
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.handlers = {
+            OUT.START_API: self.startApi,
+            OUT.REQ_IDS: self.reqIds,
+            OUT.REQ_CURRENT_TIME: self.reqCurrentTime,
+            OUT.REQ_MARKET_DATA_TYPE: self.reqMarketDataType,
+            OUT.REQ_CONTRACT_DATA: self.reqContractDetails,
+            OUT.REQ_MARKET_RULE: self.reqMarketRule,
+            OUT.REQ_MKT_DATA: self.reqMktData,
+            OUT.CANCEL_MKT_DATA: self.cancelMktData,
+            OUT.REQ_HISTORICAL_DATA: self.reqHistoricalData,
+            OUT.REQ_HEAD_TIMESTAMP: self.reqHeadTimeStamp,
+            OUT.PLACE_ORDER: self.placeOrder,
+            OUT.CANCEL_ORDER: self.cancelOrder,
+            OUT.REQ_ACCOUNT_SUMMARY: self.reqAccountSummary,
+            OUT.REQ_POSITIONS: lambda session, fields: session.send(IN.POSITION_END, 1),
+            OUT.REQ_OPEN_ORDERS: lambda session, fields: session.send(IN.OPEN_ORDER_END, 1),
+            OUT.REQ_ALL_OPEN_ORDERS: lambda session, fields: session.send(IN.OPEN_ORDER_END, 1),
+            OUT.REQ_AUTO_OPEN_ORDERS: lambda session, fields: session.send(IN.OPEN_ORDER_END, 1),
+            OUT.REQ_ACCT_DATA: lambda session, fields: session.send(
+                IN.ACCT_DOWNLOAD_END, 1, self.account),
+            OUT.REQ_EXECUTIONS: lambda session, fields: session.send(
+                IN.EXECUTION_DATA_END, 1, fields[2]),
+            OUT.REQ_COMPLETED_ORDERS: lambda session, fields: session.send(
+                IN.COMPLETED_ORDERS_END),
+        }
+
+
+    def instrument(self, symbol:str, secType:str="STK") -> SimInstrument:
+        inst = self.instruments.get((symbol, secType))
+        if inst is None:
+            inst = self.instruments[(symbol, secType)] = SimInstrument(symbol, secType)
+        return inst
+
+
+    ##### server
+
+    async def serve(self):
+        """ starts listening; self.port is the actual port after that """
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self._accept, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info("TWS simulator listening on %s:%d", self.host, self.port)
+
+
+    async def _accept(self, reader, writer):
+        session = SimSession(self, reader, writer)
+        self.sessions.add(session)
+        try:
+            await session.run()
+        except asyncio.CancelledError:
+            pass    # stop()
+
+
+    def start(self) -> int:
+        """ runs the simulator in a daemon thread, returns the port """
+        ready = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            loop.run_until_complete(self.serve())
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(self._shutdown())
+            loop.close()
+
+        self.thread = threading.Thread(target=run, name="TwsSimulator", daemon=True)
+        self.thread.start()
+        ready.wait()
+        return self.port
+
+
+    async def _shutdown(self):
+        self.server.close()
+        for session in list(self.sessions):
+            session.writer.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.server.wait_closed()
+
+
+    def stop(self):
+        if self.thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.thread = None
+
+
+    def call(self, fn, *args):
+        """ runs fn(*args) in the simulator loop, from another thread """
+        self.loop.call_soon_threadsafe(fn, *args)
+
+
+    def broadcast(self, *fields):
+        """ sends a msg to all the connected clients; from the simulator
+        loop, see call() """
+        for session in self.sessions:
+            session.send(*fields)
+
+
+    def sessionClosed(self, session):
+        """ the orders of a closed session leave the book, nobody would get
+        their fills """
+        for inst in self.instruments.values():
+            inst.restingOrders = [order for order in inst.restingOrders
+                                  if order.session is not session]
+        self.orders = {key: order for (key, order) in self.orders.items()
+                       if order.session is not session}
+
+
+    def handle(self, session, fields):
+        handler = self.handlers.get(int(fields[0]))
+        if handler is None:
+            logger.info("client %s: msg %s not simulated", session.clientId, fields[0])
+            return
+        handler(session, fields)
+
+
+    ##### handlers, fields as sent by the EClient at MAX_CLIENT_VER
+
+    def startApi(self, session, fields):
+        session.clientId = int(fields[2])
+        session.send(IN.MANAGED_ACCTS, 1, self.account)
+        session.send(IN.NEXT_VALID_ID, 1, self.nextOrderId)
+
+
+    def reqIds(self, session, fields):
+        session.send(IN.NEXT_VALID_ID, 1, self.nextOrderId)
+
+
+    def reqCurrentTime(self, session, fields):
+        session.send(IN.CURRENT_TIME, 1, int(time.time()))
+
+
+    def reqMarketDataType(self, session, fields):
+        session.marketDataType = int(fields[2])
+
+
+    def reqContractDetails(self, session, fields):
+        (reqId, conId, symbol, secType, lastTradeDate, strike, right, multiplier,
+         exchange, primaryExchange, currency, localSymbol, tradingClass) = fields[2:15]
+        inst = self.instrument(symbol, secType or "STK")
+        exchange = exchange or "SMART"
+        session.send(IN.CONTRACT_DATA, 8, reqId, symbol, inst.secType,
+            lastTradeDate, strike or 0., right, exchange, currency or "USD",
+            localSymbol or symbol, symbol, tradingClass or symbol, inst.conId,
+            inst.minTick, 1, multiplier, "ACTIVETIM,LMT,MKT,STP", "SMART,ARCA,NYSE",
+            1, 0, symbol + " SIMULATED", primaryExchange or "NYSE",
+            lastTradeDate[:6], "Simulated", "Simulated", "Simulated",
+            "US/Eastern", "", "", "", 0, 0, 1, "", "",
+            ",".join([str(inst.marketRuleId)] * 3), lastTradeDate)
+        session.send(IN.CONTRACT_DATA_END, 1, reqId)
+
+
+    def reqMarketRule(self, session, fields):
+        ruleId = int(fields[1])
+        increments = MARKET_RULES.get(ruleId, MARKET_RULES[26])
+        session.send(IN.MARKET_RULE, ruleId, len(increments),
+                     *itertools.chain.from_iterable(increments))
+
+
+    def reqMktData(self, session, fields):
+        reqId = int(fields[2])
+        inst = self.instrument(fields[4], fields[5] or "STK")
+        session.send(IN.MARKET_DATA_TYPE, 1, reqId, session.marketDataType)
+        session.send(IN.TICK_REQ_PARAMS, reqId, inst.minTick, "9c0001", 3)
+        previous = session.subscriptions.pop(reqId, None)
+        if previous is not None:
+            previous.cancel()
+        session.subscriptions[reqId] = self.loop.create_task(
+            self._streamTicks(session, reqId, inst))
+
+
+    def cancelMktData(self, session, fields):
+        task = session.subscriptions.pop(int(fields[2]), None)
+        if task is not None:
+            task.cancel()
+
+
+    async def _streamTicks(self, session, reqId, inst):
+        """ tickRate ticks/s: bid, ask and last prices with their size and
+        the volume, in turn """
+        kinds = itertools.cycle((TickTypeEnum.BID, TickTypeEnum.ASK,
+                                 TickTypeEnum.LAST, TickTypeEnum.VOLUME))
+        start = self.loop.time()
+        nSent = 0
+        while True:
+            due = int((self.loop.time() - start) * self.tickRate) + 1 - nSent
+            for _ in range(min(due, 10000)):
+                kind = next(kinds)
+                if kind == TickTypeEnum.VOLUME:
+                    session.send(IN.TICK_SIZE, 6, reqId, kind, inst.volume)
+                    continue
+                price = inst.step()
+                spread = inst.minTick if kind == TickTypeEnum.BID else 0.
+                spread = -inst.minTick if kind == TickTypeEnum.ASK else spread
+                size = inst.rnd.randrange(1, 20) * 100
+                if kind == TickTypeEnum.LAST:
+                    inst.volume += size
+                session.send(IN.TICK_PRICE, 6, reqId, kind,
+                             round(price - spread, 2), size, 0)
+                if inst.restingOrders:
+                    self._checkResting(inst)
+            nSent += max(due, 0)
+            await session.writer.drain()
+            await asyncio.sleep(max(0.001, (nSent - (self.loop.time() - start)
+                                             * self.tickRate) / self.tickRate))
+
+
+    def reqHistoricalData(self, session, fields):
+        reqId = int(fields[1])
+        inst = self.instrument(fields[3], fields[4] or "STK")
+        (endDateTime, barSizeSetting, durationStr) = fields[15:18]
+        formatDate = int(fields[20] or 1)
+        (n, unit) = barSizeSetting.split()
+        barSecs = int(n) * BAR_SIZE_SECS[unit]
+        (n, unit) = durationStr.split()
+        nBars = self.histBars
+        if nBars is None:
+            nBars = max(1, min(self.maxHistBars,
+                               int(n) * DURATION_SECS[unit] // barSecs))
+
+        end = int(time.time()) // barSecs * barSecs
+        rnd = random.Random(inst.conId + nBars)
+        price = inst.price
+        flds = [IN.HISTORICAL_DATA, reqId, "", "", nBars]
+        for i in range(nBars):
+            t = end - (nBars - 1 - i) * barSecs
+            if formatDate == 2:
+                date = str(t)
+            elif barSecs >= 86400:
+                date = time.strftime("%Y%m%d", time.localtime(t))
+            else:
+                date = time.strftime("%Y%m%d  %H:%M:%S", time.localtime(t))
+            opn = price
+            price = max(inst.minTick, round(price + rnd.gauss(0., 0.2), 2))
+            high = round(max(opn, price) + rnd.random() * 0.1, 2)
+            low = round(max(inst.minTick, min(opn, price) - rnd.random() * 0.1), 2)
+            flds += [date, opn, high, low, price, rnd.randrange(1, 5000) * 100,
+                     round((opn + price) / 2, 2), rnd.randrange(1, 500)]
+        flds[2] = flds[5] if nBars else ""
+        flds[3] = flds[-8] if nBars else ""
+        session.send(*flds)
+
+
+    def reqHeadTimeStamp(self, session, fields):
+        session.send(IN.HEAD_TIMESTAMP, fields[1], "19800101  09:30:00")
+
+
+    def reqAccountSummary(self, session, fields):
+        reqId = fields[2]
+        for (tag, value) in (("NetLiquidation", "1000000.00"),
+                             ("AvailableFunds", "1000000.00"),
+                             ("BuyingPower", "4000000.00")):
+            session.send(IN.ACCOUNT_SUMMARY, 1, reqId, self.account, tag, value, "USD")
+        session.send(IN.ACCOUNT_SUMMARY_END, 1, reqId)
+
+
+    ##### orders
+
+    PLACE_ORDER_FIELDS = ("orderId", "conId", "symbol", "secType",
+        "lastTradeDateOrContractMonth", "strike", "right", "multiplier",
+        "exchange", "primaryExchange", "currency", "localSymbol",
+        "tradingClass", "secIdType", "secId", "action", "totalQuantity",
+        "orderType", "lmtPrice", "auxPrice", "tif", "ocaGroup", "account",
+        "openClose", "origin", "orderRef", "transmit", "parentId")
+
+    # openOrder at MAX_CLIENT_VER: nb of fields, index of parentId and of
+    # the order state status; the fields not set are 0
+    OPEN_ORDER_SIZE = 130
+    OPEN_ORDER_PARENT_ID = 58
+    OPEN_ORDER_STATUS = 96
+
+    def placeOrder(self, session, fields):
+        named = dict(zip(TwsSimulator.PLACE_ORDER_FIELDS, fields[1:]))
+        orderId = int(named["orderId"])
+        self.nextOrderId = max(self.nextOrderId, orderId + 1)
+        inst = self.instrument(named["symbol"], named["secType"] or "STK")
+        order = self.orders.get((session.clientId, orderId))
+        if order is None:
+            order = SimOrder(session, orderId, inst, named)
+            order.permId = next(self.permIdSeq)
+            self.orders[(session.clientId, orderId)] = order
+        elif order.status in ("Filled", "Cancelled"):
+            session.send(IN.ERR_MSG, 2, orderId, 104, "Cannot modify a filled order.")
+            return
+        else:
+            # modification
+            order.totalQuantity = float(named["totalQuantity"])
+            order.lmtPrice = float(named["lmtPrice"] or 0.)
+            order.auxPrice = float(named["auxPrice"] or 0.)
+            order.transmit = named["transmit"] != "0"
+
+        if order.status == "Inactive":
+            if not order.transmit:
+                return
+            # the whole bracket goes with its last order
+            rootId = order.parentId or order.orderId
+            for other in self._sessionOrders(session):
+                if other.status == "Inactive" and rootId in (other.orderId, other.parentId):
+                    self._submit(other)
+        else:
+            self._sendOpenOrder(order)
+            self._sendOrderStatus(order, 0.)
+            if order in inst.restingOrders:
+                self._scheduleCheck(order)
+
+
+    def cancelOrder(self, session, fields):
+        order = self.orders.get((session.clientId, int(fields[2])))
+        if order is None or order.status in ("Filled", "Cancelled"):
+            session.send(IN.ERR_MSG, 2, int(fields[2]), 135, "Can't find order with id =" + fields[2])
+            return
+        self._cancel(order)
+        for child in self._children(order):
+            self._cancel(child)
+
+
+    def _sessionOrders(self, session):
+        return sorted((order for order in self.orders.values()
+                       if order.session is session), key=lambda order: order.orderId)
+
+
+    def _children(self, parent):
+        return [order for order in self._sessionOrders(parent.session)
+                if order.parentId == parent.orderId
+                and order.status not in ("Filled", "Cancelled")]
+
+
+    def _submit(self, order):
+        """ transmits the order, working unless its parent is not filled """
+        parent = self.orders.get((order.session.clientId, order.parentId))
+        if order.parentId and parent is not None and parent.status != "Filled":
+            order.status = "PreSubmitted"
+        else:
+            order.status = "Submitted"
+        self._sendOpenOrder(order)
+        self._sendOrderStatus(order, 0.)
+        if order.status == "Submitted":
+            order.instrument.restingOrders.append(order)
+            self._scheduleCheck(order)
+
+
+    def _scheduleCheck(self, order):
+        if self.fillDelay > 0:
+            order.session.callLater(self.fillDelay, self._checkResting, order.instrument)
+        else:
+            self._checkResting(order.instrument)
+
+
+    def _cancel(self, order):
+        order.status = "Cancelled"
+        if order in order.instrument.restingOrders:
+            order.instrument.restingOrders.remove(order)
+        self._sendOrderStatus(order, 0.)
+
+
+    def _checkResting(self, inst):
+        for order in list(inst.restingOrders):
+            # an order of the list can be cancelled by the fill of a sibling
+            if order not in inst.restingOrders:
+                continue
+            price = order.fillPrice(inst.price)
+            if price is not None:
+                inst.restingOrders.remove(order)
+                self._fill(order, price)
+
+
+    def _sendOpenOrder(self, order):
+        c = order.contractFields
+        flds = [IN.OPEN_ORDER, order.orderId, order.instrument.conId, c["symbol"],
+            order.instrument.secType, c["lastTradeDateOrContractMonth"],
+            c["strike"] or 0., c["right"], c["multiplier"], c["exchange"],
+            c["currency"], c["localSymbol"], c["tradingClass"], order.action,
+            order.totalQuantity, order.orderType, order.lmtPrice, order.auxPrice,
+            c["tif"], c["ocaGroup"], c["account"] or self.account, c["openClose"],
+            c["origin"] or 0, order.orderRef, order.session.clientId, order.permId]
+        flds += [0] * (TwsSimulator.OPEN_ORDER_SIZE - len(flds))
+        flds[TwsSimulator.OPEN_ORDER_PARENT_ID] = order.parentId
+        flds[TwsSimulator.OPEN_ORDER_STATUS] = order.status
+        order.session.send(*flds)
+
+
+    def _sendOrderStatus(self, order, lastFillPrice):
+        order.session.send(IN.ORDER_STATUS, order.orderId, order.status,
+            order.filled, order.totalQuantity - order.filled,
+            lastFillPrice if order.filled else 0., order.permId,
+            order.parentId, lastFillPrice, order.session.clientId, "",
+            0.)
+
+
+    def _fill(self, order, price):
+        session = order.session
+        qty = order.totalQuantity - order.filled
+        order.filled = order.totalQuantity
+        order.status = "Filled"
+        c = order.contractFields
+        execId = "0000e0d5.%08x.01.01" % next(self.execIdSeq)
+        session.send(IN.EXECUTION_DATA, -1, order.orderId, order.instrument.conId,
+            c["symbol"], order.instrument.secType, c["lastTradeDateOrContractMonth"],
+            c["strike"] or 0., c["right"], c["multiplier"], c["exchange"],
+            c["currency"], c["localSymbol"], c["tradingClass"], execId,
+            datetime.datetime.now().strftime("%Y%m%d  %H:%M:%S"), self.account,
+            "ISLAND", "BOT" if order.action == "BUY" else "SLD", qty, price,
+            order.permId, session.clientId, 0, order.filled, price,
+            order.orderRef, "", UNSET_DOUBLE_STR, "", 1)
+        self._sendOpenOrder(order)
+        self._sendOrderStatus(order, price)
+        session.send(IN.COMMISSION_REPORT, 1, execId, self.commission, "USD",
+                     UNSET_DOUBLE_STR, UNSET_DOUBLE_STR, 0)
+
+        if order.parentId:
+            # the children of a bracket are one cancels all
+            parent = self.orders.get((session.clientId, order.parentId))
+            if parent is not None:
+                for sibling in self._children(parent):
+                    self._cancel(sibling)
+        for child in self._children(order):
+            # not if a sibling filled and cancelled it meanwhile
+            if child.status == "PreSubmitted":
+                self._submit(child)
+
+
+def main():
+    parser = argparse.ArgumentParser("TWS simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7497)
+    parser.add_argument("--tickRate", type=float, default=10.,
+                        help="ticks/s per market data subscription")
+    parser.add_argument("--histBars", type=int, help="bars per historical answer")
+    parser.add_argument("--fillDelay", type=float, default=0.)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    sim = TwsSimulator(args.host, args.port, args.tickRate, args.histBars,
+                       fillDelay=args.fillDelay)
+
+    async def run():
+        await sim.serve()
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if "__main__" == __name__:
+    main()
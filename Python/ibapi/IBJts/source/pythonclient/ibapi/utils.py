@@ -12,6 +12,7 @@ Collection of misc tools
 import sys
 import logging
 import inspect
+import itertools
 
 from ibapi.common import UNSET_INTEGER, UNSET_DOUBLE, UNSET_LONG
 
@@ -97,6 +98,81 @@ def decode(the_type, fields, show_unset = False):
 
 
 
+class FieldReader:
+    """ Cursor over the fields of a msg, with one method per wanted type.
+    It gives the same values as decode() but w/o the per field logging and
+    type dispatching; the decoder hot paths use it:
+
+        reqId = fields.int()
+        price = fields.float_unset()
+
+    It is also an iterator over the raw fields, so it can be handed to code
+    still using decode(). """
+
+    __slots__ = ("it", )
+
+    def __init__(self, fields):
+        self.it = iter(fields)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.it)
+
+    def skip(self):
+        if next(self.it, None) is None:
+            raise BadMessage("no more fields")
+
+    def take(self, n):
+        """ the next n raw fields, as a tuple """
+        raw = tuple(itertools.islice(self.it, n))
+        if len(raw) != n:
+            raise BadMessage("no more fields")
+        return raw
+
+    def str(self):
+        s = next(self.it, None)
+        if s is None:
+            raise BadMessage("no more fields")
+        try:
+            return s.decode(errors='backslashreplace')
+        except AttributeError:
+            return s
+
+    def int(self):
+        s = next(self.it, None)
+        if s is None:
+            raise BadMessage("no more fields")
+        return int(s or 0)
+
+    def float(self):
+        s = next(self.it, None)
+        if s is None:
+            raise BadMessage("no more fields")
+        return float(s or 0)
+
+    def bool(self):
+        s = next(self.it, None)
+        if s is None:
+            raise BadMessage("no more fields")
+        return int(s or 0) != 0
+
+    def int_unset(self):
+        """ UNSET_INTEGER for an empty field """
+        s = next(self.it, None)
+        if s is None:
+            raise BadMessage("no more fields")
+        return int(s) if s else UNSET_INTEGER
+
+    def float_unset(self):
+        """ UNSET_DOUBLE for an empty field """
+        s = next(self.it, None)
+        if s is None:
+            raise BadMessage("no more fields")
+        return float(s) if s else UNSET_DOUBLE
+
+
 def ExerciseStaticMethods(klass):
 
     import types
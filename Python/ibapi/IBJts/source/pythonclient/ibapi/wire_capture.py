@@ -0,0 +1,127 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Capture of the incoming msgs and their replay into a Decoder.
+
+With EClient.captureFile set before connect(), the EReader appends every
+msg it frames to that file, with the time.monotonic_ns() of the packet it came
+in. The file is a sequence of records:
+- msg:     int64 receive time (ns), uint32 length, the msg payload (the
+           fields, without the size prefix)
+- session: int64 time, uint32 0xFFFFFFFF, uint32 server version; written
+           each time a capture is opened, so sessions can be appended to the
+           same file
+all in little endian.
+
+The replay() feeds a capture to a Decoder and so to any EWrapper, either as
+fast as possible or paced as recorded (or a multiple of that):
+
+    replay("session.ibcap", MyWrapper())             # as fast as possible
+    replay("session.ibcap", MyWrapper(), speed=1.)   # original pacing
+"""
+
+import logging
+import struct
+import time
+
+from ibapi import comm
+from ibapi.decoder import Decoder
+
+
+logger = logging.getLogger(__name__)
+
+
+_RECORD_HEADER = struct.Struct("<qI")
+_SERVER_VERSION = struct.Struct("<I")
+SESSION_MARK = 0xFFFFFFFF
+
+
+class CaptureWriter:
+    def __init__(self, fileName:str, serverVersion:int):
+        self.file = open(fileName, "ab")
+        self.nMsgs = 0
+        self.file.write(_RECORD_HEADER.pack(time.monotonic_ns(), SESSION_MARK)
+                        + _SERVER_VERSION.pack(serverVersion))
+
+
+    def write(self, msgs, recvTime:int=None):
+        """ appends the msgs received at recvTime (monotonic ns) """
+        if recvTime is None:
+            recvTime = time.monotonic_ns()
+        pack = _RECORD_HEADER.pack
+        self.file.write(b"".join(pack(recvTime, len(msg)) + msg for msg in msgs))
+        self.nMsgs += len(msgs)
+
+
+    def flush(self):
+        self.file.flush()
+
+
+    def close(self):
+        self.file.close()
+
+
+def read_capture(fileName:str, readSize:int=1 << 20):
+    """ yields (recvTime, msg) and (recvTime, serverVersion) for the session
+    records, msg being bytes and serverVersion an int. The file is read
+    readSize bytes at a time, a whole day capture is not loaded at once. """
+    unpack_from = _RECORD_HEADER.unpack_from
+    headerSize = _RECORD_HEADER.size
+    sessionSize = headerSize + _SERVER_VERSION.size
+    data = b""
+    pos = 0
+    with open(fileName, "rb") as f:
+        while True:
+            chunk = f.read(readSize)
+            if not chunk:
+                break
+            # the incomplete record left from the previous chunk first
+            data = data[pos:] + chunk
+            pos = 0
+            end = len(data)
+            while pos + headerSize <= end:
+                (recvTime, size) = unpack_from(data, pos)
+                if size == SESSION_MARK:
+                    if pos + sessionSize > end:
+                        break
+                    yield (recvTime, _SERVER_VERSION.unpack_from(data, pos + headerSize)[0])
+                    pos += sessionSize
+                    continue
+                if pos + headerSize + size > end:
+                    break
+                pos += headerSize
+                yield (recvTime, data[pos:pos+size])
+                pos += size
+    if pos < len(data):
+        logger.warning("capture %s: truncated last msg", fileName)
+
+
+def replay(fileName:str, wrapper, speed:float=None, decoder:Decoder=None) -> int:
+    """ decodes the msgs of a capture into the wrapper, as fast as possible
+    when speed is None, else with the recorded gaps divided by speed.
+    A decoder can be given for its options (columnarHistData, ...), its
+    serverVersion is set from the capture. Returns the number of msgs. """
+    if decoder is None:
+        decoder = Decoder(wrapper, 0)
+    read_fields = comm.read_fields
+    interpret = decoder.interpret
+    nMsgs = 0
+    t0 = None
+    for (recvTime, msg) in read_capture(fileName):
+        if type(msg) is int:
+            decoder.serverVersion = msg
+            t0 = None   # another session, maybe another boot
+            continue
+        if speed is not None:
+            if t0 is None:
+                (t0, start) = (recvTime, time.monotonic_ns())
+            delay = (start + (recvTime - t0) / speed - time.monotonic_ns()) / 1e9
+            if delay > 0:
+                time.sleep(delay)
+        interpret(read_fields(msg))
+        nMsgs += 1
+    return nMsgs
@@ -21,6 +21,7 @@ server and client.
 
 import logging
 
+from ibapi import log_mode
 from ibapi.common import * # @UnusedWildImport
 from ibapi.utils import * # @UnusedWildImport
 from ibapi.contract import (Contract, ContractDetails, DeltaNeutralContract)
@@ -52,17 +53,20 @@ class EWrapper:
         """This event is called when there is an error with the
         communication or when TWS wants to send a message to the client."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
         logger.error("ERROR %s %s %s", reqId, errorCode, errorString)
 
 
     def winError(self, text:str, lastError:int):
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def connectAck(self):
         """ callback signifying completion of successful connection """
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def marketDataType(self, reqId:TickerId, marketDataType:int):
@@ -74,42 +78,49 @@ class EWrapper:
         every subscription because different contracts can generally trade on a
         different schedule."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def tickPrice(self, reqId:TickerId , tickType:TickType, price:float,
                   attrib:TickAttrib):
         """Market data tick price callback. Handles all price related ticks."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def tickSize(self, reqId:TickerId, tickType:TickType, size:int):
         """Market data tick size callback. Handles all size-related ticks."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def tickSnapshotEnd(self, reqId:int):
         """When requesting market data snapshots, this market will indicate the
         snapshot reception is finished. """
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def tickGeneric(self, reqId:TickerId, tickType:TickType, value:float):
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def tickString(self, reqId:TickerId, tickType:TickType, value:str):
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def tickEFP(self, reqId:TickerId, tickType:TickType, basisPoints:float,
                 formattedBasisPoints:str, totalDividends:float,
                 holdDays:int, futureLastTradeDate:str, dividendImpact:float,
                 dividendsToLastTradeDate:float):
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
         """ market data call back for Exchange for Physical
         tickerId -      The request's identifier.
         tickType -      The type of tick being received.
@@ -125,7 +136,8 @@ class EWrapper:
         dividendsToLastTradeDate - The dividends expected until the expiration
             of the single stock future."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def orderStatus(self, orderId:OrderId , status:str, filled:float,
@@ -157,7 +169,8 @@ class EWrapper:
 
         """
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def openOrder(self, orderId:OrderId, contract:Contract, order:Order,
@@ -171,20 +184,23 @@ class EWrapper:
         orderState: OrderState - The orderState class includes attributes Used
             for both pre and post trade margin and commission data."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def openOrderEnd(self):
         """This is called at the end of a given request for open orders."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def connectionClosed(self):
         """This function is called when TWS closes the sockets
         connection with the ActiveX control, or when TWS is shut down."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def updateAccountValue(self, key:str, val:str, currency:str,
@@ -192,7 +208,8 @@ class EWrapper:
         """ This function is called only when ReqAccountUpdates on
         EEClientSocket object has been called. """
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def updatePortfolio(self, contract:Contract, position:float,
@@ -202,24 +219,28 @@ class EWrapper:
         """This function is called only when reqAccountUpdates on
         EEClientSocket object has been called."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def updateAccountTime(self, timeStamp:str):
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def accountDownloadEnd(self, accountName:str):
         """This is called after a batch updateAccountValue() and
         updatePortfolio() is sent."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def nextValidId(self, orderId:int):
         """ Receives next valid order id."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def contractDetails(self, reqId:int, contractDetails:ContractDetails):
@@ -227,14 +248,16 @@ class EWrapper:
         contracts matching the requested via EEClientSocket::reqContractDetails.
         For example, one can obtain the whole option chain with it."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def bondContractDetails(self, reqId:int, contractDetails:ContractDetails):
         """This function is called when reqContractDetails function
         has been called for bonds."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def contractDetailsEnd(self, reqId:int):
@@ -242,21 +265,24 @@ class EWrapper:
         request are received. This helps to define the end of an option
         chain."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def execDetails(self, reqId:int, contract:Contract, execution:Execution):
         """This event is fired when the reqExecutions() functions is
         invoked, or when an order is filled.  """
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def execDetailsEnd(self, reqId:int):
         """This function is called once all executions have been sent to
         a client in response to reqExecutions()."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
 
@@ -274,7 +300,8 @@ class EWrapper:
         price - the order's price
         size -  the order's size"""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def updateMktDepthL2(self, reqId:TickerId , position:int, marketMaker:str,
@@ -293,7 +320,8 @@ class EWrapper:
         size -  the order's size
         isSmartDepth - is SMART Depth request"""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def updateNewsBulletin(self, msgId:int, msgType:int, newsMessage:str,
@@ -305,12 +333,14 @@ class EWrapper:
         message - the message
         origExchange -    the exchange where the message comes from.  """
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def managedAccounts(self, accountsList:str):
         """Receives a comma-separated string with the managed account ids."""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def receiveFA(self, faData:FaDataType , cxml:str):
@@ -325,7 +355,8 @@ class EWrapper:
                  names rather than account numbers.
         faXmlData -  the xml-formatted configuration """
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def historicalData(self, reqId: int, bar: BarData):
         """ returns the requested historical data bars
@@ -343,12 +374,14 @@ class EWrapper:
         WAP -   the bar's Weighted Average Price
         hasGaps  -indicates if the data has gaps or not. """
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def historicalDataEnd(self, reqId:int, start:str, end:str):
         """ Marks the ending of the historical bars reception. """
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def scannerParameters(self, xml:str):
@@ -356,7 +389,8 @@ class EWrapper:
         scanner.
 
         xml -   the xml-formatted string with the available parameters."""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def scannerData(self, reqId:int, rank:int, contractDetails:ContractDetails,
@@ -371,7 +405,8 @@ class EWrapper:
         projection -    according to query.
         legStr - describes the combo legs when the scanner is returning EFP"""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def scannerDataEnd(self, reqId:int):
@@ -379,7 +414,8 @@ class EWrapper:
 
         reqId - the request's identifier"""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def realtimeBar(self, reqId: TickerId, time:int, open_: float, high: float, low: float, close: float,
@@ -399,13 +435,15 @@ class EWrapper:
         bar.count - the number of trades during the bar's timespan (only available
             for TRADES)."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def currentTime(self, time:int):
         """ Server's current time. This method will receive IB server's system
         time resulting after the invokation of reqCurrentTime. """
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def fundamentalData(self, reqId:TickerId , data:str):
@@ -413,7 +451,8 @@ class EWrapper:
         market data. The appropriate market data subscription must be set
         up in Account Management before you can receive this data."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def deltaNeutralValidation(self, reqId:int, deltaNeutralContract:DeltaNeutralContract):
@@ -424,7 +463,8 @@ class EWrapper:
         server. These values are locked when the RFQ is processed and remain
         locked until the RFQ is canceled."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
 
@@ -433,7 +473,8 @@ class EWrapper:
         - immediately after a trade execution
         - by calling reqExecutions()."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def position(self, account:str, contract:Contract, position:float,
@@ -441,14 +482,16 @@ class EWrapper:
         """This event returns real-time positions for all accounts in
         response to the reqPositions() method."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def positionEnd(self):
         """This is called once all position data for a given request are
         received and functions as an end marker for the position() data. """
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def accountSummary(self, reqId:int, account:str, tag:str, value:str,
@@ -456,34 +499,40 @@ class EWrapper:
         """Returns the data from the TWS Account Window Summary tab in
         response to reqAccountSummary()."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def accountSummaryEnd(self, reqId:int):
         """This method is called once all account summary data for a
         given request are received."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def verifyMessageAPI(self, apiData:str):
         """ Deprecated Function """
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def verifyCompleted(self, isSuccessful:bool, errorText:str):
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def verifyAndAuthMessageAPI(self, apiData:str, xyzChallange:str):
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def verifyAndAuthCompleted(self, isSuccessful:bool, errorText:str):
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def displayGroupList(self, reqId:int, groups:str):
@@ -495,7 +544,8 @@ class EWrapper:
              not change during TWS session (in other words, user cannot add a
             new group; sorting can change though)."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def displayGroupUpdated(self, reqId:int, contractInfo:str):
@@ -512,7 +562,8 @@ class EWrapper:
                 Examples: 8314@SMART for IBM SMART; 8314@ARCA for IBM @ARCA.
             combo = if any combo is selected.  """
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def positionMulti(self, reqId:int, account:str, modelCode:str,
@@ -520,14 +571,16 @@ class EWrapper:
         """same as position() except it can be for a certain
         account/model"""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def positionMultiEnd(self, reqId:int):
         """same as positionEnd() except it can be for a certain
         account/model"""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def accountUpdateMulti(self, reqId:int, account:str, modelCode:str,
@@ -535,14 +588,16 @@ class EWrapper:
         """same as updateAccountValue() except it can be for a certain
         account/model"""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def accountUpdateMultiEnd(self, reqId:int):
         """same as accountDownloadEnd() except it can be for a certain
         account/model"""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def tickOptionComputation(self, reqId:TickerId, tickType:TickType ,
@@ -553,7 +608,8 @@ class EWrapper:
         deltas, along with the present value of dividends expected on that
         options underlier are received."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def securityDefinitionOptionParameter(self, reqId:int, exchange:str,
@@ -573,7 +629,8 @@ class EWrapper:
         strikes - a list of the possible strikes for options of this underlying
              on this exchange """
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def securityDefinitionOptionParameterEnd(self, reqId:int):
@@ -582,7 +639,8 @@ class EWrapper:
 
         reqId - the ID used in the call to securityDefinitionOptionParameter """
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def softDollarTiers(self, reqId:int, tiers:list):
@@ -592,113 +650,139 @@ class EWrapper:
         tiers - Stores a list of SoftDollarTier that contains all Soft Dollar
             Tiers information """
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def familyCodes(self, familyCodes:ListOfFamilyCode):
         """ returns array of family codes """
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
 
     def symbolSamples(self, reqId:int,
                       contractDescriptions:ListOfContractDescription):
         """ returns array of sample contract descriptions """
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def mktDepthExchanges(self, depthMktDataDescriptions:ListOfDepthExchanges):
         """ returns array of exchanges which return depth to UpdateMktDepthL2"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def tickNews(self, tickerId: int, timeStamp:int, providerCode:str, articleId:str, headline:str, extraData:str):
         """ returns news headlines"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def smartComponents(self, reqId:int, smartComponentMap:SmartComponentMap):
         """returns exchange component mapping"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def tickReqParams(self, tickerId:int, minTick:float, bboExchange:str, snapshotPermissions:int):
         """returns exchange map of a particular contract"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def newsProviders(self, newsProviders:ListOfNewsProviders):
         """returns available, subscribed API news providers"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def newsArticle(self, requestId:int, articleType:int, articleText:str):
         """returns body of news article"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def historicalNews(self, requestId:int, time:str, providerCode:str, articleId:str, headline:str):
         """returns historical news headlines"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def historicalNewsEnd(self, requestId:int, hasMore:bool):
         """signals end of historical news"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def headTimestamp(self, reqId:int, headTimestamp:str):
         """returns earliest available data of a type of data for a particular contract"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def histogramData(self, reqId:int, items:HistogramData):
         """returns histogram data for a contract"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def historicalDataUpdate(self, reqId: int, bar: BarData):
         """returns updates in real time when keepUpToDate is set to True"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def rerouteMktDataReq(self, reqId: int, conId: int, exchange: str):
         """returns reroute CFD contract information for market data request"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def rerouteMktDepthReq(self, reqId: int, conId: int, exchange: str):
         """returns reroute CFD contract information for market depth request"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def marketRule(self, marketRuleId: int, priceIncrements: ListOfPriceIncrements):
         """returns minimum price increment structure for a particular market rule ID"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def pnl(self, reqId: int, dailyPnL: float, unrealizedPnL: float, realizedPnL: float):
         """returns the daily PnL for the account"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def pnlSingle(self, reqId: int, pos: int, dailyPnL: float, unrealizedPnL: float, realizedPnL: float, value: float):
         """returns the daily PnL for a single position in the account"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def historicalTicks(self, reqId: int, ticks: ListOfHistoricalTick, done: bool):
         """returns historical tick data when whatToShow=MIDPOINT"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def historicalTicksBidAsk(self, reqId: int, ticks: ListOfHistoricalTickBidAsk, done: bool):
         """returns historical tick data when whatToShow=BID_ASK"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def historicalTicksLast(self, reqId: int, ticks: ListOfHistoricalTickLast, done: bool):
         """returns historical tick data when whatToShow=TRADES"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def tickByTickAllLast(self, reqId: int, tickType: int, time: int, price: float,
                           size: int, tickAttribLast: TickAttribLast, exchange: str,
                           specialConditions: str):
         """returns tick-by-tick data for tickType = "Last" or "AllLast" """
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def tickByTickBidAsk(self, reqId: int, time: int, bidPrice: float, askPrice: float,
                          bidSize: int, askSize: int, tickAttribBidAsk: TickAttribBidAsk):
         """returns tick-by-tick data for tickType = "BidAsk" """
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def tickByTickMidPoint(self, reqId: int, time: int, midPoint: float):
         """returns tick-by-tick data for tickType = "MidPoint" """
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def orderBound(self, reqId: int, apiClientId: int, apiOrderId: int):
         """returns orderBound notification"""
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
         
     def completedOrder(self, contract:Contract, order:Order, orderState:OrderState):
         """This function is called to feed in completed orders.
@@ -707,9 +791,51 @@ class EWrapper:
         order: Order - The Order class gives the details of the completed order.
         orderState: OrderState - The orderState class includes completed order status details."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
 
     def completedOrdersEnd(self):
         """This is called at the end of a given request for completed orders."""
 
-        self.logAnswer(current_fn_name(), vars())
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
+
+    def msgQueueHighWater(self, depth:int, maxsize:int):
+        """This is called by a msg_queue.BoundedQueue when the number of
+        incoming messages waiting to be processed crosses its high water
+        mark. NOTE: it is called from the EReader thread, not from the
+        thread running EClient.run().
+
+        depth: int - Number of items in the queue.
+        maxsize: int - Capacity of the queue."""
+
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
+
+    def historicalDataColumns(self, reqId:int, dates, open_, high, low,
+                              close, volume, average, barCount):
+        """ returns all the bars of a historical data answer at once, as
+        NumPy arrays with one entry per bar. It is called instead of
+        historicalData() when the client's columnarHistData is set.
+
+        reqId - the request's identifier
+        dates - str array, the bars' date and time
+        open_, high, low, close, average - float64 arrays
+        volume, barCount - int64 arrays"""
+
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
+
+    def historicalTicksArray(self, reqId:int, ticks, done:bool):
+        """ returns a page of historical ticks as a NumPy structured array.
+        It is called instead of historicalTicks(), historicalTicksBidAsk()
+        and historicalTicksLast() when the client's columnarHistTicks is set.
+        The fields of the array depend on whatToShow:
+        MIDPOINT: time, price, size
+        BID_ASK: time, mask, priceBid, priceAsk, sizeBid, sizeAsk
+            (mask: 1 askPastHigh, 2 bidPastLow)
+        TRADES: time, mask, price, size, exchange, specialConditions
+            (mask: 1 pastLimit, 2 unreported)"""
+
+        if log_mode.verbose:
+            self.logAnswer(current_fn_name(), vars())
@@ -0,0 +1,229 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+
+"""
+Outbound writer thread of a Connection.
+
+Connection.sendMsg() only queues the framed msg and wakes the ConnWriter up.
+Each time it wakes up the writer takes all the msgs queued meanwhile and
+writes them with one socket.sendmsg() (a writev()), as many more as needed
+when the kernel takes only part of them, so every msg is written completely
+and in order. The callers never wait on the socket nor on each other.
+
+The msgs sent inside burst() are held until its end and go out together,
+e.g. the entry, stop, target and time exit orders of a bracket:
+
+    with app.burst():
+        for (orderId, order) in bracket:
+            app.placeOrder(orderId, contract, order)
+
+The hold is per thread: the msgs the other threads send meanwhile (say a
+cancelOrder while a thread batches its market data requests) are written
+right away.
+
+When the socket takes nothing for SEND_TIMEOUT (the peer stopped reading)
+the queued msgs are dropped, the error reported to the wrapper and the
+connection closed.
+
+It is used by the Connection when EClient.writerThread is set before
+connect(). stats() gives per burst (msgs written by one wake-up) counters
+and the latency from the first msg queued to the last byte written.
+"""
+
+import contextlib
+import logging
+import socket
+import threading
+import time
+
+from ibapi.common import NO_VALID_ID
+from ibapi.errors import SEND_TIMEOUT
+from ibapi.latency import LatencyHistogram
+
+
+logger = logging.getLogger(__name__)
+
+
+class HeldMsgs(threading.local):
+    """ the msgs a thread sends inside its burst() """
+    def __init__(self):
+        self.depth = 0          # burst() nesting
+        self.msgs = []
+        self.queuedAt = 0       # clock of msgs[0]
+
+
+class ConnWriter:
+    # buffers per sendmsg(), under the IOV_MAX of the OSes (1024 on Linux)
+    MAX_IOV = 512
+    # seconds stop() waits for the queued msgs to be written
+    STOP_TIMEOUT = 2.
+    # seconds the socket may take no byte before the connection is closed
+    SEND_TIMEOUT = 10.
+
+    def __init__(self, conn, clock=time.perf_counter_ns):
+        self.conn = conn
+        self.clock = clock
+        self.cond = threading.Condition()
+        self.pending = []
+        self.queuedAt = 0       # clock of pending[0]
+        self.held = HeldMsgs()
+        self.stopped = False
+        self.thread = None
+        # only updated by the writer thread
+        self.nBursts = 0
+        self.nMsgs = 0
+        self.nBytes = 0
+        self.nSendCalls = 0
+        self.nPartialSends = 0
+        self.maxBurstMsgs = 0
+        self.burstLatency = LatencyHistogram()
+
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="ConnWriter",
+                                       daemon=True)
+        self.thread.start()
+
+
+    def stop(self):
+        """ the msgs already queued are written first, for STOP_TIMEOUT at
+        most; the ones sent after are dropped """
+        with self.cond:
+            self.stopped = True
+            self.cond.notify()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(self.STOP_TIMEOUT)
+            if self.thread.is_alive():
+                logger.warning("writer: queued msgs not written after %.1fs",
+                               self.STOP_TIMEOUT)
+
+
+    def sendMsg(self, msg:bytes) -> int:
+        """ queues a framed msg, returns its size, 0 when stopped """
+        held = self.held
+        if held.depth:
+            if self.stopped:
+                return 0
+            if not held.msgs:
+                held.queuedAt = self.clock()
+            held.msgs.append(msg)
+            return len(msg)
+        with self.cond:
+            if self.stopped:
+                return 0
+            if not self.pending:
+                self.queuedAt = self.clock()
+            self.pending.append(msg)
+            self.cond.notify()
+        return len(msg)
+
+
+    @contextlib.contextmanager
+    def burst(self):
+        """ the msgs sent inside by this thread are written together at the
+        end, the other threads' are not held """
+        held = self.held
+        held.depth += 1
+        try:
+            yield self
+        finally:
+            held.depth -= 1
+            if not held.depth and held.msgs:
+                (msgs, held.msgs) = (held.msgs, [])
+                with self.cond:
+                    if not self.stopped:
+                        if not self.pending:
+                            self.queuedAt = held.queuedAt
+                        self.pending.extend(msgs)
+                        self.cond.notify()
+
+
+    def run(self):
+        try:
+            while True:
+                with self.cond:
+                    while not self.stopped and not self.pending:
+                        self.cond.wait()
+                    if not self.pending:
+                        break
+                    (msgs, self.pending) = (self.pending, [])
+                    queuedAt = self.queuedAt
+
+                self.writeAll(msgs)
+                self.nBursts += 1
+                self.nMsgs += len(msgs)
+                self.maxBurstMsgs = max(self.maxBurstMsgs, len(msgs))
+                self.burstLatency.record(self.clock() - queuedAt)
+        except socket.timeout:
+            # the peer is alive but does not read, the Reader would not notice
+            logger.error("writer: no byte sent for %.1fs, queued msgs dropped",
+                         self.SEND_TIMEOUT)
+            self.dropPending()
+            if self.conn.wrapper:
+                self.conn.wrapper.error(NO_VALID_ID, SEND_TIMEOUT.code(), SEND_TIMEOUT.msg())
+            self.conn.disconnect()
+        except OSError:
+            # the Reader finds out about the broken connection
+            logger.error("writer: send failed, queued msgs dropped", exc_info=True)
+            self.dropPending()
+        logger.debug("writer thread finished")
+
+
+    def dropPending(self):
+        with self.cond:
+            self.stopped = True
+            self.pending = []
+
+
+    def writeAll(self, msgs:list):
+        """ writes the msgs completely, in as few syscalls as possible """
+        sock = self.conn.socket
+        if sock is None:
+            raise OSError("not connected")
+        self.nBytes += sum(len(msg) for msg in msgs)
+        if not hasattr(sock, "sendmsg"):
+            # Windows
+            sock.sendall(b"".join(msgs))
+            self.nSendCalls += 1
+            return
+
+        first = 0
+        lastSent = time.monotonic()
+        while first < len(msgs):
+            try:
+                nSent = sock.sendmsg(msgs[first:first + self.MAX_IOV])
+            except socket.timeout:
+                # nothing was written, the peer is not reading
+                if time.monotonic() - lastSent >= self.SEND_TIMEOUT:
+                    raise
+                continue
+            lastSent = time.monotonic()
+            self.nSendCalls += 1
+            while first < len(msgs) and nSent >= len(msgs[first]):
+                nSent -= len(msgs[first])
+                first += 1
+            if nSent:
+                self.nPartialSends += 1
+                msgs[first] = memoryview(msgs[first])[nSent:]
+
+
+    def stats(self) -> dict:
+        """ counters of the bursts written, latency from the first msg queued
+        to the whole burst written, in us """
+        hist = self.burstLatency
+        return {
+            "bursts": self.nBursts,
+            "msgs": self.nMsgs,
+            "bytes": self.nBytes,
+            "sendCalls": self.nSendCalls,
+            "partialSends": self.nPartialSends,
+            "msgsPerBurst": self.nMsgs / self.nBursts if self.nBursts else 0.,
+            "maxBurstMsgs": self.maxBurstMsgs,
+            "latency": {
+                "mean": hist.sum / hist.count / 1e3 if hist.count else 0.,
+                "p50": hist.percentile(50) / 1e3,
+                "p99": hist.percentile(99) / 1e3,
+                "max": hist.max / 1e3}}
@@ -0,0 +1,71 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import unittest
+import asyncio
+
+from ibapi import comm
+from ibapi.async_client import AsyncEClient
+from ibapi.message import IN
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+class RecordingWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.answers = []
+
+    def connectAck(self):
+        self.answers.append(("connectAck",))
+
+    def nextValidId(self, orderId:int):
+        self.answers.append(("nextValidId", orderId))
+
+    def tickString(self, reqId, tickType, value:str):
+        self.answers.append(("tickString", reqId, tickType, value))
+
+    def connectionClosed(self):
+        self.answers.append(("connectionClosed",))
+
+
+async def serve(reader, writer):
+    await reader.readexactly(4)     # API\0
+    size = int.from_bytes(await reader.readexactly(4), "big")
+    await reader.readexactly(size)
+
+    writer.write(comm.make_msg(comm.make_field(MAX_CLIENT_VER)
+                               + comm.make_field("20191002 12:00:00 EST")))
+    writer.write(comm.make_msg(comm.make_field(IN.NEXT_VALID_ID)
+                               + comm.make_field(1) + comm.make_field(42)))
+    writer.write(comm.make_msg(comm.make_field(IN.TICK_STRING)
+                               + comm.make_field(6) + comm.make_field(7)
+                               + comm.make_field(45) + comm.make_field("1570000000")))
+    await writer.drain()
+    writer.close()
+
+
+class AsyncEClientTestCase(unittest.TestCase):
+    def test_connect_and_run(self):
+        wrapper = RecordingWrapper()
+
+        async def main():
+            server = await asyncio.start_server(serve, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            app = AsyncEClient(wrapper)
+            await app.connect("127.0.0.1", port, 0)
+            self.assertEqual(app.serverVersion(), MAX_CLIENT_VER)
+            await app.run()
+            server.close()
+            await server.wait_closed()
+
+        asyncio.run(main())
+
+        self.assertEqual(wrapper.answers, [("connectAck",), ("nextValidId", 42),
+            ("tickString", 7, 45, "1570000000"), ("connectionClosed",)])
+
+
+if "__main__" == __name__:
+    unittest.main()
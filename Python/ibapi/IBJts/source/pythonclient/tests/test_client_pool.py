@@ -0,0 +1,158 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import concurrent.futures
+import socket
+import threading
+import time
+import unittest
+
+from ibapi import comm
+from ibapi.client_pool import ClientPool, PoolClient
+from ibapi.contract import Contract
+from ibapi.message import IN, OUT
+from ibapi.server_versions import MAX_CLIENT_VER
+
+
+def recv_msgs(sock, buf):
+    while True:
+        msgs = buf.read_msgs()
+        if msgs:
+            return msgs
+        data = sock.recv(4096)
+        if not data:
+            return []
+        buf.write(data)
+
+
+class HeadTimestampServer:
+    """ answers reqHeadTimeStamp() with the symbol and the clientId of the
+    connection, after delay seconds """
+
+    def __init__(self, delay=0.):
+        self.delay = delay
+        self.server = socket.socket()
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(8)
+        self.port = self.server.getsockname()[1]
+        self.clientId2nReqs = {}
+        self.socks = []
+        threading.Thread(target=self.accept, daemon=True).start()
+
+    def accept(self):
+        while True:
+            try:
+                (sock, _) = self.server.accept()
+            except OSError:
+                return
+            self.socks.append(sock)
+            threading.Thread(target=self.serve, args=(sock, ), daemon=True).start()
+
+    def serve(self, sock):
+        try:
+            self.answer(sock)
+        except OSError:
+            # closed by close() or by the client
+            pass
+
+    def answer(self, sock):
+        sock.recv(4)    # API\0
+        buf = comm.MsgBuffer()
+        recv_msgs(sock, buf)
+        sock.sendall(comm.make_msg(comm.make_field(MAX_CLIENT_VER)
+                                   + comm.make_field("20191002 12:00:00 EST")))
+        clientId = None
+        while True:
+            msgs = recv_msgs(sock, buf)
+            if not msgs:
+                return
+            for text in msgs:
+                fields = comm.read_fields(text)
+                if int(fields[0]) == OUT.START_API:
+                    clientId = int(fields[2])
+                    self.clientId2nReqs[clientId] = 0
+                elif int(fields[0]) == OUT.REQ_HEAD_TIMESTAMP:
+                    time.sleep(self.delay)
+                    self.clientId2nReqs[clientId] += 1
+                    sock.sendall(comm.make_msg(comm.make_field(IN.HEAD_TIMESTAMP)
+                        + comm.make_field(int(fields[1]))
+                        + comm.make_field("%s %d" % (fields[3].decode(), clientId))))
+
+    def close(self):
+        self.server.close()
+        for sock in self.socks:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+
+def contract(symbol):
+    c = Contract()
+    c.symbol = symbol
+    return c
+
+
+class ClientPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = HeadTimestampServer(delay=0.002)
+        self.pool = ClientPool(size=3)
+
+    def tearDown(self):
+        self.pool.disconnect()
+        self.server.close()
+
+
+    def test_spread(self):
+        self.assertEqual(self.pool.connect("127.0.0.1", self.server.port, 10), 3)
+        futs = [self.pool.reqHeadTimeStampFuture(contract("S%d" % i), "TRADES", 1, 1, timeout=5)
+                for i in range(30)]
+        concurrent.futures.wait(futs, 5)
+        for (i, fut) in enumerate(futs):
+            (symbol, clientId) = fut.result().split()
+            self.assertEqual(symbol, "S%d" % i)
+            self.assertIn(int(clientId), (10, 11, 12))
+        self.assertEqual(sorted(self.server.clientId2nReqs), [10, 11, 12])
+        self.assertEqual(sum(self.server.clientId2nReqs.values()), 30)
+        self.assertTrue(all(n >= 5 for n in self.server.clientId2nReqs.values()))
+        self.assertEqual(self.pool.pendingCount(), 0)
+
+
+    def test_connection_lost(self):
+        self.pool.connect("127.0.0.1", self.server.port, 10)
+        self.server.close()
+        deadline = time.monotonic() + 5
+        while self.pool.isConnected() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(self.pool.isConnected())
+        with self.assertRaises(ConnectionError):
+            self.pool.reqHeadTimeStampFuture(contract("S"), "TRADES", 1, 1)
+        self.pool.thread.join(1)
+        self.assertFalse(self.pool.thread.is_alive())
+
+
+    def test_callback_raises(self):
+        class FailingClient(PoolClient):
+            def headTimestamp(self, reqId, headTimestamp):
+                raise RuntimeError("callback failed")
+
+        pool = ClientPool(size=2, clientClass=FailingClient)
+        self.assertEqual(pool.connect("127.0.0.1", self.server.port, 20), 2)
+        futs = [pool.reqHeadTimeStampFuture(contract("S%d" % i), "TRADES", 1, 1)
+                for i in range(2)]
+        # the thread ends on the exception, the clients are closed with it
+        pool.thread.join(5)
+        self.assertFalse(pool.thread.is_alive())
+        self.assertFalse(pool.isConnected())
+        (done, _) = concurrent.futures.wait(futs, 5)
+        self.assertEqual(len(done), 2)
+        for fut in futs:
+            self.assertIsInstance(fut.exception(), ConnectionError)
+        pool.disconnect()
+
+
+if "__main__" == __name__:
+    unittest.main()
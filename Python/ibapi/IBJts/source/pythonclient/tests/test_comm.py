@@ -61,6 +61,36 @@ class CommTestCase(unittest.TestCase):
         self.assertEqual(fields[1].decode(), text2)        
 
 
+    def test_msg_buffer(self):
+        msgs = [comm.make_msg(comm.make_field(i) + comm.make_field("x" * i))
+                for i in range(50)]
+        data = b"".join(msgs)
+
+        buf = comm.MsgBuffer(16)
+        received = []
+        for i in range(0, len(data), 7):
+            buf.write(data[i:i+7])
+            received.extend(buf.read_msgs())
+
+        self.assertEqual(len(buf), 0, "there should be no remainder msg")
+        self.assertEqual(received, [msg[4:] for msg in msgs])
+
+
+    def test_msg_buffer_partial(self):
+        msg = comm.make_msg(comm.make_field("ABCD"))
+
+        buf = comm.MsgBuffer()
+        buf.write(msg[:6])
+        self.assertEqual(buf.read_msgs(), [], "msg is not complete yet")
+        self.assertEqual(len(buf), 6)
+
+        view = buf.reserve(len(msg))
+        view[0:len(msg) - 6] = msg[6:]
+        view.release()
+        buf.commit(len(msg) - 6)
+        self.assertEqual(buf.read_msgs(), [msg[4:]])
+
+
 if "__main__" == __name__:
     unittest.main()
         
@@ -0,0 +1,207 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import unittest
+import socket
+import threading
+import time
+
+from ibapi import comm
+from ibapi.connection import Connection
+from ibapi.errors import SEND_TIMEOUT
+from ibapi.writer import ConnWriter
+
+
+class ConnectionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.conn = Connection("127.0.0.1", 0)
+        (self.conn.socket, self.peer) = socket.socketpair()
+        self.conn.socket.settimeout(1)
+
+
+    def tearDown(self):
+        self.conn.disconnect()
+        self.peer.close()
+
+
+    def test_recvMsgInto(self):
+        msgs = [comm.make_msg(comm.make_field(i) + comm.make_field("x" * 100))
+                for i in range(200)]
+        self.peer.sendall(b"".join(msgs))
+
+        buf = comm.MsgBuffer()
+        received = []
+        while len(received) < len(msgs):
+            self.assertGreater(self.conn.recvMsgInto(buf), 0)
+            received.extend(buf.read_msgs())
+
+        self.assertEqual(received, [msg[4:] for msg in msgs])
+
+        stats = self.conn.recvStats()
+        self.assertEqual(stats["recvBytes"], sum(len(msg) for msg in msgs))
+        self.assertGreater(stats["bytesPerRecv"], 0)
+
+
+    def test_recvSize_adapts(self):
+        self.peer.sendall(b"\0" * (Connection.MIN_RECV_SIZE * 8))
+        buf = comm.MsgBuffer()
+        self.conn.recvMsgInto(buf)
+        self.assertGreater(self.conn.recvSize, Connection.MIN_RECV_SIZE)
+
+        for _ in range(50):
+            self.peer.sendall(b"\0" * 100)
+            self.conn.recvMsgInto(buf)
+        self.assertEqual(self.conn.recvSize, Connection.MIN_RECV_SIZE)
+
+
+    def test_recvMsgInto_full_read(self):
+        # exactly recvSize bytes: returned without waiting for more
+        self.peer.sendall(b"\0" * self.conn.recvSize)
+        buf = comm.MsgBuffer()
+        start = time.monotonic()
+        self.assertEqual(self.conn.recvMsgInto(buf), Connection.MIN_RECV_SIZE)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+
+    def test_recvMsg_closed(self):
+        self.peer.close()
+        self.assertEqual(self.conn.recvMsg(), b"")
+        self.assertFalse(self.conn.isConnected())
+
+
+def recv_exactly(sock, size):
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+class WriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.conn = Connection("127.0.0.1", 0, writerThread=True)
+        (self.conn.socket, self.peer) = socket.socketpair()
+        self.conn.socket.settimeout(1)
+        self.peer.settimeout(5)
+        self.conn.writer = ConnWriter(self.conn)
+        self.conn.writer.start()
+
+
+    def tearDown(self):
+        self.conn.disconnect()
+        self.peer.close()
+
+
+    def test_burst(self):
+        msgs = [comm.make_msg(comm.make_field(3) + comm.make_field(i)) for i in range(4)]
+        with self.conn.writer.burst():
+            for msg in msgs:
+                self.assertEqual(self.conn.sendMsg(msg), len(msg))
+        self.assertEqual(recv_exactly(self.peer, sum(map(len, msgs))), b"".join(msgs))
+        self.conn.writer.stop()
+        stats = self.conn.sendStats()
+        self.assertEqual((stats["bursts"], stats["msgs"], stats["sendCalls"]), (1, 4, 1))
+        self.assertGreater(stats["latency"]["max"], 0)
+
+
+    def test_partial_sends(self):
+        self.conn.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        msgs = [comm.make_msg(comm.make_field(i) + comm.make_field("x" * 10000))
+                for i in range(200)]
+        with self.conn.writer.burst():
+            for msg in msgs:
+                self.conn.sendMsg(msg)
+        self.assertEqual(recv_exactly(self.peer, sum(map(len, msgs))), b"".join(msgs))
+        self.conn.writer.stop()
+        stats = self.conn.sendStats()
+        self.assertEqual(stats["bytes"], sum(map(len, msgs)))
+        self.assertGreater(stats["sendCalls"], 1)
+
+
+    def test_disconnect_flushes(self):
+        msgs = [comm.make_msg(comm.make_field(i)) for i in range(100)]
+        for msg in msgs:
+            self.conn.sendMsg(msg)
+        self.conn.disconnect()
+        self.assertEqual(self.conn.sendMsg(msgs[0]), 0)
+        self.assertEqual(recv_exactly(self.peer, sum(map(len, msgs))), b"".join(msgs))
+
+
+    def test_burst_per_thread(self):
+        # a thread's burst does not hold the msgs of the others
+        inBurst = threading.Event()
+        release = threading.Event()
+        bursted = [comm.make_msg(comm.make_field(1) + comm.make_field(i)) for i in range(3)]
+
+        def batch():
+            with self.conn.writer.burst():
+                self.conn.sendMsg(bursted[0])
+                inBurst.set()
+                release.wait(5)
+                for msg in bursted[1:]:
+                    self.conn.sendMsg(msg)
+
+        thread = threading.Thread(target=batch)
+        thread.start()
+        inBurst.wait(5)
+        cancel = comm.make_msg(comm.make_field(4) + comm.make_field(7))
+        self.conn.sendMsg(cancel)
+        self.assertEqual(recv_exactly(self.peer, len(cancel)), cancel)
+        release.set()
+        thread.join()
+        self.assertEqual(recv_exactly(self.peer, sum(map(len, bursted))), b"".join(bursted))
+
+
+    def test_send_timeout(self):
+        errors = []
+
+        class Wrapper:
+            def error(self, reqId, code, msg):
+                errors.append(code)
+
+            def connectionClosed(self):
+                errors.append("closed")
+
+        self.conn.wrapper = Wrapper()
+        self.conn.writer.SEND_TIMEOUT = 0.3
+        self.conn.socket.settimeout(0.05)
+        self.conn.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        # the peer does not read
+        msg = comm.make_msg(comm.make_field(1) + comm.make_field("x" * 100000))
+        for _ in range(20):
+            self.conn.sendMsg(msg)
+        self.conn.writer.thread.join(5)
+        self.assertFalse(self.conn.writer.thread.is_alive())
+        self.assertEqual(errors, [SEND_TIMEOUT.code(), "closed"])
+        self.assertFalse(self.conn.isConnected())
+        self.assertEqual(self.conn.writer.pending, [])
+        self.assertEqual(self.conn.sendMsg(msg), 0)
+
+
+    def test_socket_options(self):
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        conn = Connection("127.0.0.1", server.getsockname()[1], writerThread=True,
+            socketOptions=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)])
+        conn.connect()
+        (peer, _) = server.accept()
+        try:
+            self.assertTrue(conn.socket.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+            msg = comm.make_msg(comm.make_field(49) + comm.make_field(1))
+            conn.sendMsg(msg)
+            peer.settimeout(5)
+            self.assertEqual(recv_exactly(peer, len(msg)), msg)
+        finally:
+            conn.disconnect()
+            peer.close()
+            server.close()
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import unittest
+import inspect
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.utils import FieldReader
+from ibapi.wrapper import EWrapper
+
+
+def recorder(name):
+    def record(self, *args):
+        self.calls.append((name, args))
+    return record
+
+
+# EWrapper that records all the callbacks it gets
+RecordingWrapper = type("RecordingWrapper", (EWrapper, ), dict(
+    {name: recorder(name) for (name, _) in inspect.getmembers(EWrapper,
+        inspect.isfunction) if name not in ("__init__", "logAnswer")},
+    __init__=lambda self: setattr(self, "calls", [])))
+
+
+def sample_field(param):
+    if param.annotation is int:
+        return b"-12"
+    elif param.annotation is float:
+        return b"1.25"
+    return b"caf\xe9"       # not UTF-8, decoded as latin-1
+
+
+class DecoderTestCase(unittest.TestCase):
+    def test_compiled_signature_decoders(self):
+        wrapper = RecordingWrapper()
+        decoder = Decoder(wrapper, MAX_CLIENT_VER)
+        self.assertGreater(len(decoder.msgId2decodeFn), 0)
+
+        for (msgId, decodeFn) in decoder.msgId2decodeFn.items():
+            handleInfo = decoder.msgId2handleInfo[msgId]
+            fields = (str(msgId).encode(), b"1") + tuple(sample_field(param)
+                for (pname, param) in handleInfo.wrapperParams.items()
+                if pname != "self")
+
+            wrapper.calls = []
+            decoder.interpretWithSignature(fields, handleInfo)
+            expected = wrapper.calls
+
+            wrapper.calls = []
+            decoder.interpret(fields)
+            self.assertEqual(wrapper.calls, expected)
+            self.assertEqual(len(wrapper.calls), 1)
+
+
+    def test_compiled_signature_decoder_bad_length(self):
+        wrapper = RecordingWrapper()
+        decoder = Decoder(wrapper, MAX_CLIENT_VER)
+
+        with self.assertLogs("ibapi.decoder", "ERROR"):
+            decoder.interpret((b"2", b"6", b"1001", b"0"))
+        self.assertEqual(wrapper.calls, [])
+
+
+    def test_open_order(self):
+        wrapper = RecordingWrapper()
+        decoder = Decoder(wrapper, MAX_CLIENT_VER)
+
+        def open_order_fields(orderId, symbol):
+            fields = [b"0"] * 130
+            fields[0:19] = (str(IN.OPEN_ORDER).encode(), str(orderId).encode(),
+                b"265598", symbol, b"STK", b"", b"0", b"", b"", b"SMART", b"USD",
+                symbol, b"NMS", b"BUY", b"100", b"LMT", b"150.25", b"", b"DAY")
+            return fields
+
+        for (orderId, symbol) in ((7, b"AAPL"), (8, b"MSFT")):
+            fields = FieldReader(open_order_fields(orderId, symbol))
+            decoder.processOpenOrder(fields)
+            self.assertRaises(StopIteration, next, fields)
+
+        self.assertEqual([name for (name, _) in wrapper.calls], ["openOrder"] * 2)
+        ((_, (orderId, contract, order, orderState)), (_, args)) = wrapper.calls
+        self.assertEqual(orderId, 7)
+        self.assertEqual((contract.symbol, contract.conId), ("AAPL", 265598))
+        self.assertEqual((order.action, order.totalQuantity, order.lmtPrice,
+            order.tif), ("BUY", 100., 150.25, "DAY"))
+        self.assertEqual(args[1].symbol, "MSFT")
+        self.assertIsNot(args[2], order)
+
+
+    def test_completed_order(self):
+        wrapper = RecordingWrapper()
+        decoder = Decoder(wrapper, MAX_CLIENT_VER)
+
+        fields = [b"0"] * 98
+        fields[0:3] = (str(IN.COMPLETED_ORDER).encode(), b"265598", b"AAPL")
+        fields = FieldReader(fields)
+        decoder.processCompletedOrderMsg(fields)
+        self.assertRaises(StopIteration, next, fields)
+
+        ((name, (contract, order, orderState)), ) = wrapper.calls
+        self.assertEqual(name, "completedOrder")
+        self.assertEqual(contract.symbol, "AAPL")
+
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_historical_data_columns(self):
+        bars = ((b"20190902", b"289.12", b"290.5", b"288.75", b"289.9", b"1234", b"289.4", b"43"),
+                (b"20190903 caf\xe9", b"290", b"291.25", b"", b"290.5", b"", b"290.1", b"0"))
+        fields = (str(IN.HISTORICAL_DATA).encode(), b"7", b"20190902", b"20190904",
+                  b"2") + sum(bars, ())
+
+        wrapper = RecordingWrapper()
+        Decoder(wrapper, MAX_CLIENT_VER).interpret(fields)
+        perBar = wrapper.calls
+
+        wrapper.calls = []
+        Decoder(wrapper, MAX_CLIENT_VER, columnarHistData=True).interpret(fields)
+        ((name, (reqId, *columns)), end) = wrapper.calls
+        self.assertEqual((name, reqId), ("historicalDataColumns", 7))
+        self.assertEqual(end, perBar[-1])
+        self.assertEqual([len(col) for col in columns], [2] * 8)
+        self.assertEqual([col.dtype.kind for col in columns], list("Uffffifi"))
+
+        for (i, (_, (_, bar))) in enumerate(perBar[:-1]):
+            self.assertEqual([col[i].item() for col in columns], [bar.date,
+                bar.open, bar.high, bar.low, bar.close, bar.volume,
+                bar.average, bar.barCount])
+
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_historical_ticks_array(self):
+        pages = (
+            (IN.HISTORICAL_TICKS, "historicalTicks",
+                (b"1567411200", b"", b"289.12", b"100", b"1567411201", b"", b"", b"")),
+            (IN.HISTORICAL_TICKS_BID_ASK, "historicalTicksBidAsk",
+                (b"1567411200", b"2", b"289.1", b"289.2", b"300", b"200",
+                 b"1567411201", b"1", b"289.15", b"", b"", b"100")),
+            (IN.HISTORICAL_TICKS_LAST, "historicalTicksLast",
+                (b"1567411200", b"3", b"289.12", b"100", b"NYSE", b"",
+                 b"1567411201", b"0", b"289.13", b"5", b"B\xf6rse", b"  I")))
+        getters = {
+            "time": lambda tick: tick.time,
+            "price": lambda tick: tick.price,
+            "size": lambda tick: tick.size,
+            "priceBid": lambda tick: tick.priceBid,
+            "priceAsk": lambda tick: tick.priceAsk,
+            "sizeBid": lambda tick: tick.sizeBid,
+            "sizeAsk": lambda tick: tick.sizeAsk,
+            "exchange": lambda tick: tick.exchange,
+            "specialConditions": lambda tick: tick.specialConditions,
+            "mask": lambda tick: (tick.tickAttribBidAsk.askPastHigh
+                + 2 * tick.tickAttribBidAsk.bidPastLow
+                if hasattr(tick, "tickAttribBidAsk")
+                else tick.tickAttribLast.pastLimit + 2 * tick.tickAttribLast.unreported)}
+
+        wrapper = RecordingWrapper()
+        for (msgId, name, ticks) in pages:
+            fields = (str(msgId).encode(), b"5", b"2") + ticks + (b"1", )
+            wrapper.calls = []
+            Decoder(wrapper, MAX_CLIENT_VER).interpret(fields)
+            ((objName, (_, objTicks, objDone)), ) = wrapper.calls
+
+            wrapper.calls = []
+            Decoder(wrapper, MAX_CLIENT_VER, columnarHistTicks=True).interpret(fields)
+            ((arrName, (reqId, arr, done)), ) = wrapper.calls
+            self.assertEqual((objName, arrName), (name, "historicalTicksArray"))
+            self.assertEqual((reqId, done), (5, objDone))
+            self.assertEqual(len(arr), 2)
+            for (tick, row) in zip(objTicks, arr):
+                self.assertEqual({field: row[field].item() for field in arr.dtype.names},
+                    {field: getters[field](tick) for field in arr.dtype.names})
+
+
+if "__main__" == __name__:
+    unittest.main()
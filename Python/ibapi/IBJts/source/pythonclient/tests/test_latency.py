@@ -0,0 +1,137 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import os
+import queue
+import tempfile
+import threading
+import time
+import unittest
+
+from ibapi import comm
+from ibapi.client import EClient
+from ibapi.contract import Contract
+from ibapi.decoder import Decoder
+from ibapi.latency import LatencyHistogram, LatencyTracer, TracedMsg
+from ibapi.message import IN
+from ibapi.msg_queue import LaneQueue
+from ibapi.reader import EReader
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.tws_sim import TwsSimulator
+from ibapi.wrapper import EWrapper
+
+from test_reader import MemConnection
+
+
+class TickWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.ticks = []
+
+    def tickString(self, reqId, tickType, value:str):
+        self.ticks.append((reqId, tickType, value))
+
+    def tickPrice(self, reqId, tickType, price:float, attrib):
+        self.ticks.append((reqId, tickType, price))
+
+
+def tick_msg(i):
+    return (comm.make_field(IN.TICK_STRING) + comm.make_field(6)
+            + comm.make_field(i) + comm.make_field(45)
+            + comm.make_field(str(i))).encode()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1000
+        return self.now
+
+
+class LatencyTestCase(unittest.TestCase):
+    def test_histogram(self):
+        hist = LatencyHistogram()
+        for ns in range(1, 1001):
+            hist.record(ns * 1000)
+        self.assertEqual(hist.count, 1000)
+        self.assertEqual(hist.max, 1000000)
+        for (pct, exact) in ((50, 500000), (99, 990000), (100, 1000000)):
+            self.assertGreaterEqual(hist.percentile(pct), exact)
+            self.assertLessEqual(hist.percentile(pct), exact * 1.125)
+        for ns in (0, 7, 15, 16, 17, 1000, 123456789):
+            idx = LatencyHistogram.bucket(ns)
+            self.assertLessEqual(ns, LatencyHistogram.bucketTop(idx))
+            self.assertGreater(ns, LatencyHistogram.bucketTop(idx - 1) if idx else -1)
+
+
+    def test_traced_msg_through_lane_queue(self):
+        conn = MemConnection([comm.make_msg(tick_msg(i).decode()) for i in range(3)])
+        conn.recvTime = 0
+        msg_queue = LaneQueue()
+        tracer = LatencyTracer(clock=FakeClock())
+        EReader(conn, msg_queue, tracer=tracer).run()
+
+        wrapper = TickWrapper()
+        decoder = Decoder(wrapper, MAX_CLIENT_VER)
+        decoder.setTracer(tracer)
+        while not msg_queue.empty():
+            msg = msg_queue.get()
+            self.assertIsInstance(msg, TracedMsg)
+            self.assertGreater(msg.framedTime, 0)
+            tracer.dequeued(msg, tracer.clock())
+            decoder.interpret(comm.read_fields(msg))
+        self.assertEqual([value for (_, _, value) in wrapper.ticks], ["0", "1", "2"])
+
+        stats = tracer.stats()["TICK_STRING"]
+        self.assertEqual(stats["interpret"]["count"], 3)
+        self.assertEqual(stats["queue"]["count"], 3)
+        # the MemConnection does not set recvTime
+        self.assertNotIn("total", stats)
+
+        decoder.setTracer(None)
+        decoder.interpret(comm.read_fields(tick_msg(3)))
+        self.assertEqual(tracer.stats()["TICK_STRING"]["interpret"]["count"], 3)
+        self.assertEqual(len(wrapper.ticks), 4)
+
+
+    def test_client(self):
+        sim = TwsSimulator(tickRate=500)
+        port = sim.start()
+        (fd, dumpFile) = tempfile.mkstemp(suffix=".txt")
+        os.close(fd)
+        try:
+            app = EClient(TickWrapper())
+            app.latencyTracer = LatencyTracer(dumpFile=dumpFile)
+            app.connect("127.0.0.1", port, 4)
+            thread = threading.Thread(target=app.run, daemon=True)
+            thread.start()
+            contract = Contract()
+            contract.symbol = "MSFT"
+            contract.secType = "STK"
+            contract.exchange = "SMART"
+            contract.currency = "USD"
+            app.reqMktData(1, contract, "", False, False, [])
+            deadline = time.monotonic() + 5
+            while len(app.wrapper.ticks) < 50 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            stats = app.latencyTracer.stats()["TICK_PRICE"]
+            self.assertEqual(set(stats), {"frame", "queue", "fields", "interpret", "total"})
+            self.assertGreaterEqual(stats["total"]["max"], stats["interpret"]["p50"])
+            self.assertGreater(stats["total"]["count"], 0)
+
+            app.disconnect()
+            thread.join(2)
+            with open(dumpFile) as f:
+                self.assertIn("TICK_PRICE", f.read())
+        finally:
+            sim.stop()
+            os.remove(dumpFile)
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import inspect
+import itertools
+import logging
+import unittest
+
+from ibapi import comm, log_mode
+from ibapi.client import EClient
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+class NullConnection:
+    def __init__(self):
+        self.msgs = []
+
+    def isConnected(self):
+        return True
+
+    def sendMsg(self, msg):
+        self.msgs.append(msg)
+        return len(msg)
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        logging.Handler.__init__(self, logging.DEBUG)
+        self.msgs = []
+
+    def emit(self, record):
+        self.msgs.append(record.getMessage())
+
+
+class LogModeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.records = Records()
+        self.ibapiLogger = logging.getLogger("ibapi")
+        self.level = self.ibapiLogger.level
+        self.ibapiLogger.setLevel(logging.DEBUG)
+        self.ibapiLogger.addHandler(self.records)
+
+        self.client = EClient(EWrapper())
+        self.client.conn = NullConnection()
+        self.client.serverVersion_ = MAX_CLIENT_VER
+        self.client.connState = EClient.CONNECTED
+        self.records.msgs.clear()
+
+    def tearDown(self):
+        log_mode.setLogMode(log_mode.VERBOSE)
+        self.ibapiLogger.removeHandler(self.records)
+        self.ibapiLogger.setLevel(self.level)
+
+
+    def test_verbose(self):
+        self.assertEqual(log_mode.logMode(), log_mode.VERBOSE)
+        self.client.reqCurrentTime()
+        self.client.wrapper.currentTime(1570000000)
+        self.assertTrue(any(msg.startswith("REQUEST reqCurrentTime") for msg in self.records.msgs))
+        self.assertTrue(any(msg.startswith("SENDING reqCurrentTime") for msg in self.records.msgs))
+        self.assertTrue(any(msg.startswith("ANSWER currentTime") for msg in self.records.msgs))
+
+
+    def test_production(self):
+        log_mode.setLogMode(log_mode.PRODUCTION)
+        self.client.reqCurrentTime()
+        self.client.wrapper.currentTime(1570000000)
+        self.assertEqual(self.records.msgs, [])
+        self.assertEqual(len(self.client.conn.msgs), 1)
+        # the errors are still logged
+        self.client.wrapper.error(1, 200, "No security definition")
+        self.assertEqual(self.records.msgs, ["ERROR 1 200 No security definition"])
+        self.assertRaises(ValueError, log_mode.setLogMode, "quiet")
+
+
+    def test_wrapper_callbacks(self):
+        # every default callback logs its answer when verbose, only then
+        wrapper = self.client.wrapper
+        callbacks = [(name, len(inspect.signature(fn).parameters) - 1)
+                     for (name, fn) in inspect.getmembers(EWrapper, inspect.isfunction)
+                     if name not in ("__init__", "logAnswer")]
+        for mode in (log_mode.VERBOSE, log_mode.PRODUCTION):
+            log_mode.setLogMode(mode)
+            for (name, nParams) in callbacks:
+                self.records.msgs.clear()
+                getattr(wrapper, name)(*[None] * nParams)
+                logged = any(msg.startswith("ANSWER %s " % name)
+                             for msg in self.records.msgs)
+                self.assertEqual(logged, mode == log_mode.VERBOSE, name)
+
+
+    def test_wire_sample(self):
+        log_mode.setLogMode(log_mode.PRODUCTION, sample=3)
+        log_mode._nSent = itertools.count(1)
+        for _ in range(7):
+            self.client.reqCurrentTime()
+        sent = [msg for msg in self.records.msgs if msg.startswith("SENT")]
+        self.assertEqual(len(sent), 2)
+
+        self.records.msgs.clear()
+        log_mode._nRecvd = 0
+        msgs = [comm.make_field(i).encode() for i in range(10)]
+        log_mode.sampleReceived(msgs[:2])
+        log_mode.sampleReceived(msgs[2:])
+        self.assertEqual(self.records.msgs, ["RECEIVED %s" % msgs[8]])
+        log_mode.sampleReceived(msgs[:2])
+        self.assertEqual(self.records.msgs[1:], ["RECEIVED %s" % msgs[1]])
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,217 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import unittest
+import queue
+import socket
+
+from ibapi import comm
+from ibapi.connection import Connection
+from ibapi.message import IN
+from ibapi.msg_queue import (LaneQueue, ConflatingQueue, BoundedQueue,
+    MsgLaneEnum, OverflowPolicyEnum, msg_lane, conflation_key)
+from ibapi.reader import EReader
+
+
+def make_text(msgId, *vals):
+    return str.encode(comm.make_field(msgId)
+                      + "".join(comm.make_field(val) for val in vals))
+
+
+class LaneQueueTestCase(unittest.TestCase):
+    def setUp(self):
+        self.bar1 = make_text(IN.HISTORICAL_DATA, 1, "bar1")
+        self.bar2 = make_text(IN.HISTORICAL_DATA, 1, "bar2")
+        self.tick = make_text(IN.TICK_PRICE, 6, 1001, 1, 10.5, 100, 0)
+        self.status = make_text(IN.ORDER_STATUS, 7, "Filled")
+
+
+    def test_msg_lane(self):
+        self.assertEqual(msg_lane(self.status), MsgLaneEnum.ORDERS)
+        self.assertEqual(msg_lane(self.tick), MsgLaneEnum.MKT_DATA)
+        self.assertEqual(msg_lane(self.bar1), MsgLaneEnum.BULK)
+        self.assertEqual(msg_lane(make_text(IN.ACCT_VALUE, 2)), MsgLaneEnum.MKT_DATA)
+
+
+    def test_priority(self):
+        q = LaneQueue()
+        for text in (self.bar1, self.bar2, self.tick, self.status):
+            q.put(text)
+
+        self.assertEqual(q.qsize(), 4)
+        self.assertEqual([q.get() for _ in range(4)],
+                         [self.status, self.tick, self.bar1, self.bar2])
+        self.assertTrue(q.empty())
+
+        stats = q.laneStats()
+        self.assertEqual(stats["BULK"], {"depth": 0, "maxDepth": 2, "msgs": 2})
+        self.assertEqual(stats["ORDERS"]["msgs"], 1)
+
+
+    def test_batch(self):
+        q = LaneQueue()
+        q.put([self.bar1, self.tick, self.bar2, self.status])
+
+        self.assertEqual(q.get(), [self.status])
+        self.assertEqual(q.get(), [self.tick])
+        self.assertEqual(q.get(), [self.bar1, self.bar2])
+        self.assertEqual(q.laneStats()["BULK"]["msgs"], 2)
+
+
+class ConflatingQueueTestCase(unittest.TestCase):
+    def test_conflation_key(self):
+        self.assertEqual(conflation_key(make_text(IN.TICK_SIZE, 6, 1001, 0, 300)),
+                         (IN.TICK_SIZE, b"1001", b"0"))
+        self.assertIsNone(conflation_key(make_text(IN.ORDER_STATUS, 7, "Filled")))
+        self.assertIsNone(conflation_key(make_text(IN.TICK_SNAPSHOT_END, 1, 1001)))
+        # trade prints, not latest values
+        self.assertIsNone(conflation_key(make_text(IN.TICK_STRING, 6, 1001, 48,
+                                                   "10.5;100;1567000000000;1000;10.4;true")))
+        self.assertIsNone(conflation_key(make_text(IN.TICK_STRING, 6, 1001, 77,
+                                                   "10.5;100;1567000000000;1000;10.4;true")))
+        self.assertEqual(conflation_key(make_text(IN.TICK_STRING, 6, 1001, 45, "1567000000")),
+                         (IN.TICK_STRING, b"1001", b"45"))
+
+
+    def test_conflation(self):
+        bid1 = make_text(IN.TICK_PRICE, 6, 1001, 1, 10.5, 100, 0)
+        ask1 = make_text(IN.TICK_PRICE, 6, 1001, 2, 10.6, 100, 0)
+        bid2 = make_text(IN.TICK_PRICE, 6, 1001, 1, 10.4, 200, 0)
+        bidOther = make_text(IN.TICK_PRICE, 6, 1002, 1, 99.0, 1, 0)
+        fill1 = make_text(IN.EXECUTION_DATA, 1, 7)
+        fill2 = make_text(IN.EXECUTION_DATA, 1, 7)
+        bid3 = make_text(IN.TICK_PRICE, 6, 1001, 1, 10.3, 300, 0)
+
+        q = ConflatingQueue()
+        q.put([bid1, ask1, fill1, bid2, bidOther])
+        q.put(fill2)
+        q.put(bid3)
+
+        self.assertEqual(q.qsize(), 5)
+        self.assertEqual([q.get() for _ in range(5)],
+                         [[fill1], fill2, ask1, bidOther, bid3])
+        self.assertEqual(q.conflationStats(),
+                         {"dropped": 2, "merged": 1, "byMsgId": {IN.TICK_PRICE: 2}})
+
+
+class RecordingWrapper:
+    def __init__(self):
+        self.calls = []
+
+    def error(self, reqId, errorCode, errorString):
+        self.calls.append(("error", errorCode))
+
+    def msgQueueHighWater(self, depth, maxsize):
+        self.calls.append(("msgQueueHighWater", depth, maxsize))
+
+
+class BoundedQueueTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ticks = [make_text(IN.TICK_PRICE, 6, 1001, 1, 10. + i, 1, 0)
+                      for i in range(5)]
+        self.status = make_text(IN.ORDER_STATUS, 7, "Filled")
+        self.wrapper = RecordingWrapper()
+
+
+    def test_block(self):
+        q = BoundedQueue(2, highWaterMark=2)
+        q.wrapper = self.wrapper
+        q.put(self.ticks[0])
+        q.put(self.ticks[1])
+        self.assertRaises(queue.Full, q.put, self.ticks[2], timeout=0.01)
+        self.assertEqual(self.wrapper.calls, [("msgQueueHighWater", 2, 2)])
+        self.assertEqual(q.queueStats()["maxDepth"], 2)
+
+
+    def test_drop_oldest_mkt_data(self):
+        q = BoundedQueue(3, OverflowPolicyEnum.DROP_OLDEST_MKT_DATA)
+        q.put(self.status)
+        for tick in self.ticks:
+            q.put(tick)
+
+        self.assertEqual([q.get() for _ in range(3)],
+                         [self.status, self.ticks[3], self.ticks[4]])
+        self.assertEqual(q.queueStats()["dropped"], 3)
+
+
+    def test_drop_never_drops_orders(self):
+        q = BoundedQueue(1, OverflowPolicyEnum.DROP_OLDEST_MKT_DATA)
+        q.put(self.status)
+        self.assertRaises(queue.Full, q.put, self.status, block=False)
+
+
+    def test_disconnect(self):
+        q = BoundedQueue(1, OverflowPolicyEnum.DISCONNECT)
+        q.wrapper = self.wrapper
+        q.put(self.ticks[0])
+        self.assertRaises(queue.Full, q.put, self.ticks[1])
+        self.assertIn(("error", 540), self.wrapper.calls)
+        self.assertEqual(q.queueStats()["overflows"], 1)
+
+
+    def test_disconnect_wrapper_uses_queue(self):
+        q = BoundedQueue(1, OverflowPolicyEnum.DISCONNECT)
+        stats = []
+        q.wrapper = self.wrapper
+        self.wrapper.error = lambda reqId, errorCode, errorString: stats.append(q.queueStats())
+        q.put(self.ticks[0])
+        self.assertRaises(queue.Full, q.put, self.ticks[1])
+        self.assertEqual(stats[0]["overflows"], 1)
+
+
+    def test_order_received(self):
+        bar = make_text(IN.HISTORICAL_DATA, 1, "bar")
+        err = make_text(IN.ERR_MSG, 2, 1, 162, "Historical Market Data Service error")
+        q = BoundedQueue(10)
+        for item in (self.ticks[0], bar, err, self.status):
+            q.put(item)
+        self.assertEqual([q.get() for _ in range(4)],
+                         [self.ticks[0], bar, err, self.status])
+
+        q = BoundedQueue(10, lanePriority=True)
+        for item in (self.ticks[0], bar, err, self.status):
+            q.put(item)
+        self.assertEqual([q.get() for _ in range(4)],
+                         [err, self.status, self.ticks[0], bar])
+
+
+    def test_batch(self):
+        q = BoundedQueue(2, OverflowPolicyEnum.DROP_OLDEST_MKT_DATA)
+        q.put([self.ticks[0], self.status])
+        q.put(self.ticks[1:3])
+        q.put(self.ticks[3:])
+        self.assertEqual(q.qsize(), 2)
+        self.assertEqual(q.queueStats()["dropped"], 2)
+        self.assertEqual(q.get(), [self.ticks[0], self.status])
+        self.assertEqual(q.get(), self.ticks[3:])
+        self.assertEqual(q.laneStats()["MKT_DATA"]["msgs"], 5)
+
+
+
+    def test_consumer_stopped(self):
+        # EClient.run() stops with the queue full, then closes the connection
+        conn = Connection("127.0.0.1", 0)
+        (conn.socket, peer) = socket.socketpair()
+        conn.socket.settimeout(1)
+        q = BoundedQueue(2)
+        q.conn = conn
+        reader = EReader(conn, q)
+        reader.start()
+        try:
+            peer.sendall(b"".join(comm.make_msg(comm.make_field(IN.TICK_PRICE)
+                                                + comm.make_field(i)) for i in range(5)))
+            while q.qsize() < 2:
+                reader.join(0.01)
+            self.assertTrue(reader.is_alive())
+            conn.disconnect()
+            reader.join(5)
+            self.assertFalse(reader.is_alive())
+            self.assertEqual(q.qsize(), 2)
+        finally:
+            conn.disconnect()
+            peer.close()
+
+if "__main__" == __name__:
+    unittest.main()
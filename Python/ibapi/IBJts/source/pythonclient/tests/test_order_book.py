@@ -0,0 +1,85 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import unittest
+
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.order_book import (OrderBook, OrderBookWrapper, DepthSideEnum,
+                              DepthOperationEnum)
+from ibapi.server_versions import MAX_CLIENT_VER
+
+
+INSERT = DepthOperationEnum.INSERT
+UPDATE = DepthOperationEnum.UPDATE
+DELETE = DepthOperationEnum.DELETE
+ASK = DepthSideEnum.ASK
+BID = DepthSideEnum.BID
+
+
+def rows(book, side):
+    (prices, sizes) = book.top(side)
+    return list(zip(prices.tolist(), sizes.tolist(), book.marketMakers[side]))
+
+
+class OrderBookTestCase(unittest.TestCase):
+    def test_insert_update_delete(self):
+        book = OrderBook(2)
+        book.update(0, INSERT, BID, 100.0, 300, "ARCA")
+        book.update(0, INSERT, BID, 100.5, 200, "NSDQ")
+        book.update(2, INSERT, BID, 99.5, 100, "BATS")   # grows the book
+        book.update(1, UPDATE, BID, 100.0, 400, "ARCA")
+        self.assertEqual(rows(book, BID), [(100.5, 200, "NSDQ"),
+            (100.0, 400, "ARCA"), (99.5, 100, "BATS")])
+
+        book.update(0, DELETE, BID, 0., 0)
+        self.assertEqual(rows(book, BID), [(100.0, 400, "ARCA"), (99.5, 100, "BATS")])
+        book.update(5, DELETE, BID, 0., 0)  # no such row
+        book.update(4, UPDATE, BID, 99.0, 50) # update of a new row: appended
+        self.assertEqual(rows(book, BID)[-1], (99.0, 50, ""))
+        self.assertEqual(rows(book, ASK), [])
+
+
+    def test_views_and_stats(self):
+        book = OrderBook(10)
+        self.assertIsNone(book.microprice())
+        self.assertIsNone(book.imbalance())
+        for (pos, price, size) in ((0, 100.0, 100), (1, 99.9, 500)):
+            book.update(pos, INSERT, BID, price, size)
+        for (pos, price, size) in ((0, 100.1, 300), (1, 100.2, 100)):
+            book.update(pos, INSERT, ASK, price, size)
+
+        (prices, sizes) = book.top(BID, 1)
+        self.assertEqual((prices.tolist(), sizes.tolist()), ([100.0], [100]))
+        book.update(0, UPDATE, BID, 100.05, 150)
+        self.assertEqual(prices[0], 100.05)     # a view, not a copy
+
+        self.assertEqual(book.bestBid(), (100.05, 150))
+        self.assertEqual(book.bestAsk(), (100.1, 300))
+        self.assertAlmostEqual(book.spread(), 0.05)
+        self.assertAlmostEqual(book.microprice(), (100.05 * 300 + 100.1 * 150) / 450)
+        self.assertAlmostEqual(book.imbalance(), (150 - 300) / 450)
+        self.assertAlmostEqual(book.imbalance(5), (650 - 400) / 1050)
+
+
+    def test_wrapper(self):
+        updates = []
+
+        class App(OrderBookWrapper):
+            def orderBookUpdate(self, reqId, book):
+                updates.append((reqId, book.bestBid()))
+
+        app = App()
+        decoder = Decoder(app, MAX_CLIENT_VER)
+        decoder.interpret((str(IN.MARKET_DEPTH_L2).encode(), b"1", b"7", b"0",
+            b"ARCA", b"0", b"1", b"100.5", b"200", b"1"))
+        decoder.interpret((str(IN.MARKET_DEPTH).encode(), b"1", b"8", b"0",
+            b"0", b"1", b"50.25", b"100"))
+        self.assertEqual(updates, [(7, (100.5, 200)), (8, (50.25, 100))])
+        self.assertEqual(app.orderBooks[7].marketMakers[BID][0], "ARCA")
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,237 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import threading
+import unittest
+
+from ibapi import comm
+from ibapi.errors import SEND_FAILED
+from ibapi.message import OUT
+from ibapi.pacing import (PacingScheduler, TokenBucket, OutMsgId2Lane, SendLaneEnum,
+                          Cancels)
+from ibapi.server_versions import MAX_CLIENT_VER
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.
+
+    def __call__(self):
+        return self.now
+
+
+class FakeConn:
+    def __init__(self):
+        self.sent = []
+        self.wrapper = None
+
+    def sendMsg(self, msg):
+        self.sent.append(int(msg[4:msg.index(b"\0", 4)]))
+
+
+def make_msg(msgId, reqId, *rest):
+    return comm.make_msg(comm.make_field(msgId) + comm.make_field(reqId)
+                         + "".join(comm.make_field(v) for v in rest))
+
+
+class PacingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.conn = FakeConn()
+        self.pacer = PacingScheduler(self.conn, MAX_CLIENT_VER, self.clock)
+
+
+    def run_for(self, seconds):
+        end = self.clock.now + seconds
+        while self.clock.now < end - 1e-9:
+            wait = self.pacer.sendReady()
+            self.clock.now = min(end, self.clock.now + (wait or seconds))
+        self.pacer.sendReady()
+
+
+    def test_token_bucket(self):
+        bucket = TokenBucket.forLimit(60, 600., 10)
+        for _ in range(10):
+            self.assertEqual(bucket.waitTime(0.), 0.)
+            bucket.take(0.)
+        self.assertAlmostEqual(bucket.waitTime(0.), 12.)
+        self.assertAlmostEqual(bucket.waitTime(6.), 6.)
+
+
+    def test_msgs_per_sec(self):
+        for reqId in range(60):
+            self.pacer.sendMsg(make_msg(OUT.REQ_MKT_DATA, reqId))
+        wait = self.pacer.sendReady()
+        self.assertEqual(len(self.conn.sent), PacingScheduler.MSGS_BURST)
+        self.assertAlmostEqual(wait, 1 / 45)
+
+        self.run_for(1.)
+        # never more than 50 in a second
+        self.assertEqual(len(self.conn.sent), 50)
+        self.run_for(1.)
+        self.assertIsNone(self.pacer.sendReady())
+        self.assertEqual(len(self.conn.sent), 60)
+
+
+    def test_orders_first(self):
+        for reqId in range(20):
+            self.pacer.sendMsg(make_msg(OUT.REQ_CONTRACT_DATA, reqId))
+        self.pacer.sendMsg(make_msg(OUT.CANCEL_ORDER, 1))
+        self.pacer.sendMsg(make_msg(OUT.REQ_ACCOUNT_SUMMARY, 2))
+        self.pacer.sendReady()
+        self.assertEqual(self.conn.sent[:2], [OUT.CANCEL_ORDER, OUT.REQ_ACCOUNT_SUMMARY])
+
+        queued = self.pacer.queuedRequests()
+        self.assertEqual(len(queued), 17)
+        self.assertEqual(queued[0]["lane"], "BULK")
+        waits = [q["expectedWait"] for q in queued]
+        self.assertEqual(waits, sorted(waits))
+        self.assertAlmostEqual(waits[-1], 17 / 45)
+
+        self.pacer.sendMsg(make_msg(OUT.PLACE_ORDER, 3))
+        self.clock.now += 1 / 45
+        self.pacer.sendReady()
+        self.assertEqual(self.conn.sent[-1], OUT.PLACE_ORDER)
+
+
+    def test_historical(self):
+        for reqId in range(12):
+            self.pacer.sendMsg(make_msg(OUT.REQ_HEAD_TIMESTAMP, reqId, "AAPL%d" % reqId))
+        # same as the first one but the reqId
+        self.pacer.sendMsg(make_msg(OUT.REQ_HEAD_TIMESTAMP, 100, "AAPL0"))
+        self.pacer.sendMsg(make_msg(OUT.REQ_POSITIONS, 1))
+        self.run_for(10.)
+        # the historical limit does not hold back the other lanes
+        self.assertEqual(self.conn.sent.count(OUT.REQ_HEAD_TIMESTAMP), 10)
+        self.assertIn(OUT.REQ_POSITIONS, self.conn.sent)
+
+        queued = self.pacer.queuedRequests()
+        self.assertEqual([q["msgId"] for q in queued], [OUT.REQ_HEAD_TIMESTAMP] * 3)
+        # one every 12s, the first as soon as the 10s of refill add up to it
+        waits = [q["expectedWait"] for q in queued]
+        self.assertAlmostEqual(waits[0], 12. - 10., 1)
+        self.assertAlmostEqual(waits[1] - waits[0], 12.)
+        self.assertAlmostEqual(waits[2] - waits[1], 12.)
+        self.assertAlmostEqual(queued[2]["waited"], 10.)
+
+        self.run_for(12.)
+        self.assertEqual(self.conn.sent.count(OUT.REQ_HEAD_TIMESTAMP), 11)
+
+
+    def test_identical(self):
+        self.pacer.sendMsg(make_msg(OUT.REQ_HISTORICAL_TICKS, 1, "AAPL"))
+        self.pacer.sendMsg(make_msg(OUT.REQ_HISTORICAL_TICKS, 2, "AAPL"))
+        self.pacer.sendMsg(make_msg(OUT.REQ_HISTORICAL_TICKS, 3, "MSFT"))
+        wait = self.pacer.sendReady()
+        # the MSFT one waits behind the identical one
+        self.assertEqual(len(self.conn.sent), 1)
+        self.assertAlmostEqual(wait, PacingScheduler.IDENTICAL_DELAY)
+        self.clock.now += PacingScheduler.IDENTICAL_DELAY
+        self.pacer.sendReady()
+        self.assertEqual(len(self.conn.sent), 3)
+
+
+    def test_cancel_queued(self):
+        for reqId in range(12):
+            self.pacer.sendMsg(make_msg(OUT.REQ_HISTORICAL_DATA, reqId, "AAPL%d" % reqId))
+        self.pacer.sendMsg(make_msg(OUT.REQ_HEAD_TIMESTAMP, 20, "AAPL"))
+        self.run_for(1.)
+        self.assertEqual(len(self.conn.sent), PacingScheduler.HIST_BURST)
+
+        # still queued: the request is dropped, nothing is sent
+        self.pacer.sendMsg(make_msg(OUT.CANCEL_HISTORICAL_DATA, 1, 11))
+        self.pacer.sendMsg(make_msg(OUT.CANCEL_HEAD_TIMESTAMP, 20))
+        # already sent: the cancel goes right away
+        self.pacer.sendMsg(make_msg(OUT.CANCEL_HISTORICAL_DATA, 1, 0))
+        self.run_for(1.)
+        self.assertEqual(self.conn.sent[-1], OUT.CANCEL_HISTORICAL_DATA)
+        self.assertEqual([q["msgId"] for q in self.pacer.queuedRequests()],
+                         [OUT.REQ_HISTORICAL_DATA])
+        self.assertEqual(self.pacer.pacingStats()["cancelledQueued"], 2)
+
+
+    def test_cancel_queued_bulk(self):
+        for reqId in range(8):
+            self.pacer.sendMsg(make_msg(OUT.REQ_SCANNER_SUBSCRIPTION, reqId, 50))
+        self.pacer.sendMsg(make_msg(OUT.REQ_FUNDAMENTAL_DATA, 2, 8))
+        self.pacer.sendMsg(make_msg(OUT.CANCEL_SCANNER_SUBSCRIPTION, 1, 7))
+        self.pacer.sendMsg(make_msg(OUT.CANCEL_FUNDAMENTAL_DATA, 1, 8))
+        self.run_for(1.)
+        self.assertEqual(self.conn.sent, [OUT.REQ_SCANNER_SUBSCRIPTION] * 7)
+        self.assertEqual(self.pacer.pacingStats()["cancelledQueued"], 2)
+
+
+    def test_cancels_not_overtaking(self):
+        # each cancel queued ahead of its request's lane drops the request
+        for (name, cancelId) in vars(OUT).items():
+            reqId = getattr(OUT, "REQ" + name[len("CANCEL"):], None)
+            if not name.startswith("CANCEL_") or reqId is None:
+                continue
+            cancelLane = OutMsgId2Lane.get(cancelId, SendLaneEnum.CONTROL)
+            if OutMsgId2Lane.get(reqId, SendLaneEnum.CONTROL) > cancelLane:
+                self.assertEqual(Cancels.get(cancelId, (None, ))[0], reqId, name)
+
+
+    def test_send_outside_lock(self):
+        pacer = self.pacer
+        queued = []
+
+        class SlowConn(FakeConn):
+            def sendMsg(self, msg):
+                # another thread can queue while this one is sending
+                thread = threading.Thread(target=lambda: queued.append(
+                    pacer.sendMsg(make_msg(OUT.REQ_POSITIONS, 1))))
+                thread.start()
+                thread.join(1.)
+                super().sendMsg(msg)
+
+        pacer.conn = SlowConn()
+        pacer.sendMsg(make_msg(OUT.REQ_MKT_DATA, 1))
+        pacer.sendReady()
+        self.assertEqual(queued, [None])
+        self.assertEqual(pacer.conn.sent, [OUT.REQ_MKT_DATA])
+
+
+    def test_thread(self):
+        pacer = PacingScheduler(self.conn, MAX_CLIENT_VER)
+        pacer.start()
+        for reqId in range(3):
+            pacer.sendMsg(make_msg(OUT.REQ_MKT_DATA, reqId))
+        pacer.stop()
+        pacer.thread.join(1.)
+        self.assertFalse(pacer.thread.is_alive())
+        self.assertEqual(pacer.pacingStats()["queued"]["CONTROL"], 0)
+
+
+
+    def test_send_failed(self):
+        errors = []
+
+        class Wrapper:
+            def error(self, reqId, code, msg):
+                errors.append(code)
+
+        class FailingConn(FakeConn):
+            def sendMsg(self, msg):
+                if len(self.sent) == 2:
+                    raise ConnectionResetError("reset by peer")
+                super().sendMsg(msg)
+
+        conn = FailingConn()
+        conn.wrapper = Wrapper()
+        pacer = PacingScheduler(conn, MAX_CLIENT_VER)
+        pacer.start()
+        for reqId in range(4):
+            pacer.sendMsg(make_msg(OUT.REQ_MKT_DATA, reqId))
+        pacer.thread.join(1.)
+        # the thread ends, the error is reported and nothing is queued any more
+        self.assertFalse(pacer.thread.is_alive())
+        self.assertEqual(errors, [SEND_FAILED.code()])
+        self.assertEqual(conn.sent, [OUT.REQ_MKT_DATA] * 2)
+        pacer.sendMsg(make_msg(OUT.REQ_MKT_DATA, 5))
+        self.assertEqual(pacer.pacingStats()["queued"]["CONTROL"], 0)
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import unittest
+import queue
+
+from ibapi import comm
+from ibapi.msg_queue import BoundedQueue, OverflowPolicyEnum
+from ibapi.reader import EReader
+
+
+class MemConnection:
+    def __init__(self, packets):
+        self.packets = iter(packets)
+        self.connected = True
+
+    def isConnected(self):
+        return self.connected
+
+    def recvMsgInto(self, msgBuf):
+        try:
+            data = next(self.packets)
+        except StopIteration:
+            self.connected = False
+            return 0
+        msgBuf.write(data)
+        return len(data)
+
+    def disconnect(self):
+        self.connected = False
+
+
+class ReaderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.msgs = [comm.make_msg(comm.make_field(i)) for i in range(10)]
+        data = b"".join(self.msgs)
+        self.packets = [data[:15], data[15:16], data[16:]]
+
+
+    def drain(self, msg_queue):
+        items = []
+        while not msg_queue.empty():
+            items.append(msg_queue.get())
+        return items
+
+
+    def test_one_msg_per_item(self):
+        msg_queue = queue.Queue()
+        EReader(MemConnection(self.packets), msg_queue).run()
+
+        self.assertEqual(self.drain(msg_queue), [msg[4:] for msg in self.msgs])
+
+
+    def test_batch(self):
+        msg_queue = queue.Queue()
+        EReader(MemConnection(self.packets), msg_queue, batchMsgs=True).run()
+
+        batches = self.drain(msg_queue)
+        self.assertEqual(len(batches), 2, "one batch per packet w/ complete msgs")
+        self.assertEqual(sum(batches, []), [msg[4:] for msg in self.msgs])
+
+
+    def test_queue_full_disconnects(self):
+        conn = MemConnection(self.packets)
+        msg_queue = BoundedQueue(3, OverflowPolicyEnum.DISCONNECT)
+        EReader(conn, msg_queue).run()
+
+        self.assertFalse(conn.connected)
+        self.assertEqual(msg_queue.qsize(), 3)
+
+
+if "__main__" == __name__:
+    unittest.main()
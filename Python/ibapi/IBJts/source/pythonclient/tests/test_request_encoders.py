@@ -0,0 +1,422 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+"""
+Golden tests of the request encoding: the msgs sent by EClient for the
+OrderSamples/ContractSamples of the Testbed sample, at several server
+versions, have to be byte for byte the ones in golden_requests.txt, recorded
+from the make_field based EClient requests before they were moved to the
+precompiled encoders of the encoder module. The golden file is rewritten by
+
+    python tests/test_request_encoders.py --write-golden
+"""
+
+import inspect
+import os
+import sys
+import unittest
+
+from ibapi import comm, encoder
+from ibapi.client import EClient
+from ibapi.common import UNSET_DOUBLE
+from ibapi.contract import Contract, DeltaNeutralContract
+from ibapi.errors import UPDATE_TWS
+from ibapi.message import OUT
+from ibapi.server_versions import * # @UnusedWildImport
+from ibapi.softdollartier import SoftDollarTier
+from ibapi.tag_value import TagValue
+from ibapi.wrapper import EWrapper
+
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_FILE = os.path.join(TESTS_DIR, "golden_requests.txt")
+SAMPLES_DIR = os.path.join(TESTS_DIR, "..", "..", "..", "samples", "Python", "Testbed")
+
+try:
+    sys.path.insert(0, SAMPLES_DIR)
+    from AvailableAlgoParams import AvailableAlgoParams
+    from ContractSamples import ContractSamples
+    from OrderSamples import OrderSamples
+except ImportError:
+    OrderSamples = None
+finally:
+    sys.path.remove(SAMPLES_DIR)
+
+
+# the oldest ones only check the version handling, TWS >= MIN_CLIENT_VER
+ORDER_VERSIONS = (38, 45, 61, 70, MIN_CLIENT_VER, 102, 111, 138, 144,
+                  MIN_SERVER_VER_ORDER_CONTAINER, 150, MAX_CLIENT_VER)
+VERSIONS = (38, 46, 68, 70, 75, MIN_CLIENT_VER, 123, 124, MAX_CLIENT_VER)
+
+
+class ErrorWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.errors = []
+
+    def error(self, reqId, errorCode, errorString):
+        self.errors.append("ERROR %s %s %s" % (reqId, errorCode, errorString))
+
+
+class NullConnection:
+    def __init__(self):
+        self.msgs = []
+
+    def isConnected(self):
+        return True
+
+    def sendMsg(self, msg):
+        self.msgs.append(msg)
+        return len(msg)
+
+
+def connected_client(serverVersion):
+    client = EClient(ErrorWrapper())
+    client.conn = NullConnection()
+    client.serverVersion_ = serverVersion
+    client.connState = EClient.CONNECTED
+    return client
+
+
+def order_cases():
+    """ (name, contract, order) """
+    stock = ContractSamples.USStockAtSmart
+    combo = ContractSamples.StockComboContract
+    cases = []
+    def add(name, order, contract=None):
+        cases.append((name, contract if contract is not None else stock(), order))
+
+    add("AtAuction", OrderSamples.AtAuction("BUY", 100, 30.5))
+    add("Discretionary", OrderSamples.Discretionary("SELL", 100, 30.5, 0.1))
+    add("MarketOrder", OrderSamples.MarketOrder("BUY", 100))
+    add("MarketOrderFractional", OrderSamples.MarketOrder("BUY", 12.5))
+    add("MarketIfTouched", OrderSamples.MarketIfTouched("BUY", 100, 30.5))
+    add("MarketOnClose", OrderSamples.MarketOnClose("SELL", 100))
+    add("MarketOnOpen", OrderSamples.MarketOnOpen("BUY", 100))
+    add("MidpointMatch", OrderSamples.MidpointMatch("BUY", 100))
+    add("Midprice", OrderSamples.Midprice("BUY", 100, 150))
+    add("PeggedToMarket", OrderSamples.PeggedToMarket("BUY", 100, 0.05))
+    add("PeggedToStock", OrderSamples.PeggedToStock("BUY", 100, 0.5, 30, 35))
+    add("RelativePeggedToPrimary", OrderSamples.RelativePeggedToPrimary("BUY", 100, 30, 0.01))
+    add("SweepToFill", OrderSamples.SweepToFill("BUY", 100, 30.5))
+    add("AuctionLimit", OrderSamples.AuctionLimit("SELL", 100, 30.5, 2))
+    add("AuctionPeggedToStock", OrderSamples.AuctionPeggedToStock("BUY", 100, 30, 0.5))
+    add("AuctionRelative", OrderSamples.AuctionRelative("SELL", 100, 0.05))
+    add("Block", OrderSamples.Block("BUY", 100, 30.5))
+    add("BoxTop", OrderSamples.BoxTop("SELL", 100))
+    add("LimitOrder", OrderSamples.LimitOrder("SELL", 100, 30.5))
+    add("LimitOrderWithCashQty", OrderSamples.LimitOrderWithCashQty("BUY", 1, 30, 5000))
+    add("LimitIfTouched", OrderSamples.LimitIfTouched("BUY", 100, 30.5, 30))
+    add("LimitOnClose", OrderSamples.LimitOnClose("SELL", 100, 30.5))
+    add("LimitOnOpen", OrderSamples.LimitOnOpen("SELL", 100, 30.5))
+    add("PassiveRelative", OrderSamples.PassiveRelative("BUY", 100, 0.5))
+    add("PeggedToMidpoint", OrderSamples.PeggedToMidpoint("BUY", 100, 0.02, 30.5))
+    for (i, order) in enumerate(OrderSamples.BracketOrder(1000, "BUY", 100, 30, 40, 20)):
+        add("BracketOrder%d" % i, order)
+    add("MarketToLimit", OrderSamples.MarketToLimit("BUY", 100))
+    add("MarketWithProtection", OrderSamples.MarketWithProtection("BUY", 100))
+    add("Stop", OrderSamples.Stop("SELL", 100, 29.5))
+    add("StopLimit", OrderSamples.StopLimit("BUY", 100, 30, 31))
+    add("StopWithProtection", OrderSamples.StopWithProtection("SELL", 100, 29.5))
+    add("TrailingStop", OrderSamples.TrailingStop("SELL", 100, 0.5, 30))
+    add("TrailingStopLimit", OrderSamples.TrailingStopLimit("BUY", 100, 2, 5, 50))
+    add("ComboLimitOrder", OrderSamples.ComboLimitOrder("SELL", 1, 10, True), combo())
+    add("ComboMarketOrder", OrderSamples.ComboMarketOrder("BUY", 1, True), combo())
+    add("LimitOrderForComboWithLegPrices", OrderSamples.LimitOrderForComboWithLegPrices(
+        "BUY", 1, [10, 5], True), combo())
+    add("RelativeLimitCombo", OrderSamples.RelativeLimitCombo("BUY", 1, 10, True), combo())
+    add("RelativeMarketCombo", OrderSamples.RelativeMarketCombo("BUY", 1, True), combo())
+    add("FutureCombo", OrderSamples.ComboLimitOrder("BUY", 1, 1.5, False),
+        ContractSamples.FutureComboContract())
+    for (i, order) in enumerate(OrderSamples.OneCancelsAll("OCA_1", [
+            OrderSamples.LimitOrder("BUY", 1, 10), OrderSamples.LimitOrder("BUY", 1, 11)], 2)):
+        add("OneCancelsAll%d" % i, order)
+    add("Volatility", OrderSamples.Volatility("SELL", 1, 5, 2), ContractSamples.OptionAtBOX())
+    add("MarketFHedge", OrderSamples.MarketFHedge(1001, "BUY"), ContractSamples.EurGbpFx())
+    add("PeggedToBenchmark", OrderSamples.PeggedToBenchmark("SELL", 100, 33, True, 0.1, 0.2,
+        208813720, "ISLAND", 750, 650, 800), ContractSamples.OptionAtBOX())
+
+    parent = OrderSamples.Stop("SELL", 100, 30)
+    add("AttachAdjustableToStop", OrderSamples.AttachAdjustableToStop(parent, 35, 32, 33))
+    add("AttachAdjustableToStopLimit",
+        OrderSamples.AttachAdjustableToStopLimit(parent, 35, 33, 32, 33))
+    add("AttachAdjustableToTrail",
+        OrderSamples.AttachAdjustableToTrail(parent, 35, 32, 32, 1, 0))
+
+    order = OrderSamples.LimitOrder("BUY", 100, 10)
+    order.conditions.append(OrderSamples.PriceCondition(2, 208813720, "SMART", 600, False, False))
+    order.conditions.append(OrderSamples.ExecutionCondition("EUR", "CASH", "IDEAL", True))
+    order.conditions.append(OrderSamples.MarginCondition(30, True, False))
+    order.conditions.append(OrderSamples.PercentageChangeCondition(15.0, 208813720, "SMART", True, True))
+    order.conditions.append(OrderSamples.TimeCondition("20160118 23:59:59", True, False))
+    order.conditions.append(OrderSamples.VolumeCondition(208813720, "SMART", False, 100, True))
+    order.conditionsIgnoreRth = True
+    add("Conditions", order)
+
+    order = OrderSamples.LimitOrder("BUY", 1000, 10)
+    AvailableAlgoParams.FillScaleParams(order, 2000, 500, True, 0.002, 0.001, 600, 0.02, True, 100, 50)
+    add("Scale", order)
+    order = OrderSamples.LimitOrder("BUY", 1000, 1)
+    AvailableAlgoParams.FillArrivalPriceParams(order, 0.1, "Aggressive", "09:00:00 CET",
+                                               "16:00:00 CET", True, True, 100000)
+    add("ArrivalPrice", order)
+    order = OrderSamples.LimitOrder("BUY", 1000, 1)
+    AvailableAlgoParams.FillAdaptiveParams(order, "Normal")
+    add("Adaptive", order)
+    order = OrderSamples.LimitOrder("BUY", 1000, 1)
+    AvailableAlgoParams.FillVwapParams(order, 0.2, "09:00:00 CET", "16:00:00 CET", True, True, 100000)
+    add("Vwap", order)
+
+    order = OrderSamples.LimitOrder("BUY", 100, 10)
+    order.account = "DU123456"
+    order.modelCode = "Model1"
+    order.hedgeType = "D"
+    order.hedgeParam = "0.5"
+    order.whatIf = True
+    order.algoId = "algo1"
+    order.orderMiscOptions = [TagValue("tag1", "value1"), TagValue("tag2", "value2")]
+    order.softDollarTier = SoftDollarTier("sdt", "1", "Soft dollar tier")
+    order.mifid2DecisionMaker = "dm"
+    order.mifid2DecisionAlgo = "da"
+    order.mifid2ExecutionTrader = "et"
+    order.mifid2ExecutionAlgo = "ea"
+    order.dontUseAutoPriceForHedge = True
+    order.isOmsContainer = True
+    order.discretionaryUpToLimitPrice = True
+    order.usePriceMgmtAlgo = True
+    order.extOperator = "op"
+    order.notHeld = True
+    order.solicited = True
+    order.randomizeSize = True
+    order.randomizePrice = True
+    order.deltaNeutralOrderType = "LMT"
+    order.deltaNeutralAuxPrice = 1.5
+    order.deltaNeutralConId = 12087792
+    order.deltaNeutralSettlingFirm = "firm"
+    order.deltaNeutralClearingAccount = "acct"
+    order.deltaNeutralClearingIntent = "IB"
+    order.deltaNeutralOpenClose = "O"
+    order.deltaNeutralShortSale = True
+    order.deltaNeutralShortSaleSlot = 1
+    order.deltaNeutralDesignatedLocation = "loc"
+    order.scaleTable = "table"
+    order.activeStartTime = "20190101 09:30:00"
+    order.activeStopTime = "20190101 16:00:00"
+    contract = ContractSamples.USStockWithPrimaryExch()
+    contract.conId = 265598
+    contract.tradingClass = "NMS"
+    contract.secIdType = "ISIN"
+    contract.secId = "US0378331005"
+    contract.deltaNeutralContract = DeltaNeutralContract()
+    contract.deltaNeutralContract.conId = 265598
+    contract.deltaNeutralContract.delta = 0.5
+    contract.deltaNeutralContract.price = 170.25
+    add("Everything", order, contract)
+
+    order = OrderSamples.LimitOrder("BUY", 100, 10)
+    order.usePriceMgmtAlgo = False
+    add("PriceMgmtAlgoOff", order)
+    return cases
+
+
+def contract_cases():
+    """ (name, contract) of all the ContractSamples """
+    return [(name, fn()) for (name, fn) in
+            inspect.getmembers(ContractSamples, inspect.isfunction)]
+
+
+def encode_all():
+    """ yields (key, framed msg or error text) for all the requests """
+    for serverVersion in ORDER_VERSIONS:
+        for (name, contract, order) in order_cases():
+            # the default cashQty (UNSET_DOUBLE) is refused by the TWS older
+            # than MIN_SERVER_VER_CASH_QTY, which would hide the rest
+            if serverVersion < MIN_SERVER_VER_CASH_QTY and order.cashQty == UNSET_DOUBLE:
+                order.cashQty = 0
+            client = connected_client(serverVersion)
+            client.placeOrder(1001, contract, order)
+            yield ("placeOrder %s %d" % (name, serverVersion),
+                   client.conn.msgs + client.wrapper.errors)
+
+    for serverVersion in VERSIONS:
+        for (name, contract) in contract_cases():
+            client = connected_client(serverVersion)
+            client.reqMktData(1002, contract, "233,236", False, False, [])
+            client.reqMktData(1003, contract, "", True, True, [])
+            client.cancelMktData(1002)
+            yield ("reqMktData %s %d" % (name, serverVersion),
+                   client.conn.msgs + client.wrapper.errors)
+
+            client = connected_client(serverVersion)
+            client.reqHistoricalData(1004, contract, "20191018 16:00:00", "1 D",
+                                     "1 min", "TRADES", 1, 1, False, [])
+            client.reqHistoricalData(1005, contract, "", "2 W", "1 hour",
+                                     "MIDPOINT", 0, 2, True,
+                                     [TagValue("XYZ", "1")])
+            yield ("reqHistoricalData %s %d" % (name, serverVersion),
+                   client.conn.msgs + client.wrapper.errors)
+
+            client = connected_client(serverVersion)
+            client.reqContractDetails(1006, contract)
+            yield ("reqContractDetails %s %d" % (name, serverVersion),
+                   client.conn.msgs + client.wrapper.errors)
+
+        client = connected_client(serverVersion)
+        client.cancelOrder(1001)
+        client.cancelHistoricalData(1004)
+        yield ("cancel %d" % serverVersion, client.conn.msgs + client.wrapper.errors)
+
+
+def golden_line(key, sent):
+    """ the fields separated by | instead of NULL, one msg after the other """
+    texts = []
+    for msg in sent:
+        if type(msg) is bytes:
+            (size, text, rest) = comm.read_msg(msg)
+            assert size == len(text) and not rest and b"|" not in text
+            texts.append(text.decode().replace("\0", "|"))
+        else:
+            texts.append(msg)
+    return "%s\t%s" % (key, "\t".join(texts))
+
+
+def write_golden():
+    with open(GOLDEN_FILE, "w") as f:
+        for (key, sent) in encode_all():
+            f.write(golden_line(key, sent) + "\n")
+
+
+@unittest.skipIf(OrderSamples is None, "the Testbed samples are not there")
+class RequestEncodersTestCase(unittest.TestCase):
+    def test_golden(self):
+        with open(GOLDEN_FILE) as f:
+            golden = dict(line.rstrip("\n").split("\t", 1) for line in f)
+        nChecked = 0
+        for (key, sent) in encode_all():
+            self.assertEqual(golden_line(key, sent).split("\t", 1)[1], golden[key], key)
+            nChecked += 1
+        self.assertEqual(nChecked, len(golden))
+
+
+class EncodersTestCase(unittest.TestCase):
+    def test_compiled_once(self):
+        encoders = encoder.forServerVersion(MAX_CLIENT_VER)
+        self.assertIs(encoder.forServerVersion(MAX_CLIENT_VER), encoders)
+        self.assertIsNot(encoder.forServerVersion(MIN_CLIENT_VER), encoders)
+        # the version tests are resolved, the constant fields merged
+        self.assertNotIn("serverVersion", encoders.placeOrder.source)
+        self.assertIn(repr("%d\0%d" % (OUT.REQ_MKT_DATA, 11)),
+                      encoders.reqMktData.source)
+
+    def test_framing(self):
+        contract = Contract()
+        contract.symbol = "N\u00e9stle"
+        msg = encoder.forServerVersion(MAX_CLIENT_VER).reqContractDetails(1, contract)
+        (size, text, rest) = comm.read_msg(msg)
+        # the size is the one of the utf-8 bytes
+        self.assertEqual((size, rest), (len(msg) - 4, b""))
+        self.assertEqual(text.decode().split("\0")[4], "N\u00e9stle")
+
+    def test_errors(self):
+        client = connected_client(MIN_SERVER_VER_TRADING_CLASS - 1)
+        contract = Contract()
+        contract.tradingClass = "NMS"
+        client.reqContractDetails(7, contract)
+        self.assertEqual(client.conn.msgs, [])
+        self.assertEqual(client.wrapper.errors, ["ERROR 7 %d %s" % (UPDATE_TWS.code(),
+            UPDATE_TWS.msg() + "  It does not support tradingClass parameter in reqContractDetails.")])
+
+        contract.symbol = None
+        self.assertRaises(ValueError, connected_client(MAX_CLIENT_VER).reqContractDetails,
+                          7, contract)
+
+
+class ContractCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.encoders = encoder.forServerVersion(MAX_CLIENT_VER)
+        self.contract = Contract()
+        self.contract.conId = 265598
+        self.contract.symbol = "AAPL"
+        self.contract.secType = "STK"
+        self.contract.exchange = "SMART"
+        self.contract.currency = "USD"
+        encoder.contractCache.invalidate()
+
+    def tearDown(self):
+        encoder.contractCache.maxSize = 10000
+        encoder.contractCache.invalidate()
+
+    def fields(self, msg):
+        return comm.read_msg(msg)[1].split(b"\0")
+
+    def test_cached(self):
+        reqMktData = self.encoders.reqMktData
+        msg = reqMktData(1, self.contract, "", False, False, [])
+        self.assertEqual(len(encoder.contractCache), 1)
+        self.assertEqual(reqMktData(1, self.contract, "", False, False, []), msg)
+        self.assertEqual(self.fields(reqMktData(2, self.contract, "", False, False, []))[3:],
+                         self.fields(msg)[3:])
+        # one entry per request kind
+        self.encoders.reqContractDetails(3, self.contract)
+        self.assertEqual(len(encoder.contractCache), 2)
+
+    def test_changed_contract(self):
+        reqMktData = self.encoders.reqMktData
+        reqMktData(1, self.contract, "", False, False, [])
+        self.contract.exchange = "ISLAND"
+        self.assertEqual(self.fields(reqMktData(1, self.contract, "", False, False, []))[10],
+                         b"ISLAND")
+        other = Contract()
+        other.conId = self.contract.conId
+        other.symbol = "MSFT"
+        self.assertEqual(self.fields(reqMktData(1, other, "", False, False, []))[4], b"MSFT")
+        self.assertEqual(len(encoder.contractCache), 1)
+
+    def test_equal_values_of_other_types(self):
+        # 100 == 100.0 but they are sent as "100" and "100.0"
+        self.contract.secType = "OPT"
+        self.contract.right = "C"
+        self.contract.lastTradeDateOrContractMonth = "20191018"
+        expected = {}
+        encoder.contractCache.maxSize = 0
+        for strike in (100, 100.0, True, 1):
+            self.contract.strike = strike
+            expected[repr(strike)] = self.encoders.reqMktData(1, self.contract, "", False,
+                                                             False, [])
+        encoder.contractCache.maxSize = 10000
+        for strike in (100, 100.0, 100, True, 1):
+            self.contract.strike = strike
+            self.assertEqual(self.encoders.reqMktData(1, self.contract, "", False, False, []),
+                             expected[repr(strike)])
+        self.assertEqual(self.fields(expected["100.0"])[7], b"100.0")
+        self.assertEqual(self.fields(expected["True"])[7], b"1")
+
+    def test_not_cached(self):
+        self.contract.conId = 0
+        self.encoders.reqMktData(1, self.contract, "", False, False, [])
+        self.assertEqual(len(encoder.contractCache), 0)
+        self.contract.conId = 265598
+        encoder.contractCache.maxSize = 0
+        self.encoders.reqMktData(1, self.contract, "", False, False, [])
+        self.assertEqual(len(encoder.contractCache), 0)
+
+    def test_size_and_invalidate(self):
+        encoder.contractCache.maxSize = 2
+        for conId in (1, 2, 3):
+            self.contract.conId = conId
+            self.encoders.reqMktData(1, self.contract, "", False, False, [])
+        blocks = encoder.contractCache.kindBlocks(("reqMktData", MAX_CLIENT_VER))
+        self.assertEqual(list(blocks), [2, 3])
+        encoder.contractCache.invalidate(3)
+        self.assertEqual(list(blocks), [2])
+        encoder.contractCache.invalidate()
+        self.assertEqual(len(encoder.contractCache), 0)
+
+
+if "__main__" == __name__:
+    if sys.argv[1:] == ["--write-golden"]:
+        write_golden()
+    else:
+        unittest.main()
@@ -0,0 +1,134 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import asyncio
+import unittest
+
+from ibapi.client import EClient
+from ibapi.common import BarData
+from ibapi.contract import Contract, ContractDetails
+from ibapi.request_manager import RequestManager, RequestError
+from ibapi.wrapper import EWrapper
+
+
+class MyWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.untracked = []
+
+    def contractDetails(self, reqId, contractDetails):
+        self.untracked.append(reqId)
+
+    def error(self, reqId, errorCode, errorString):
+        self.untracked.append((reqId, errorCode))
+
+
+class App(RequestManager, MyWrapper, EClient):
+    """ records the requests instead of sending them """
+    def __init__(self):
+        RequestManager.__init__(self)
+        MyWrapper.__init__(self)
+        EClient.__init__(self, wrapper=self)
+        self.sent = []
+        self.cancelled = []
+
+    def isConnected(self):
+        return True
+
+    def reqContractDetails(self, reqId, contract):
+        self.sent.append((reqId, contract.symbol))
+
+    def reqHistoricalData(self, reqId, *args):
+        self.sent.append((reqId, "bars"))
+
+    def cancelHistoricalData(self, reqId):
+        self.cancelled.append(reqId)
+
+
+def details(symbol):
+    cd = ContractDetails()
+    cd.contract.symbol = symbol
+    return cd
+
+
+def contract(symbol):
+    c = Contract()
+    c.symbol = symbol
+    return c
+
+
+class RequestManagerTestCase(unittest.TestCase):
+    def test_concurrent_requests(self):
+        app = App()
+        futs = [app.reqContractDetailsFuture(contract(s)) for s in ("AAPL", "MSFT")]
+        ((aaplId, _), (msftId, _)) = app.sent
+        self.assertNotEqual(aaplId, msftId)
+
+        app.contractDetails(msftId, details("MSFT"))
+        app.contractDetails(aaplId, details("AAPL"))
+        app.contractDetails(7, details("IBM"))      # not a managed reqId
+        app.contractDetails(msftId, details("MSFT"))
+        app.contractDetailsEnd(msftId)
+        self.assertTrue(futs[1].done())
+        self.assertFalse(futs[0].done())
+        app.contractDetailsEnd(aaplId)
+
+        self.assertEqual([cd.contract.symbol for cd in futs[0].result()], ["AAPL"])
+        self.assertEqual([cd.contract.symbol for cd in futs[1].result()], ["MSFT"] * 2)
+        self.assertEqual(app.untracked, [7])
+        self.assertEqual(app.pendingCount(), 0)
+
+
+    def test_error_and_warning(self):
+        app = App()
+        fut = app.reqHistoricalDataFuture(contract("AAPL"), "", "1 D", "1 min",
+                                          "TRADES", 1, 1)
+        ((reqId, _), ) = app.sent
+        app.error(reqId, 2176, "a warning")
+        app.historicalData(reqId, BarData())
+        app.error(reqId, 162, "HMDS query returned no data")
+        with self.assertRaises(RequestError) as cm:
+            fut.result(0)
+        self.assertEqual(cm.exception.errorCode, 162)
+        self.assertEqual(app.untracked, [(reqId, 2176)])
+
+
+    def test_timeout_and_disconnect(self):
+        app = App()
+        fut = app.reqHistoricalDataFuture(contract("AAPL"), "", "1 D", "1 min",
+                                          "TRADES", 1, 1, timeout=0.05)
+        other = app.reqContractDetailsFuture(contract("MSFT"))
+        with self.assertRaises(TimeoutError):
+            fut.result(5)
+        self.assertEqual(app.cancelled, [app.sent[0][0]])
+
+        app.connectionClosed()
+        with self.assertRaises(ConnectionError):
+            other.result(0)
+
+
+    def test_asyncio_futures(self):
+        app = App()
+        app.asyncFutures = True
+
+        async def main():
+            futs = [app.reqContractDetailsFuture(contract(s), timeout=5)
+                    for s in ("AAPL", "MSFT")]
+            slow = app.reqContractDetailsFuture(contract("IBM"), timeout=0.05)
+            for (reqId, symbol) in app.sent[:2]:
+                app.contractDetails(reqId, details(symbol))
+                app.contractDetailsEnd(reqId)
+            results = await asyncio.gather(*futs)
+            with self.assertRaises(TimeoutError):
+                await slow
+            return results
+
+        results = asyncio.run(main())
+        self.assertEqual([[cd.contract.symbol for cd in cds] for cds in results],
+                         [["AAPL"], ["MSFT"]])
+
+
+if "__main__" == __name__:
+    unittest.main()
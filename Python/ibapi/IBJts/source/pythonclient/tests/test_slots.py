@@ -0,0 +1,78 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import copy
+import os
+import pickle
+import subprocess
+import sys
+import unittest
+
+from ibapi.commission_report import CommissionReport
+from ibapi.common import (BarData, RealTimeBar, TickAttrib, TickAttribBidAsk,
+    TickAttribLast, HistoricalTick, HistoricalTickBidAsk, HistoricalTickLast)
+from ibapi.contract import Contract, ContractDetails
+from ibapi.execution import Execution
+from ibapi.object_implem import slotted
+from ibapi.order import Order
+from ibapi.softdollartier import SoftDollarTier
+
+
+SLOTTED = (BarData, RealTimeBar, TickAttrib, TickAttribBidAsk, TickAttribLast,
+           HistoricalTick, HistoricalTickBidAsk, HistoricalTickLast,
+           CommissionReport, Contract, ContractDetails, Execution, Order,
+           SoftDollarTier)
+
+
+class SlotsTestCase(unittest.TestCase):
+    @unittest.skipIf(slotted, "IBAPI_SLOTTED is set")
+    def test_dict_by_default(self):
+        for cls in SLOTTED:
+            obj = cls()
+            obj.myTag = 1
+            self.assertEqual(vars(obj)["myTag"], 1, cls.__name__)
+
+
+    @unittest.skipIf(slotted, "IBAPI_SLOTTED is set")
+    def test_slotted_mode(self):
+        testsDir = os.path.dirname(os.path.abspath(__file__))
+        env = dict(os.environ, IBAPI_SLOTTED="1",
+                   PYTHONPATH=os.path.dirname(testsDir))
+        proc = subprocess.run([sys.executable, os.path.join(testsDir, "test_slots.py"),
+                               "SlotsTestCase.test_no_dict", "SlotsTestCase.test_copy_and_pickle"],
+                              env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              universal_newlines=True, timeout=60)
+        self.assertEqual(proc.returncode, 0, proc.stdout)
+
+
+    @unittest.skipUnless(slotted, "IBAPI_SLOTTED is not set")
+    def test_no_dict(self):
+        for cls in SLOTTED:
+            obj = cls()
+            self.assertFalse(hasattr(obj, "__dict__"), cls.__name__)
+            # all the slots are set by __init__
+            for name in cls.__slots__:
+                getattr(obj, name)
+            with self.assertRaises(AttributeError):
+                obj.notAnAttribute = 1
+
+
+    def test_copy_and_pickle(self):
+        order = Order()
+        order.orderId = 7
+        order.lmtPrice = 150.25
+        order.softDollarTier = SoftDollarTier("n", "v", "d")
+        for other in (copy.copy(order), copy.deepcopy(order),
+                      pickle.loads(pickle.dumps(order))):
+            self.assertEqual((other.orderId, other.lmtPrice), (7, 150.25))
+            self.assertEqual(str(other), str(order))
+
+        cd = pickle.loads(pickle.dumps(ContractDetails()))
+        cd.contract.symbol = "AAPL"
+        self.assertEqual(cd.contract.symbol, "AAPL")
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,244 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import socket
+import threading
+import time
+import unittest
+
+from ibapi.client import EClient
+from ibapi.contract import Contract
+from ibapi.message import IN, OUT
+from ibapi.order import Order
+from ibapi.request_manager import RequestManager
+from ibapi.tws_sim import TwsSimulator
+
+
+class App(RequestManager, EClient):
+    def __init__(self):
+        RequestManager.__init__(self)
+        EClient.__init__(self, wrapper=self)
+        self.nextOrderId = None
+        self.accounts = None
+        self.ticks = []
+        self.statuses = []
+        self.events = []
+        self.execs = []
+        self.commissions = []
+        self.news = None
+        self.filled = threading.Event()
+
+    def nextValidId(self, orderId:int):
+        self.nextOrderId = orderId
+
+    def managedAccounts(self, accountsList:str):
+        self.accounts = accountsList
+
+    def tickPrice(self, reqId, tickType, price:float, attrib):
+        self.ticks.append((reqId, tickType, price))
+
+    def orderStatus(self, orderId, status, filled, remaining, avgFillPrice,
+                    permId, parentId, lastFillPrice, clientId, whyHeld, mktCapPrice):
+        self.statuses.append((orderId, status, filled, remaining))
+        self.events.append(("orderStatus", orderId, status))
+        if status == "Filled":
+            self.filled.set()
+
+    def openOrder(self, orderId, contract, order, orderState):
+        self.events.append(("openOrder", orderId, orderState.status, order.parentId))
+
+    def execDetails(self, reqId, contract, execution):
+        self.execs.append((contract.symbol, execution.side, execution.shares))
+
+    def commissionReport(self, commissionReport):
+        self.commissions.append(commissionReport.commission)
+
+    def newsProviders(self, newsProviders):
+        self.news = newsProviders
+
+
+def stock(symbol):
+    contract = Contract()
+    contract.symbol = symbol
+    contract.secType = "STK"
+    contract.exchange = "SMART"
+    contract.currency = "USD"
+    return contract
+
+
+class TwsSimulatorTestCase(unittest.TestCase):
+    writerThread = False
+
+    def setUp(self):
+        self.sim = TwsSimulator(tickRate=500)
+        self.sim.handlers[OUT.REQ_NEWS_PROVIDERS] = \
+            lambda session, fields: session.send(IN.NEWS_PROVIDERS, 1, "BZ", "Benzinga")
+        port = self.sim.start()
+        self.app = App()
+        if self.writerThread:
+            self.app.writerThread = True
+            self.app.socketOptions = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+        self.app.connect("127.0.0.1", port, 3)
+        self.thread = threading.Thread(target=self.app.run, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.app.disconnect()
+        self.thread.join(2)
+        self.sim.stop()
+
+
+    def wait_for(self, cond, timeout=5.):
+        deadline = time.monotonic() + timeout
+        while not cond() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(cond())
+
+
+    def test_requests(self):
+        self.wait_for(lambda: self.app.nextOrderId is not None)
+        self.assertEqual(self.app.accounts, "DU123456")
+
+        details = self.app.reqContractDetailsFuture(stock("AAPL"), timeout=5).result()
+        self.assertEqual(len(details), 1)
+        self.assertEqual(details[0].contract.symbol, "AAPL")
+        self.assertEqual(details[0].contract.conId, self.sim.instrument("AAPL").conId)
+        self.assertEqual(details[0].marketRuleIds, "26,26,26")
+
+        bars = self.app.reqHistoricalDataFuture(stock("AAPL"), "", "2 D", "1 hour",
+                                                "TRADES", 1, 1, timeout=5).result()
+        self.assertEqual(len(bars), 48)
+        self.assertTrue(all(bar.low <= bar.open <= bar.high for bar in bars))
+
+        self.app.reqNewsProviders()
+        self.wait_for(lambda: self.app.news is not None)
+        self.assertEqual(self.app.news[0].code, "BZ")
+
+
+    def test_market_data(self):
+        self.app.reqMktData(7, stock("MSFT"), "", False, False, [])
+        self.wait_for(lambda: len(self.app.ticks) >= 100)
+        self.app.cancelMktData(7)
+        time.sleep(0.1)
+        nTicks = len(self.app.ticks)
+        time.sleep(0.1)
+        self.assertEqual(len(self.app.ticks), nTicks)
+        self.assertEqual({reqId for (reqId, _, _) in self.app.ticks}, {7})
+
+
+    def test_orders(self):
+        self.wait_for(lambda: self.app.nextOrderId is not None)
+        order = Order()
+        order.action = "BUY"
+        order.totalQuantity = 100
+        order.orderType = "MKT"
+        self.app.placeOrder(self.app.nextOrderId, stock("IBM"), order)
+        self.assertTrue(self.app.filled.wait(5))
+        self.wait_for(lambda: self.app.commissions)
+        self.assertEqual(self.app.statuses[0][1], "Submitted")
+        self.assertEqual(self.app.statuses[-1][1:], ("Filled", 100, 0))
+        self.assertEqual(self.app.execs, [("IBM", "BOT", 100)])
+
+        # far from the market: rests until cancelled
+        order.orderType = "LMT"
+        order.lmtPrice = 0.01
+        self.app.placeOrder(self.app.nextOrderId + 1, stock("IBM"), order)
+        self.app.cancelOrder(self.app.nextOrderId + 1)
+        self.wait_for(lambda: self.app.statuses[-1][1] == "Cancelled")
+
+
+    def test_bracket_order(self):
+        self.wait_for(lambda: self.app.nextOrderId is not None)
+        parentId = self.app.nextOrderId
+        orders = []
+        # the children would fill right away if they were working
+        for (action, orderType, price) in (("BUY", "LMT", 0.01),
+                                           ("SELL", "STP", 100000.),
+                                           ("SELL", "LMT", 0.01)):
+            order = Order()
+            order.action = action
+            order.totalQuantity = 100
+            order.orderType = orderType
+            order.lmtPrice = price if orderType == "LMT" else 0.
+            order.auxPrice = price if orderType == "STP" else 0.
+            order.parentId = parentId if orders else 0
+            order.transmit = len(orders) == 2
+            orders.append(order)
+        for (i, order) in enumerate(orders[:2]):
+            self.app.placeOrder(parentId + i, stock("IBM"), order)
+        time.sleep(0.1)
+        self.assertEqual(self.app.events, [], "not transmitted yet")
+
+        self.app.placeOrder(parentId + 2, stock("IBM"), orders[2])
+        self.wait_for(lambda: len(self.app.events) >= 6)
+        self.assertEqual(self.app.events, [
+            ("openOrder", parentId, "Submitted", 0),
+            ("orderStatus", parentId, "Submitted"),
+            ("openOrder", parentId + 1, "PreSubmitted", parentId),
+            ("orderStatus", parentId + 1, "PreSubmitted"),
+            ("openOrder", parentId + 2, "PreSubmitted", parentId),
+            ("orderStatus", parentId + 2, "PreSubmitted")])
+        self.assertEqual(self.app.execs, [])
+
+        # the parent fills, then one child, the other one is cancelled
+        orders[0].lmtPrice = 100000.
+        self.app.placeOrder(parentId, stock("IBM"), orders[0])
+        self.wait_for(lambda: len(self.app.commissions) == 2)
+        self.wait_for(lambda: ("orderStatus", parentId + 2, "Cancelled") in self.app.events)
+        self.assertEqual(self.app.execs, [("IBM", "BOT", 100), ("IBM", "SLD", 100)])
+        statuses = [event for event in self.app.events if event[0] == "orderStatus"]
+        self.assertEqual(statuses[-5:], [
+            ("orderStatus", parentId, "Submitted"),
+            ("orderStatus", parentId, "Filled"),
+            ("orderStatus", parentId + 1, "Submitted"),
+            ("orderStatus", parentId + 1, "Filled"),
+            ("orderStatus", parentId + 2, "Cancelled")])
+
+
+    def test_fill_after_disconnect(self):
+        self.wait_for(lambda: self.app.nextOrderId is not None)
+        (session, ) = self.sim.sessions
+        self.sim.fillDelay = 0.2
+        order = Order()
+        order.action = "BUY"
+        order.totalQuantity = 100
+        order.orderType = "MKT"
+        self.app.placeOrder(self.app.nextOrderId, stock("IBM"), order)
+        self.wait_for(lambda: session.timers)
+        timers = list(session.timers)
+        # the FIN goes out now, not when the EReader leaves recv()
+        self.app.conn.socket.shutdown(socket.SHUT_RDWR)
+        self.app.disconnect()
+        self.wait_for(lambda: session.closed)
+        self.assertTrue(all(handle.cancelled() for handle in timers))
+        self.assertEqual(self.sim.instrument("IBM").restingOrders, [])
+
+
+class WriterThreadTestCase(TwsSimulatorTestCase):
+    """ the same with the msgs written by a writer thread """
+    writerThread = True
+
+    def test_bracket(self):
+        self.wait_for(lambda: self.app.nextOrderId is not None)
+        orders = []
+        for (orderType, price) in (("LMT", 0.01), ("STP", 0.02), ("LMT", 0.03)):
+            order = Order()
+            order.action = "BUY"
+            order.totalQuantity = 100
+            order.orderType = orderType
+            order.lmtPrice = price
+            order.auxPrice = price
+            orders.append(order)
+        stats = self.app.conn.sendStats()
+        with self.app.burst():
+            for (i, order) in enumerate(orders):
+                self.app.placeOrder(self.app.nextOrderId + i, stock("IBM"), order)
+        self.wait_for(lambda: len(self.app.statuses) >= 3)
+        self.assertEqual(self.app.conn.sendStats()["bursts"], stats["bursts"] + 1)
+        self.assertEqual(self.app.conn.sendStats()["msgs"], stats["msgs"] + 3)
+
+
+if "__main__" == __name__:
+    unittest.main()
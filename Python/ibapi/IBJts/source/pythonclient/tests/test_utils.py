@@ -6,7 +6,8 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
 import unittest
 
 from ibapi.enum_implem import Enum
-from ibapi.utils import setattr_log
+from ibapi.common import UNSET_INTEGER, UNSET_DOUBLE
+from ibapi.utils import setattr_log, decode, FieldReader, BadMessage, SHOW_UNSET
 
 
 class UtilsTestCase(unittest.TestCase):
@@ -49,6 +50,32 @@ class UtilsTestCase(unittest.TestCase):
         o = B()
         #import code; code.interact(local=locals())
 
+
+    def test_field_reader(self):
+        fields = (b"9", b"", b"1.5", b"", b"abc", b"caf\xe9", b"0", b"1", b"", b"")
+        reader = FieldReader(fields)
+        reader.skip()
+        self.assertEqual(reader.int(), 0)
+        self.assertEqual(reader.float(), 1.5)
+        self.assertEqual(reader.float(), 0.)
+        self.assertEqual(reader.str(), "abc")
+        self.assertEqual(reader.str(), decode(str, iter(fields[5:])))
+        self.assertEqual((reader.bool(), reader.bool()), (False, True))
+        self.assertEqual(reader.int_unset(), UNSET_INTEGER)
+        self.assertEqual(reader.float_unset(), UNSET_DOUBLE)
+        self.assertRaises(BadMessage, reader.int)
+
+
+    def test_field_reader_as_iterator(self):
+        reader = FieldReader((b"12", b""))
+        self.assertEqual(decode(int, reader), 12)
+        self.assertEqual(decode(float, reader, SHOW_UNSET), UNSET_DOUBLE)
+
+    def test_field_reader_take(self):
+        reader = FieldReader((b"1", b"2", b"3"))
+        self.assertEqual(reader.take(2), (b"1", b"2"))
+        self.assertRaises(BadMessage, reader.take, 2)
+
  
 if "__main__" == __name__:
     unittest.main()
@@ -0,0 +1,99 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import os
+import queue
+import tempfile
+import time
+import unittest
+
+from ibapi import comm
+from ibapi.message import IN
+from ibapi.reader import EReader
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wire_capture import CaptureWriter, read_capture, replay
+from ibapi.wrapper import EWrapper
+
+from test_reader import MemConnection
+
+
+class TickWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.ticks = []
+
+    def tickString(self, reqId, tickType, value:str):
+        self.ticks.append((reqId, tickType, value))
+
+
+def tick_msg(i):
+    return (comm.make_field(IN.TICK_STRING) + comm.make_field(6)
+            + comm.make_field(i) + comm.make_field(45)
+            + comm.make_field(str(i))).encode()
+
+
+class WireCaptureTestCase(unittest.TestCase):
+    def setUp(self):
+        (fd, self.fileName) = tempfile.mkstemp(suffix=".ibcap")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.fileName)
+
+
+    def test_write_read(self):
+        capture = CaptureWriter(self.fileName, 150)
+        capture.write([tick_msg(0), tick_msg(1)], 1000)
+        capture.write([tick_msg(2)], 2000)
+        capture.close()
+        # a second session appended
+        capture = CaptureWriter(self.fileName, MAX_CLIENT_VER)
+        capture.write([tick_msg(3)], 50)
+        capture.close()
+
+        records = list(read_capture(self.fileName))
+        self.assertEqual(records[0][1], 150)
+        self.assertEqual(records[1:4], [(1000, tick_msg(0)), (1000, tick_msg(1)),
+                                        (2000, tick_msg(2))])
+        self.assertEqual(records[4][1], MAX_CLIENT_VER)
+        self.assertEqual(records[5], (50, tick_msg(3)))
+        # read in chunks that split the records anywhere
+        for readSize in (1, 7, 30):
+            self.assertEqual(list(read_capture(self.fileName, readSize)), records)
+
+        # a truncated last msg is dropped
+        with open(self.fileName, "r+b") as f:
+            f.truncate(os.path.getsize(self.fileName) - 1)
+        self.assertEqual(len(list(read_capture(self.fileName))), 5)
+
+
+    def test_reader_capture_and_replay(self):
+        data = b"".join(comm.make_msg(tick_msg(i).decode()) for i in range(10))
+        capture = CaptureWriter(self.fileName, MAX_CLIENT_VER)
+        EReader(MemConnection([data[:30], data[30:]]), queue.Queue(),
+                capture=capture).run()
+        self.assertTrue(capture.file.closed)
+
+        wrapper = TickWrapper()
+        self.assertEqual(replay(self.fileName, wrapper), 10)
+        self.assertEqual(wrapper.ticks, [(i, 45, str(i)) for i in range(10)])
+
+
+    def test_paced_replay(self):
+        capture = CaptureWriter(self.fileName, MAX_CLIENT_VER)
+        capture.write([tick_msg(0)], 0)
+        capture.write([tick_msg(1)], 200 * 1000000)    # 200ms later
+        capture.close()
+
+        t0 = time.monotonic()
+        replay(self.fileName, TickWrapper(), speed=2.)
+        self.assertGreaterEqual(time.monotonic() - t0, 0.1)
+        t0 = time.monotonic()
+        replay(self.fileName, TickWrapper())
+        self.assertLess(time.monotonic() - t0, 0.1)
+
+
+if "__main__" == __name__:
+    unittest.main()